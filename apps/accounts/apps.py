@@ -5,3 +5,7 @@ class AccountsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.accounts"
     verbose_name = "Accounts & Authentication"
+
+    def ready(self):
+        # Registers the signals that invalidate cached XC/API-key principals.
+        import apps.accounts.principal_cache  # noqa: F401
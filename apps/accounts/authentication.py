@@ -4,7 +4,7 @@ from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from django.conf import settings
 from drf_spectacular.extensions import OpenApiAuthenticationExtension
-from .models import User
+from .principal_cache import authenticate_api_key
 
 
 class JWTAuthenticationScheme(OpenApiAuthenticationExtension):
@@ -74,9 +74,8 @@ class ApiKeyAuthentication(authentication.BaseAuthentication):
         if not raw_key:
             return None
 
-        try:
-            user = User.objects.get(api_key=raw_key)
-        except User.DoesNotExist:
+        user = authenticate_api_key(raw_key)
+        if user is None:
             raise exceptions.AuthenticationFailed("Invalid API key")
 
         if not user.is_active:
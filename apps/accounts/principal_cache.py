@@ -0,0 +1,139 @@
+"""Short-lived per-process cache of authenticated principals.
+
+XC clients call ``player_api.php``, ``get_short_epg`` and stream URLs with
+the same username/password over and over, and API-key clients send the same
+key on every request. Verifying those credentials used to cost a user query
+each time. Successful verifications are kept here for ``PRINCIPAL_TTL``
+seconds, keyed by username plus a digest of the credential (raw secrets are
+never stored). Each entry holds the user with its channel profiles
+prefetched, so the user level, profile filter and stream limit checks that
+follow do not query the database either.
+
+Saving or deleting a user, changing its channel profiles or deleting a
+channel profile drops the affected entries in the process where the change
+happened. Other workers see the change once their entries expire.
+"""
+
+import copy
+import hashlib
+import hmac
+import threading
+import time
+
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .models import User
+
+PRINCIPAL_TTL = 10
+MAX_ENTRIES = 2048
+
+_lock = threading.Lock()
+_entries = {}  # key -> (expires_at, user)
+
+
+def _digest(secret):
+    return hashlib.sha256(str(secret).encode("utf-8")).hexdigest()
+
+
+def _load_user(**lookup):
+    return User.objects.prefetch_related("channel_profiles").filter(**lookup).first()
+
+
+def _get(key, now):
+    with _lock:
+        entry = _entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= now:
+            del _entries[key]
+            return None
+        user = entry[1]
+    # Each request gets its own instance; the prefetched profiles stay shared.
+    return copy.copy(user)
+
+
+def _put(key, user, now):
+    with _lock:
+        if len(_entries) >= MAX_ENTRIES:
+            expired = [k for k, (expires_at, _user) in _entries.items() if expires_at <= now]
+            for k in expired or list(_entries):
+                del _entries[k]
+        _entries[key] = (now + PRINCIPAL_TTL, user)
+    return copy.copy(user)
+
+
+def authenticate_xc(username, password):
+    """Return the user whose ``xc_password`` matches, or None."""
+    if not username or not password:
+        return None
+    now = time.monotonic()
+    key = ("xc", username, _digest(password))
+    user = _get(key, now)
+    if user is not None:
+        return user
+
+    user = _load_user(username=username)
+    if user is None:
+        return None
+    expected = (user.custom_properties or {}).get("xc_password")
+    if not expected or not hmac.compare_digest(str(expected), str(password)):
+        return None
+    return _put(key, user, now)
+
+
+def authenticate_api_key(raw_key):
+    """Return the user owning ``raw_key`` (active or not), or None."""
+    if not raw_key:
+        return None
+    now = time.monotonic()
+    key = ("api_key", _digest(raw_key))
+    user = _get(key, now)
+    if user is not None:
+        return user
+
+    user = _load_user(api_key=raw_key)
+    if user is None:
+        return None
+    return _put(key, user, now)
+
+
+def invalidate_user(user_id, username=None):
+    with _lock:
+        stale = [
+            key
+            for key, (_expires_at, user) in _entries.items()
+            if user.pk == user_id or (username is not None and user.username == username)
+        ]
+        for key in stale:
+            del _entries[key]
+
+
+def clear():
+    with _lock:
+        _entries.clear()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def _user_changed(sender, instance, **kwargs):
+    invalidate_user(instance.pk, instance.username)
+
+
+@receiver(m2m_changed, sender=User.channel_profiles.through)
+def _user_profiles_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        invalidate_user(instance.pk)
+    elif pk_set:
+        for user_id in pk_set:
+            invalidate_user(user_id)
+    else:
+        # profile.users.clear() does not say which users were removed.
+        clear()
+
+
+@receiver(post_delete, sender="dispatcharr_channels.ChannelProfile")
+def _channel_profile_deleted(sender, instance, **kwargs):
+    clear()
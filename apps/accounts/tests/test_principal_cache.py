@@ -0,0 +1,78 @@
+from django.test import RequestFactory, TestCase
+from rest_framework import exceptions
+
+from apps.accounts import principal_cache
+from apps.accounts.authentication import ApiKeyAuthentication
+from apps.accounts.models import User
+from apps.channels.models import ChannelProfile
+
+
+class PrincipalCacheTests(TestCase):
+    """Repeated XC/API-key logins are answered from the per-process cache."""
+
+    def setUp(self):
+        principal_cache.clear()
+        self.addCleanup(principal_cache.clear)
+        self.user = User.objects.create_user(
+            username="xc-viewer",
+            password="unused",
+            custom_properties={"xc_password": "right-pass"},
+            api_key="key-123",
+            stream_limit=2,
+        )
+        self.profile = ChannelProfile.objects.create(name="Kids")
+        self.user.channel_profiles.add(self.profile)
+
+    def test_repeat_xc_login_costs_no_queries(self):
+        self.assertIsNotNone(principal_cache.authenticate_xc("xc-viewer", "right-pass"))
+
+        with self.assertNumQueries(0):
+            user = principal_cache.authenticate_xc("xc-viewer", "right-pass")
+            self.assertEqual(user.user_level, User.UserLevel.STREAMER)
+            self.assertEqual(user.stream_limit, 2)
+            self.assertEqual(user.channel_profiles.count(), 1)
+            self.assertEqual([p.id for p in user.channel_profiles.all()], [self.profile.id])
+
+    def test_wrong_or_missing_xc_password_is_rejected(self):
+        self.assertIsNone(principal_cache.authenticate_xc("xc-viewer", "wrong"))
+        self.assertIsNone(principal_cache.authenticate_xc("ghost", "right-pass"))
+        self.assertIsNone(principal_cache.authenticate_xc("xc-viewer", ""))
+
+    def test_password_change_invalidates_cached_login(self):
+        principal_cache.authenticate_xc("xc-viewer", "right-pass")
+
+        self.user.custom_properties = {"xc_password": "new-pass"}
+        self.user.save()
+
+        self.assertIsNone(principal_cache.authenticate_xc("xc-viewer", "right-pass"))
+        self.assertIsNotNone(principal_cache.authenticate_xc("xc-viewer", "new-pass"))
+
+    def test_profile_assignment_change_invalidates_cached_login(self):
+        principal_cache.authenticate_xc("xc-viewer", "right-pass")
+
+        self.user.channel_profiles.remove(self.profile)
+
+        user = principal_cache.authenticate_xc("xc-viewer", "right-pass")
+        self.assertEqual(user.channel_profiles.count(), 0)
+
+    def test_api_key_authentication_is_cached(self):
+        request = RequestFactory().get("/", HTTP_X_API_KEY="key-123")
+        auth = ApiKeyAuthentication()
+        self.assertEqual(auth.authenticate(request)[0].pk, self.user.pk)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(auth.authenticate(request)[0].pk, self.user.pk)
+
+        bad = RequestFactory().get("/", HTTP_X_API_KEY="nope")
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            auth.authenticate(bad)
+
+    def test_deactivated_user_is_refused_by_api_key_auth(self):
+        request = RequestFactory().get("/", HTTP_X_API_KEY="key-123")
+        ApiKeyAuthentication().authenticate(request)
+
+        self.user.is_active = False
+        self.user.save()
+
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            ApiKeyAuthentication().authenticate(request)
@@ -191,6 +191,16 @@ def download_backup(request, filename):
         if not backup_file.exists() or not backup_file.is_file():
             raise Http404("Backup file not found")
 
+        if services.references_chunk_store(backup_file):
+            # Data files live in the local chunk store; stream a copy that carries them.
+            logger.info(f"[DOWNLOAD] File: {filename}, streaming with data chunks")
+            response = StreamingHttpResponse(
+                services.iter_portable_backup(backup_file),
+                content_type="application/zip",
+            )
+            response["Content-Disposition"] = f'attachment; filename="{filename}"'
+            return response
+
         file_size = backup_file.stat().st_size
 
         # Use X-Accel-Redirect for nginx (AIO container) - nginx serves file directly
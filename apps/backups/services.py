@@ -1,11 +1,15 @@
 import datetime
+import fcntl
+import hashlib
 import json
 import os
 import shutil
+import stat
 import subprocess
 import tempfile
-from pathlib import Path
-from zipfile import ZipFile, ZIP_DEFLATED
+from contextlib import contextmanager
+from pathlib import Path, PurePosixPath
+from zipfile import BadZipFile, ZipFile, ZipInfo, ZIP_DEFLATED, ZIP_STORED
 import logging
 import pytz
 
@@ -14,6 +18,12 @@ from core.models import CoreSettings
 
 logger = logging.getLogger(__name__)
 
+BACKUP_FORMAT_VERSION = 3
+DATA_MANIFEST_NAME = "data_manifest.json"
+# Archive directory of downloaded backups, holding each referenced chunk once.
+DATA_CHUNKS_DIR = "chunks"
+COPY_CHUNK_SIZE = 1024 * 1024
+
 
 def get_backup_dir() -> Path:
     """Get the backup directory, creating it if necessary."""
@@ -22,6 +32,13 @@ def get_backup_dir() -> Path:
     return backup_dir
 
 
+def get_chunk_dir() -> Path:
+    """Content-addressed store shared by all backups for data-directory files."""
+    chunk_dir = get_backup_dir() / "chunks"
+    chunk_dir.mkdir(parents=True, exist_ok=True)
+    return chunk_dir
+
+
 def _is_postgresql() -> bool:
     return "postgresql" in settings.DATABASES["default"]["ENGINE"]
 
@@ -71,8 +88,8 @@ def _get_pg_args() -> list[str]:
     ]
 
 
-def _dump_postgresql(output_file: Path) -> None:
-    """Dump PostgreSQL database using pg_dump."""
+def _dump_postgresql(output) -> None:
+    """Stream a pg_dump custom-format dump into the writable binary ``output``."""
     logger.info("Dumping PostgreSQL database with pg_dump...")
 
     cmd = [
@@ -80,21 +97,30 @@ def _dump_postgresql(output_file: Path) -> None:
         *_get_pg_args(),
         "-Fc",  # Custom format for pg_restore
         "-v",   # Verbose
-        "-f", str(output_file),
     ]
 
-    result = subprocess.run(
-        cmd,
-        env=_get_pg_env(),
-        capture_output=True,
-        text=True,
-    )
+    # stderr goes to a file: verbose output could fill a pipe and stall pg_dump.
+    with tempfile.TemporaryFile() as stderr_file:
+        process = subprocess.Popen(
+            cmd,
+            env=_get_pg_env(),
+            stdout=subprocess.PIPE,
+            stderr=stderr_file,
+        )
+        try:
+            while chunk := process.stdout.read(COPY_CHUNK_SIZE):
+                output.write(chunk)
+        finally:
+            process.stdout.close()
+            returncode = process.wait()
+        stderr_file.seek(0)
+        stderr = stderr_file.read().decode(errors="replace")
 
-    if result.returncode != 0:
-        logger.error(f"pg_dump failed: {result.stderr}")
-        raise RuntimeError(f"pg_dump failed: {result.stderr}")
+    if returncode != 0:
+        logger.error(f"pg_dump failed: {stderr}")
+        raise RuntimeError(f"pg_dump failed: {stderr}")
 
-    logger.debug(f"pg_dump output: {result.stderr}")
+    logger.debug(f"pg_dump output: {stderr}")
 
 
 def _clean_postgresql_schema() -> None:
@@ -226,10 +252,131 @@ def _restore_sqlite(dump_file: Path) -> None:
     logger.info("SQLite restore completed successfully")
 
 
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(COPY_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _chunk_path(chunk_dir: Path, digest: str) -> Path:
+    return chunk_dir / digest[:2] / digest
+
+
+@contextmanager
+def _chunk_store_lock(chunk_dir: Path):
+    """Serialize snapshotting and pruning so a prune never drops chunks mid-backup."""
+    with open(chunk_dir / ".lock", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _store_chunk(chunk_dir: Path, path: Path, digest: str) -> int:
+    """Copy ``path`` into the chunk store unless its content is already there."""
+    target = _chunk_path(chunk_dir, digest)
+    if target.exists():
+        return 0
+    target.parent.mkdir(parents=True, exist_ok=True)
+    partial = target.with_name(f".{digest}.partial")
+    shutil.copyfile(path, partial)
+    os.replace(partial, target)
+    return target.stat().st_size
+
+
+def _load_chunk_index(chunk_dir: Path) -> dict:
+    try:
+        with open(chunk_dir / "index.json") as f:
+            index = json.load(f)
+        return index if isinstance(index, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_chunk_index(chunk_dir: Path, index: dict) -> None:
+    partial = chunk_dir / "index.json.partial"
+    with open(partial, "w") as f:
+        json.dump(index, f)
+    os.replace(partial, chunk_dir / "index.json")
+
+
+def _snapshot_data_dirs(chunk_dir: Path) -> tuple[list[dict], dict]:
+    """
+    Store every file under BACKUP_DATA_DIRS in the chunk store.
+
+    Files whose size and mtime match the previous snapshot reuse the recorded
+    digest without being read, so only changed files cost I/O. Returns the
+    manifest entries and counters for logging.
+    """
+    previous = _load_chunk_index(chunk_dir)
+    index = {}
+    entries = []
+    stats = {"files": 0, "hashed": 0, "new_chunks": 0, "new_bytes": 0}
+
+    for root in settings.BACKUP_DATA_DIRS:
+        root_path = Path(root)
+        if not root_path.is_dir():
+            continue
+        for dirpath, dirnames, filenames in os.walk(root_path):
+            dirnames[:] = sorted(d for d in dirnames if d != "__pycache__")
+            for name in sorted(filenames):
+                path = Path(dirpath) / name
+                try:
+                    st = path.lstat()
+                except OSError:
+                    continue
+                if not stat.S_ISREG(st.st_mode):
+                    continue
+
+                key = str(path)
+                cached = previous.get(key)
+                digest = None
+                if (
+                    cached
+                    and cached[0] == st.st_size
+                    and cached[1] == st.st_mtime_ns
+                    and _chunk_path(chunk_dir, cached[2]).exists()
+                ):
+                    digest = cached[2]
+                else:
+                    try:
+                        digest = _hash_file(path)
+                        added = _store_chunk(chunk_dir, path, digest)
+                    except OSError as e:
+                        logger.warning(f"Skipping unreadable file {path}: {e}")
+                        continue
+                    stats["hashed"] += 1
+                    if added:
+                        stats["new_chunks"] += 1
+                        stats["new_bytes"] += added
+
+                index[key] = [st.st_size, st.st_mtime_ns, digest]
+                entries.append({
+                    "root": str(root_path),
+                    "path": path.relative_to(root_path).as_posix(),
+                    "sha256": digest,
+                    "size": st.st_size,
+                    "mode": stat.S_IMODE(st.st_mode),
+                })
+                stats["files"] += 1
+
+    _save_chunk_index(chunk_dir, index)
+    return entries, stats
+
+
 def create_backup() -> Path:
     """
     Create a backup archive containing database dump and data directories.
     Returns the path to the created backup file.
+
+    The PostgreSQL dump is streamed from pg_dump straight into the archive.
+    Data-directory files go to the shared chunk store, deduplicated by
+    content, and the archive records them in ``data_manifest.json``. The
+    chunks themselves are only added when the backup is downloaded (see
+    ``iter_portable_backup``).
     """
     backup_dir = get_backup_dir()
 
@@ -245,38 +392,56 @@ def create_backup() -> Path:
 
     backup_name = f"dispatcharr-backup-{timestamp}.zip"
     backup_file = backup_dir / backup_name
+    # Written under a name list_backups() ignores until it is complete.
+    partial_file = backup_dir / f"{backup_name}.partial"
 
     logger.info(f"Creating backup: {backup_name}")
 
-    with tempfile.TemporaryDirectory(prefix="dispatcharr-backup-") as temp_dir:
-        temp_path = Path(temp_dir)
-
-        # Determine database type and dump accordingly
-        if _is_postgresql():
-            db_dump_file = temp_path / "database.dump"
-            _dump_postgresql(db_dump_file)
-            db_type = "postgresql"
-        else:
-            db_dump_file = temp_path / "database.sqlite3"
-            _dump_sqlite(db_dump_file)
-            db_type = "sqlite"
-
-        # Create ZIP archive with compression and ZIP64 support for large files
-        with ZipFile(backup_file, "w", compression=ZIP_DEFLATED, allowZip64=True) as zip_file:
-            # Add database dump
-            zip_file.write(db_dump_file, db_dump_file.name)
+    chunk_dir = get_chunk_dir()
+    try:
+        with _chunk_store_lock(chunk_dir), ZipFile(
+            partial_file, "w", compression=ZIP_DEFLATED, allowZip64=True
+        ) as zip_file:
+            # Determine database type and dump accordingly
+            if _is_postgresql():
+                db_file_name = "database.dump"
+                db_type = "postgresql"
+                # Custom-format dumps are already compressed; store, don't deflate again.
+                info = ZipInfo(db_file_name, date_time=datetime.datetime.now().timetuple()[:6])
+                info.compress_type = ZIP_STORED
+                with zip_file.open(info, "w", force_zip64=True) as db_entry:
+                    _dump_postgresql(db_entry)
+            else:
+                db_file_name = "database.sqlite3"
+                db_type = "sqlite"
+                with tempfile.TemporaryDirectory(prefix="dispatcharr-backup-") as temp_dir:
+                    db_dump_file = Path(temp_dir) / db_file_name
+                    _dump_sqlite(db_dump_file)
+                    zip_file.write(db_dump_file, db_file_name)
+
+            entries, stats = _snapshot_data_dirs(chunk_dir)
+            zip_file.writestr(DATA_MANIFEST_NAME, json.dumps({"files": entries}))
 
             # Add metadata
             metadata = {
                 "format": "dispatcharr-backup",
-                "version": 2,
+                "version": BACKUP_FORMAT_VERSION,
                 "database_type": db_type,
-                "database_file": db_dump_file.name,
+                "database_file": db_file_name,
+                "data_manifest": DATA_MANIFEST_NAME,
+                "data_files": stats["files"],
                 "created_at": datetime.datetime.now(datetime.UTC).isoformat(),
             }
             zip_file.writestr("metadata.json", json.dumps(metadata, indent=2))
-
-    logger.info(f"Backup created successfully: {backup_file}")
+        os.replace(partial_file, backup_file)
+    except BaseException:
+        partial_file.unlink(missing_ok=True)
+        raise
+
+    logger.info(
+        f"Backup created successfully: {backup_file} ({stats['files']} data file(s), "
+        f"{stats['hashed']} re-read, {stats['new_chunks']} new chunk(s), {stats['new_bytes']} new bytes)"
+    )
     return backup_file
 
 
@@ -306,12 +471,92 @@ def restore_backup(backup_file: Path) -> None:
         with open(metadata_file) as f:
             metadata = json.load(f)
 
+        manifest = None
+        manifest_file = temp_path / metadata.get("data_manifest", DATA_MANIFEST_NAME)
+        if manifest_file.exists():
+            with open(manifest_file) as f:
+                manifest = json.load(f)
+        archive_chunk_dir = temp_path / DATA_CHUNKS_DIR
+
+        # Refuse before touching the database rather than restoring half a backup.
+        if manifest:
+            missing = {
+                entry["sha256"] for entry in _valid_manifest_entries(manifest)
+                if _find_chunk(archive_chunk_dir, entry["sha256"]) is None
+            }
+            if missing:
+                raise ValueError(
+                    f"Backup references {len(missing)} data chunk(s) that are neither in the archive "
+                    f"nor in {get_chunk_dir()}; download it from the host that created it and "
+                    f"upload that copy instead"
+                )
+
         # Restore database
         _restore_database(temp_path, metadata)
 
+        if manifest:
+            _restore_data_files(manifest, archive_chunk_dir)
+
     logger.info("Restore completed successfully")
 
 
+def _valid_manifest_entries(manifest: dict):
+    """Yield manifest entries that stay inside BACKUP_DATA_DIRS and carry a sha256 digest."""
+    allowed_roots = {str(Path(root)) for root in settings.BACKUP_DATA_DIRS}
+    for entry in manifest.get("files", []):
+        rel_path = PurePosixPath(entry.get("path") or "")
+        digest = str(entry.get("sha256") or "")
+        if (
+            entry.get("root") in allowed_roots
+            and not rel_path.is_absolute()
+            and ".." not in rel_path.parts
+            and rel_path.parts
+            and len(digest) == 64
+            and all(c in "0123456789abcdef" for c in digest)
+        ):
+            yield entry
+
+
+def _find_chunk(archive_chunk_dir: Path, digest: str) -> Path | None:
+    """Locate a chunk in the extracted archive, falling back to the local chunk store."""
+    for chunk in (archive_chunk_dir / digest, _chunk_path(get_chunk_dir(), digest)):
+        if chunk.is_file():
+            return chunk
+    return None
+
+
+def _restore_data_files(manifest: dict, archive_chunk_dir: Path) -> None:
+    """Write data-directory files back from the archive's chunks or the local chunk store."""
+    restored = unchanged = missing = 0
+    entries = list(_valid_manifest_entries(manifest))
+    skipped = len(manifest.get("files", [])) - len(entries)
+
+    for entry in entries:
+        digest = entry["sha256"]
+        chunk = _find_chunk(archive_chunk_dir, digest)
+        if chunk is None:
+            missing += 1
+            continue
+
+        target = Path(entry["root"], *PurePosixPath(entry["path"]).parts)
+        if target.is_file() and target.stat().st_size == entry.get("size") and _hash_file(target) == digest:
+            unchanged += 1
+            continue
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        partial = target.with_name(f".{target.name}.restore")
+        shutil.copyfile(chunk, partial)
+        os.chmod(partial, entry.get("mode") or 0o644)
+        os.replace(partial, target)
+        restored += 1
+
+    if missing:
+        logger.error(f"{missing} data file(s) could not be restored: their chunks are missing")
+    logger.info(
+        f"Data files restored: {restored} written, {unchanged} unchanged, {skipped} skipped"
+    )
+
+
 def _restore_database(temp_path: Path, metadata: dict) -> None:
     """Restore database from backup."""
     db_type = metadata.get("database_type", "postgresql")
@@ -335,6 +580,86 @@ def _restore_database(temp_path: Path, metadata: dict) -> None:
         _restore_sqlite(dump_file)
 
 
+class _StreamWriter:
+    """Write-only file object collecting what ZipFile writes, for streaming."""
+
+    def __init__(self):
+        self._parts = []
+
+    def write(self, data) -> int:
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def _referenced_digests(zip_file: ZipFile) -> list[str]:
+    """Chunk digests the archive's manifest references but does not carry itself."""
+    names = set(zip_file.namelist())
+    if DATA_MANIFEST_NAME not in names:
+        return []
+    manifest = json.loads(zip_file.read(DATA_MANIFEST_NAME))
+    return [
+        digest
+        for digest in dict.fromkeys(entry.get("sha256") for entry in manifest.get("files", []))
+        if digest and f"{DATA_CHUNKS_DIR}/{digest}" not in names
+    ]
+
+
+def references_chunk_store(backup_file: Path) -> bool:
+    """True when restoring ``backup_file`` elsewhere needs chunks from this host's store."""
+    try:
+        with ZipFile(backup_file, "r") as zip_file:
+            return bool(_referenced_digests(zip_file))
+    except (BadZipFile, OSError, ValueError):
+        return False
+
+
+def iter_portable_backup(backup_file: Path):
+    """
+    Yield ``backup_file`` as a self-contained zip, for downloads.
+
+    Archives on disk only reference the shared chunk store; the download
+    appends one copy of each referenced chunk under ``chunks/``, stored
+    rather than deflated again, so it restores on another host.
+    """
+    chunk_dir = get_chunk_dir()
+    out = _StreamWriter()
+    with ZipFile(backup_file, "r") as source, ZipFile(out, "w", allowZip64=True) as target:
+        digests = _referenced_digests(source)
+        for info in source.infolist():
+            entry = ZipInfo(info.filename, date_time=info.date_time)
+            entry.compress_type = info.compress_type
+            with source.open(info) as src, target.open(entry, "w", force_zip64=True) as dst:
+                while block := src.read(COPY_CHUNK_SIZE):
+                    dst.write(block)
+                    if data := out.drain():
+                        yield data
+
+        missing = 0
+        for digest in digests:
+            chunk = _chunk_path(chunk_dir, digest)
+            if not chunk.is_file():
+                missing += 1
+                continue
+            entry = ZipInfo(f"{DATA_CHUNKS_DIR}/{digest}", date_time=datetime.datetime.now().timetuple()[:6])
+            entry.compress_type = ZIP_STORED
+            with open(chunk, "rb") as src, target.open(entry, "w", force_zip64=True) as dst:
+                while block := src.read(COPY_CHUNK_SIZE):
+                    dst.write(block)
+                    if data := out.drain():
+                        yield data
+        if missing:
+            logger.error(f"Download of {backup_file.name} lacks {missing} data chunk(s) missing from {chunk_dir}")
+    yield out.drain()
+
+
 def list_backups() -> list[dict]:
     """List all available backup files with metadata."""
     backup_dir = get_backup_dir()
@@ -352,8 +677,8 @@ def list_backups() -> list[dict]:
     return backups
 
 
-def delete_backup(filename: str) -> None:
-    """Delete a backup file."""
+def delete_backup(filename: str, prune: bool = True) -> None:
+    """Delete a backup file (and, unless ``prune`` is False, chunks nothing references)."""
     backup_dir = get_backup_dir()
     backup_file = backup_dir / filename
 
@@ -365,3 +690,40 @@ def delete_backup(filename: str) -> None:
 
     backup_file.unlink()
     logger.info(f"Deleted backup: {filename}")
+    if prune:
+        prune_chunks()
+
+
+def prune_chunks() -> int:
+    """Remove chunks no remaining backup references. Returns the number removed."""
+    backup_dir = get_backup_dir()
+    chunk_dir = get_chunk_dir()
+    removed = 0
+
+    with _chunk_store_lock(chunk_dir):
+        referenced = set()
+        for archive in backup_dir.glob("*.zip"):
+            try:
+                with ZipFile(archive, "r") as zip_file:
+                    if DATA_MANIFEST_NAME not in zip_file.namelist():
+                        continue
+                    manifest = json.loads(zip_file.read(DATA_MANIFEST_NAME))
+            except (BadZipFile, OSError, ValueError) as e:
+                logger.warning(f"Could not read manifest from {archive.name}: {e}")
+                continue
+            referenced.update(entry.get("sha256") for entry in manifest.get("files", []))
+
+        for chunk in chunk_dir.glob("??/*"):
+            if chunk.name not in referenced:
+                chunk.unlink(missing_ok=True)
+                removed += 1
+
+        if removed:
+            index = _load_chunk_index(chunk_dir)
+            _save_chunk_index(
+                chunk_dir, {k: v for k, v in index.items() if v[2] in referenced}
+            )
+
+    if removed:
+        logger.info(f"Pruned {removed} unreferenced backup chunk(s)")
+    return removed
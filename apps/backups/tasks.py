@@ -23,12 +23,19 @@ def _cleanup_old_backups(retention_count: int) -> int:
 
     for backup in to_delete:
         try:
-            services.delete_backup(backup["name"])
+            services.delete_backup(backup["name"], prune=False)
             deleted += 1
             logger.info(f"[CLEANUP] Deleted old backup: {backup['name']}")
         except Exception as e:
             logger.error(f"[CLEANUP] Failed to delete {backup['name']}: {e}")
 
+    if deleted:
+        # One pass over the remaining manifests instead of one per deleted backup.
+        try:
+            services.prune_chunks()
+        except Exception as e:
+            logger.error(f"[CLEANUP] Failed to prune backup chunks: {e}")
+
     return deleted
 
 
@@ -2,7 +2,7 @@ import json
 import tempfile
 from io import BytesIO
 from pathlib import Path
-from zipfile import ZipFile
+from zipfile import ZIP_STORED, ZipFile
 from unittest.mock import patch, MagicMock
 
 from django.test import TestCase
@@ -158,7 +158,7 @@ class BackupServicesTestCase(TestCase):
 
             # Check metadata
             metadata = json.loads(zf.read('metadata.json'))
-            self.assertEqual(metadata['version'], 2)
+            self.assertEqual(metadata['version'], 3)
             self.assertEqual(metadata['database_type'], 'sqlite')
 
     @patch('apps.backups.services.get_backup_dir')
@@ -169,9 +169,9 @@ class BackupServicesTestCase(TestCase):
         mock_get_backup_dir.return_value = Path(self.temp_backup_dir)
         mock_is_pg.return_value = True
 
-        # Mock PostgreSQL dump to create a temp file
-        def mock_dump(output_file):
-            output_file.write_bytes(b"pg dump data")
+        # Mock PostgreSQL dump streaming into the archive entry
+        def mock_dump(output):
+            output.write(b"pg dump data")
 
         mock_dump_pg.side_effect = mock_dump
 
@@ -185,10 +185,11 @@ class BackupServicesTestCase(TestCase):
             names = zf.namelist()
             self.assertIn('database.dump', names)
             self.assertIn('metadata.json', names)
+            self.assertEqual(zf.read('database.dump'), b"pg dump data")
 
             # Check metadata
             metadata = json.loads(zf.read('metadata.json'))
-            self.assertEqual(metadata['version'], 2)
+            self.assertEqual(metadata['version'], 3)
             self.assertEqual(metadata['database_type'], 'postgresql')
 
     @patch('apps.backups.services.get_backup_dir')
@@ -356,6 +357,158 @@ class BackupServicesTestCase(TestCase):
         self.assertIn('database.dump', str(context.exception))
 
 
+class BackupChunkStoreTestCase(TestCase):
+    """Data directories are deduplicated into a chunk store shared by backups"""
+
+    def setUp(self):
+        import shutil
+        self.temp_backup_dir = Path(tempfile.mkdtemp())
+        self.data_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.temp_backup_dir, True)
+        self.addCleanup(shutil.rmtree, self.data_dir, True)
+        (self.data_dir / "logos").mkdir()
+        (self.data_dir / "logos" / "a.png").write_bytes(b"logo-a")
+        (self.data_dir / "logos" / "copy-of-a.png").write_bytes(b"logo-a")
+        (self.data_dir / "plugin.py").write_text("print('hi')")
+
+        for target, value in (
+            ('apps.backups.services.get_backup_dir', self.temp_backup_dir),
+            ('apps.backups.services._is_postgresql', False),
+        ):
+            patcher = patch(target, return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        dump = patch('apps.backups.services._dump_sqlite', side_effect=lambda f: f.write_text("db"))
+        dump.start()
+        self.addCleanup(dump.stop)
+        data_dirs = self.settings(BACKUP_DATA_DIRS=[str(self.data_dir)])
+        data_dirs.enable()
+        self.addCleanup(data_dirs.disable)
+
+    def _chunks(self):
+        return sorted(p.name for p in (self.temp_backup_dir / "chunks").glob("??/*"))
+
+    def _manifest(self, backup):
+        with ZipFile(backup, 'r') as zf:
+            return json.loads(zf.read(services.DATA_MANIFEST_NAME))["files"]
+
+    def test_identical_content_is_stored_once(self):
+        backup = services.create_backup()
+
+        files = self._manifest(backup)
+        self.assertEqual(
+            sorted(f["path"] for f in files), ["logos/a.png", "logos/copy-of-a.png", "plugin.py"]
+        )
+        self.assertEqual(len(self._chunks()), 2)
+        self.assertFalse(list(self.temp_backup_dir.glob("*.partial")))
+
+    @patch('apps.backups.services.datetime')
+    def test_unchanged_files_are_not_reread(self, mock_datetime):
+        import datetime as real_datetime
+        mock_datetime.UTC = real_datetime.UTC
+        mock_datetime.datetime.now.side_effect = [
+            real_datetime.datetime(2026, 1, 1, 3, 0, second, tzinfo=real_datetime.UTC)
+            for second in range(10)
+        ]
+        services.create_backup()
+
+        (self.data_dir / "plugin.py").write_text("print('changed')")
+        with patch('apps.backups.services._hash_file', wraps=services._hash_file) as mock_hash:
+            services.create_backup()
+
+        mock_hash.assert_called_once_with(self.data_dir / "plugin.py")
+        self.assertEqual(len(self._chunks()), 3)
+
+    def test_deleting_a_backup_prunes_only_unreferenced_chunks(self):
+        first = services.create_backup()
+        (self.data_dir / "plugin.py").unlink()
+        second = first.with_name("dispatcharr-backup-second.zip")
+        first.rename(second)
+        latest = services.create_backup()
+        self.assertEqual(len(self._chunks()), 2)
+
+        services.delete_backup(second.name)
+
+        self.assertEqual(len(self._chunks()), 1)
+        self.assertTrue(latest.exists())
+
+    def test_restore_writes_changed_files_back_from_chunks(self):
+        backup = services.create_backup()
+        (self.data_dir / "logos" / "a.png").write_bytes(b"corrupted")
+        (self.data_dir / "plugin.py").unlink()
+
+        with patch('apps.backups.services._restore_sqlite'):
+            services.restore_backup(backup)
+
+        self.assertEqual((self.data_dir / "logos" / "a.png").read_bytes(), b"logo-a")
+        self.assertEqual((self.data_dir / "plugin.py").read_text(), "print('hi')")
+
+    def _download(self, backup):
+        portable = backup.with_name("downloaded.zip")
+        portable.write_bytes(b"".join(services.iter_portable_backup(backup)))
+        return portable
+
+    def test_archives_reference_chunks_and_downloads_carry_them_once(self):
+        backup = services.create_backup()
+        with ZipFile(backup, 'r') as zf:
+            self.assertFalse([n for n in zf.namelist() if n.startswith(f"{services.DATA_CHUNKS_DIR}/")])
+        self.assertTrue(services.references_chunk_store(backup))
+
+        portable = self._download(backup)
+
+        with ZipFile(portable, 'r') as zf:
+            chunks = [i for i in zf.infolist() if i.filename.startswith(f"{services.DATA_CHUNKS_DIR}/")]
+            self.assertEqual(sorted(i.filename.split("/", 1)[1] for i in chunks), self._chunks())
+            self.assertTrue(all(i.compress_type == ZIP_STORED for i in chunks))
+            self.assertEqual(zf.read('database.sqlite3'), b"db")
+        self.assertFalse(services.references_chunk_store(portable))
+
+    def test_downloaded_backup_restores_on_another_host(self):
+        import shutil
+        portable = self._download(services.create_backup())
+        shutil.rmtree(self.temp_backup_dir / "chunks")
+        (self.data_dir / "logos" / "a.png").unlink()
+
+        with patch('apps.backups.services._restore_sqlite'):
+            services.restore_backup(portable)
+
+        self.assertEqual((self.data_dir / "logos" / "a.png").read_bytes(), b"logo-a")
+
+    def test_restore_fails_before_database_when_chunks_are_missing(self):
+        backup = self.temp_backup_dir / "host-bound.zip"
+        with ZipFile(backup, 'w') as zf:
+            zf.writestr('database.sqlite3', 'db')
+            zf.writestr('metadata.json', json.dumps({
+                'version': 3, 'database_type': 'sqlite', 'database_file': 'database.sqlite3',
+            }))
+            zf.writestr(services.DATA_MANIFEST_NAME, json.dumps({"files": [
+                {"root": str(self.data_dir), "path": "logos/gone.png", "sha256": "a" * 64, "size": 1},
+            ]}))
+
+        with patch('apps.backups.services._restore_sqlite') as mock_restore:
+            with self.assertRaises(ValueError) as context:
+                services.restore_backup(backup)
+
+        self.assertIn("1 data chunk", str(context.exception))
+        mock_restore.assert_not_called()
+
+    def test_restore_ignores_paths_outside_data_dirs(self):
+        backup = self.temp_backup_dir / "crafted.zip"
+        with ZipFile(backup, 'w') as zf:
+            zf.writestr('database.sqlite3', 'db')
+            zf.writestr('metadata.json', json.dumps({
+                'version': 3, 'database_type': 'sqlite', 'database_file': 'database.sqlite3',
+            }))
+            zf.writestr(services.DATA_MANIFEST_NAME, json.dumps({"files": [
+                {"root": str(self.data_dir), "path": "../escape.txt", "sha256": "0" * 64, "size": 1},
+            ]}))
+
+        with patch('apps.backups.services._restore_sqlite'):
+            services.restore_backup(backup)
+
+        self.assertFalse((self.data_dir.parent / "escape.txt").exists())
+
+
 class BackupAPITestCase(TestCase):
     """Test cases for backup API endpoints"""
 
@@ -474,6 +627,27 @@ class BackupAPITestCase(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response['Content-Type'], 'application/zip')
 
+    @patch('apps.backups.services.get_backup_dir')
+    def test_download_backup_adds_referenced_chunks(self, mock_get_backup_dir):
+        """Archives that reference the chunk store are downloaded with their chunks"""
+        backup_dir = Path(self.temp_backup_dir)
+        mock_get_backup_dir.return_value = backup_dir
+        digest = "ab" * 32
+        chunk = backup_dir / "chunks" / digest[:2] / digest
+        chunk.parent.mkdir(parents=True)
+        chunk.write_bytes(b"logo")
+        with ZipFile(backup_dir / "test-backup.zip", 'w') as zf:
+            zf.writestr('metadata.json', '{}')
+            zf.writestr(services.DATA_MANIFEST_NAME, json.dumps({"files": [{"sha256": digest}]}))
+
+        auth_header = self.get_auth_header(self.admin_user)
+        response = self.client.get('/api/backups/test-backup.zip/download/', HTTP_AUTHORIZATION=auth_header)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('X-Accel-Redirect', response)
+        with ZipFile(BytesIO(b"".join(response.streaming_content)), 'r') as zf:
+            self.assertEqual(zf.read(f"{services.DATA_CHUNKS_DIR}/{digest}"), b"logo")
+
     @patch('apps.backups.services.get_backup_dir')
     def test_download_backup_not_found(self, mock_get_backup_dir):
         """Test downloading non-existent backup"""
@@ -1242,9 +1416,10 @@ class BackupTasksTestCase(TestCase):
         if Path(self.temp_backup_dir).exists():
             shutil.rmtree(self.temp_backup_dir)
 
+    @patch('apps.backups.tasks.services.prune_chunks')
     @patch('apps.backups.tasks.services.list_backups')
     @patch('apps.backups.tasks.services.delete_backup')
-    def test_cleanup_old_backups_keeps_recent(self, mock_delete, mock_list):
+    def test_cleanup_old_backups_keeps_recent(self, mock_delete, mock_list, mock_prune):
         """Test that cleanup keeps the most recent backups"""
         from apps.backups.tasks import _cleanup_old_backups
 
@@ -1257,7 +1432,8 @@ class BackupTasksTestCase(TestCase):
         deleted = _cleanup_old_backups(retention_count=2)
 
         self.assertEqual(deleted, 1)
-        mock_delete.assert_called_once_with('backup-1.zip')
+        mock_delete.assert_called_once_with('backup-1.zip', prune=False)
+        mock_prune.assert_called_once()
 
     @patch('apps.backups.tasks.services.list_backups')
     @patch('apps.backups.tasks.services.delete_backup')
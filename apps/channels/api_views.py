@@ -26,6 +26,7 @@ from apps.accounts.permissions import (
 
 from core.models import CoreSettings
 from core.utils import RedisClient, safe_upload_path, resolve_safe_local_data_path
+from core.file_serving import serve_file
 from core.image_proxy import (
     image_fetch_failures as _logo_fetch_failures,
     serve_local_or_remote_image,
@@ -54,6 +55,7 @@ from .serializers import (
     RecordingSerializer,
     RecurringRecordingRuleSerializer,
 )
+from .routing import invalidate_channel_routing
 from .tasks import (
     match_epg_channels,
     evaluate_series_rules_impl,
@@ -68,7 +70,7 @@ from rest_framework.filters import SearchFilter, OrderingFilter
 from apps.epg.models import EPGData
 from apps.vod.models import Movie, Series
 from django.db.models import Q
-from django.http import HttpResponse, StreamingHttpResponse, FileResponse, Http404, JsonResponse, HttpResponseRedirect
+from django.http import HttpResponse, Http404, JsonResponse, HttpResponseRedirect
 from django.utils import timezone
 import mimetypes
 from django.conf import settings
@@ -1487,6 +1489,8 @@ class ChannelViewSet(viewsets.ModelViewSet):
 
                 if to_update:
                     ChannelStream.objects.bulk_update(to_update, ["order"])
+                    # bulk_update skips signals; the failover order changed.
+                    invalidate_channel_routing(channel.pk)
 
         # Return the updated objects (already in memory)
         serialized_channels = ChannelSerializer(
@@ -3409,55 +3413,7 @@ class RecordingViewSet(viewsets.ModelViewSet):
         else:
             content_type = mimetypes.guess_type(file_path)[0] or "application/octet-stream"
 
-        file_size = os.path.getsize(file_path)
-        range_header = request.META.get("HTTP_RANGE", "").strip()
-
-        def file_iterator(path, start=0, end=None, chunk_size=8192):
-            with open(path, "rb") as f:
-                f.seek(start)
-                remaining = (end - start + 1) if end is not None else None
-                while True:
-                    if remaining is not None and remaining <= 0:
-                        break
-                    bytes_to_read = min(chunk_size, remaining) if remaining is not None else chunk_size
-                    data = f.read(bytes_to_read)
-                    if not data:
-                        break
-                    if remaining is not None:
-                        remaining -= len(data)
-                    yield data
-
-        if range_header and range_header.startswith("bytes="):
-            # Parse Range header
-            try:
-                range_spec = range_header.split("=", 1)[1]
-                start_str, end_str = range_spec.split("-", 1)
-                start = int(start_str) if start_str else 0
-                end = int(end_str) if end_str else file_size - 1
-                start = max(0, start)
-                end = min(file_size - 1, end)
-                length = end - start + 1
-
-                resp = StreamingHttpResponse(
-                    file_iterator(file_path, start, end),
-                    status=206,
-                    content_type=content_type,
-                )
-                resp["Content-Range"] = f"bytes {start}-{end}/{file_size}"
-                resp["Content-Length"] = str(length)
-                resp["Accept-Ranges"] = "bytes"
-                resp["Content-Disposition"] = f"inline; filename=\"{file_name}\""
-                return resp
-            except Exception:
-                # Fall back to full file if parsing fails
-                pass
-
-        # Full file response
-        response = FileResponse(open(file_path, "rb"), content_type=content_type)
-        response["Content-Length"] = str(file_size)
-        response["Accept-Ranges"] = "bytes"
-        response["Content-Disposition"] = f"inline; filename=\"{file_name}\""
-        return response
+        return serve_file(request, file_path, content_type, filename=file_name)
 
     @action(
         detail=True,
@@ -3531,7 +3487,7 @@ class RecordingViewSet(viewsets.ModelViewSet):
                     _rv.set(f"dvr:hls_viewer:{pk}", "1", ex=20)
             except Exception:
                 pass
-            return FileResponse(open(requested, "rb"), content_type="video/mp2t")
+            return serve_file(request, requested, "video/mp2t")
 
         raise Http404("Unsupported HLS file type")
 
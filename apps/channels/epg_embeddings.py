@@ -0,0 +1,207 @@
+"""
+Persistent sentence-transformer embeddings of EPG names.
+
+ML-assisted matching compares a channel name against EPG candidate names.
+Encoding the candidates on every run costs far more than the comparison, and
+EPG names rarely change, so the normalized name of every active EPG entry is
+encoded once and kept on disk as a float16 matrix:
+
+    <EPG_EMBEDDING_INDEX_DIR>/CURRENT        name of the live generation
+    <EPG_EMBEDDING_INDEX_DIR>/<gen>/ids.npy      EPGData ids, ascending
+    <EPG_EMBEDDING_INDEX_DIR>/<gen>/hashes.npy   hash of the encoded text
+    <EPG_EMBEDDING_INDEX_DIR>/<gen>/vectors.npy  unit-length float16 rows
+    <EPG_EMBEDDING_INDEX_DIR>/<gen>/meta.json
+
+``update_embedding_index`` runs after EPG refreshes and only encodes rows
+whose id is new or whose text hash changed. Each update writes a new
+generation directory and then swaps ``CURRENT``, so readers that already
+memory-mapped the previous generation keep a consistent view.
+"""
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import shutil
+import uuid
+
+import numpy as np
+from django.conf import settings
+
+from apps.epg.models import EPGData
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+ENCODE_BATCH_SIZE = 256
+_CURRENT_FILE = "CURRENT"
+
+
+def index_dir():
+    return getattr(settings, "EPG_EMBEDDING_INDEX_DIR", "/data/models/epg_index")
+
+
+def embeddings_available():
+    """True when sentence-transformers is installed."""
+    return importlib.util.find_spec("sentence_transformers") is not None
+
+
+def text_hash(text):
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little", signed=True)
+
+
+def encode_texts(model, texts):
+    """Unit-length float32 embeddings of ``texts``; dot products are cosine similarities."""
+    vectors = model.encode(
+        list(texts),
+        batch_size=ENCODE_BATCH_SIZE,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+        show_progress_bar=False,
+    )
+    return np.asarray(vectors, dtype=np.float32)
+
+
+class EmbeddingIndex:
+    """EPGData id -> embedding lookup over one index generation."""
+
+    def __init__(self, ids, hashes, vectors, model_name):
+        self.ids = ids
+        self.hashes = hashes
+        self.vectors = vectors
+        self.model_name = model_name
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def dim(self):
+        return self.vectors.shape[1]
+
+    def positions(self, ids, hashes):
+        """Row of each (id, hash) pair in the index, or -1 when absent or stale."""
+        ids = np.asarray(ids, dtype=np.int64)
+        if not len(self.ids) or not len(ids):
+            return np.full(len(ids), -1, dtype=np.int64)
+        rows = np.searchsorted(self.ids, ids)
+        rows = np.minimum(rows, len(self.ids) - 1)
+        current = (self.ids[rows] == ids) & (self.hashes[rows] == np.asarray(hashes, dtype=np.int64))
+        return np.where(current, rows, -1)
+
+    def lookup(self, epg_rows):
+        """
+        Embeddings for matching rows (dicts with ``id`` and ``norm_name``).
+
+        Returns ``(vectors, found)``: a float32 matrix with one row per input
+        and a boolean mask of the rows the index had for the current name.
+        """
+        positions = self.positions(
+            [row["id"] for row in epg_rows],
+            [text_hash(row["norm_name"]) for row in epg_rows],
+        )
+        found = positions >= 0
+        vectors = np.zeros((len(epg_rows), self.dim), dtype=np.float32)
+        vectors[found] = self.vectors[positions[found]]
+        return vectors, found
+
+    @classmethod
+    def load(cls, model_name, path=None):
+        """Memory-map the live generation; None when missing or built by another model."""
+        path = path or index_dir()
+        try:
+            with open(os.path.join(path, _CURRENT_FILE)) as f:
+                generation = os.path.join(path, f.read().strip())
+            with open(os.path.join(generation, "meta.json")) as f:
+                meta = json.load(f)
+            if meta.get("version") != INDEX_VERSION or meta.get("model") != model_name:
+                return None
+            return cls(
+                np.load(os.path.join(generation, "ids.npy")),
+                np.load(os.path.join(generation, "hashes.npy")),
+                np.load(os.path.join(generation, "vectors.npy"), mmap_mode="r"),
+                model_name,
+            )
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable EPG embedding index at {path}: {e}")
+            return None
+
+    def save(self, path=None):
+        path = path or index_dir()
+        name = f"gen-{uuid.uuid4().hex[:12]}"
+        generation = os.path.join(path, name)
+        os.makedirs(generation)
+        np.save(os.path.join(generation, "ids.npy"), self.ids)
+        np.save(os.path.join(generation, "hashes.npy"), self.hashes)
+        np.save(os.path.join(generation, "vectors.npy"), np.asarray(self.vectors, dtype=np.float16))
+        with open(os.path.join(generation, "meta.json"), "w") as f:
+            json.dump(
+                {"version": INDEX_VERSION, "model": self.model_name, "dim": self.dim, "count": len(self)},
+                f,
+            )
+
+        pointer = os.path.join(path, f".{_CURRENT_FILE}.{name}")
+        with open(pointer, "w") as f:
+            f.write(name)
+        os.replace(pointer, os.path.join(path, _CURRENT_FILE))
+
+        # Open memory maps keep their files readable after the directory is removed.
+        for entry in os.listdir(path):
+            if entry.startswith("gen-") and entry != name:
+                shutil.rmtree(os.path.join(path, entry), ignore_errors=True)
+
+
+def _indexed_rows():
+    queryset = (
+        EPGData.objects
+        .filter(epg_source__is_active=True)
+        .exclude(norm_name="")
+        .order_by("id")
+        .values_list("id", "norm_name")
+    )
+    return list(queryset.iterator(chunk_size=5000))
+
+
+def update_embedding_index(load_model, model_name, path=None):
+    """
+    Bring the on-disk index in line with active EPG entries.
+
+    Vectors of rows whose id and name hash are unchanged are copied from the
+    previous generation; only new or renamed rows are encoded, and
+    ``load_model()`` is called only when there is something to encode.
+    Returns ``{"total", "encoded", "reused"}``, or None when the model could
+    not be loaded.
+    """
+    rows = _indexed_rows()
+    ids = np.fromiter((epg_id for epg_id, _name in rows), dtype=np.int64, count=len(rows))
+    hashes = np.fromiter((text_hash(name) for _id, name in rows), dtype=np.int64, count=len(rows))
+
+    previous = EmbeddingIndex.load(model_name, path)
+    positions = previous.positions(ids, hashes) if previous is not None else np.full(len(rows), -1)
+    reused = positions >= 0
+    stats = {"total": len(rows), "encoded": int((~reused).sum()), "reused": int(reused.sum())}
+    if previous is not None and stats["encoded"] == 0 and len(previous) == len(rows):
+        return stats
+
+    if stats["encoded"]:
+        model = load_model()
+        if model is None:
+            return None
+        dim = model.get_sentence_embedding_dimension()
+    elif previous is not None:
+        dim = previous.dim
+    else:
+        return stats
+
+    vectors = np.zeros((len(rows), dim), dtype=np.float16)
+    if stats["reused"]:
+        vectors[reused] = previous.vectors[positions[reused]]
+    missing = np.flatnonzero(~reused)
+    for start in range(0, len(missing), ENCODE_BATCH_SIZE * 8):
+        batch = missing[start:start + ENCODE_BATCH_SIZE * 8]
+        vectors[batch] = encode_texts(model, [rows[i][1] for i in batch])
+
+    EmbeddingIndex(ids, hashes, vectors, model_name).save(path)
+    return stats
@@ -5,12 +5,14 @@ Celery tasks in tasks.py call into this module; keep orchestration here and
 task wiring thin so matching logic stays testable without a worker.
 """
 import gc
+import hashlib
 import heapq
+import json
 import logging
 import os
 import re
 
-from rapidfuzz import fuzz
+from django.core.cache import cache
 
 from apps.epg.models import EPGData
 from core.models import CoreSettings
@@ -21,9 +23,17 @@ logger = logging.getLogger(__name__)
 _ml_model_cache = {'sentence_transformer': None}
 _normalize_settings_cache = None
 
+ML_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
 ML_CANDIDATE_LIMIT = 20
 SINGLE_CHANNEL_MATCH_TIMEOUT_MS = 180_000
 
+# Bump when normalize_name() changes so persisted EPGData.norm_name values are rebuilt.
+NORMALIZER_VERSION = 1
+NORM_FINGERPRINT_CACHE_KEY = "epg_matching:norm_fingerprint"
+# Upper bound on channel x EPG score cells held in memory per cdist batch.
+FUZZY_BATCH_CELLS = 8_000_000
+_REGION_TAG_RE = re.compile(r'\.([a-z]{2})')
+
 COMMON_EXTRANEOUS_WORDS = [
     "tv", "channel", "network", "television",
     "east", "west", "hd", "uhd", "24/7",
@@ -68,7 +78,7 @@ def get_sentence_transformer():
             from sentence_transformers import SentenceTransformer
             from sentence_transformers import util
 
-            model_name = "sentence-transformers/all-MiniLM-L6-v2"
+            model_name = ML_MODEL_NAME
             cache_dir = "/data/models"
             disable_downloads = os.environ.get('DISABLE_ML_DOWNLOADS', 'false').lower() == 'true'
 
@@ -99,11 +109,7 @@ def get_sentence_transformer():
     return _ml_model_cache['sentence_transformer'], util
 
 
-def normalize_name(name: str) -> str:
-    """Normalize a channel/EPG name for fuzzy matching."""
-    if not name:
-        return ""
-
+def _normalize_settings():
     global _normalize_settings_cache
     if _normalize_settings_cache is None:
         prefixes = []
@@ -125,8 +131,15 @@ def normalize_name(name: str) -> str:
         except Exception as e:
             logger.debug(f"Could not load EPG matching settings: {e}")
         _normalize_settings_cache = (prefixes, suffixes, custom_strings)
+    return _normalize_settings_cache
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a channel/EPG name for fuzzy matching."""
+    if not name:
+        return ""
 
-    prefixes, suffixes, custom_strings = _normalize_settings_cache
+    prefixes, suffixes, custom_strings = _normalize_settings()
     result = name
 
     for prefix in prefixes:
@@ -166,6 +179,71 @@ def normalize_name(name: str) -> str:
     return " ".join(tokens).strip()
 
 
+def normalization_fingerprint():
+    """Identify the normalize_name() rules currently in effect."""
+    raw = json.dumps([NORMALIZER_VERSION, *_normalize_settings()], default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _store_norm_names(queryset):
+    changed = []
+    updated = 0
+    for epg_id, name, norm_name in queryset.values_list("id", "name", "norm_name").iterator(chunk_size=2000):
+        new_norm = normalize_name(name)
+        if new_norm != norm_name:
+            changed.append(EPGData(id=epg_id, norm_name=new_norm))
+        if len(changed) >= 1000:
+            EPGData.objects.bulk_update(changed, ["norm_name"])
+            updated += len(changed)
+            changed = []
+    if changed:
+        EPGData.objects.bulk_update(changed, ["norm_name"])
+        updated += len(changed)
+    return updated
+
+
+def refresh_epg_norm_names(epg_source_id=None):
+    """
+    Persist normalize_name(name) into EPGData.norm_name where it changed.
+
+    Runs after each EPG source refresh so matching reads normalized names
+    instead of normalizing the whole catalog on every run. Returns the
+    number of rows updated.
+    """
+    queryset = EPGData.objects.all()
+    if epg_source_id is not None:
+        queryset = queryset.filter(epg_source_id=epg_source_id)
+    return _store_norm_names(queryset)
+
+
+def ensure_epg_norm_names():
+    """
+    Bring persisted norm_name values in line with the current rules.
+
+    When the EPG matching settings or NORMALIZER_VERSION changed since the
+    last run every row is renormalized once; otherwise only rows written
+    without a norm_name (e.g. by an older release) are filled in.
+    """
+    clear_normalize_settings_cache()
+    fingerprint = normalization_fingerprint()
+    try:
+        stored = cache.get(NORM_FINGERPRINT_CACHE_KEY)
+    except Exception as e:
+        logger.debug(f"Could not read EPG normalization fingerprint: {e}")
+        stored = None
+
+    if stored == fingerprint:
+        _store_norm_names(EPGData.objects.filter(norm_name="").exclude(name=""))
+        return
+
+    updated = refresh_epg_norm_names()
+    logger.info(f"Normalization rules changed; renormalized {updated} EPG name(s)")
+    try:
+        cache.set(NORM_FINGERPRINT_CACHE_KEY, fingerprint, timeout=None)
+    except Exception as e:
+        logger.debug(f"Could not store EPG normalization fingerprint: {e}")
+
+
 def send_epg_matching_progress(total_channels, matched_channels, current_channel_name="", stage="matching"):
     """Send bulk EPG matching progress via WebSocket."""
     matched_count = (
@@ -208,30 +286,84 @@ def send_single_channel_epg_match_result(channel_id, matched, message, channel=N
         logger.warning(f"Failed to send single channel EPG match result: {e}")
 
 
+def _region_tags(row):
+    """Two-letter ``.xx`` region tags in an EPG row's tvg_id and name."""
+    if not row.get("tvg_id"):
+        return ()
+    return tuple(_REGION_TAG_RE.findall(row["tvg_id"].lower() + " " + row["name"].lower()))
+
+
+def _region_bonus(row, region_code):
+    """Score bonus/penalty for the preferred region (uses precomputed region_tags)."""
+    if not region_code or not row.get("tvg_id"):
+        return 0
+    tags = row.get("region_tags")
+    if tags is None:
+        tags = _region_tags(row)
+    if tags:
+        return 15 if region_code in tags else -15
+    if region_code in row["tvg_id"].lower() + " " + row["name"].lower():
+        return 10
+    return 0
+
+
 def _compute_fuzzy_score(chan_norm, row, region_code=None):
     """Compute fuzzy match score with optional region bonus/penalty."""
     if not row.get("norm_name"):
         return 0
-    base_score = fuzz.ratio(chan_norm, row["norm_name"])
-    bonus = 0
-    if region_code and row.get("tvg_id"):
-        combined_text = row["tvg_id"].lower() + " " + row["name"].lower()
-        dot_regions = re.findall(r'\.([a-z]{2})', combined_text)
-        if dot_regions:
-            bonus = 15 if region_code in dot_regions else -15
-        elif region_code in combined_text:
-            bonus = 10
-    return base_score + bonus
-
-
-def _ml_cosine_similarities(st_model, util, query_text, candidate_texts):
-    """Encode only the query plus candidate texts (not the full EPG database)."""
-    if not candidate_texts:
+    from rapidfuzz import fuzz
+
+    return fuzz.ratio(chan_norm, row["norm_name"]) + _region_bonus(row, region_code)
+
+
+def _ml_embedding_index(ml_state):
+    """Persistent EPG embedding index for this run, loaded (memory-mapped) once."""
+    if "index" not in ml_state:
+        from apps.channels.epg_embeddings import EmbeddingIndex
+
+        ml_state["index"] = EmbeddingIndex.load(ML_MODEL_NAME)
+    return ml_state["index"]
+
+
+def encode_channel_names(ml_state, texts):
+    """Encode channel names in one batch and keep them for this run."""
+    vectors = ml_state.setdefault("query_vectors", {})
+    pending = list(dict.fromkeys(text for text in texts if text not in vectors))
+    if pending:
+        from apps.channels.epg_embeddings import encode_texts
+
+        vectors.update(zip(pending, encode_texts(ml_state["st_model"], pending)))
+
+
+def _ml_cosine_similarities(ml_state, query_text, candidate_rows):
+    """
+    Cosine similarity of ``query_text`` to each candidate's norm_name.
+
+    Candidate vectors come from the persistent index; only rows it lacks (new
+    since the last index update) and a channel name that was not batch
+    encoded beforehand are run through the model.
+    """
+    if not candidate_rows:
         return []
-    texts = [query_text] + list(candidate_texts)
-    embeddings = st_model.encode(texts, convert_to_tensor=True, show_progress_bar=False)
-    sim_scores = util.cos_sim(embeddings[0:1], embeddings[1:])[0]
-    return [float(s) for s in sim_scores]
+    import numpy as np
+
+    from apps.channels.epg_embeddings import encode_texts
+
+    index = _ml_embedding_index(ml_state)
+    if index is not None:
+        candidates, found = index.lookup(candidate_rows)
+    else:
+        candidates, found = None, np.zeros(len(candidate_rows), dtype=bool)
+
+    missing = np.flatnonzero(~found)
+    if len(missing):
+        encoded = encode_texts(ml_state["st_model"], [candidate_rows[i]["norm_name"] for i in missing])
+        if candidates is None:
+            candidates = np.zeros((len(candidate_rows), encoded.shape[1]), dtype=np.float32)
+        candidates[missing] = encoded
+
+    encode_channel_names(ml_state, [query_text])
+    return [float(s) for s in candidates @ ml_state["query_vectors"][query_text]]
 
 
 def _active_epg_lookup_queryset():
@@ -239,7 +371,7 @@ def _active_epg_lookup_queryset():
     return (
         EPGData.objects
         .filter(epg_source__is_active=True)
-        .values('id', 'tvg_id', 'name', 'epg_source_id', 'epg_source__priority')
+        .values('id', 'tvg_id', 'name', 'norm_name', 'epg_source_id', 'epg_source__priority')
     )
 
 
@@ -260,6 +392,7 @@ def _row_from_epg_values(values_row):
         'tvg_id': normalized_tvg_id,
         'original_tvg_id': tvg_id,
         'name': values_row['name'],
+        'norm_name': values_row.get('norm_name') or '',
         'epg_source_id': values_row['epg_source_id'],
         'epg_source_priority': values_row.get('epg_source__priority') or 0,
     }
@@ -277,14 +410,19 @@ def build_epg_matching_catalog():
     """
     Build the in-memory EPG catalog for bulk matching using a streaming DB cursor.
 
+    Normalized names are read from EPGData.norm_name (see
+    ensure_epg_norm_names) and region tags are extracted once per row here,
+    so scoring never re-derives either per channel.
+
     Returns (epg_data, tvg_id_index): the full catalog plus an O(1) in-memory
     tvg_id lookup table (no extra DB queries). The index prefers the first entry
     per tvg_id after priority sorting.
     """
+    ensure_epg_norm_names()
     epg_data = []
-    for values_row in _active_epg_fuzzy_queryset().iterator(chunk_size=500):
+    for values_row in _active_epg_fuzzy_queryset().iterator(chunk_size=2000):
         row = _row_from_epg_values(values_row)
-        row['norm_name'] = normalize_name(row['name'])
+        row['region_tags'] = _region_tags(row)
         epg_data.append(row)
     epg_data.sort(key=lambda x: x['epg_source_priority'], reverse=True)
     return epg_data, build_epg_tvg_id_index(epg_data)
@@ -476,20 +614,72 @@ def _fuzzy_scan_core(chan_norm, rows, region_code=None, candidate_limit=ML_CANDI
     return best_score, best_epg, [(score, row) for score, _, _, row in top_candidates], scanned
 
 
+def _ranked_candidates(scores, rows, priority, candidate_limit):
+    """Best score, best row and top candidates from one row of catalog scores."""
+    import numpy as np
+
+    positive = np.flatnonzero(scores > 0)
+    if positive.size == 0:
+        return 0, None, [], len(rows)
+    if positive.size > candidate_limit:
+        kth = np.partition(scores[positive], -candidate_limit)[-candidate_limit]
+        positive = positive[scores[positive] >= kth]
+    # Same order as _fuzzy_scan_core: score, then source priority, then catalog order.
+    ranked = positive[np.lexsort((positive, -priority[positive], -scores[positive]))][:candidate_limit]
+    top_candidates = [(float(scores[i]), rows[i]) for i in ranked]
+    best_score, best_epg = top_candidates[0]
+    return best_score, best_epg, top_candidates, len(rows)
+
+
+def bulk_fuzzy_scan(chan_norms, epg_data, region_code=None, candidate_limit=ML_CANDIDATE_LIMIT):
+    """
+    Fuzzy-scan many normalized channel names against an in-memory catalog.
+
+    Returns one (best_score, best_epg, top_candidates, scanned) tuple per
+    name, the same result _fuzzy_scan_core() gives for that name. Scores are
+    computed by rapidfuzz's multi-threaded cdist in batches of at most
+    FUZZY_BATCH_CELLS cells, and region bonuses once per catalog row.
+    """
+    rows = [row for row in epg_data if row.get("norm_name")]
+    if not rows:
+        return [(0, None, [], 0) for _ in chan_norms]
+
+    import numpy as np
+    from rapidfuzz import fuzz, process
+
+    choices = [row["norm_name"] for row in rows]
+    bonus = np.fromiter((_region_bonus(row, region_code) for row in rows), dtype=np.float64, count=len(rows))
+    priority = np.fromiter((row["epg_source_priority"] for row in rows), dtype=np.int64, count=len(rows))
+    per_batch = max(1, FUZZY_BATCH_CELLS // len(rows))
+
+    results = []
+    for start in range(0, len(chan_norms), per_batch):
+        scores = process.cdist(
+            chan_norms[start:start + per_batch],
+            choices,
+            scorer=fuzz.ratio,
+            dtype=np.float64,
+            workers=-1,
+        )
+        scores += bonus
+        for row_scores in scores:
+            results.append(_ranked_candidates(row_scores, rows, priority, candidate_limit))
+    return results
+
+
 def fuzzy_scan_epg_list(chan_norm, epg_data, region_code=None, candidate_limit=ML_CANDIDATE_LIMIT):
     """Fuzzy scan over a pre-built in-memory EPG catalog (bulk matching)."""
     logger.debug(f"Fuzzy matching '{chan_norm}' against EPG entries...")
-    return _fuzzy_scan_core(chan_norm, epg_data, region_code, candidate_limit)
+    return bulk_fuzzy_scan([chan_norm], epg_data, region_code, candidate_limit)[0]
 
 
 def stream_fuzzy_epg_scan(chan_norm, region_code=None, candidate_limit=ML_CANDIDATE_LIMIT):
     """Stream fuzzy scan over active EPG entries (single-channel matching)."""
+    ensure_epg_norm_names()
 
     def row_iterator():
         for values_row in _active_epg_fuzzy_queryset().iterator(chunk_size=500):
-            row = _row_from_epg_values(values_row)
-            row['norm_name'] = normalize_name(row['name'])
-            yield row
+            yield _row_from_epg_values(values_row)
 
     logger.debug(f"Fuzzy matching '{chan_norm}' against EPG entries...")
     return _fuzzy_scan_core(chan_norm, row_iterator(), region_code, candidate_limit)
@@ -561,7 +751,7 @@ def try_epg_name_match(chan, best_score, best_epg, top_candidates, is_bulk_match
         if st_model:
             try:
                 logger.info("Validating fuzzy best match with ML model (single candidate)")
-                sims = _ml_cosine_similarities(st_model, util, chan["norm_chan"], [best_epg["norm_name"]])
+                sims = _ml_cosine_similarities(ml_state, chan["norm_chan"], [best_epg])
                 top_value = sims[0] if sims else 0.0
 
                 if top_value >= ml_high - 1e-9:
@@ -600,12 +790,7 @@ def try_epg_name_match(chan, best_score, best_epg, top_candidates, is_bulk_match
                     f"top {len(top_candidates)} fuzzy candidates (fuzzy={best_score})"
                 )
                 candidate_rows = [row for _, row in top_candidates]
-                sims = _ml_cosine_similarities(
-                    st_model,
-                    util,
-                    chan["norm_chan"],
-                    [row["norm_name"] for row in candidate_rows],
-                )
+                sims = _ml_cosine_similarities(ml_state, chan["norm_chan"], candidate_rows)
                 top_index = max(range(len(sims)), key=lambda i: sims[i])
                 top_value = sims[top_index]
                 matched_epg = candidate_rows[top_index]
@@ -635,6 +820,28 @@ def try_epg_name_match(chan, best_score, best_epg, top_candidates, is_bulk_match
     return None
 
 
+def _encode_ml_channel_batch(chan_norms, best_scores, is_bulk_matching, ml_state):
+    """Encode every channel name that will reach ML validation in one model call."""
+    thresholds = _get_epg_match_thresholds(is_bulk_matching)
+    texts = [
+        chan_norm
+        for chan_norm, score in zip(chan_norms, best_scores)
+        if thresholds['FUZZY_LAST_RESORT_MIN'] <= score < thresholds['FUZZY_SKIP_ML']
+    ]
+    if not texts:
+        return
+    st_model, util = get_sentence_transformer()
+    ml_state['st_model'] = st_model
+    ml_state['util'] = util
+    if st_model is None:
+        return
+    try:
+        encode_channel_names(ml_state, texts)
+        logger.info(f"Encoded {len(set(texts))} channel name(s) for ML validation")
+    except Exception as e:
+        logger.warning(f"Batch ML encoding failed, channels will be encoded one by one: {e}")
+
+
 def prepare_channel_match_data(channel):
     """Build the channel dict used by matching logic."""
     normalized_tvg_id = channel.tvg_id.strip().lower() if channel.tvg_id else ""
@@ -684,6 +891,30 @@ def match_channels_to_epg(
     else:
         logger.info("Using aggressive thresholds for single channel matching")
 
+    # Score every channel that has no exact ID match in one vectorized pass.
+    fuzzy_indexes = [
+        index for index, chan in enumerate(channels_data)
+        if chan["norm_chan"]
+        and not any(
+            key and key in epg_by_tvg_id
+            for key in (chan.get("tvg_id", ""), chan.get("gracenote_id", ""))
+        )
+    ]
+    fuzzy_results = {}
+    if fuzzy_indexes:
+        logger.info(f"Fuzzy scoring {len(fuzzy_indexes)} channel(s) against {len(epg_data)} EPG entries")
+        scans = bulk_fuzzy_scan(
+            [channels_data[index]["norm_chan"] for index in fuzzy_indexes], epg_data, region_code
+        )
+        fuzzy_results = dict(zip(fuzzy_indexes, scans))
+        if use_ml:
+            _encode_ml_channel_batch(
+                [channels_data[index]["norm_chan"] for index in fuzzy_indexes],
+                [scan[0] for scan in scans],
+                is_bulk_matching,
+                ml_state,
+            )
+
     for index, chan in enumerate(channels_data):
         normalized_tvg_id = chan.get("tvg_id", "")
         fallback_name = chan["tvg_id"].strip() if chan["tvg_id"] else chan["name"]
@@ -733,9 +964,7 @@ def match_channels_to_epg(
             logger.debug(f"Channel {chan['id']} '{chan['name']}' => empty after normalization, skipping")
             continue
 
-        best_score, best_epg, top_candidates, _scanned = fuzzy_scan_epg_list(
-            chan["norm_chan"], epg_data, region_code
-        )
+        best_score, best_epg, top_candidates, _scanned = fuzzy_results[index]
         if not best_epg:
             logger.debug(f"Channel {chan['id']} '{chan['name']}' => no EPG entries with valid norm_name found")
             continue
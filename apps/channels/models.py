@@ -17,7 +17,14 @@ logger = logging.getLogger(__name__)
 
 # If you have an M3UAccount model in apps.m3u, you can still import it:
 from apps.m3u.models import M3UAccount
-from apps.m3u.connection_pool import reserve_profile_slot, release_profile_slot
+from apps.m3u.connection_pool import (
+    release_profile_slot,
+    reserve_first_available_slot,
+    reserve_profile_slot,
+)
+from apps.channels.routing import get_routing_table
+from apps.proxy.live_proxy.standby import preempt_standby_channel
+from apps.proxy.live_proxy.stream_health import adaptive_ordering_enabled, order_candidates
 
 
 # Add fallback functions if Redis isn't available
@@ -689,10 +696,13 @@ class Channel(models.Model):
         redis_client.delete(f"channel_stream:{self.id}")
         redis_client.delete(f"stream_profile:{stream_id}")
 
-    def get_stream(self, requester=None):
+    def get_stream(self, requester=None, preempt_standby=True):
         """
         Finds an available stream for the requested channel and returns the selected stream and profile.
 
+        When every candidate is full and ``preempt_standby`` is set, an idle
+        standby-pool channel on one of the candidate profiles gives up its slot.
+
         Returns:
             Tuple[Optional[int], Optional[int], Optional[str], bool]:
             (stream_id, profile_id, error_reason, slot_reserved)
@@ -700,8 +710,11 @@ class Channel(models.Model):
         redis_client = RedisClient.get_client()
         error_reason = None
 
+        # Ordered stream/profile candidates (cached; see apps.channels.routing)
+        routing = get_routing_table(self, redis_client)
+
         # Check if this channel has any streams
-        if not self.streams.exists():
+        if not routing["has_streams"]:
             error_reason = "No streams assigned to channel"
             return None, None, error_reason, False
 
@@ -740,93 +753,50 @@ class Channel(models.Model):
                     )
                     self._release_stale_stream_assignment(redis_client, stream_id)
 
-        # No existing active stream, attempt to assign a new one
-        has_streams_but_maxed_out = False
-        has_active_profiles = False
-
-        # Iterate through channel streams and their profiles
-        for stream in self.streams.all().order_by("channelstream__order"):
-            # Retrieve the M3U account associated with the stream.
-            m3u_account = stream.m3u_account
-            if not m3u_account:
-                logger.debug(f"Stream {stream.id} has no M3U account")
-                continue
-            if m3u_account.is_active == False:
-                logger.debug(f"M3U account {m3u_account.id} is inactive, skipping.")
-                continue
-
-            m3u_profiles = m3u_account.profiles.filter(is_active=True)
-            default_profile = next(
-                (obj for obj in m3u_profiles if obj.is_default), None
-            )
-
-            if not default_profile:
-                logger.debug(f"M3U account {m3u_account.id} has no active default profile")
-                continue
-
-            profiles = [default_profile] + [
-                obj for obj in m3u_profiles if not obj.is_default
-            ]
-
-            for profile in profiles:
-                has_active_profiles = True
-
-                # Atomically check and reserve a slot (INCR-first pattern)
-                reserved, current_count, failure_reason = reserve_profile_slot(
-                    profile, redis_client
-                )
-
-                if reserved:
-                    # Slot reserved — assign stream to this channel
-                    redis_client.set(f"channel_stream:{self.id}", stream.id)
-                    redis_client.set(f"stream_profile:{stream.id}", profile.id)
-                    logger.info(
-                        f"Channel {self.uuid}: assigned stream {stream.id} "
-                        f"profile {profile.id} ({profile.name})"
-                    )
-
-                    return (
-                        stream.id,
-                        profile.id,
-                        None,
-                        True,
-                    )  # Return newly assigned stream and matched profile
-                else:
-                    # At capacity: try to preempt a lower-impact channel on this profile
-                    victim_channel_id = self._pick_channel_to_preempt(
-                        profile_id=profile.id,
-                        requester_level=requester.user_level if requester else 100,
-                        redis_client=redis_client,
-                        exclude_channel_ids=None,
-                    )
-                    if victim_channel_id:
-                        logger.info(f"Preempting channel {victim_channel_id} for new stream on profile {profile.id}")
-                        # return self.id, profile.id, victim_channel_id
-
-                    has_streams_but_maxed_out = True
-                    if failure_reason == "profile_full":
-                        logger.info(
-                            f"Profile {profile.id} at max connections: "
-                            f"{current_count}/{profile.max_streams}, trying next profile"
-                        )
-                    elif failure_reason == "credential_full":
-                        logger.info(
-                            f"Profile {profile.id} shared login pool full, trying next profile"
-                        )
-                    else:
-                        logger.debug(
-                            f"Profile {profile.id} reservation failed: "
-                            f"{current_count}/{profile.max_streams}"
-                        )
-
-        # No available streams - determine specific reason
-        if has_streams_but_maxed_out:
-            error_reason = "All active M3U profiles have reached maximum connection limits"
-        elif has_active_profiles:
-            error_reason = "No compatible active profile found for any assigned stream"
-        else:
+        # No existing active stream, attempt to assign a new one. One Lua call
+        # walks the whole failover list and reserves the first free slot.
+        candidates = routing["candidates"]
+        if not candidates:
             error_reason = "No active profiles found for any assigned stream"
+            return None, None, error_reason, False
+        if adaptive_ordering_enabled():
+            candidates = order_candidates(candidates, redis_client)
+
+        slots = [(profile_id, max_streams, cred_key) for _stream_id, profile_id, max_streams, cred_key in candidates]
+        index = reserve_first_available_slot(slots, redis_client)
+        if index is None and preempt_standby and preempt_standby_channel(
+            {profile_id for profile_id, _max_streams, _cred_key in slots},
+            redis_client,
+            exclude_channel_id=self.uuid,
+        ):
+            index = reserve_first_available_slot(slots, redis_client)
+        if index is not None:
+            stream_id, profile_id = candidates[index][0], candidates[index][1]
+            # Slot reserved — assign stream to this channel
+            redis_client.set(f"channel_stream:{self.id}", stream_id)
+            redis_client.set(f"stream_profile:{stream_id}", profile_id)
+            logger.info(
+                f"Channel {self.uuid}: assigned stream {stream_id} "
+                f"profile {profile_id} (candidate {index + 1}/{len(candidates)})"
+            )
+            return stream_id, profile_id, None, True
+
+        # At capacity: try to preempt a lower-impact channel on the preferred profile
+        victim_channel_id = self._pick_channel_to_preempt(
+            profile_id=candidates[0][1],
+            requester_level=requester.user_level if requester else 100,
+            redis_client=redis_client,
+            exclude_channel_ids=None,
+        )
+        if victim_channel_id:
+            logger.info(f"Preempting channel {victim_channel_id} for new stream on profile {candidates[0][1]}")
+            # return self.id, profile.id, victim_channel_id
 
+        logger.info(
+            f"Channel {self.uuid}: all {len(candidates)} stream/profile candidates "
+            f"are at max connections"
+        )
+        error_reason = "All active M3U profiles have reached maximum connection limits"
         return None, None, error_reason, False
 
     def release_stream(self):
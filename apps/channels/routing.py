@@ -0,0 +1,106 @@
+"""
+Cached per-channel routing tables for ``Channel.get_stream``.
+
+A routing table is the channel's full failover list flattened into ordered
+(stream, profile) candidates: streams in ``ChannelStream.order``, skipping
+inactive accounts and accounts without an active default profile, and each
+account's default profile before its other active profiles. Every candidate
+carries its ``max_streams`` and shared-credential counter key, so a tune
+needs no DB queries and a single Lua call
+(``reserve_first_available_slot``) to find and reserve a free slot.
+
+Tables are cached in Redis. Signals drop one channel's table when its
+streams change, and bump a global generation when accounts, profiles or
+server groups change so every table is rebuilt on next use.
+"""
+
+import json
+import logging
+
+from apps.m3u.connection_pool import credential_counter_key_for_profile
+
+logger = logging.getLogger(__name__)
+
+ROUTING_KEY = "channel_routing:{channel_id}"
+ROUTING_GENERATION_KEY = "channel_routing:generation"
+ROUTING_TTL = 600  # Safety net for bulk writes that bypass signals
+
+
+def routing_key(channel_id):
+    return ROUTING_KEY.format(channel_id=channel_id)
+
+
+def invalidate_channel_routing(channel_id=None, redis_client=None):
+    """Drop one channel's routing table, or every table when channel_id is None."""
+    from core.utils import RedisClient
+
+    redis_client = redis_client or RedisClient.get_client()
+    if redis_client is None:
+        return
+    try:
+        if channel_id is None:
+            redis_client.incr(ROUTING_GENERATION_KEY)
+        else:
+            redis_client.delete(routing_key(channel_id))
+    except Exception as e:
+        logger.debug(f"Could not invalidate channel routing ({channel_id}): {e}")
+
+
+def build_routing_table(channel):
+    """Ordered ``[stream_id, profile_id, max_streams, credential_key]`` candidates."""
+    from apps.channels.models import ChannelStream
+    from apps.m3u.models import M3UAccountProfile
+
+    links = list(
+        ChannelStream.objects.filter(channel=channel)
+        .select_related("stream__m3u_account")
+        .order_by("order")
+    )
+    account_ids = {
+        link.stream.m3u_account_id
+        for link in links
+        if link.stream.m3u_account_id and link.stream.m3u_account.is_active
+    }
+    profiles_by_account = {}
+    for profile in M3UAccountProfile.objects.filter(
+        m3u_account_id__in=account_ids, is_active=True
+    ).select_related("m3u_account__server_group"):
+        profiles_by_account.setdefault(profile.m3u_account_id, []).append(profile)
+
+    candidates = []
+    credential_keys = {}
+    for link in links:
+        profiles = profiles_by_account.get(link.stream.m3u_account_id, [])
+        default_profile = next((p for p in profiles if p.is_default), None)
+        if not default_profile:
+            continue
+        for profile in [default_profile] + [p for p in profiles if not p.is_default]:
+            if profile.id not in credential_keys:
+                credential_keys[profile.id] = credential_counter_key_for_profile(profile)
+            candidates.append([
+                link.stream_id,
+                profile.id,
+                profile.max_streams,
+                credential_keys[profile.id],
+            ])
+
+    return {"has_streams": bool(links), "candidates": candidates}
+
+
+def get_routing_table(channel, redis_client):
+    """Cached routing table for ``channel``; rebuilt when missing or stale."""
+    key = routing_key(channel.id)
+    cached_raw, generation = redis_client.mget([key, ROUTING_GENERATION_KEY])
+    generation = int(generation or 0)
+    if cached_raw:
+        try:
+            cached = json.loads(cached_raw)
+            if cached.get("generation") == generation:
+                return cached
+        except (TypeError, ValueError):
+            pass
+
+    table = build_routing_table(channel)
+    table["generation"] = generation
+    redis_client.set(key, json.dumps(table), ex=ROUTING_TTL)
+    return table
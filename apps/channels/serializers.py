@@ -24,6 +24,7 @@ from rest_framework import serializers
 from django.utils import timezone
 from core.utils import validate_flexible_url, build_absolute_uri_with_port
 from apps.channels.utils import coerce_channel_profile_ids
+from apps.channels.routing import invalidate_channel_routing
 
 
 class LogoSerializer(serializers.ModelSerializer):
@@ -718,6 +719,8 @@ class ChannelSerializer(serializers.ModelSerializer):
 
                 if to_update:
                     ChannelStream.objects.bulk_update(to_update, ["order"])
+                    # bulk_update skips signals; the failover order changed.
+                    invalidate_channel_routing(instance.pk)
 
         return instance
 
@@ -6,11 +6,12 @@ from django.utils.timezone import now, is_aware, make_aware
 from celery.result import AsyncResult
 from django_celery_beat.models import ClockedSchedule, PeriodicTask
 from .models import Channel, Stream, ChannelStream, ChannelProfile, ChannelProfileMembership, ChannelOverride, Recording
-from apps.m3u.models import M3UAccount
+from apps.m3u.models import M3UAccount, M3UAccountProfile, ServerGroup
 from apps.epg.tasks import parse_programs_for_tvg_id
 import json
 import logging
 from .tasks import run_recording, prefetch_recording_artwork
+from .routing import invalidate_channel_routing
 from datetime import timedelta
 
 logger = logging.getLogger(__name__)
@@ -405,3 +406,50 @@ def update_channel_catchup_fields(sender, instance, **kwargs):
         is_catchup=catchup_qs.exists(),
         catchup_days=max_days or 0,
     )
+
+
+# Fields on M3UAccount that change how Channel.get_stream routes a tune.
+_ROUTING_ACCOUNT_FIELDS = {"is_active", "server_group", "username", "password", "server_url"}
+
+
+@receiver([post_save, post_delete], sender=ChannelStream)
+def invalidate_routing_on_channel_stream_change(sender, instance, **kwargs):
+    invalidate_channel_routing(instance.channel_id)
+
+
+@receiver(m2m_changed, sender=Channel.streams.through)
+def invalidate_routing_on_streams_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action == "pre_clear":
+        # The through rows are gone by post_clear; remember whose routing to drop.
+        instance._routing_cleared_channel_ids = list(
+            ChannelStream.objects.filter(stream=instance).values_list("channel_id", flat=True)
+        )
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:
+        # stream.channels.add(...): instance is the Stream
+        if action == "post_clear":
+            channel_ids = instance.__dict__.pop("_routing_cleared_channel_ids", [])
+        else:
+            channel_ids = pk_set or ()
+        for channel_id in channel_ids:
+            invalidate_channel_routing(channel_id)
+    else:
+        invalidate_channel_routing(instance.pk)
+
+
+@receiver(post_save, sender=M3UAccount)
+def invalidate_routing_on_account_save(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        return
+    if update_fields and not _ROUTING_ACCOUNT_FIELDS.intersection(update_fields):
+        return
+    invalidate_channel_routing()
+
+
+@receiver([post_save, post_delete], sender=M3UAccountProfile)
+@receiver([post_save, post_delete], sender=ServerGroup)
+@receiver(post_delete, sender=M3UAccount)
+def invalidate_routing_on_pool_change(sender, instance, **kwargs):
+    invalidate_channel_routing()
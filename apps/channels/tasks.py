@@ -20,9 +20,11 @@ from celery.signals import worker_shutting_down
 from django.utils.text import slugify
 
 from apps.channels.epg_matching import (
+    ML_MODEL_NAME,
     apply_matched_epg_to_channels,
     build_epg_matching_catalog,
     cleanup_after_matching,
+    get_sentence_transformer,
     match_channels_to_epg,
     normalize_name,
     run_single_channel_epg_match,
@@ -30,7 +32,7 @@ from apps.channels.epg_matching import (
 from apps.channels.models import Channel
 from apps.epg.models import EPGData
 from core.models import CoreSettings
-from core.utils import acquire_task_lock, release_task_lock
+from core.utils import TaskLockRenewer, acquire_task_lock, release_task_lock
 
 from django.db import InterfaceError, OperationalError, close_old_connections
 from channels.layers import get_channel_layer
@@ -464,6 +466,30 @@ def match_single_channel_epg(channel_id):
         cleanup_memory(log_usage=True, force_collection=True)
 
 
+@shared_task
+def refresh_epg_embedding_index():
+    """Encode new or renamed EPG entries into the persistent ML matching index."""
+    if not acquire_task_lock('refresh_epg_embedding_index', 'all'):
+        # Run again afterwards so entries from the latest refresh are not missed.
+        refresh_epg_embedding_index.apply_async(countdown=60)
+        return "EPG embedding index update already running, rescheduled"
+    try:
+        from apps.channels.epg_embeddings import update_embedding_index
+
+        with TaskLockRenewer('refresh_epg_embedding_index', 'all'):
+            stats = update_embedding_index(lambda: get_sentence_transformer()[0], ML_MODEL_NAME)
+        if stats is None:
+            return "ML model unavailable, EPG embedding index not updated"
+        logger.info(
+            f"EPG embedding index: {stats['total']} entries, "
+            f"{stats['encoded']} encoded, {stats['reused']} reused"
+        )
+        return stats
+    finally:
+        release_task_lock('refresh_epg_embedding_index', 'all')
+        cleanup_after_matching()
+
+
 def evaluate_series_rules_impl(tvg_id: str | None = None):
     """Synchronous implementation of series rule evaluation; returns details for debugging."""
     result = {"scheduled": 0, "details": []}
@@ -1246,6 +1272,52 @@ def _dvr_build_hls_concat_cmd(concat_list_path, output_path, extra_args=None):
     return cmd
 
 
+def _dvr_finalize_hls_playlist(hls_m3u8, segments):
+    """Close an HLS recording's playlist so the segment set plays as VOD.
+
+    FFmpeg rewrites ``index.m3u8`` after every segment (``append_list`` +
+    ``omit_endlist``), so the playlist on disk is already a checkpoint of
+    everything recorded and is what a resumed run appends to.  Finalizing
+    only adds ``#EXT-X-PLAYLIST-TYPE:VOD`` and ``#EXT-X-ENDLIST``; no segment
+    data is read or rewritten.  If the playlist is missing or lists nothing
+    (FFmpeg died before its first rewrite) it is rebuilt from ``segments``
+    with the nominal ``-hls_time`` duration.
+
+    Returns True when the playlist on disk ends with ``#EXT-X-ENDLIST``.
+    """
+    if not hls_m3u8 or not segments:
+        return False
+    try:
+        if _dvr_hls_playlist_has_segments(hls_m3u8):
+            with open(hls_m3u8) as _f:
+                lines = [_line.rstrip("\n") for _line in _f]
+        else:
+            lines = [
+                "#EXTM3U",
+                "#EXT-X-VERSION:3",
+                "#EXT-X-TARGETDURATION:4",
+                "#EXT-X-MEDIA-SEQUENCE:0",
+            ]
+            for seg in segments:
+                lines.append("#EXTINF:4.000000,")
+                lines.append(os.path.basename(seg))
+
+        if any(_line.strip() == "#EXT-X-ENDLIST" for _line in lines):
+            return True
+        if not any(_line.startswith("#EXT-X-PLAYLIST-TYPE") for _line in lines):
+            lines.insert(1, "#EXT-X-PLAYLIST-TYPE:VOD")
+        lines.append("#EXT-X-ENDLIST")
+
+        tmp_path = f"{hls_m3u8}.tmp"
+        with open(tmp_path, "w") as _f:
+            _f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, hls_m3u8)
+        return True
+    except OSError as e:
+        logger.warning(f"DVR: failed to finalize HLS playlist {hls_m3u8}: {e}")
+        return False
+
+
 def _dvr_drain_ffmpeg_stderr(proc, rec_id, tail):
     """Drain FFmpeg stderr in a background thread (see run_recording for rationale)."""
     try:
@@ -2111,7 +2183,13 @@ def run_recording(recording_id, channel_id, start_time_str, end_time_str):
 
     # --- Post-processing: concat HLS segments → final MKV ---
     remux_success = False
+    hls_finalized = False
     hls_m3u8 = os.path.join(hls_dir, "index.m3u8") if hls_dir else None
+    try:
+        from core.models import CoreSettings
+        finalize_mode = CoreSettings.get_dvr_finalize_mode()
+    except Exception:
+        finalize_mode = "concat"
 
     def _get_hls_segments(m3u8_path, seg_dir):
         """Return ordered segment paths from an HLS m3u8 playlist."""
@@ -2144,7 +2222,24 @@ def run_recording(recording_id, channel_id, start_time_str, end_time_str):
         except Exception:
             segments = []
 
-    if segments:
+    hls_finalize_failed = False
+    if segments and finalize_mode == "hls":
+        # Keep the segment set as the playable artifact: closing the playlist
+        # is a metadata-only write, so finishing a long recording does not
+        # re-read and rewrite every segment while other recordings start.
+        hls_finalized = _dvr_finalize_hls_playlist(hls_m3u8, segments)
+        if hls_finalized:
+            logger.info(
+                f"DVR recording {recording_id}: finalized HLS playlist with "
+                f"{len(segments)} segments (finalize_mode=hls, no concat)"
+            )
+        else:
+            hls_finalize_failed = True
+            logger.error(
+                f"DVR recording {recording_id}: could not finalize HLS playlist; "
+                f"keeping HLS segments for recovery"
+            )
+    elif segments:
         concat_list_path = os.path.join(hls_dir, "concat.txt")
         try:
             with open(concat_list_path, "w") as _cl:
@@ -2341,7 +2436,13 @@ def run_recording(recording_id, channel_id, start_time_str, end_time_str):
 
         # Restore file_url to the permanent MKV endpoint now that recording has ended.
         # During recording it pointed to /hls/index.m3u8; clients should use /file/ hereafter.
-        cp["file_url"] = f"/api/channels/recordings/{recording_id}/file/"
+        # HLS-finalized recordings have no MKV, so they keep the playlist URL.
+        if hls_finalized or hls_finalize_failed:
+            cp["file_url"] = f"/api/channels/recordings/{recording_id}/hls/index.m3u8"
+            if hls_finalized:
+                cp["finalize_mode"] = "hls"
+        else:
+            cp["file_url"] = f"/api/channels/recordings/{recording_id}/file/"
         cp["output_file_url"] = cp["file_url"]
 
         # Final status priority: stopped > completed > interrupted.
@@ -2351,6 +2452,10 @@ def run_recording(recording_id, channel_id, start_time_str, end_time_str):
         if db_status_now == "stopped":
             # Deliberate user stop — preserve; do not overwrite with "completed".
             cp.pop("interrupted_reason", None)
+        elif hls_finalize_failed:
+            # The playlist is still open, so the recording is not playable as
+            # VOD yet; leaving it "recording" lets startup recovery retry.
+            pass
         elif not interrupted:
             cp["status"] = "completed"
             cp.pop("interrupted_reason", None)
@@ -2449,10 +2554,10 @@ def run_recording(recording_id, channel_id, start_time_str, end_time_str):
     except Exception as e:
         logger.debug(f"Unable to finalize Recording metadata: {e}")
 
-    # Optionally run comskip post-process
+    # Optionally run comskip post-process (it operates on the final MKV)
     try:
         from core.models import CoreSettings
-        if CoreSettings.get_dvr_comskip_enabled():
+        if CoreSettings.get_dvr_comskip_enabled() and not (hls_finalized or hls_finalize_failed):
             comskip_process_recording.delay(recording_id)
     except Exception:
         pass
@@ -2594,6 +2699,10 @@ def recover_recordings_on_startup():
             )),
             label="DVR recovery: fetching expired recordings",
         )
+        try:
+            finalize_mode = CoreSettings.get_dvr_finalize_mode()
+        except Exception:
+            finalize_mode = "concat"
         for rec in expired:
             try:
                 cp = rec.custom_properties or {}
@@ -2622,7 +2731,25 @@ def recover_recordings_on_startup():
                             if f.startswith("seg_") and f.endswith(".ts")
                         )
 
-                    if _segs:
+                    if _segs and finalize_mode == "hls":
+                        if not _dvr_finalize_hls_playlist(_m3u8, _segs):
+                            # Keep status "recording" so the next startup retries.
+                            logger.error(
+                                f"recover_recordings_on_startup: recording {rec.id} expired "
+                                f"during downtime, could not finalize HLS playlist; will retry"
+                            )
+                            continue
+                        cp["status"] = "interrupted"
+                        cp["interrupted_reason"] = "server_restarted_after_end"
+                        cp["remux_success"] = False
+                        cp["finalize_mode"] = "hls"
+                        cp["file_url"] = f"/api/channels/recordings/{rec.id}/hls/index.m3u8"
+                        cp["output_file_url"] = cp["file_url"]
+                        logger.info(
+                            f"recover_recordings_on_startup: recording {rec.id} expired "
+                            f"during downtime, finalized HLS playlist ({len(_segs)} segment(s))"
+                        )
+                    elif _segs:
                         logger.info(
                             f"recover_recordings_on_startup: recording {rec.id} expired "
                             f"during downtime, concat {len(_segs)} HLS segment(s) \u2192 MKV"
@@ -0,0 +1,92 @@
+"""Tests for cached channel routing tables used by Channel.get_stream()."""
+
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from apps.channels.models import Channel, ChannelStream, Stream
+from apps.channels.routing import (
+    ROUTING_GENERATION_KEY,
+    build_routing_table,
+    get_routing_table,
+    invalidate_channel_routing,
+    routing_key,
+)
+from apps.channels.tests.test_get_stream_assignment import FakeAssignmentRedis
+from apps.m3u.models import M3UAccount, M3UAccountProfile
+
+
+class ChannelRoutingTableTests(TestCase):
+    def setUp(self):
+        self.redis = FakeAssignmentRedis()
+        self.account = M3UAccount.objects.create(
+            name="routing-test", account_type="STD", max_streams=3,
+        )
+        self.default_profile = M3UAccountProfile.objects.get(
+            m3u_account=self.account, is_default=True
+        )
+        self.extra_profile = M3UAccountProfile.objects.create(
+            m3u_account=self.account,
+            name="Backup",
+            max_streams=1,
+            search_pattern="^(.*)$",
+            replace_pattern="$1",
+        )
+        self.inactive_account = M3UAccount.objects.create(
+            name="routing-inactive", account_type="STD", is_active=False,
+        )
+        self.primary = Stream.objects.create(
+            name="Primary", url="http://a/1.ts", m3u_account=self.account
+        )
+        self.dead = Stream.objects.create(
+            name="Dead", url="http://b/1.ts", m3u_account=self.inactive_account
+        )
+        self.channel = Channel.objects.create(channel_number=601, name="Routing Ch")
+        ChannelStream.objects.create(channel=self.channel, stream=self.dead, order=0)
+        ChannelStream.objects.create(channel=self.channel, stream=self.primary, order=1)
+
+    def test_candidates_follow_failover_order_default_profile_first(self):
+        table = build_routing_table(self.channel)
+
+        self.assertTrue(table["has_streams"])
+        self.assertEqual(
+            [(stream_id, profile_id) for stream_id, profile_id, _, _ in table["candidates"]],
+            [
+                (self.primary.id, self.default_profile.id),
+                (self.primary.id, self.extra_profile.id),
+            ],
+        )
+        self.assertEqual(table["candidates"][1][2], 1)
+
+    def test_cached_table_reused_until_generation_bump(self):
+        first = get_routing_table(self.channel, self.redis)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_routing_table(self.channel, self.redis), first)
+
+        invalidate_channel_routing(redis_client=self.redis)
+        self.assertEqual(int(self.redis.get(ROUTING_GENERATION_KEY)), 1)
+        with self.assertNumQueries(2):
+            self.assertEqual(get_routing_table(self.channel, self.redis)["generation"], 1)
+
+    def test_channel_stream_change_drops_cached_table(self):
+        get_routing_table(self.channel, self.redis)
+        self.assertTrue(self.redis.exists(routing_key(self.channel.id)))
+
+        with patch("core.utils.RedisClient.get_client", return_value=self.redis):
+            ChannelStream.objects.filter(stream=self.dead).delete()
+        self.assertFalse(self.redis.exists(routing_key(self.channel.id)))
+
+    def test_clearing_a_streams_channels_drops_their_tables(self):
+        from django.db.models.signals import post_delete
+        from apps.channels import signals
+
+        # Exercise the m2m path on its own, without the per-row delete receiver.
+        post_delete.disconnect(signals.invalidate_routing_on_channel_stream_change, sender=ChannelStream)
+        self.addCleanup(
+            post_delete.connect, signals.invalidate_routing_on_channel_stream_change, sender=ChannelStream
+        )
+        get_routing_table(self.channel, self.redis)
+
+        with patch("core.utils.RedisClient.get_client", return_value=self.redis):
+            self.primary.channels.clear()
+        self.assertFalse(self.redis.exists(routing_key(self.channel.id)))
@@ -0,0 +1,130 @@
+"""Tests for vectorized bulk EPG fuzzy matching and persisted normalized names."""
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+
+from apps.channels.epg_matching import (
+    NORM_FINGERPRINT_CACHE_KEY,
+    _fuzzy_scan_core,
+    _region_tags,
+    build_epg_matching_catalog,
+    bulk_fuzzy_scan,
+    clear_normalize_settings_cache,
+    match_channels_to_epg,
+    normalize_name,
+    refresh_epg_norm_names,
+)
+from apps.epg.models import EPGData, EPGSource
+from core.models import CoreSettings, EPG_SETTINGS_KEY
+
+CATALOG = [
+    ("hbo.us", "HBO East", 10),
+    ("hbo.uk", "HBO", 10),
+    ("hbo2.us", "HBO 2", 5),
+    ("cnn.us", "CNN", 5),
+    ("cnni", "CNN International", 1),
+    ("abc7", "ABC 7 (KABC)", 1),
+    ("espn.us", "ESPN", 10),
+    ("espn2.us", "ESPN 2", 10),
+    ("espn.ca", "ESPN", 1),
+    ("nameless", "HD", 1),
+]
+
+
+def _catalog_rows():
+    rows = []
+    for index, (tvg_id, name, priority) in enumerate(CATALOG):
+        row = {
+            "id": index + 1,
+            "tvg_id": tvg_id,
+            "original_tvg_id": tvg_id,
+            "name": name,
+            "norm_name": normalize_name(name),
+            "epg_source_id": 1,
+            "epg_source_priority": priority,
+        }
+        row["region_tags"] = _region_tags(row)
+        rows.append(row)
+    rows.sort(key=lambda row: row["epg_source_priority"], reverse=True)
+    return rows
+
+
+class BulkFuzzyScanTests(SimpleTestCase):
+    def setUp(self):
+        clear_normalize_settings_cache()
+        self.addCleanup(clear_normalize_settings_cache)
+
+    def test_matches_row_by_row_scan(self):
+        rows = _catalog_rows()
+        names = ["hbo", "espn", "cnn international", "abc kabc", "zzz"]
+        for region_code in (None, "us", "uk"):
+            results = bulk_fuzzy_scan(names, rows, region_code, candidate_limit=3)
+            for name, (best_score, best_epg, top, scanned) in zip(names, results):
+                expected = _fuzzy_scan_core(name, rows, region_code, candidate_limit=3)
+                self.assertEqual(best_score, expected[0], (name, region_code))
+                self.assertEqual(best_epg and best_epg["id"], expected[1] and expected[1]["id"])
+                # The row-by-row heap leaves full ties in arbitrary order.
+                self.assertEqual(
+                    sorted((score, row["id"]) for score, row in top),
+                    sorted((score, row["id"]) for score, row in expected[2]),
+                )
+                self.assertEqual([score for score, _row in top], [score for score, _row in expected[2]])
+                self.assertEqual(scanned, expected[3])
+
+    def test_ties_prefer_higher_priority_source(self):
+        rows = _catalog_rows()
+        best_score, best_epg, _top, _scanned = bulk_fuzzy_scan(["espn"], rows)[0]
+        self.assertEqual(best_score, 100)
+        self.assertEqual(best_epg["tvg_id"], "espn.us")
+
+
+class PersistedNormNameTests(TestCase):
+    def setUp(self):
+        clear_normalize_settings_cache()
+        cache.delete(NORM_FINGERPRINT_CACHE_KEY)
+        self.addCleanup(cache.delete, NORM_FINGERPRINT_CACHE_KEY)
+        self.addCleanup(clear_normalize_settings_cache)
+        self.source = EPGSource.objects.create(name="Guide", source_type="xmltv")
+
+    def _set_epg_settings(self, **value):
+        CoreSettings.objects.update_or_create(
+            key=EPG_SETTINGS_KEY, defaults={"name": "EPG Settings", "value": value}
+        )
+        clear_normalize_settings_cache()
+
+    def test_refresh_stores_normalized_names_for_source(self):
+        epg = EPGData.objects.create(tvg_id="abc7", name="ABC 7 (KABC) HD", epg_source=self.source)
+
+        self.assertEqual(refresh_epg_norm_names(self.source.id), 1)
+        epg.refresh_from_db()
+        self.assertEqual(epg.norm_name, "abc 7 kabc")
+        self.assertEqual(refresh_epg_norm_names(self.source.id), 0)
+
+    def test_catalog_renormalizes_when_rules_change(self):
+        EPGData.objects.create(tvg_id="hbo", name="Sling:HBO", epg_source=self.source)
+
+        catalog, _index = build_epg_matching_catalog()
+        self.assertEqual(catalog[0]["norm_name"], "slinghbo")
+
+        self._set_epg_settings(epg_match_mode="advanced", epg_match_ignore_prefixes=["Sling:"])
+        catalog, _index = build_epg_matching_catalog()
+        self.assertEqual(catalog[0]["norm_name"], "hbo")
+        self.assertEqual(EPGData.objects.get(tvg_id="hbo").norm_name, "hbo")
+
+    def test_bulk_match_uses_exact_ids_then_fuzzy_scores(self):
+        EPGData.objects.create(tvg_id="cnn.us", name="CNN", epg_source=self.source)
+        EPGData.objects.create(tvg_id="espn.us", name="ESPN HD", epg_source=self.source)
+        catalog, index = build_epg_matching_catalog()
+        channels = [
+            {"id": 1, "name": "News", "tvg_id": "cnn.us", "gracenote_id": "", "norm_chan": "news",
+             "current_epg_data_id": None},
+            {"id": 2, "name": "ESPN", "tvg_id": "", "gracenote_id": "", "norm_chan": "espn",
+             "current_epg_data_id": None},
+        ]
+
+        result = match_channels_to_epg(
+            channels, catalog, use_ml=False, send_progress=False, epg_tvg_id_index=index
+        )
+
+        matched = {entry["id"]: entry["epg_data_id"] for entry in result["channels_to_update"]}
+        self.assertEqual(matched[1], EPGData.objects.get(tvg_id="cnn.us").id)
+        self.assertEqual(matched[2], EPGData.objects.get(tvg_id="espn.us").id)
@@ -0,0 +1,104 @@
+"""Tests for the persistent EPG name embedding index used by ML matching."""
+import shutil
+import tempfile
+from unittest.mock import patch
+
+import numpy as np
+from django.test import TestCase, override_settings
+
+from apps.channels.epg_embeddings import EmbeddingIndex, update_embedding_index
+from apps.channels.epg_matching import ML_MODEL_NAME, _ml_cosine_similarities, match_channels_to_epg
+from apps.epg.models import EPGData, EPGSource
+
+
+class FakeModel:
+    """Letter-count embeddings; records every text it encodes."""
+
+    def __init__(self):
+        self.encoded = []
+
+    def get_sentence_embedding_dimension(self):
+        return 26
+
+    def encode(self, texts, normalize_embeddings=False, **kwargs):
+        self.encoded.append(list(texts))
+        vectors = np.zeros((len(texts), 26), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for char in text:
+                if "a" <= char <= "z":
+                    vectors[row, ord(char) - ord("a")] += 1
+        if normalize_embeddings:
+            vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-9)
+        return vectors
+
+
+class EmbeddingIndexTests(TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path, ignore_errors=True)
+        self.settings_override = override_settings(EPG_EMBEDDING_INDEX_DIR=self.path)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+        self.source = EPGSource.objects.create(name="Guide", source_type="xmltv")
+        self.hbo = EPGData.objects.create(tvg_id="hbo", name="HBO", norm_name="hbo", epg_source=self.source)
+        self.cnn = EPGData.objects.create(tvg_id="cnn", name="CNN", norm_name="cnn", epg_source=self.source)
+        self.model = FakeModel()
+
+    def _update(self):
+        return update_embedding_index(lambda: self.model, ML_MODEL_NAME)
+
+    def test_update_encodes_only_new_or_renamed_rows(self):
+        self.assertEqual(self._update(), {"total": 2, "encoded": 2, "reused": 0})
+
+        self.model.encoded.clear()
+        self.assertEqual(update_embedding_index(lambda: None, ML_MODEL_NAME)["encoded"], 0)
+
+        EPGData.objects.filter(id=self.cnn.id).update(norm_name="cnn international")
+        EPGData.objects.create(tvg_id="espn", name="ESPN", norm_name="espn", epg_source=self.source)
+        self.assertEqual(self._update(), {"total": 3, "encoded": 2, "reused": 1})
+        self.assertEqual(sorted(sum(self.model.encoded, [])), ["cnn international", "espn"])
+
+        index = EmbeddingIndex.load(ML_MODEL_NAME)
+        self.assertEqual(index.vectors.dtype, np.float16)
+        self.assertIsInstance(index.vectors, np.memmap)
+        self.assertEqual(len(index), 3)
+
+    def test_index_built_by_another_model_is_ignored(self):
+        self._update()
+        self.assertIsNone(EmbeddingIndex.load("some/other-model"))
+
+    def test_similarities_use_index_and_encode_only_missing_rows(self):
+        self._update()
+        self.model.encoded.clear()
+        espn = EPGData.objects.create(tvg_id="espn", name="ESPN", norm_name="espn", epg_source=self.source)
+        rows = [
+            {"id": self.hbo.id, "norm_name": "hbo"},
+            {"id": self.cnn.id, "norm_name": "cnn"},
+            {"id": espn.id, "norm_name": "espn"},
+        ]
+
+        sims = _ml_cosine_similarities({"st_model": self.model}, "hbo", rows)
+
+        self.assertEqual(self.model.encoded, [["espn"], ["hbo"]])
+        self.assertAlmostEqual(sims[0], 1.0, places=3)
+        self.assertAlmostEqual(sims[1], 0.0, places=3)
+
+    def test_bulk_match_encodes_ml_channels_in_one_call(self):
+        self._update()
+        self.model.encoded.clear()
+        channels = [
+            {"id": i, "name": name, "tvg_id": "", "gracenote_id": "", "norm_chan": name}
+            for i, name in enumerate(["hbo east", "cnn news", "hbo hd"], start=1)
+        ]
+        epg_rows = [
+            {"id": self.hbo.id, "tvg_id": "hbo", "name": "HBO", "norm_name": "hbo", "epg_source_priority": 0},
+            {"id": self.cnn.id, "tvg_id": "cnn", "name": "CNN", "norm_name": "cnn", "epg_source_priority": 0},
+        ]
+
+        with patch(
+            "apps.channels.epg_matching.get_sentence_transformer", return_value=(self.model, None)
+        ):
+            match_channels_to_epg(channels, epg_rows, send_progress=False)
+
+        self.assertEqual(self.model.encoded, [["hbo east", "cnn news", "hbo hd"]])
@@ -30,9 +30,18 @@ class FakeAssignmentRedis:
             return str(value).encode()
         return str(value).encode()
 
-    def set(self, key, value):
+    def set(self, key, value, ex=None):
         self._strings[key] = value
 
+    def mget(self, keys):
+        return [self.get(key) for key in keys]
+
+    def incr(self, key):
+        current = int(self._decode(self.get(key)) or 0)
+        current += 1
+        self._strings[key] = current
+        return current
+
     def delete(self, key):
         self._strings.pop(key, None)
         self._hashes.pop(key, None)
@@ -49,12 +58,6 @@ class FakeAssignmentRedis:
             bucket.update(mapping)
         bucket.update(kwargs)
 
-    def incr(self, key):
-        current = int(self._decode(self.get(key)) or 0)
-        current += 1
-        self._strings[key] = current
-        return current
-
     def decr(self, key):
         current = int(self._decode(self.get(key)) or 0)
         current -= 1
@@ -93,7 +96,7 @@ class ChannelGetStreamAssignmentTests(TestCase):
         self.redis.set(f"stream_profile:{self.stream.id}", self.profile.id)
 
     @patch("apps.channels.models.RedisClient.get_client")
-    @patch("apps.channels.models.reserve_profile_slot")
+    @patch("apps.channels.models.reserve_first_available_slot")
     def test_reuses_assignment_when_proxy_active(
         self, mock_reserve, mock_get_client
     ):
@@ -113,7 +116,7 @@ class ChannelGetStreamAssignmentTests(TestCase):
         mock_reserve.assert_not_called()
 
     @patch("apps.channels.models.RedisClient.get_client")
-    @patch("apps.channels.models.reserve_profile_slot")
+    @patch("apps.channels.models.reserve_first_available_slot")
     def test_reuses_assignment_during_init_before_metadata(
         self, mock_reserve, mock_get_client
     ):
@@ -130,12 +133,12 @@ class ChannelGetStreamAssignmentTests(TestCase):
 
     @patch("apps.channels.models.RedisClient.get_client")
     @patch("apps.channels.models.release_profile_slot")
-    @patch("apps.channels.models.reserve_profile_slot")
+    @patch("apps.channels.models.reserve_first_available_slot")
     def test_releases_stale_assignment_when_proxy_stopped(
         self, mock_reserve, mock_release, mock_get_client
     ):
         mock_get_client.return_value = self.redis
-        mock_reserve.return_value = (True, 1, None)
+        mock_reserve.return_value = 0
         self._seed_assignment()
         self.redis.hset(
             self.metadata_key,
@@ -171,3 +174,41 @@ class ChannelGetStreamAssignmentTests(TestCase):
         self.assertFalse(
             self.channel._stream_assignment_is_reusable(self.redis, self.stream.id)
         )
+
+    @patch("apps.channels.models.RedisClient.get_client")
+    @patch("apps.channels.models.preempt_standby_channel")
+    @patch("apps.channels.models.reserve_first_available_slot")
+    def test_full_profiles_preempt_a_standby_channel_and_retry(
+        self, mock_reserve, mock_preempt, mock_get_client
+    ):
+        mock_get_client.return_value = self.redis
+        mock_reserve.side_effect = [None, 0]
+        mock_preempt.return_value = "standby-channel-uuid"
+
+        stream_id, profile_id, error, slot_reserved = self.channel.get_stream()
+
+        mock_preempt.assert_called_once_with(
+            {self.profile.id}, self.redis, exclude_channel_id=self.channel.uuid
+        )
+        self.assertEqual(mock_reserve.call_count, 2)
+        self.assertEqual((stream_id, profile_id, error), (self.stream.id, self.profile.id, None))
+        self.assertTrue(slot_reserved)
+
+    @patch("apps.channels.models.RedisClient.get_client")
+    @patch.object(Channel, "_pick_channel_to_preempt", return_value=None)
+    @patch("apps.channels.models.preempt_standby_channel")
+    @patch("apps.channels.models.reserve_first_available_slot")
+    def test_standby_starts_never_preempt(
+        self, mock_reserve, mock_preempt, _mock_pick, mock_get_client
+    ):
+        mock_get_client.return_value = self.redis
+        mock_reserve.return_value = None
+
+        stream_id, _profile_id, error, slot_reserved = self.channel.get_stream(
+            preempt_standby=False
+        )
+
+        mock_preempt.assert_not_called()
+        self.assertIsNone(stream_id)
+        self.assertIn("maximum connection limits", error)
+        self.assertFalse(slot_reserved)
@@ -6,6 +6,7 @@ Covers:
   3. Recording status lifecycle: status transitions visible via API
   4. Concat flags: error-tolerant ffmpeg flags used for segment concatenation
   5. Recovery skip-list: "recording" status NOT in terminal skip list
+  6. HLS finalize mode: closing the playlist instead of a full concat
 """
 import os
 import datetime as dt
@@ -580,7 +581,177 @@ class FfmpegRetryTests(TestCase):
 
 
 # =========================================================================
-# 6. Frontend red-dot filter (guideUtils.mapRecordingsByProgramId)
+# 6. HLS finalize mode — segment set kept as the playable artifact
+# =========================================================================
+
+class HlsFinalizeModeTests(TestCase):
+    """finalize_mode=hls closes the FFmpeg playlist instead of concatenating."""
+
+    def test_finalize_appends_endlist_to_existing_playlist(self):
+        import tempfile
+        from apps.channels.tasks import _dvr_finalize_hls_playlist
+
+        with tempfile.TemporaryDirectory() as tmp:
+            m3u8 = os.path.join(tmp, "index.m3u8")
+            seg = os.path.join(tmp, "seg_00000.ts")
+            open(seg, "wb").write(b"\x00")
+            with open(m3u8, "w") as f:
+                f.write("#EXTM3U\n#EXT-X-TARGETDURATION:4\n#EXTINF:3.9,\nseg_00000.ts\n")
+
+            self.assertTrue(_dvr_finalize_hls_playlist(m3u8, [seg]))
+            with open(m3u8) as f:
+                lines = f.read().splitlines()
+            self.assertEqual(lines[-1], "#EXT-X-ENDLIST")
+            self.assertIn("#EXT-X-PLAYLIST-TYPE:VOD", lines)
+            self.assertIn("#EXTINF:3.9,", lines)
+
+            # Idempotent: a second call must not append another ENDLIST.
+            self.assertTrue(_dvr_finalize_hls_playlist(m3u8, [seg]))
+            with open(m3u8) as f:
+                self.assertEqual(f.read().count("#EXT-X-ENDLIST"), 1)
+
+    def test_finalize_rebuilds_missing_playlist_from_segments(self):
+        import tempfile
+        from apps.channels.tasks import _dvr_finalize_hls_playlist
+
+        with tempfile.TemporaryDirectory() as tmp:
+            m3u8 = os.path.join(tmp, "index.m3u8")
+            segs = []
+            for i in range(3):
+                seg = os.path.join(tmp, f"seg_{i:05d}.ts")
+                open(seg, "wb").write(b"\x00")
+                segs.append(seg)
+
+            self.assertTrue(_dvr_finalize_hls_playlist(m3u8, segs))
+            with open(m3u8) as f:
+                lines = f.read().splitlines()
+            self.assertEqual(
+                [l for l in lines if not l.startswith("#")],
+                ["seg_00000.ts", "seg_00001.ts", "seg_00002.ts"],
+            )
+            self.assertEqual(lines[-1], "#EXT-X-ENDLIST")
+
+    def test_finalize_without_segments_is_noop(self):
+        from apps.channels.tasks import _dvr_finalize_hls_playlist
+
+        self.assertFalse(_dvr_finalize_hls_playlist("/nonexistent/index.m3u8", []))
+
+    def test_finalize_mode_setting_defaults_to_concat(self):
+        from core.models import CoreSettings
+
+        with patch.object(CoreSettings, "get_dvr_settings", return_value={}):
+            self.assertEqual(CoreSettings.get_dvr_finalize_mode(), "concat")
+        with patch.object(CoreSettings, "get_dvr_settings", return_value={"finalize_mode": "bogus"}):
+            self.assertEqual(CoreSettings.get_dvr_finalize_mode(), "concat")
+        with patch.object(CoreSettings, "get_dvr_settings", return_value={"finalize_mode": "hls"}):
+            self.assertEqual(CoreSettings.get_dvr_finalize_mode(), "hls")
+
+    def _expired_recording(self, status):
+        """A recording whose window has passed, with one segment on disk."""
+        import shutil
+        import tempfile
+
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp, True)
+        hls_dir = os.path.join(tmp, ".dvr_hls")
+        os.makedirs(hls_dir)
+        with open(os.path.join(hls_dir, "seg_00000.ts"), "wb") as f:
+            f.write(b"\x47" * 188)
+        with open(os.path.join(hls_dir, "index.m3u8"), "w") as f:
+            f.write("#EXTM3U\n#EXT-X-TARGETDURATION:4\n#EXTINF:4.0,\nseg_00000.ts\n")
+
+        now = timezone.now()
+        return _make_recording(
+            _make_channel("Finalize Mode", 420),
+            start_time=now - timedelta(hours=2),
+            end_time=now - timedelta(minutes=5),
+            custom_properties={
+                "status": status,
+                "_hls_dir": hls_dir,
+                "file_path": os.path.join(tmp, "show.mkv"),
+            },
+        )
+
+    def _run(self, task, rec, mode, finalized):
+        from core.models import CoreSettings
+
+        redis_conn = MagicMock()
+        redis_conn.set.return_value = True
+        redis_conn.exists.return_value = False
+        redis_conn.hgetall.return_value = {}
+        with patch("core.utils.RedisClient") as mock_redis_cls, \
+                patch.object(CoreSettings, "get_dvr_finalize_mode", return_value=mode), \
+                patch("apps.channels.tasks._dvr_finalize_hls_playlist", return_value=finalized) as mock_finalize, \
+                patch("apps.channels.tasks._resolve_poster_for_program", return_value=(None, None)), \
+                patch("apps.channels.tasks.subprocess.run") as mock_subprocess, \
+                patch("apps.channels.signals.revoke_task"):
+            mock_redis_cls.get_client.return_value = redis_conn
+            mock_subprocess.return_value.returncode = 1
+            mock_subprocess.return_value.stderr = ""
+            if task == "run_recording":
+                from apps.channels.tasks import run_recording
+                run_recording(rec.id, rec.channel_id, str(rec.start_time), str(rec.end_time))
+            else:
+                from apps.channels.tasks import recover_recordings_on_startup
+                recover_recordings_on_startup()
+        rec.refresh_from_db()
+        return rec.custom_properties, mock_finalize, mock_subprocess
+
+    def test_run_recording_closes_playlist_in_hls_mode(self):
+        rec = self._expired_recording("interrupted")
+        cp, mock_finalize, mock_subprocess = self._run("run_recording", rec, "hls", True)
+
+        mock_finalize.assert_called_once()
+        mock_subprocess.assert_not_called()
+        self.assertEqual(cp["finalize_mode"], "hls")
+        self.assertEqual(cp["file_url"], f"/api/channels/recordings/{rec.id}/hls/index.m3u8")
+
+    def test_run_recording_concatenates_in_concat_mode(self):
+        rec = self._expired_recording("interrupted")
+        cp, mock_finalize, mock_subprocess = self._run("run_recording", rec, "concat", True)
+
+        mock_finalize.assert_not_called()
+        self.assertTrue(mock_subprocess.called)
+        self.assertNotIn("finalize_mode", cp)
+
+    def test_run_recording_leaves_status_when_hls_finalize_fails(self):
+        rec = self._expired_recording("interrupted")
+        cp, mock_finalize, _ = self._run("run_recording", rec, "hls", False)
+
+        mock_finalize.assert_called_once()
+        self.assertEqual(cp["status"], "recording")
+        self.assertNotIn("finalize_mode", cp)
+        self.assertEqual(cp["file_url"], f"/api/channels/recordings/{rec.id}/hls/index.m3u8")
+
+    def test_recovery_closes_playlist_in_hls_mode(self):
+        rec = self._expired_recording("recording")
+        cp, mock_finalize, mock_subprocess = self._run("recover", rec, "hls", True)
+
+        mock_finalize.assert_called_once()
+        mock_subprocess.assert_not_called()
+        self.assertEqual(cp["status"], "interrupted")
+        self.assertEqual(cp["finalize_mode"], "hls")
+
+    def test_recovery_concatenates_in_concat_mode(self):
+        rec = self._expired_recording("recording")
+        cp, mock_finalize, mock_subprocess = self._run("recover", rec, "concat", True)
+
+        mock_finalize.assert_not_called()
+        mock_subprocess.assert_called_once()
+        self.assertEqual(cp["status"], "interrupted")
+        self.assertNotIn("finalize_mode", cp)
+
+    def test_recovery_retries_when_hls_finalize_fails(self):
+        rec = self._expired_recording("recording")
+        cp, mock_finalize, _ = self._run("recover", rec, "hls", False)
+
+        mock_finalize.assert_called_once()
+        self.assertEqual(cp["status"], "recording")
+        self.assertNotIn("interrupted_reason", cp)
+
+
+# =========================================================================
+# 7. Frontend red-dot filter (guideUtils.mapRecordingsByProgramId)
 # =========================================================================
 
 class MapRecordingsByProgramIdTests(TestCase):
@@ -586,6 +586,7 @@ class HandleClientDisconnectUpstreamFirstTests(TestCase):
         server.output_managers = {}
         server.redis_client = MagicMock()
         server.redis_client.scard.return_value = 0
+        server.redis_client.sismember.return_value = False  # not on standby
         server._stopping_channels = set()
         return server
 
@@ -614,6 +615,7 @@ class ShutdownDelayWaitTests(TestCase):
                 server = ProxyServer()
         server.redis_client = MagicMock()
         server.redis_client.scard.return_value = 0
+        server.redis_client.sismember.return_value = False  # not on standby
         return server
 
     @patch("apps.proxy.live_proxy.server.gevent.sleep")
@@ -0,0 +1,49 @@
+import logging
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.connect.outbox import OutboxDeliveryService
+from core.utils import RedisClient
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Deliver queued Connect events (webhooks, scripts, plugin hooks) from the Redis outbox"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Delivery thread pool size. Defaults to DISPATCHARR_CONNECT_WORKERS.",
+        )
+        parser.add_argument(
+            "--per-integration",
+            type=int,
+            default=None,
+            help="Concurrent deliveries per integration. "
+                 "Defaults to DISPATCHARR_CONNECT_PER_INTEGRATION.",
+        )
+
+    def handle(self, *args, **options):
+        stop_event = threading.Event()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(sig, lambda *_args: stop_event.set())
+
+        if not settings.CONNECT_OUTBOX_ENABLED:
+            # Stay idle instead of exiting so process supervisors (uWSGI
+            # attach-daemon) do not keep respawning the command.
+            logger.info("Connect outbox disabled; events are dispatched by the emitting process")
+            stop_event.wait()
+            return
+
+        OutboxDeliveryService(
+            RedisClient.get_client(),
+            workers=options["workers"],
+            per_integration=options["per_integration"],
+            stop_event=stop_event,
+        ).run()
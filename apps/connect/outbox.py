@@ -0,0 +1,356 @@
+"""Durable outbox for Connect integrations and plugin event hooks.
+
+``log_system_event`` runs on streaming paths (channel start/stop, client
+connects), so it must not wait on webhooks, scripts or even the ORM lookups
+that build an event payload. While a delivery worker is alive the event is
+appended to a capped Redis stream with a single XADD and the caller returns.
+
+``manage.py deliver_events`` runs ``OutboxDeliveryService``: it reads the
+stream through a consumer group in batches, builds payloads with shared
+lookups, loads subscriptions and plugin actions once per batch, and runs
+the deliveries on a thread pool with a per-integration concurrency limit and
+retries with backoff. ``DeliveryLog`` rows are written with one bulk insert
+per batch. Entries are acknowledged only after their batch finished, so a
+crashed worker's pending entries are reclaimed by the next one. A batch that
+fails as a whole (a database error, say) is appended again with an attempt
+count and dropped with an error after ``MAX_BATCH_ATTEMPTS``.
+
+Stream and profile ids are read from Redis when the event is enqueued, since
+the live channel's keys may be gone by the time a stop event is delivered;
+names and the rest of the payload are looked up at delivery.
+
+Without a live worker heartbeat ``enqueue_event`` returns False and callers
+fall back to direct dispatch.
+"""
+
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+from .models import SUPPORTED_EVENTS
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_STREAM = "connect:outbox"
+OUTBOX_GROUP = "connect-delivery"
+OUTBOX_HEARTBEAT_KEY = "connect:outbox:heartbeat"
+OUTBOX_MAXLEN = 10000
+
+HEARTBEAT_TTL = 30
+HEARTBEAT_INTERVAL = 10
+BATCH_SIZE = 100
+READ_BLOCK_MS = 2000
+# Entries a dead consumer left unacknowledged for this long are reclaimed.
+RECLAIM_IDLE_MS = 120000
+# Whole-batch failures are retried this many times, backing off between them.
+MAX_BATCH_ATTEMPTS = 5
+BATCH_RETRY_DELAY = 2.0
+
+# Emitters cache the heartbeat check instead of reading Redis per event.
+_HEARTBEAT_CACHE_SECONDS = 5.0
+_heartbeat_cache = {"alive": False, "checked": 0.0}
+
+
+def outbox_enabled():
+    return getattr(settings, "CONNECT_OUTBOX_ENABLED", True)
+
+
+def _redis():
+    from core.utils import RedisClient
+
+    return RedisClient.get_client()
+
+
+def delivery_worker_alive(redis_client=None, now=None):
+    """True while a ``deliver_events`` worker heartbeat is present (cached briefly)."""
+    now = now if now is not None else time.monotonic()
+    if now - _heartbeat_cache["checked"] < _HEARTBEAT_CACHE_SECONDS:
+        return _heartbeat_cache["alive"]
+    redis_client = redis_client or _redis()
+    try:
+        alive = bool(redis_client is not None and redis_client.exists(OUTBOX_HEARTBEAT_KEY))
+    except Exception:
+        alive = False
+    _heartbeat_cache.update(alive=alive, checked=now)
+    return alive
+
+
+def enqueue_event(event_type, channel_id=None, channel_name=None, **details):
+    """
+    Append an event to the outbox; False when the caller must dispatch directly.
+
+    Unsupported events are accepted and dropped, since nothing subscribes to them.
+    """
+    if not outbox_enabled():
+        return False
+    if event_type not in SUPPORTED_EVENTS:
+        return True
+    redis_client = _redis()
+    if redis_client is None or not delivery_worker_alive(redis_client):
+        return False
+    try:
+        details.update(_volatile_stream_fields(redis_client, channel_id, details))
+        redis_client.xadd(
+            OUTBOX_STREAM,
+            {
+                "event": event_type,
+                "channel_id": str(channel_id) if channel_id else "",
+                "channel_name": channel_name or "",
+                "details": json.dumps(details, default=str),
+                "ts": f"{time.time():.3f}",
+            },
+            maxlen=OUTBOX_MAXLEN,
+            approximate=True,
+        )
+        return True
+    except Exception as e:
+        logger.warning(f"Could not enqueue connect event {event_type}: {e}")
+        return False
+
+
+def _volatile_stream_fields(redis_client, channel_id, details):
+    """
+    Stream and stream-profile ids from the live channel's Redis keys.
+
+    ``build_event_payload`` would read the same keys at delivery, but a
+    stopped channel's keys are deleted right after its stop event.
+    """
+    from apps.proxy.live_proxy.constants import ChannelMetadataField
+    from apps.proxy.live_proxy.redis_keys import RedisKeys
+
+    captured = {}
+    stream_id = details.get("stream_id")
+    try:
+        if not stream_id and channel_id:
+            stream_id = _decode(redis_client.hget(
+                RedisKeys.channel_metadata(str(channel_id)), ChannelMetadataField.STREAM_ID
+            ))
+            if stream_id:
+                captured["stream_id"] = int(stream_id)
+        if stream_id and "stream_profile_id" not in details:
+            profile_id = _decode(redis_client.get(f"stream_profile:{stream_id}"))
+            if profile_id:
+                captured["stream_profile_id"] = int(profile_id)
+    except (TypeError, ValueError):
+        pass
+    return captured
+
+
+def _decode(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def decode_entry(fields):
+    """Outbox stream fields -> (event_type, channel_id, channel_name, details)."""
+    fields = {_decode(k): _decode(v) for k, v in fields.items()}
+    fields.pop("attempt", None)
+    try:
+        details = json.loads(fields.get("details") or "{}")
+    except ValueError:
+        details = {}
+    return (
+        fields.get("event"),
+        fields.get("channel_id") or None,
+        fields.get("channel_name") or None,
+        details if isinstance(details, dict) else {},
+    )
+
+
+class OutboxDeliveryService:
+    """Consumer-group reader that delivers outbox batches on a bounded thread pool."""
+
+    def __init__(self, redis_client, workers=None, per_integration=None, stop_event=None, consumer=None):
+        from .utils import IntegrationLimiter
+
+        self.redis_client = redis_client
+        self.workers = max(1, int(workers or getattr(settings, "CONNECT_DELIVERY_WORKERS", 8)))
+        self.limiter = IntegrationLimiter(
+            per_integration or getattr(settings, "CONNECT_DELIVERY_PER_INTEGRATION", 2)
+        )
+        self.stop_event = stop_event or threading.Event()
+        self.consumer = consumer or f"{socket.gethostname()}:{os.getpid()}"
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="connect-delivery")
+
+    def _heartbeat(self):
+        try:
+            self.redis_client.set(OUTBOX_HEARTBEAT_KEY, self.consumer, ex=HEARTBEAT_TTL)
+        except Exception as e:
+            logger.warning(f"Connect outbox heartbeat failed: {e}")
+
+    def _heartbeat_loop(self):
+        # Own thread: a batch of slow webhooks must not let emitters think we died.
+        while not self.stop_event.wait(HEARTBEAT_INTERVAL):
+            self._heartbeat()
+
+    def _ensure_group(self):
+        try:
+            self.redis_client.xgroup_create(OUTBOX_STREAM, OUTBOX_GROUP, id="0", mkstream=True)
+        except Exception as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    def _read_batch(self):
+        # Entries left pending by a crashed worker first, then new ones.
+        try:
+            claimed = self.redis_client.xautoclaim(
+                OUTBOX_STREAM, OUTBOX_GROUP, self.consumer,
+                min_idle_time=RECLAIM_IDLE_MS, start_id="0-0", count=BATCH_SIZE,
+            )
+            entries = claimed[1] if claimed else []
+        except Exception:
+            entries = []
+        if entries:
+            return entries
+        response = self.redis_client.xreadgroup(
+            OUTBOX_GROUP, self.consumer, {OUTBOX_STREAM: ">"},
+            count=BATCH_SIZE, block=READ_BLOCK_MS,
+        )
+        return response[0][1] if response else []
+
+    def deliver_batch(self, entries):
+        """
+        Deliver decoded outbox entries; returns the number of DeliveryLog rows written.
+
+        Raises only before any delivery is submitted. Once jobs run, job and
+        log-write failures are logged, so a retried batch never repeats a
+        delivery.
+        """
+        from django.db import close_old_connections
+        from core.utils import build_event_payload
+        from .models import DeliveryLog
+        from .utils import deliver_subscription, plugin_actions_by_event, run_plugin_action, subscriptions_by_event
+
+        events = []
+        cache = {}
+        for event_type, channel_id, channel_name, details in entries:
+            if event_type not in SUPPORTED_EVENTS:
+                continue
+            payload = build_event_payload(
+                channel_id=channel_id, channel_name=channel_name, cache=cache, **details
+            )
+            events.append((event_type, payload))
+        if not events:
+            return 0
+
+        names = {event_type for event_type, _payload in events}
+        subscriptions = subscriptions_by_event(names)
+        pm, plugin_actions = plugin_actions_by_event(names)
+        close_old_connections()
+
+        def _job(sub, payload):
+            limiter = self.limiter.for_key(("integration", sub.integration_id))
+            return deliver_subscription(sub, payload, limiter=limiter)
+
+        def _plugin_job(event_type, payload, key, action_id):
+            try:
+                with self.limiter.for_key(("plugin", key)):
+                    run_plugin_action(pm, event_type, payload, key, action_id)
+            finally:
+                close_old_connections()
+
+        futures = []
+        plugin_futures = []
+        for event_type, payload in events:
+            for sub in subscriptions.get(event_type, []):
+                futures.append(self.executor.submit(_job, sub, payload))
+            for key, action_id in plugin_actions.get(event_type, []):
+                plugin_futures.append(
+                    (key, action_id, self.executor.submit(_plugin_job, event_type, payload, key, action_id))
+                )
+
+        logs = []
+        for future in futures:
+            try:
+                logs.append(future.result())
+            except Exception as e:
+                logger.error(f"Connect delivery job failed: {e}")
+        for key, action_id, future in plugin_futures:
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"Plugin event action {key}.{action_id} failed: {e}")
+        if logs:
+            try:
+                DeliveryLog.objects.bulk_create(logs)
+            except Exception as e:
+                logger.error(f"Could not write {len(logs)} connect delivery log(s): {e}")
+                return 0
+        return len(logs)
+
+    def _requeue(self, raw):
+        """Append a failed batch again with its attempt count, or drop it after the last attempt."""
+        pipe = self.redis_client.pipeline(transaction=False)
+        dropped = 0
+        for _entry_id, fields in raw:
+            fields = {_decode(k): _decode(v) for k, v in fields.items()}
+            attempt = int(fields.get("attempt") or 1) + 1
+            if attempt > MAX_BATCH_ATTEMPTS:
+                dropped += 1
+                continue
+            fields["attempt"] = str(attempt)
+            pipe.xadd(OUTBOX_STREAM, fields, maxlen=OUTBOX_MAXLEN, approximate=True)
+        pipe.execute()
+        if dropped:
+            logger.error(f"Dropped {dropped} connect event(s) after {MAX_BATCH_ATTEMPTS} failed batch attempts")
+
+    def process_once(self):
+        """Read, deliver and acknowledge one batch; returns the number of entries handled."""
+        from django.db import close_old_connections
+
+        raw = self._read_batch()
+        if not raw:
+            return 0
+        raw = [(entry_id, fields) for entry_id, fields in raw if fields]
+        ids = [entry_id for entry_id, _fields in raw]
+        if not ids:
+            return 0
+        failed = False
+        try:
+            self.deliver_batch([decode_entry(fields) for _entry_id, fields in raw])
+        except Exception as e:
+            failed = True
+            logger.error(f"Connect outbox batch failed: {e}", exc_info=True)
+        finally:
+            close_old_connections()
+        if failed:
+            # deliver_batch only raises before submitting any delivery, so
+            # nothing in the batch has reached a receiver yet.
+            self._requeue(raw)
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.xack(OUTBOX_STREAM, OUTBOX_GROUP, *ids)
+        pipe.xdel(OUTBOX_STREAM, *ids)
+        pipe.execute()
+        if failed:
+            self.stop_event.wait(BATCH_RETRY_DELAY)
+        return len(ids)
+
+    def run(self):
+        self._ensure_group()
+        self._heartbeat()
+        threading.Thread(
+            target=self._heartbeat_loop, name="connect-outbox-heartbeat", daemon=True
+        ).start()
+        logger.info(
+            f"Connect outbox delivery started (workers={self.workers}, "
+            f"per integration={self.limiter.limit})"
+        )
+        try:
+            while not self.stop_event.is_set():
+                try:
+                    self.process_once()
+                except Exception as e:
+                    logger.error(f"Connect outbox read failed: {e}")
+                    self.stop_event.wait(1)
+        finally:
+            try:
+                if self.redis_client.get(OUTBOX_HEARTBEAT_KEY) in (self.consumer, self.consumer.encode()):
+                    self.redis_client.delete(OUTBOX_HEARTBEAT_KEY)
+            except Exception:
+                pass
+            self.executor.shutdown(wait=True)
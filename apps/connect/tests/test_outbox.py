@@ -0,0 +1,224 @@
+"""
+Connect event outbox: constant-time enqueue, consumer-group batches, and
+pooled delivery with retries and per-integration concurrency limits.
+"""
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase
+
+from apps.connect import outbox
+from apps.connect.models import EventSubscription, Integration
+from apps.connect.utils import deliver_subscription
+
+
+def _subscription(sub_id, integration_id=1):
+    integration = Integration(id=integration_id, name=f"hook-{integration_id}", type="webhook")
+    return EventSubscription(id=sub_id, event="client_connect", integration=integration)
+
+
+class EnqueueEventTests(SimpleTestCase):
+    def setUp(self):
+        outbox._heartbeat_cache.update(alive=False, checked=0.0)
+        self.addCleanup(outbox._heartbeat_cache.update, alive=False, checked=0.0)
+
+    def test_enqueue_is_one_xadd_while_worker_alive(self):
+        redis = MagicMock()
+        redis.exists.return_value = 1
+        redis.hget.return_value = None
+        redis.get.return_value = None
+
+        with patch("apps.connect.outbox._redis", return_value=redis):
+            self.assertTrue(outbox.enqueue_event("channel_start", channel_id="abc", stream_id=5))
+            self.assertTrue(outbox.enqueue_event("channel_stop", channel_id="abc"))
+
+        self.assertEqual(redis.xadd.call_count, 2)
+        redis.exists.assert_called_once()  # heartbeat check is cached
+        key, fields = redis.xadd.call_args_list[0].args
+        self.assertEqual(key, outbox.OUTBOX_STREAM)
+        self.assertEqual(outbox.decode_entry(fields), ("channel_start", "abc", None, {"stream_id": 5}))
+
+    def test_captures_stream_and_profile_ids_while_the_channel_is_live(self):
+        redis = MagicMock()
+        redis.exists.return_value = 1
+        redis.hget.return_value = "42"
+        redis.get.return_value = "3"
+
+        with patch("apps.connect.outbox._redis", return_value=redis):
+            self.assertTrue(outbox.enqueue_event("channel_stop", channel_id="abc"))
+
+        redis.hget.assert_called_once_with("live:channel:abc:metadata", "stream_id")
+        redis.get.assert_called_once_with("stream_profile:42")
+        _key, fields = redis.xadd.call_args.args
+        self.assertEqual(
+            outbox.decode_entry(fields), ("channel_stop", "abc", None, {"stream_id": 42, "stream_profile_id": 3})
+        )
+
+    def test_falls_back_without_a_delivery_worker(self):
+        redis = MagicMock()
+        redis.exists.return_value = 0
+
+        with patch("apps.connect.outbox._redis", return_value=redis):
+            self.assertFalse(outbox.enqueue_event("channel_start", channel_id="abc"))
+
+        redis.xadd.assert_not_called()
+
+
+class OutboxStreamTests(SimpleTestCase):
+    """Consumer-group round trip against the real Redis the suite is configured with."""
+
+    def setUp(self):
+        from core.utils import RedisClient
+
+        self.redis = RedisClient.get_client()
+        if self.redis is None:
+            self.skipTest("Redis unavailable")
+        self.stream_patch = patch.object(outbox, "OUTBOX_STREAM", "test:connect:outbox")
+        self.stream_patch.start()
+        self.addCleanup(self.stream_patch.stop)
+        self.addCleanup(self.redis.delete, "test:connect:outbox")
+        self.redis.delete("test:connect:outbox")
+
+    def test_process_once_delivers_and_acknowledges_a_batch(self):
+        self.redis.xadd(outbox.OUTBOX_STREAM, {"event": "client_connect", "channel_id": "c1", "details": "{}"})
+        self.redis.xadd(outbox.OUTBOX_STREAM, {"event": "client_disconnect", "details": '{"user": "bob"}'})
+        service = outbox.OutboxDeliveryService(self.redis, workers=2, consumer="test-consumer")
+        self.addCleanup(service.executor.shutdown)
+        service._ensure_group()
+
+        with patch.object(service, "deliver_batch") as mock_deliver:
+            handled = service.process_once()
+
+        self.assertEqual(handled, 2)
+        entries = mock_deliver.call_args.args[0]
+        self.assertEqual(entries[0], ("client_connect", "c1", None, {}))
+        self.assertEqual(entries[1], ("client_disconnect", None, None, {"user": "bob"}))
+        self.assertEqual(self.redis.xlen(outbox.OUTBOX_STREAM), 0)
+        self.assertEqual(self.redis.xpending(outbox.OUTBOX_STREAM, outbox.OUTBOX_GROUP)["pending"], 0)
+
+    def test_failed_batch_is_requeued_then_dropped(self):
+        self.redis.xadd(outbox.OUTBOX_STREAM, {"event": "client_connect", "channel_id": "c1", "details": "{}"})
+        service = outbox.OutboxDeliveryService(self.redis, workers=1, consumer="test-consumer")
+        self.addCleanup(service.executor.shutdown)
+        service._ensure_group()
+
+        with patch.object(service, "deliver_batch", side_effect=RuntimeError("db down")) as mock_deliver, \
+                patch.object(outbox, "BATCH_RETRY_DELAY", 0):
+            for attempt in range(1, outbox.MAX_BATCH_ATTEMPTS + 1):
+                self.assertEqual(service.process_once(), 1)
+                self.assertEqual(mock_deliver.call_args.args[0], [("client_connect", "c1", None, {})])
+                remaining = self.redis.xrange(outbox.OUTBOX_STREAM)
+                if attempt < outbox.MAX_BATCH_ATTEMPTS:
+                    self.assertEqual(len(remaining), 1)
+                    self.assertEqual(remaining[0][1]["attempt"], str(attempt + 1))
+
+        self.assertEqual(mock_deliver.call_count, outbox.MAX_BATCH_ATTEMPTS)
+        self.assertEqual(self.redis.xlen(outbox.OUTBOX_STREAM), 0)
+        self.assertEqual(self.redis.xpending(outbox.OUTBOX_STREAM, outbox.OUTBOX_GROUP)["pending"], 0)
+
+    def test_failed_log_write_does_not_redeliver(self):
+        self.redis.xadd(outbox.OUTBOX_STREAM, {"event": "client_connect", "channel_id": "c1", "details": "{}"})
+        service = outbox.OutboxDeliveryService(self.redis, workers=2, consumer="test-consumer")
+        self.addCleanup(service.executor.shutdown)
+        service._ensure_group()
+        subs = [_subscription(1, integration_id=1), _subscription(2, integration_id=2)]
+
+        with patch("core.utils.build_event_payload", side_effect=lambda **kw: {}), patch(
+            "apps.connect.utils.subscriptions_by_event", return_value={"client_connect": subs}
+        ), patch(
+            "apps.connect.utils.plugin_actions_by_event", return_value=(MagicMock(), {})
+        ), patch("apps.connect.utils.deliver_subscription") as mock_deliver, patch(
+            "apps.connect.models.DeliveryLog.objects.bulk_create", side_effect=RuntimeError("db down")
+        ), self.assertLogs("apps.connect.outbox", level="ERROR") as logs:
+            self.assertEqual(service.process_once(), 1)
+
+        self.assertCountEqual([c.args[0] for c in mock_deliver.call_args_list], subs)
+        self.assertIn("delivery log", logs.output[0])
+        self.assertEqual(self.redis.xlen(outbox.OUTBOX_STREAM), 0)
+        self.assertEqual(self.redis.xpending(outbox.OUTBOX_STREAM, outbox.OUTBOX_GROUP)["pending"], 0)
+
+
+class DeliveryTests(SimpleTestCase):
+    @patch("apps.connect.utils.time.sleep")
+    def test_retries_server_errors_with_backoff(self, mock_sleep):
+        handler = MagicMock()
+        handler.return_value.execute.side_effect = [
+            {"status_code": 503, "success": False},
+            {"status_code": 200, "success": True},
+        ]
+        with patch.dict("apps.connect.utils.HANDLERS", {"webhook": handler}):
+            log = deliver_subscription(_subscription(1), {"a": 1})
+
+        self.assertEqual(log.status, "success")
+        self.assertEqual(handler.return_value.execute.call_count, 2)
+        mock_sleep.assert_called_once_with(1.0)
+
+    @patch("apps.connect.utils.time.sleep")
+    def test_client_errors_are_not_retried(self, mock_sleep):
+        handler = MagicMock()
+        handler.return_value.execute.return_value = {"status_code": 404, "success": False}
+        with patch.dict("apps.connect.utils.HANDLERS", {"webhook": handler}):
+            log = deliver_subscription(_subscription(1), {"a": 1})
+
+        self.assertEqual(log.status, "failed")
+        handler.return_value.execute.assert_called_once()
+        mock_sleep.assert_not_called()
+
+    def test_batch_respects_per_integration_limit_and_bulk_inserts(self):
+        lock = threading.Lock()
+        state = {"running": 0, "peak": 0}
+
+        class SlowHandler:
+            def __init__(self, *args):
+                pass
+
+            def execute(self):
+                with lock:
+                    state["running"] += 1
+                    state["peak"] = max(state["peak"], state["running"])
+                time.sleep(0.02)
+                with lock:
+                    state["running"] -= 1
+                return {"status_code": 200, "success": True}
+
+        subs = [_subscription(i, integration_id=7) for i in range(4)]
+        service = outbox.OutboxDeliveryService(MagicMock(), workers=4, per_integration=1)
+        self.addCleanup(service.executor.shutdown)
+
+        with patch.dict("apps.connect.utils.HANDLERS", {"webhook": SlowHandler}), patch(
+            "core.utils.build_event_payload", side_effect=lambda **kw: {"user": "bob"}
+        ), patch(
+            "apps.connect.utils.subscriptions_by_event", return_value={"client_connect": subs}
+        ), patch(
+            "apps.connect.utils.plugin_actions_by_event", return_value=(MagicMock(), {})
+        ), patch("apps.connect.models.DeliveryLog.objects.bulk_create") as mock_bulk:
+            written = service.deliver_batch([("client_connect", None, None, {})])
+
+        self.assertEqual(written, 4)
+        self.assertEqual(state["peak"], 1)
+        mock_bulk.assert_called_once()
+        self.assertEqual(len(mock_bulk.call_args.args[0]), 4)
+
+    def test_batch_waits_for_plugin_actions_and_logs_their_failures(self):
+        service = outbox.OutboxDeliveryService(MagicMock(), workers=2)
+        self.addCleanup(service.executor.shutdown)
+        finished = []
+
+        def run_action(pm, event_type, payload, key, action_id):
+            time.sleep(0.02)
+            finished.append(action_id)
+            if action_id == "bad":
+                raise RuntimeError("plugin broke")
+
+        with patch("core.utils.build_event_payload", side_effect=lambda **kw: {}), patch(
+            "apps.connect.utils.subscriptions_by_event", return_value={}
+        ), patch(
+            "apps.connect.utils.plugin_actions_by_event",
+            return_value=(MagicMock(), {"client_connect": [("p", "good"), ("p", "bad")]}),
+        ), patch("apps.connect.utils.run_plugin_action", side_effect=run_action), \
+                self.assertLogs("apps.connect.outbox", level="ERROR") as logs:
+            service.deliver_batch([("client_connect", None, None, {})])
+
+        self.assertCountEqual(finished, ["good", "bad"])
+        self.assertIn("p.bad failed", logs.output[0])
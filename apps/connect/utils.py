@@ -1,5 +1,7 @@
 # connect/utils.py
 import logging
+import threading
+import time
 from django.template import Template, Context
 from .models import EventSubscription, DeliveryLog, SUPPORTED_EVENTS
 from .handlers.webhook import WebhookHandler
@@ -13,23 +15,110 @@ HANDLERS = {
     "script": ScriptHandler,
 }
 
+# Delivery retries: attempts per subscription and the first backoff delay
+# (doubled after every failed attempt). Only errors and 429/5xx responses retry.
+DELIVERY_ATTEMPTS = 3
+DELIVERY_BACKOFF = 1.0
 
-def trigger_event(event_name, payload):
-    if event_name not in SUPPORTED_EVENTS:
-        logger.debug(f"Unsupported event '{event_name}' - skipping")
-        return
 
-    logger.debug(
-        f"Triggering connect event: {event_name} payload_keys={list((payload or {}).keys())}"
+def render_payload(integration, sub, payload):
+    # apply optional payload template (only for webhook integrations)
+    # If the rendered template is valid JSON, use that object as the payload.
+    # Otherwise, pass the rendered string as-is.
+    if integration.type == 'webhook' and sub.payload_template:
+        try:
+            template = Template(sub.payload_template)
+            return template.render(Context(payload)).strip()
+        except Exception as e:
+            logger.error(
+                f"Payload template render failed for subscription id={sub.id}: {e}"
+            )
+    return payload
+
+
+def _should_retry(result):
+    status = result.get("status_code")
+    return status is not None and (status == 429 or status >= 500)
+
+
+def deliver_subscription(sub, payload, attempts=DELIVERY_ATTEMPTS, backoff=DELIVERY_BACKOFF, limiter=None):
+    """
+    Run one subscription's handler with retries; returns an unsaved DeliveryLog.
+
+    ``limiter`` (a semaphore) is held only while the handler runs, not
+    during backoff, so a slow integration cannot hog its concurrency slots.
+    """
+    integration = sub.integration
+    final_payload = render_payload(integration, sub, payload)
+
+    handler_cls = HANDLERS.get(integration.type)
+    if not handler_cls:
+        logger.error(
+            f"No handler for integration type '{integration.type}' (integration id={integration.id})"
+        )
+        return DeliveryLog(
+            subscription=sub,
+            status="failed",
+            request_payload=final_payload,
+            error_message=f"No handler for integration type '{integration.type}'",
+        )
+
+    delay = backoff
+    for attempt in range(1, attempts + 1):
+        logger.debug(
+            f"Executing handler type={integration.type} integration_id={integration.id} "
+            f"subscription_id={sub.id} attempt={attempt}"
+        )
+        error = None
+        result = None
+        try:
+            if limiter is not None:
+                with limiter:
+                    result = handler_cls(integration, sub, final_payload).execute()
+            else:
+                result = handler_cls(integration, sub, final_payload).execute()
+        except Exception as e:
+            error = e
+
+        retry = error is not None or _should_retry(result)
+        if not retry or attempt == attempts:
+            break
+        logger.warning(
+            f"Connect delivery attempt {attempt}/{attempts} failed for subscription id={sub.id} "
+            f"integration '{integration.name}', retrying in {delay:.0f}s"
+        )
+        time.sleep(delay)
+        delay *= 2
+
+    if error is not None:
+        logger.error(
+            f"Connect delivery failed for subscription id={sub.id} integration '{integration.name}': {error}"
+        )
+        return DeliveryLog(
+            subscription=sub,
+            status="failed",
+            request_payload=final_payload,
+            error_message=f"{error} (after {attempt} attempt(s))" if attempt > 1 else str(error),
+        )
+
+    logger.info(
+        f"Connect delivery {'succeeded' if result.get('success') else 'failed'} for subscription "
+        f"id={sub.id} integration '{integration.name}'"
+    )
+    return DeliveryLog(
+        subscription=sub,
+        status="success" if result.get("success") else "failed",
+        request_payload=final_payload,
+        response_payload=result,
     )
-    subscriptions = EventSubscription.objects.filter(
-        event=event_name, enabled=True
-    ).select_related("integration")
 
-    count = subscriptions.count()
-    logger.info(f"Found {count} connect subscription(s) for event '{event_name}'")
 
-    # First, fetch all subscriptions and trigger
+def subscriptions_by_event(event_names):
+    """Enabled subscriptions of enabled integrations, grouped by event, in one query."""
+    grouped = {}
+    subscriptions = EventSubscription.objects.filter(
+        event__in=list(event_names), enabled=True
+    ).select_related("integration")
     for sub in subscriptions:
         integration = sub.integration
         if not integration.enabled:
@@ -37,101 +126,97 @@ def trigger_event(event_name, payload):
                 f"Skipping disabled integration id={integration.id} name={integration.name}"
             )
             continue
+        grouped.setdefault(sub.event, []).append(sub)
+    return grouped
 
-        # apply optional payload template (only for webhook integrations)
-        # If the rendered template is valid JSON, use that object as the payload.
-        # Otherwise, pass the rendered string as-is.
-        final_payload = payload
-        if integration.type == 'webhook' and sub.payload_template:
-            try:
-                template = Template(sub.payload_template)
-                final_payload = template.render(Context(payload)).strip()
-            except Exception as e:
-                logger.error(
-                    f"Payload template render failed for subscription id={sub.id}: {e}"
-                )
-                final_payload = payload
-
-        handler_cls = HANDLERS.get(integration.type)
-        if not handler_cls:
-            DeliveryLog.objects.create(
-                subscription=sub,
-                status="failed",
-                request_payload=final_payload,
-                error_message=f"No handler for integration type '{integration.type}'",
-            )
-            logger.error(
-                f"No handler for integration type '{integration.type}' (integration id={integration.id})"
-            )
-            continue
-
-        handler = handler_cls(integration, sub, final_payload)
-        logger.debug(
-            f"Executing handler type={integration.type} integration_id={integration.id} subscription_id={sub.id}"
-        )
-
-        try:
-            result = handler.execute()
-            DeliveryLog.objects.create(
-                subscription=sub,
-                status="success" if result.get("success") else "failed",
-                request_payload=final_payload,
-                response_payload=result,
-            )
-            logger.info(
-                f"Connect delivery succeeded for subscription id={sub.id} integration '{integration.name}'"
-            )
-        except Exception as e:
-            DeliveryLog.objects.create(
-                subscription=sub,
-                status="failed",
-                request_payload=final_payload,
-                error_message=str(e),
-            )
-            logger.error(
-                f"Connect delivery failed for subscription id={sub.id} integration '{integration.name}': {e}"
-            )
 
+def plugin_actions_by_event(event_names):
+    """Enabled plugin actions per event; plugins are discovered once per call."""
     pm = PluginManager.get()
     pm.discover_plugins(sync_db=False, use_cache=True, release_connections=False)
-    handlers = list(pm.iter_actions_for_event(event_name))
-    if not handlers:
-        return
+    actions = {}
+    for event_name in set(event_names):
+        handlers = list(pm.iter_actions_for_event(event_name))
+        if handlers:
+            actions[event_name] = handlers
+    if not actions:
+        return pm, {}
 
     from apps.plugins.models import PluginConfig
 
-    handler_keys = {key for key, _ in handlers}
+    handler_keys = {key for handlers in actions.values() for key, _ in handlers}
     enabled_keys = set(
         PluginConfig.objects.filter(enabled=True, key__in=handler_keys).values_list(
             "key", flat=True
         )
     )
+    for event_name, handlers in actions.items():
+        logger.debug(
+            "Dispatching event '%s' to %d plugin action(s) (%d enabled)",
+            event_name,
+            len(handlers),
+            len(enabled_keys),
+        )
+        for key, _action_id in handlers:
+            if key not in enabled_keys:
+                logger.debug(
+                    "Skipping disabled plugin id=%s for event '%s'", key, event_name
+                )
+        actions[event_name] = [(key, action_id) for key, action_id in handlers if key in enabled_keys]
+    return pm, actions
+
 
+def run_plugin_action(pm, event_name, payload, key, action_id):
     logger.debug(
-        "Dispatching event '%s' to %d plugin action(s) (%d enabled)",
+        "Triggering plugin action for event '%s' on plugin id=%s action=%s",
         event_name,
-        len(handlers),
-        len(enabled_keys),
+        key,
+        action_id,
     )
-    params = {"event": event_name, "payload": payload}
-    for key, action_id in handlers:
-        if key not in enabled_keys:
-            logger.debug(
-                "Skipping disabled plugin id=%s for event '%s'", key, event_name
-            )
-            continue
-        logger.debug(
-            "Triggering plugin action for event '%s' on plugin id=%s action=%s",
+    try:
+        pm.run_action(key, action_id, {"event": event_name, "payload": payload})
+    except Exception:
+        logger.exception(
+            "Plugin action failed for event '%s' on plugin id=%s action=%s",
             event_name,
             key,
             action_id,
         )
-        try:
-            pm.run_action(key, action_id, params)
-        except Exception:
-            logger.exception(
-                "Plugin action failed for event '%s' on plugin id=%s action=%s",
-                event_name,
-                key,
-                action_id,
-            )
+
+
+def trigger_event(event_name, payload):
+    """Deliver one event synchronously (used when the outbox worker is not running)."""
+    if event_name not in SUPPORTED_EVENTS:
+        logger.debug(f"Unsupported event '{event_name}' - skipping")
+        return
+
+    logger.debug(
+        f"Triggering connect event: {event_name} payload_keys={list((payload or {}).keys())}"
+    )
+    subscriptions = subscriptions_by_event([event_name]).get(event_name, [])
+    logger.info(f"Found {len(subscriptions)} connect subscription(s) for event '{event_name}'")
+
+    logs = [deliver_subscription(sub, payload) for sub in subscriptions]
+    if logs:
+        DeliveryLog.objects.bulk_create(logs)
+
+    pm, actions = plugin_actions_by_event([event_name])
+    for key, action_id in actions.get(event_name, []):
+        run_plugin_action(pm, event_name, payload, key, action_id)
+
+
+class IntegrationLimiter:
+    """Per-integration semaphores shared by the delivery worker pool."""
+
+    def __init__(self, limit):
+        self.limit = max(1, int(limit))
+        self._lock = threading.Lock()
+        self._semaphores = {}
+
+    def for_key(self, key):
+        with self._lock:
+            semaphore = self._semaphores.get(key)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.limit)
+                self._semaphores[key] = semaphore
+            return semaphore
@@ -15,6 +15,7 @@ from rest_framework.decorators import action
 from drf_spectacular.utils import extend_schema, OpenApiParameter, inline_serializer
 from drf_spectacular.types import OpenApiTypes
 from django.db.models import Q
+from django.http import HttpResponse, HttpResponseNotModified
 from django.utils import timezone
 from django.utils.dateparse import parse_datetime
 from datetime import timedelta
@@ -28,6 +29,13 @@ from .serializers import (
 )
 from .tasks import refresh_epg_data, find_current_program_for_tvg_id
 from .query_utils import parse_text_query
+from .guide_grid import (
+    dummy_name_to_parse,
+    guide_channel_rows,
+    guide_grid_etag,
+    guide_grid_json,
+    parse_window,
+)
 from apps.accounts.permissions import (
     Authenticated,
     IsAdmin,
@@ -526,26 +534,7 @@ class EPGGridAPIView(APIView):
                 logger.debug(f"Generating custom dummy programs for channel: {channel.name} (ID: {channel.id})")
 
                 # Determine which name to parse based on custom properties
-                name_to_parse = channel.name
-                if epg_source and epg_source.custom_properties:
-                    custom_props = epg_source.custom_properties
-                    name_source = custom_props.get('name_source')
-
-                    if name_source == 'stream':
-                        # Get the stream index (1-based from user, convert to 0-based)
-                        stream_index = custom_props.get('stream_index', 1) - 1
-
-                        # Get streams ordered by channelstream order
-                        channel_streams = channel.streams.all().order_by('channelstream__order')
-
-                        if channel_streams.exists() and 0 <= stream_index < channel_streams.count():
-                            stream = list(channel_streams)[stream_index]
-                            name_to_parse = stream.name
-                            logger.debug(f"Using stream name for parsing: {name_to_parse} (stream index: {stream_index})")
-                        else:
-                            logger.warning(f"Stream index {stream_index} not found for channel {channel.name}, falling back to channel name")
-                    elif name_source == 'channel':
-                        logger.debug(f"Using channel name for parsing: {name_to_parse}")
+                name_to_parse = dummy_name_to_parse(channel, epg_source)
 
                 # Generate programs using custom patterns from the dummy EPG source
                 # Use the same tvg_id that will be set in the program data
@@ -667,6 +656,73 @@ class EPGGridAPIView(APIView):
         return response
 
 
+class GuideGridAPIView(APIView):
+    """Columnar guide data for a time window and channel set (see apps.epg.guide_grid)."""
+
+    def get_permissions(self):
+        try:
+            return [
+                perm() for perm in permission_classes_by_method[self.request.method]
+            ]
+        except KeyError:
+            return [Authenticated()]
+
+    @extend_schema(
+        description=(
+            "Compact guide grid: channel rows plus programmes overlapping the window as "
+            "parallel arrays (row index, epoch start/stop, interned title and sub-title, flag bits). "
+            "The window is widened to half-hour boundaries and limited to 48 hours. Responses carry "
+            "an ETag that changes when guide data changes."
+        ),
+        parameters=[
+            OpenApiParameter("start", OpenApiTypes.STR, description="ISO 8601 time or epoch seconds (default: an hour ago)"),
+            OpenApiParameter("end", OpenApiTypes.STR, description="ISO 8601 time or epoch seconds (default: start + 13 hours)"),
+            OpenApiParameter("channels", OpenApiTypes.STR, description="Comma-separated channel ids (default: all visible channels)"),
+            OpenApiParameter("channel_profile_id", OpenApiTypes.INT, description="Only channels enabled in this profile"),
+        ],
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    def get(self, request, format=None):
+        from apps.channels.models import Channel
+
+        try:
+            start_ts, end_ts = parse_window(request.GET.get("start"), request.GET.get("end"))
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        channels = Channel.objects.filter(hidden_from_output=False)
+        channel_ids = request.GET.get("channels")
+        if channel_ids:
+            try:
+                channels = channels.filter(id__in=[int(c) for c in channel_ids.split(",") if c.strip()])
+            except ValueError:
+                return Response({"error": "channels must be comma-separated integers"}, status=status.HTTP_400_BAD_REQUEST)
+        channel_profile_id = request.GET.get("channel_profile_id")
+        if channel_profile_id:
+            try:
+                channels = channels.filter(
+                    channelprofilemembership__channel_profile_id=int(channel_profile_id),
+                    channelprofilemembership__enabled=True,
+                )
+            except ValueError:
+                return Response({"error": "channel_profile_id must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        if request.user.user_level < 10:
+            channels = channels.filter(user_level__lte=request.user.user_level)
+            if (request.user.custom_properties or {}).get("hide_adult_content", False):
+                channels = channels.filter(is_adult=False)
+
+        rows = guide_channel_rows(channels)
+        etag = guide_grid_etag(rows, start_ts, end_ts)
+        if etag and request.META.get("HTTP_IF_NONE_MATCH") == etag:
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(guide_grid_json(rows, start_ts, end_ts, etag), content_type="application/json")
+        if etag:
+            response["ETag"] = etag
+        response["Cache-Control"] = "private, no-cache"
+        return response
+
+
 # ─────────────────────────────
 # 4) EPG Import View
 # ─────────────────────────────
@@ -0,0 +1,360 @@
+"""
+Columnar guide-grid snapshots for the web TV guide.
+
+``/api/epg/grid/`` returns one dict per programme, with descriptions, for a
+fixed 25-hour window. The guide only needs row placement and a label to
+draw, so ``/api/epg/guide-grid/`` answers a (window, channel set) query with
+parallel arrays instead:
+
+    {
+      "start": 1767571200, "end": 1767614400,
+      "channels": [12, 7, 31],              # channel ids, one per row
+      "strings": ["News at Six", ...],      # titles and sub-titles, interned
+      "programmes": {
+        "id":        [901, 902, null, ...], # null for generated dummy programmes
+        "channel":   [0, 0, 2, ...],        # row index into "channels"
+        "start":     [...], "stop": [...],  # epoch seconds
+        "title":     [0, 3, 5, ...],        # index into "strings"
+        "sub_title": [-1, 4, -1, ...],      # index into "strings", -1 for none
+        "flags":     [1, 0, 2, ...]         # FLAG_* bits
+      }
+    }
+
+Programmes are grouped by row and sorted by start within a row. Details such
+as descriptions are fetched per programme from ``/api/epg/programs/<id>/``.
+
+Windows are widened to ``WINDOW_ALIGN`` boundaries so scrolling requests
+land on the same cache entries. The rendered JSON is cached per
+(version, window, channel set); the version is a random token in the cache
+that ``invalidate_guide_grid`` replaces whenever guide data changes (EPG
+imports and EPG assignment changes, via ``invalidate_epg_chunk_cache``).
+Assignment and channel-set changes also change the cache key directly.
+"""
+import hashlib
+import json
+import logging
+import math
+import uuid
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+logger = logging.getLogger(__name__)
+
+GRID_VERSION_KEY = "epg_guide_grid:version"
+GRID_CACHE_PREFIX = "epg_guide_grid:window:"
+# Window edges are widened to this many seconds.
+WINDOW_ALIGN = 30 * 60
+MAX_WINDOW = 48 * 3600
+DEFAULT_LOOKBACK = 3600
+DEFAULT_LOOKAHEAD = 12 * 3600
+# Bounds how long generated dummy programmes (relative to now) can be served.
+GRID_CACHE_TTL = 30 * 60
+
+FLAG_NEW = 1
+FLAG_LIVE = 2
+FLAG_PREMIERE = 4
+FLAG_FINALE = 8
+
+
+def _new_version():
+    return uuid.uuid4().hex[:12]
+
+
+def grid_version():
+    """Current guide-grid version token, or None when the cache is unavailable."""
+    try:
+        version = cache.get(GRID_VERSION_KEY)
+        if version is None:
+            cache.add(GRID_VERSION_KEY, _new_version(), timeout=None)
+            version = cache.get(GRID_VERSION_KEY)
+        return version
+    except Exception as e:
+        logger.debug(f"Guide grid version unavailable: {e}")
+        return None
+
+
+def invalidate_guide_grid():
+    """Start a new guide-grid version so every cached window is rebuilt."""
+    try:
+        cache.set(GRID_VERSION_KEY, _new_version(), timeout=None)
+    except Exception as e:
+        logger.warning(f"Could not invalidate guide grid cache: {e}")
+
+
+def _parse_time(value):
+    """Epoch seconds from an ISO 8601 string or a number of epoch seconds."""
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValueError(f"Invalid time: {value}")
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed, dt_timezone.utc)
+    return parsed.timestamp()
+
+
+def parse_window(start=None, end=None, now=None):
+    """
+    The aligned (start, end) window in epoch seconds.
+
+    Defaults to one hour back and twelve ahead of ``now``. Raises ValueError
+    for unparseable times, an empty window or one longer than ``MAX_WINDOW``.
+    """
+    now = (now or timezone.now()).timestamp()
+    start_ts = _parse_time(start) if start else now - DEFAULT_LOOKBACK
+    end_ts = _parse_time(end) if end else start_ts + DEFAULT_LOOKBACK + DEFAULT_LOOKAHEAD
+    start_ts = int(start_ts // WINDOW_ALIGN * WINDOW_ALIGN)
+    end_ts = int(math.ceil(end_ts / WINDOW_ALIGN) * WINDOW_ALIGN)
+    if end_ts <= start_ts:
+        raise ValueError("end must be after start")
+    if end_ts - start_ts > MAX_WINDOW:
+        raise ValueError(f"The window cannot be longer than {MAX_WINDOW // 3600} hours")
+    return start_ts, end_ts
+
+
+def guide_channel_rows(channels):
+    """
+    ``(channel_id, epg_data_id, dummy_source_id, name)`` per channel, in guide order.
+
+    ``channels`` is a Channel queryset; EPG assignments honour overrides and
+    ``dummy_source_id`` is set for channels on a dummy EPG source.
+    """
+    from apps.channels.managers import with_effective_values
+    from apps.epg.models import EPGSource
+
+    rows = list(
+        with_effective_values(channels)
+        .order_by("effective_channel_number", "id")
+        .values_list("id", "effective_epg_data_id", "effective_name")
+    )
+    epg_ids = {epg_id for _, epg_id, _ in rows if epg_id}
+    dummy_sources = dict(
+        EPGSource.objects.filter(source_type="dummy", epgs__id__in=epg_ids).values_list("epgs__id", "id")
+    ) if epg_ids else {}
+    return [
+        (channel_id, epg_id, dummy_sources.get(epg_id), name)
+        for channel_id, epg_id, name in rows
+    ]
+
+
+def dummy_name_to_parse(channel, epg_source):
+    """The channel or stream name a custom dummy EPG source parses its patterns from."""
+    name_to_parse = channel.name
+    custom_props = epg_source.custom_properties if epg_source else None
+    if custom_props and custom_props.get("name_source") == "stream":
+        # 1-based stream position from the source settings
+        stream_index = custom_props.get("stream_index", 1) - 1
+        streams = list(channel.streams.all().order_by("channelstream__order"))
+        if 0 <= stream_index < len(streams):
+            name_to_parse = streams[stream_index].name
+            logger.debug(f"Using stream name for parsing: {name_to_parse} (stream index: {stream_index})")
+        else:
+            logger.warning(
+                f"Stream index {stream_index} not found for channel {channel.name}, falling back to channel name"
+            )
+    return name_to_parse
+
+
+class _Columns:
+    """Programme columns with interned strings."""
+
+    def __init__(self):
+        self.strings = []
+        self._string_index = {}
+        self.ids = []
+        self.rows = []
+        self.starts = []
+        self.stops = []
+        self.titles = []
+        self.sub_titles = []
+        self.flags = []
+
+    def intern(self, value):
+        if not value:
+            return -1
+        index = self._string_index.get(value)
+        if index is None:
+            index = self._string_index[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+    def add(self, program_id, row, start, stop, title, sub_title, flags):
+        self.ids.append(program_id)
+        self.rows.append(row)
+        self.starts.append(start)
+        self.stops.append(stop)
+        self.titles.append(self.intern(title or ""))
+        self.sub_titles.append(self.intern(sub_title))
+        self.flags.append(flags)
+
+    def as_dict(self):
+        return {
+            "id": self.ids,
+            "channel": self.rows,
+            "start": self.starts,
+            "stop": self.stops,
+            "title": self.titles,
+            "sub_title": self.sub_titles,
+            "flags": self.flags,
+        }
+
+
+def _flags(new, live, premiere, premiere_text):
+    flags = 0
+    if new:
+        flags |= FLAG_NEW
+    if live:
+        flags |= FLAG_LIVE
+    if premiere:
+        flags |= FLAG_PREMIERE
+    if premiere_text and "finale" in str(premiere_text).lower():
+        flags |= FLAG_FINALE
+    return flags
+
+
+def _programme_rows(epg_ids, window_start, window_end):
+    """Programmes of ``epg_ids`` overlapping the window, grouped by EPG entry and start time."""
+    from apps.epg.models import ProgramData
+
+    return (
+        ProgramData.objects.filter(
+            epg_id__in=epg_ids,
+            end_time__gt=window_start,
+            start_time__lt=window_end,
+        )
+        .order_by("epg_id", "start_time", "id")
+        .values_list(
+            "id", "epg_id", "start_time", "end_time", "title", "sub_title",
+            # Only the flag keys, not the whole custom_properties document.
+            "custom_properties__new", "custom_properties__live",
+            "custom_properties__premiere", "custom_properties__premiere_text",
+        )
+        .iterator(chunk_size=5000)
+    )
+
+
+def _dummy_programmes(rows, window_start, window_end):
+    """Generated programmes per row index for channels on custom dummy EPG sources."""
+    from apps.channels.models import Channel
+    from apps.epg.models import EPGSource
+    from apps.output.epg import generate_dummy_programs
+
+    dummy_rows = {channel_id: row for row, (channel_id, _, source_id, _) in enumerate(rows) if source_id}
+    if not dummy_rows:
+        return {}
+    sources = {source.id: source for source in EPGSource.objects.filter(
+        id__in={source_id for _, _, source_id, _ in rows if source_id}
+    )}
+    num_days = max(1, math.ceil((window_end - timezone.now()).total_seconds() / 86400))
+    generated = {}
+    for channel in Channel.objects.filter(id__in=dummy_rows).select_related("override"):
+        row = dummy_rows[channel.id]
+        epg_source = sources[rows[row][2]]
+        try:
+            programs = generate_dummy_programs(
+                channel_id=str(channel.uuid),
+                channel_name=dummy_name_to_parse(channel, epg_source),
+                num_days=num_days,
+                program_length_hours=4,
+                epg_source=epg_source,
+                export_lookback=window_start,
+                export_cutoff=window_end,
+            )
+        except Exception as e:
+            logger.error(f"Error creating custom dummy programs for channel {channel.name} (ID: {channel.id}): {e}")
+            continue
+        generated[row] = [
+            program for program in programs
+            if program["end_time"] > window_start and program["start_time"] < window_end
+        ]
+    return generated
+
+
+def build_guide_grid(rows, start_ts, end_ts):
+    """The columnar guide payload for channel ``rows`` (see ``guide_channel_rows``)."""
+    window_start = datetime.fromtimestamp(start_ts, tz=dt_timezone.utc)
+    window_end = datetime.fromtimestamp(end_ts, tz=dt_timezone.utc)
+
+    rows_by_epg = {}
+    for row, (_, epg_id, source_id, _) in enumerate(rows):
+        if epg_id and not source_id:
+            rows_by_epg.setdefault(epg_id, []).append(row)
+
+    # Collected per row so every row's programmes are contiguous.
+    per_row = {}
+    if rows_by_epg:
+        for (program_id, epg_id, start, stop, title, sub_title,
+             new, live, premiere, premiere_text) in _programme_rows(rows_by_epg, window_start, window_end):
+            entry = (
+                program_id, int(start.timestamp()), int(stop.timestamp()), title, sub_title,
+                _flags(new, live, premiere, premiere_text),
+            )
+            for row in rows_by_epg[epg_id]:
+                per_row.setdefault(row, []).append(entry)
+
+    for row, programs in _dummy_programmes(rows, window_start, window_end).items():
+        per_row[row] = [
+            (
+                None, int(program["start_time"].timestamp()), int(program["end_time"].timestamp()),
+                program["title"], program.get("sub_title"),
+                FLAG_LIVE if (program.get("custom_properties") or {}).get("live") else 0,
+            )
+            for program in programs
+        ]
+
+    columns = _Columns()
+    for row in sorted(per_row):
+        for program_id, start, stop, title, sub_title, flags in per_row[row]:
+            columns.add(program_id, row, start, stop, title, sub_title, flags)
+
+    return {
+        "start": start_ts,
+        "end": end_ts,
+        "channels": [channel_id for channel_id, _, _, _ in rows],
+        "strings": columns.strings,
+        "programmes": columns.as_dict(),
+    }
+
+
+def guide_grid_etag(rows, start_ts, end_ts):
+    """ETag for a window, or None when the cache is unavailable."""
+    version = grid_version()
+    if version is None:
+        return None
+    # Dummy titles come from the channel name, so it is part of the key for those rows.
+    channel_set = json.dumps(
+        [[channel_id, epg_id, name if source_id else ""] for channel_id, epg_id, source_id, name in rows],
+        separators=(",", ":"),
+    )
+    digest = hashlib.md5(f"{start_ts}:{end_ts}:{channel_set}".encode()).hexdigest()[:16]
+    return f'"{version}-{digest}"'
+
+
+def guide_grid_json(rows, start_ts, end_ts, etag=None):
+    """The rendered payload, from the cache when ``etag`` names a cached window."""
+    cache_key = f"{GRID_CACHE_PREFIX}{etag.strip('"')}" if etag else None
+    if cache_key:
+        try:
+            body = cache.get(cache_key)
+            if body is not None:
+                return body
+        except Exception as e:
+            logger.debug(f"Guide grid cache read failed: {e}")
+
+    payload = build_guide_grid(rows, start_ts, end_ts)
+    body = json.dumps(payload, separators=(",", ":")).encode()
+    logger.debug(
+        f"Built guide grid {start_ts}-{end_ts}: {len(rows)} channels, "
+        f"{len(payload['programmes']['id'])} programmes, {len(body)} bytes"
+    )
+    if cache_key:
+        try:
+            cache.set(cache_key, body, timeout=GRID_CACHE_TTL)
+        except Exception as e:
+            logger.debug(f"Guide grid cache write failed: {e}")
+    return body
@@ -0,0 +1,18 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('epg', '0026_epgsourceindex'),
+    ]
+
+    operations = [
+        # Filled in by the next EPG refresh or matching run
+        # (apps.channels.epg_matching.ensure_epg_norm_names).
+        migrations.AddField(
+            model_name='epgdata',
+            name='norm_name',
+            field=models.CharField(blank=True, default='', max_length=512),
+        ),
+    ]
@@ -156,6 +156,8 @@ class EPGSourceIndex(models.Model):
 class EPGData(models.Model):
     tvg_id = models.CharField(max_length=255, null=True, blank=True, db_index=True)
     name = models.CharField(max_length=512)
+    # normalize_name(name), refreshed with the source; read by EPG auto-matching.
+    norm_name = models.CharField(max_length=512, blank=True, default="")
     icon_url = models.URLField(max_length=500, null=True, blank=True)
     epg_source = models.ForeignKey(
         EPGSource,
@@ -185,6 +187,8 @@ class ProgramData(models.Model):
     class Meta:
         indexes = [
             models.Index(fields=['epg', 'id'], name='epg_prog_epg_id_idx'),
+            # XMLTV export streams programmes in (epg, start_time, id) order.
+            models.Index(fields=['epg', 'start_time', 'id'], name='epg_prog_epg_start_idx'),
         ]
 
     def __str__(self):
@@ -12,6 +12,7 @@ import hashlib
 import json
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date, datetime, timedelta, timezone as dt_timezone
 
 import requests
@@ -40,6 +41,43 @@ SD_PROGRAM_BATCH_SIZE = 5000
 SD_BULK_GUIDE_FETCH_THRESHOLD = 3
 SD_MAPPED_GUIDE_BATCH_DEFER_SECONDS = 90
 SD_MAPPED_GUIDE_FETCH_DEFER_MAX_RETRIES = 2
+SD_ARTWORK_BATCH_SIZE = 500
+# Schedule, program and artwork batches in flight at once during a refresh.
+SD_MAX_CONCURRENT_REQUESTS = 4
+
+
+class _SDRequestPool:
+    """
+    Bounded thread pool for Schedules Direct batch POSTs.
+
+    Futures resolve to the decoded JSON body, or raise the request error.
+    Requests go through the refresh's ``sd_req`` so token refresh and lockout
+    handling stay in one place; the pool only bounds how many are in flight.
+    """
+
+    def __init__(self, sd_req, max_workers=SD_MAX_CONCURRENT_REQUESTS):
+        self._sd_req = sd_req
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='sd-fetch'
+        )
+
+    def _post(self, url, body, timeout):
+        try:
+            response = self._sd_req('POST', url, json=body, timeout=timeout)
+            response.raise_for_status()
+            return response.json()
+        finally:
+            # A token refresh may have saved the source from this thread.
+            connection.close()
+
+    def post(self, url, body, timeout=120):
+        return self._executor.submit(self._post, url, body, timeout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._executor.shutdown(wait=True, cancel_futures=True)
 
 def _sd_compute_schedule_changes_from_md5(server_md5s, cached_md5s, date_list):
     """Return station_id -> [date_str] for dates whose schedule MD5 differs from cache."""
@@ -107,6 +145,25 @@ def _sd_programs_needing_metadata(
     }
 
 
+def _sd_existing_program_cache(source, program_ids):
+    """Title/description/custom_properties of existing ProgramData, keyed by programID."""
+    cache = {}
+    if not program_ids:
+        return cache
+    for pd in ProgramData.objects.filter(
+        epg__epg_source=source,
+        program_id__in=program_ids,
+    ).only('program_id', 'title', 'description', 'sub_title', 'custom_properties'):
+        if pd.program_id not in cache:
+            cache[pd.program_id] = {
+                'title': pd.title,
+                'description': pd.description,
+                'sub_title': pd.sub_title,
+                'custom_properties': pd.custom_properties,
+            }
+    return cache
+
+
 SD_POSTER_CATEGORIES = (
     'Iconic', 'Banner-L1', 'Banner-L2', 'Banner-L3', 'Banner',
     'Staple', 'Poster Art', 'Box Art',
@@ -519,6 +576,8 @@ def fetch_schedules_direct(
          the user can run Auto-match EPG before the full program fetch.
       5. Fetch schedule grids in 14-day date-batched requests per station.
       6. Fetch program metadata in batched requests (up to 5000 programIDs per request).
+         Schedule, program and artwork batches share a pool of at most
+         SD_MAX_CONCURRENT_REQUESTS requests in flight.
       7. Persist channels to EPGData and programs to ProgramData.
 
     Args:
@@ -641,44 +700,44 @@ def fetch_schedules_direct(
 
                 artwork_map = {}
                 artwork_list = list(artwork_lookup_ids)
-                SD_ARTWORK_BATCH_SIZE = 500
                 total_art_batches = max(1, (len(artwork_list) + SD_ARTWORK_BATCH_SIZE - 1) // SD_ARTWORK_BATCH_SIZE)
                 logger.info(f"Fetching artwork index for {len(artwork_list)} unique program/series IDs "
                             f"in {total_art_batches} batch(es).")
 
-                for batch_idx in range(total_art_batches):
-                    batch = artwork_list[batch_idx * SD_ARTWORK_BATCH_SIZE:(batch_idx + 1) * SD_ARTWORK_BATCH_SIZE]
-                    try:
-                        art_response = _sd_req(
-                            'POST',
+                with _SDRequestPool(_sd_req) as pool:
+                    art_futures = {
+                        pool.post(
                             f"{SD_BASE_URL}/metadata/programs/",
-                            json=batch,
-                            timeout=120,
-                        )
-                        art_response.raise_for_status()
-                        art_data = art_response.json()
-
-                        for entry in art_data:
-                            if not isinstance(entry, dict):
-                                continue
-                            entry_pid = entry.get('programID')
-                            images = entry.get('data') or []
-                            if not entry_pid or not images:
-                                continue
-                            images = [img for img in images if isinstance(img, dict)]
-                            if not images:
-                                continue
-
-                            poster_url = _sd_pick_poster_url(images, poster_style)
-                            if poster_url:
-                                if not poster_url.startswith('http'):
-                                    poster_url = f"{SD_BASE_URL}/image/{poster_url}"
-                                artwork_map[entry_pid] = poster_url
-
-                        logger.info(f"Artwork batch {batch_idx + 1}/{total_art_batches}: "
-                                    f"{len(artwork_map)} posters found so far.")
-                    except requests.exceptions.RequestException as e:
-                        logger.warning(f"Failed to fetch artwork batch {batch_idx + 1}: {e}")
+                            artwork_list[batch_idx * SD_ARTWORK_BATCH_SIZE:(batch_idx + 1) * SD_ARTWORK_BATCH_SIZE],
+                        ): batch_idx
+                        for batch_idx in range(total_art_batches)
+                    }
+                    for future in as_completed(art_futures):
+                        batch_idx = art_futures[future]
+                        try:
+                            art_data = future.result()
+
+                            for entry in art_data:
+                                if not isinstance(entry, dict):
+                                    continue
+                                entry_pid = entry.get('programID')
+                                images = entry.get('data') or []
+                                if not entry_pid or not images:
+                                    continue
+                                images = [img for img in images if isinstance(img, dict)]
+                                if not images:
+                                    continue
+
+                                poster_url = _sd_pick_poster_url(images, poster_style)
+                                if poster_url:
+                                    if not poster_url.startswith('http'):
+                                        poster_url = f"{SD_BASE_URL}/image/{poster_url}"
+                                    artwork_map[entry_pid] = poster_url
+
+                            logger.info(f"Artwork batch {batch_idx + 1}/{total_art_batches}: "
+                                        f"{len(artwork_map)} posters found so far.")
+                        except requests.exceptions.RequestException as e:
+                            logger.warning(f"Failed to fetch artwork batch {batch_idx + 1}: {e}")
 
                 if artwork_map:
                     programs_to_update = []
@@ -803,14 +862,19 @@ def fetch_schedules_direct(
     def _sd_req(method, url, **kwargs):
         nonlocal token
         content_type = kwargs.pop('content_type', 'application/json')
-        resp, token = sd_authorized_request(
+        sent_token = token
+        resp, new_token = sd_authorized_request(
             method,
             url,
             source=source,
-            token=token,
+            token=sent_token,
             content_type=content_type,
             **kwargs,
         )
+        # Batches run concurrently: only adopt a refreshed token, never put
+        # back the one this request started with.
+        if new_token != sent_token:
+            token = new_token
         return resp
 
     # -------------------------------------------------------------------------
@@ -1000,6 +1064,13 @@ def fetch_schedules_direct(
             EPGData.objects.bulk_update(epgs_to_update, ['name', 'icon_url'])
             logger.info(f"Updated {len(epgs_to_update)} existing EPGData entries.")
 
+        # Normalize names once per refresh so EPG auto-matching can read them from the DB
+        try:
+            from apps.channels.epg_matching import refresh_epg_norm_names
+            refresh_epg_norm_names(source.id)
+        except Exception as e:
+            logger.warning(f"Could not store normalized EPG names: {e}")
+
         gc.collect()
 
         # Rebuild map with fresh DB ids for all stations
@@ -1214,7 +1285,12 @@ def fetch_schedules_direct(
         source.save(update_fields=['status', 'last_message', 'updated_at'])
         return
 
-    # Download only changed schedules, batched by 7-day windows per station
+    # Download only changed schedules, batched by 7-day windows per station.
+    # Schedule windows and program metadata batches share one bounded request
+    # pool: metadata for programs found in a finished window is requested
+    # while the remaining windows download, and the MD5 cache lookups and
+    # writes run on this thread in the meantime. Batch boundaries are the same
+    # as a sequential fetch, so the number of API calls does not change.
     SCHEDULE_BATCH_DAYS = 7
     changed_station_ids = list(changed_by_station.keys())
     date_batches = [date_list[i:i + SCHEDULE_BATCH_DAYS] for i in range(0, len(date_list), SCHEDULE_BATCH_DAYS)]
@@ -1225,35 +1301,66 @@ def fetch_schedules_direct(
         for r in SDScheduleMD5.objects.filter(epg_source=source, station_id__in=changed_station_ids)
     }
 
-    for batch_idx, date_batch in enumerate(date_batches):
-        # Notify frontend at the start of each batch so progress updates immediately
-        pre_progress = 38 + int((batch_idx / len(date_batches)) * 22)
-        logger.info(f"Fetching schedule batch {batch_idx + 1} of {len(date_batches)}...")
-        send_epg_update(source.id, "parsing_programs", min(59, pre_progress),
-                        message=f"Fetching schedules: batch {batch_idx + 1} of {len(date_batches)}...")
-        # Yield to gevent hub so the WebSocket update is delivered before the blocking request
-        try:
-            import gevent; gevent.sleep(0)
-        except ImportError:
-            pass
-        # Only include stations that have changes in this date batch
-        request_body = [
-            {'stationID': sid, 'date': [d for d in date_batch if d in changed_by_station.get(sid, [])]}
-            for sid in changed_station_ids
-            if any(d in changed_by_station.get(sid, []) for d in date_batch)
-        ]
-        if not request_body:
-            continue
-        try:
-            sched_response = _sd_req(
-                'POST',
-                f"{SD_BASE_URL}/schedules",
-                json=request_body,
-                timeout=120,
+    schedule_program_md5s = {}  # programID -> md5 from schedule
+    programs_to_fetch = set()
+    pending_program_ids = []
+    program_futures = {}  # future -> 1-based metadata batch number
+    program_metadata = {}
+
+    def _queue_program_metadata(pool, new_pids, flush=False):
+        """MD5-check newly seen programIDs and submit every full metadata batch."""
+        if new_pids:
+            needed = _sd_programs_needing_metadata(
+                new_pids,
+                schedule_program_md5s,
+                {
+                    r.program_id: r.md5
+                    for r in SDProgramMD5.objects.filter(
+                        epg_source=source,
+                        program_id__in=new_pids,
+                    ).only('program_id', 'md5')
+                },
+                ProgramData.objects.filter(
+                    epg__epg_source=source,
+                    program_id__in=new_pids,
+                ).values_list('program_id', flat=True).distinct(),
             )
-            sched_response.raise_for_status()
-            sched_data = sched_response.json()
+            programs_to_fetch.update(needed)
+            pending_program_ids.extend(pid for pid in new_pids if pid in needed)
+        while len(pending_program_ids) >= SD_PROGRAM_BATCH_SIZE or (flush and pending_program_ids):
+            batch = pending_program_ids[:SD_PROGRAM_BATCH_SIZE]
+            del pending_program_ids[:SD_PROGRAM_BATCH_SIZE]
+            future = pool.post(f"{SD_BASE_URL}/programs", batch)
+            program_futures[future] = len(program_futures) + 1
+
+    with _SDRequestPool(_sd_req) as pool:
+        schedule_futures = {}
+        for batch_idx, date_batch in enumerate(date_batches):
+            # Only include stations that have changes in this date batch
+            request_body = [
+                {'stationID': sid, 'date': [d for d in date_batch if d in changed_by_station.get(sid, [])]}
+                for sid in changed_station_ids
+                if any(d in changed_by_station.get(sid, []) for d in date_batch)
+            ]
+            if request_body:
+                schedule_futures[pool.post(f"{SD_BASE_URL}/schedules", request_body)] = batch_idx
 
+        logger.info(
+            f"Fetching {len(schedule_futures)} schedule batch(es) "
+            f"with up to {SD_MAX_CONCURRENT_REQUESTS} requests in flight..."
+        )
+        send_epg_update(source.id, "parsing_programs", 38,
+                        message=f"Fetching schedules: {len(schedule_futures)} batch(es)...")
+
+        for done, future in enumerate(as_completed(schedule_futures), start=1):
+            batch_idx = schedule_futures[future]
+            try:
+                sched_data = future.result()
+            except requests.exceptions.RequestException as e:
+                logger.warning(f"Failed to fetch schedule batch {batch_idx + 1}: {e}")
+                continue
+
+            new_pids = []
             for station_sched in sched_data:
                 sid = station_sched.get('stationID')
                 if not sid:
@@ -1262,8 +1369,13 @@ def fetch_schedules_direct(
                 schedules_by_station.setdefault(sid, []).extend(programs)
                 for prog in programs:
                     pid = prog.get('programID')
-                    if pid:
+                    if not pid:
+                        continue
+                    if prog.get('md5'):
+                        schedule_program_md5s[pid] = prog['md5']
+                    if pid not in program_ids_needed:
                         program_ids_needed.add(pid)
+                        new_pids.append(pid)
 
                 # Update MD5 cache for this station/date
                 meta = station_sched.get('metadata', {})
@@ -1292,117 +1404,91 @@ def fetch_schedules_direct(
                         except ValueError:
                             pass
 
-            progress = 38 + int(((batch_idx + 1) / len(date_batches)) * 22)
-            send_epg_update(source.id, "parsing_programs", min(60, progress),
-                            message=f"Fetching changed schedules: batch {batch_idx + 1}/{len(date_batches)} ({len(program_ids_needed):,} programs found)")
-
-        except requests.exceptions.RequestException as e:
-            logger.warning(f"Failed to fetch schedule batch {batch_idx + 1}: {e}")
-
-    # Persist updated MD5 cache
-    if new_md5_records:
-        SDScheduleMD5.objects.bulk_create(new_md5_records, ignore_conflicts=True)
-        logger.info(f"Cached {len(new_md5_records)} new schedule MD5s.")
-    if updated_md5_records:
-        SDScheduleMD5.objects.bulk_update(updated_md5_records, ['md5', 'last_modified'])
-        logger.info(f"Updated {len(updated_md5_records)} existing schedule MD5s.")
-
-    if not program_ids_needed:
-        msg = "No schedule data returned from Schedules Direct."
-        logger.warning(msg)
-        source.status = EPGSource.STATUS_ERROR
-        source.last_message = msg
-        source.save(update_fields=['status', 'last_message'])
-        send_epg_update(source.id, "parsing_programs", 100, status="error", error=msg)
-        return
+            _queue_program_metadata(pool, new_pids)
 
-    # -------------------------------------------------------------------------
-    # Step 6: MD5-delta program metadata fetch
-    # The schedule response includes an MD5 hash per program airing.
-    # Compare against our cached program MD5s to only download programs
-    # whose metadata has changed since our last fetch.
-    # -------------------------------------------------------------------------
+            progress = 38 + int((done / len(schedule_futures)) * 22)
+            logger.info(f"Fetched schedule batch {batch_idx + 1} of {len(date_batches)}.")
+            send_epg_update(source.id, "parsing_programs", min(60, progress),
+                            message=f"Fetching changed schedules: batch {done}/{len(schedule_futures)} ({len(program_ids_needed):,} programs found)")
+
+        # Persist updated MD5 cache while program metadata is still downloading
+        if new_md5_records:
+            SDScheduleMD5.objects.bulk_create(new_md5_records, ignore_conflicts=True)
+            logger.info(f"Cached {len(new_md5_records)} new schedule MD5s.")
+        if updated_md5_records:
+            SDScheduleMD5.objects.bulk_update(updated_md5_records, ['md5', 'last_modified'])
+            logger.info(f"Updated {len(updated_md5_records)} existing schedule MD5s.")
+
+        if not program_ids_needed:
+            msg = "No schedule data returned from Schedules Direct."
+            logger.warning(msg)
+            source.status = EPGSource.STATUS_ERROR
+            source.last_message = msg
+            source.save(update_fields=['status', 'last_message'])
+            send_epg_update(source.id, "parsing_programs", 100, status="error", error=msg)
+            return
 
-    # Build map of programID -> md5 from schedule data
-    schedule_program_md5s = {}  # programID -> md5 from schedule
-    for sid, airings in schedules_by_station.items():
-        for airing in airings:
-            pid = airing.get('programID')
-            md5 = airing.get('md5')
-            if pid and md5:
-                schedule_program_md5s[pid] = md5
-
-    # Load cached program MD5s from SDProgramMD5 table, keyed by programID
-    cached_prog_md5s = {
-        r.program_id: r.md5
-        for r in SDProgramMD5.objects.filter(
-            epg_source=source,
-            program_id__in=program_ids_needed,
-        ).only('program_id', 'md5')
-    }
+        # -------------------------------------------------------------------------
+        # Step 6: MD5-delta program metadata fetch
+        # The schedule response includes an MD5 hash per program airing.
+        # Programs were compared against our cached program MD5s as each
+        # schedule batch arrived; only programs whose metadata changed since
+        # our last fetch (or that have no ProgramData yet) are downloaded.
+        # -------------------------------------------------------------------------
+        _queue_program_metadata(pool, [], flush=True)
+        total_batches = len(program_futures)
 
-    programs_with_data = set()
-    if program_ids_needed:
-        programs_with_data = set(
-            ProgramData.objects.filter(
-                epg__epg_source=source,
-                program_id__in=program_ids_needed,
-            ).values_list('program_id', flat=True).distinct()
+        logger.info(
+            f"Program MD5 delta: {len(program_ids_needed)} programs in schedules, "
+            f"{len(programs_to_fetch)} need downloading ({len(program_ids_needed) - len(programs_to_fetch)} unchanged).")
+
+        # Cache existing program data for unchanged programs BEFORE surgical delete.
+        # When a station/date schedule MD5 changes, ALL airings are re-fetched, but only
+        # programs with changed program MD5s get metadata re-downloaded. The surgical delete
+        # wipes ALL ProgramData for changed dates, so unchanged programs lose their titles.
+        # This cache preserves their data for rebuilding; it is read while the
+        # metadata batches are in flight.
+        mapped_airing_pids = {
+            airing.get('programID')
+            for sid, airings in schedules_by_station.items()
+            if sid in mapped_tvg_ids
+            for airing in airings
+            if airing.get('programID')
+        }
+        existing_program_cache = _sd_existing_program_cache(
+            source, mapped_airing_pids - programs_to_fetch,
         )
 
-    programs_to_fetch = _sd_programs_needing_metadata(
-        program_ids_needed,
-        schedule_program_md5s,
-        cached_prog_md5s,
-        programs_with_data,
-    )
-
-    logger.info(
-        f"Program MD5 delta: {len(program_ids_needed)} programs in schedules, "
-        f"{len(programs_to_fetch)} need downloading ({len(program_ids_needed) - len(programs_to_fetch)} unchanged).")
-
-    program_metadata = {}
-    program_id_list = list(programs_to_fetch)
-    total_batches = max(1, (len(program_id_list) + SD_PROGRAM_BATCH_SIZE - 1) // SD_PROGRAM_BATCH_SIZE)
-
-    if program_id_list:
-        logger.info(f"Fetching metadata for {len(program_id_list)} programs in {total_batches} batch(es).")
-        for batch_idx in range(total_batches):
-            # Notify frontend at the start of each batch so progress updates immediately
-            pre_progress = 60 + int((batch_idx / total_batches) * 20)
-            logger.info(f"Fetching program metadata batch {batch_idx + 1} of {total_batches} ({batch_idx * SD_PROGRAM_BATCH_SIZE:,} of {len(program_id_list):,} programs)...")
-            send_epg_update(source.id, "parsing_programs", min(79, pre_progress),
-                            message=f"Fetching program data: batch {batch_idx + 1} of {total_batches} ({batch_idx * SD_PROGRAM_BATCH_SIZE:,} of {len(program_id_list):,} programs)")
-            # Yield to gevent hub so the WebSocket update is delivered before the blocking request
-            try:
-                import gevent; gevent.sleep(0)
-            except ImportError:
-                pass
-            batch = program_id_list[batch_idx * SD_PROGRAM_BATCH_SIZE:(batch_idx + 1) * SD_PROGRAM_BATCH_SIZE]
-            try:
-                prog_response = _sd_req(
-                    'POST',
-                    f"{SD_BASE_URL}/programs",
-                    json=batch,
-                    timeout=120,
-                )
-                prog_response.raise_for_status()
-                prog_data = prog_response.json()
+        if program_futures:
+            logger.info(f"Fetching metadata for {len(programs_to_fetch)} programs in {total_batches} batch(es).")
+            send_epg_update(source.id, "parsing_programs", 60,
+                            message=f"Fetching program data: {total_batches} batch(es) for {len(programs_to_fetch):,} programs")
+            for done, future in enumerate(as_completed(program_futures), start=1):
+                batch_num = program_futures[future]
+                try:
+                    prog_data = future.result()
+                except requests.exceptions.RequestException as e:
+                    logger.warning(f"Failed to fetch program metadata batch {batch_num}: {e}")
+                    continue
                 for prog in prog_data:
                     pid = prog.get('programID')
                     if pid:
                         program_metadata[pid] = prog
 
-                progress = 60 + int(((batch_idx + 1) / total_batches) * 20)
+                progress = 60 + int((done / total_batches) * 20)
                 send_epg_update(source.id, "parsing_programs", min(80, progress),
-                                message=f"Fetching program details: batch {batch_idx + 1}/{total_batches} ({len(program_metadata):,} programs loaded)")
-                logger.debug(f"Fetched program metadata batch {batch_idx + 1}/{total_batches}")
-
-            except requests.exceptions.RequestException as e:
-                logger.warning(f"Failed to fetch program metadata batch {batch_idx + 1}: {e}")
-    else:
-        logger.info("All program metadata unchanged - skipping program download.")
-        send_epg_update(source.id, "parsing_programs", 80, message="Program metadata unchanged - using cached data.")
+                                message=f"Fetching program details: batch {done}/{total_batches} ({len(program_metadata):,} programs loaded)")
+                logger.debug(f"Fetched program metadata batch {batch_num}/{total_batches}")
+        else:
+            logger.info("All program metadata unchanged - skipping program download.")
+            send_epg_update(source.id, "parsing_programs", 80, message="Program metadata unchanged - using cached data.")
+
+    # Programs whose metadata batch failed are rebuilt from existing rows too.
+    failed_pids = (mapped_airing_pids & programs_to_fetch) - program_metadata.keys()
+    if failed_pids:
+        existing_program_cache.update(_sd_existing_program_cache(source, failed_pids))
+    if existing_program_cache:
+        logger.info(f"Cached {len(existing_program_cache)} existing program records for unchanged programs.")
 
     gc.collect()
 
@@ -1412,35 +1498,6 @@ def fetch_schedules_direct(
     logger.info("Building program records...")
     send_epg_update(source.id, "parsing_programs", 80)
 
-    # Cache existing program data for unchanged programs BEFORE surgical delete.
-    # When a station/date schedule MD5 changes, ALL airings are re-fetched, but only
-    # programs with changed program MD5s get metadata re-downloaded. The surgical delete
-    # wipes ALL ProgramData for changed dates, so unchanged programs lose their titles.
-    # This cache preserves their data for rebuilding.
-    unchanged_pids = set()
-    for sid, airings in schedules_by_station.items():
-        if sid not in mapped_tvg_ids:
-            continue
-        for airing in airings:
-            pid = airing.get('programID')
-            if pid and pid not in program_metadata:
-                unchanged_pids.add(pid)
-
-    existing_program_cache = {}
-    if unchanged_pids:
-        for pd in ProgramData.objects.filter(
-            epg__epg_source=source,
-            program_id__in=unchanged_pids,
-        ).only('program_id', 'title', 'description', 'sub_title', 'custom_properties'):
-            if pd.program_id not in existing_program_cache:
-                existing_program_cache[pd.program_id] = {
-                    'title': pd.title,
-                    'description': pd.description,
-                    'sub_title': pd.sub_title,
-                    'custom_properties': pd.custom_properties,
-                }
-        logger.info(f"Cached {len(existing_program_cache)} existing program records for unchanged programs.")
-
     all_programs_to_create = []
     total_programs = 0
     skipped_unmapped = 0
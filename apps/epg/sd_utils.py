@@ -9,6 +9,7 @@ from __future__ import annotations
 import hashlib
 import json
 import logging
+import threading
 import time
 from dataclasses import dataclass
 from datetime import timedelta, timezone as dt_timezone
@@ -97,6 +98,9 @@ def sd_auth_lockout_retry_message():
 
 # Shared across uWSGI workers via Django's Redis cache.
 _SD_TOKEN_CACHE_PREFIX = 'sd:token:'
+# Serializes token refreshes so concurrent guide requests that all see an
+# expired token trigger a single /token call instead of one each.
+_sd_token_refresh_lock = threading.Lock()
 # Expire a bit early so we re-auth before SD rejects an almost-expired token.
 _SD_TOKEN_CACHE_SKEW_SECONDS = 60
 _SD_TOKEN_DEFAULT_TTL_SECONDS = 86400
@@ -564,6 +568,9 @@ def sd_authorized_request(
 
     On HTTP 401/403 (SD documents TOKEN_EXPIRED as 403 + code 4006), clears the
     Redis token cache, obtains a fresh token, and retries the request once.
+    Refreshes are serialized per process: a request that fails while another
+    one already replaced the token retries with that token instead of logging
+    in again.
 
     On JSON code 2055 (unexpected ``RouteTo: debug``), disables Extra Schedules
     Direct Debugging and retries once without that header. This matters when a
@@ -612,14 +619,18 @@ def sd_authorized_request(
         url,
         response.status_code,
     )
-    sd_clear_cached_token(getattr(source, 'id', None))
     auth_timeout = timeout if isinstance(timeout, (int, float)) else 30
-    auth = sd_obtain_token(
-        source,
-        username=username,
-        password=password,
-        timeout=min(int(auth_timeout), 30) if auth_timeout else 30,
-    )
+    auth_timeout = min(int(auth_timeout), 30) if auth_timeout else 30
+    with _sd_token_refresh_lock:
+        auth = sd_obtain_token(
+            source, username=username, password=password, timeout=auth_timeout
+        )
+        if auth.ok and auth.token == token:
+            # Nobody refreshed the rejected token yet: drop it and log in again.
+            sd_clear_cached_token(getattr(source, 'id', None))
+            auth = sd_obtain_token(
+                source, username=username, password=password, timeout=auth_timeout
+            )
     if not auth.ok or not auth.token:
         return response, token
 
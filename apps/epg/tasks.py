@@ -12,7 +12,6 @@ from datetime import datetime, timedelta, timezone as dt_timezone
 import gc  # Add garbage collection module
 import json
 import re
-from lxml import etree  # Using lxml exclusively
 import psutil  # Add import for memory tracking
 import zipfile
 
@@ -242,6 +241,8 @@ _HTML_ENTITY_DOCTYPE = _build_html_entity_doctype()
 def _parse_programme_element(element_bytes):
     """Parse a single <programme> element, prepending the HTML-entity DOCTYPE
     so references like &eacute; in the text resolve instead of failing."""
+    from lxml import etree
+
     parser = etree.XMLParser(resolve_entities=True, load_dtd=True, no_network=True)
     return etree.fromstring(_HTML_ENTITY_DOCTYPE + element_bytes, parser)
 
@@ -526,6 +527,14 @@ def _refresh_epg_data_impl(source_id, force=False, _file_defer_retry=0):
         evaluate_series_rules.delay()
     except Exception:
         pass
+    try:
+        from apps.channels.epg_embeddings import embeddings_available
+        if embeddings_available():
+            from apps.channels.tasks import refresh_epg_embedding_index
+            # Delayed so sources refreshed together share one index update.
+            refresh_epg_embedding_index.apply_async(countdown=60)
+    except Exception:
+        pass
 
 
 def fetch_xmltv(source):
@@ -1109,6 +1118,8 @@ def _channel_parse_progress(processed_channels, channel_estimate, had_db_baselin
 
 
 def parse_channels_only(source):
+    from lxml import etree
+
     # Use extracted file if available, otherwise use the original file path
     file_path = source.extracted_file_path if source.extracted_file_path else source.file_path
     if not file_path:
@@ -1464,6 +1475,13 @@ def parse_channels_only(source):
             if deleted_count:
                 logger.info(f"[parse_channels_only] Cleaned up {deleted_count} stale EPG entries not in current scan and unmapped to any channel")
 
+        # Normalize names once per refresh so EPG auto-matching can read them from the DB
+        try:
+            from apps.channels.epg_matching import refresh_epg_norm_names
+            refresh_epg_norm_names(source.id)
+        except Exception as e:
+            logger.warning(f"[parse_channels_only] Could not store normalized EPG names: {e}")
+
         if process:
             logger.debug(f"[parse_channels_only] Memory after final batch creation: {process.memory_info().rss / 1024 / 1024:.2f} MB")
 
@@ -1569,6 +1587,8 @@ def _defer_parse_programs_for_tvg_id(epg_id, force, defer_retry, reason):
 
 @shared_task(time_limit=3600, soft_time_limit=3500)
 def parse_programs_for_tvg_id(epg_id, force=False, _defer_retry=0):
+    from lxml import etree
+
     epg_obj = None
     try:
         epg_obj = EPGData.objects.select_related('epg_source').filter(id=epg_id).first()
@@ -2089,6 +2109,8 @@ def parse_programs_for_source(epg_source, tvg_id=None):
     This dramatically improves performance when an EPG source has many channels
     but only a fraction are mapped.
     """
+    from lxml import etree
+
     # Send initial programs parsing notification
     send_epg_update(epg_source.id, "parsing_programs", 0)
     should_log_memory = False
@@ -3143,6 +3165,8 @@ def _read_programs_at_offsets(file_path, tvg_id, offsets, now):
     Seek to each offset, extract <programme> elements for *tvg_id*, return the
     first one currently airing. Chunk-based so it works on minified XML.
     """
+    from lxml import etree
+
     PROG_CLOSE = b'</programme>'
     CLOSE_LEN = len(PROG_CLOSE)
     READ_SIZE = 2 * 1024 * 1024  # 2MB per read
@@ -3233,6 +3257,8 @@ def _scan_from_offset_for_tvg_id(file_path, tvg_id, start_offset, now, timeout_s
     a channel exceeded the stored offset cap.
     Returns dict, None, or 'timeout'.
     """
+    from lxml import etree
+
     PROG_CLOSE = b'</programme>'
     CLOSE_LEN = len(PROG_CLOSE)
     READ_SIZE = 2 * 1024 * 1024
@@ -0,0 +1,152 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.channels.models import Channel, ChannelGroup, ChannelOverride
+from apps.epg import guide_grid
+from apps.epg.models import EPGData, EPGSource, ProgramData
+from apps.output.streaming_chunk_cache import invalidate_epg_chunk_cache
+
+User = get_user_model()
+
+GUIDE_GRID_URL = "/api/epg/guide-grid/"
+# 2026-01-05 00:00 UTC
+WINDOW_START = 1767571200
+
+
+def _at(hours):
+    return datetime.fromtimestamp(WINDOW_START, tz=dt_timezone.utc) + timedelta(hours=hours)
+
+
+class ParseWindowTests(SimpleTestCase):
+    def test_window_is_widened_to_half_hours(self):
+        self.assertEqual(
+            guide_grid.parse_window(str(WINDOW_START + 600), "2026-01-05T02:10:00Z"),
+            (WINDOW_START, WINDOW_START + 2 * 3600 + 1800),
+        )
+
+    def test_defaults_around_now(self):
+        start, end = guide_grid.parse_window(now=_at(10) + timedelta(minutes=5))
+        self.assertEqual((start, end), (WINDOW_START + 9 * 3600, WINDOW_START + 22 * 3600 + 1800))
+
+    def test_rejects_bad_windows(self):
+        for start, end in (("soon", None), (str(WINDOW_START), str(WINDOW_START - 3600)),
+                           (str(WINDOW_START), str(WINDOW_START + 49 * 3600))):
+            with self.assertRaises(ValueError):
+                guide_grid.parse_window(start, end)
+
+
+class GuideGridAPITests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="guide_admin", password="x", user_level=10)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        source = EPGSource.objects.create(name="Guide XMLTV", source_type="xmltv", url="http://example.com/epg.xml")
+        self.news = EPGData.objects.create(tvg_id="news.tv", name="News", epg_source=source)
+        self.movies = EPGData.objects.create(tvg_id="movies.tv", name="Movies", epg_source=source)
+        self.programmes = [
+            ProgramData.objects.create(
+                epg=self.news, tvg_id="news.tv", title="Morning News", sub_title="Headlines",
+                start_time=_at(-1), end_time=_at(1), custom_properties={"new": True, "description_extra": "x" * 500},
+            ),
+            ProgramData.objects.create(
+                epg=self.news, tvg_id="news.tv", title="Morning News",
+                start_time=_at(1), end_time=_at(3), custom_properties={"live": True},
+            ),
+            ProgramData.objects.create(
+                epg=self.news, tvg_id="news.tv", title="Out of window",
+                start_time=_at(30), end_time=_at(31),
+            ),
+            ProgramData.objects.create(
+                epg=self.movies, tvg_id="movies.tv", title="Season Finale",
+                start_time=_at(0), end_time=_at(2),
+                custom_properties={"premiere": True, "premiere_text": "Season Finale"},
+            ),
+        ]
+
+        group = ChannelGroup.objects.create(name="Guide")
+        self.news_channel = Channel.objects.create(channel_number=2, name="News", channel_group=group, epg_data=self.news)
+        self.no_epg_channel = Channel.objects.create(channel_number=1, name="No EPG", channel_group=group)
+        # Auto-synced channel whose guide comes from an override.
+        self.movies_channel = Channel.objects.create(channel_number=3, name="Movies", channel_group=group, auto_created=True)
+        ChannelOverride.objects.create(channel=self.movies_channel, epg_data=self.movies)
+        Channel.objects.create(channel_number=4, name="Hidden", channel_group=group, epg_data=self.news, hidden_from_output=True)
+
+        guide_grid.invalidate_guide_grid()
+
+    def _get(self, **params):
+        params.setdefault("start", str(WINDOW_START))
+        params.setdefault("end", str(WINDOW_START + 6 * 3600))
+        return self.client.get(GUIDE_GRID_URL, params)
+
+    def test_columnar_payload(self):
+        response = self._get()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        grid = response.json()
+
+        self.assertEqual(grid["start"], WINDOW_START)
+        self.assertEqual(grid["channels"], [self.no_epg_channel.id, self.news_channel.id, self.movies_channel.id])
+        programmes = grid["programmes"]
+        self.assertEqual(programmes["id"], [p.id for p in (self.programmes[0], self.programmes[1], self.programmes[3])])
+        self.assertEqual(programmes["channel"], [1, 1, 2])
+        self.assertEqual(programmes["start"], [WINDOW_START - 3600, WINDOW_START + 3600, WINDOW_START])
+        self.assertEqual(programmes["stop"], [WINDOW_START + 3600, WINDOW_START + 3 * 3600, WINDOW_START + 2 * 3600])
+        titles = [grid["strings"][i] for i in programmes["title"]]
+        self.assertEqual(titles, ["Morning News", "Morning News", "Season Finale"])
+        self.assertEqual(programmes["title"][0], programmes["title"][1])
+        self.assertEqual(grid["strings"][programmes["sub_title"][0]], "Headlines")
+        self.assertEqual(programmes["sub_title"][1:], [-1, -1])
+        self.assertEqual(
+            programmes["flags"],
+            [guide_grid.FLAG_NEW, guide_grid.FLAG_LIVE, guide_grid.FLAG_PREMIERE | guide_grid.FLAG_FINALE],
+        )
+        self.assertNotIn(b"description_extra", response.content)
+
+    def test_channel_filter(self):
+        grid = self._get(channels=f"{self.movies_channel.id}").json()
+        self.assertEqual(grid["channels"], [self.movies_channel.id])
+        self.assertEqual(grid["programmes"]["channel"], [0])
+
+        self.assertEqual(self._get(channels="a,b").status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self._get(end=str(WINDOW_START + 72 * 3600)).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_user_level_limits_channels(self):
+        Channel.objects.filter(id=self.movies_channel.id).update(user_level=10)
+        viewer = User.objects.create_user(username="guide_viewer", password="x", user_level=1)
+        self.client.force_authenticate(user=viewer)
+        self.assertNotIn(self.movies_channel.id, self._get().json()["channels"])
+
+    def test_etag_changes_when_guide_data_changes(self):
+        first = self._get()
+        etag = first["ETag"]
+        self.assertEqual(
+            self.client.get(GUIDE_GRID_URL, {"start": str(WINDOW_START), "end": str(WINDOW_START + 6 * 3600)},
+                            HTTP_IF_NONE_MATCH=etag).status_code,
+            status.HTTP_304_NOT_MODIFIED,
+        )
+
+        # Cached body is served until the guide changes.
+        ProgramData.objects.filter(id=self.programmes[3].id).update(title="Renamed")
+        self.assertEqual(self._get().content, first.content)
+
+        invalidate_epg_chunk_cache()
+        second = self._get()
+        self.assertNotEqual(second["ETag"], etag)
+        self.assertIn("Renamed", second.json()["strings"])
+
+    def test_dummy_source_channels_get_generated_programmes(self):
+        dummy = EPGSource.objects.create(name="Guide Dummy", source_type="dummy")
+        dummy_epg = EPGData.objects.create(tvg_id="dummy.tv", name="Dummy", epg_source=dummy)
+        channel = Channel.objects.create(channel_number=5, name="Dummy Channel", epg_data=dummy_epg)
+
+        grid = self.client.get(GUIDE_GRID_URL, {"channels": str(channel.id)}).json()
+        programmes = grid["programmes"]
+        self.assertGreater(len(programmes["id"]), 0)
+        self.assertTrue(all(program_id is None for program_id in programmes["id"]))
+        self.assertTrue(all(row == 0 for row in programmes["channel"]))
+        self.assertTrue(all(stop > grid["start"] and start < grid["end"]
+                            for start, stop in zip(programmes["start"], programmes["stop"])))
@@ -2048,6 +2048,77 @@ class SDUtilsTests(TestCase):
             retry_headers = mock_get.call_args_list[1][1].get('headers')
         self.assertEqual(retry_headers.get('token'), 'fresh-tok')
 
+    @patch('apps.epg.sd_utils.requests.get')
+    @patch('apps.epg.sd_utils.requests.post')
+    def test_authorized_request_reuses_token_refreshed_by_concurrent_request(
+        self, mock_post, mock_get,
+    ):
+        """A 403 after another request already refreshed the token must not log in again."""
+        from apps.epg.sd_utils import (
+            sd_authorized_request,
+            sd_clear_cached_token,
+            sd_set_cached_token,
+        )
+
+        source = EPGSource.objects.create(
+            name='SD Concurrent Refresh',
+            source_type='schedules_direct',
+            username='sduser',
+            password='sdpass',
+        )
+        sd_clear_cached_token(source.id)
+        self.addCleanup(sd_clear_cached_token, source.id)
+        sd_set_cached_token(
+            source.id, 'already-fresh', time.time() + 3600,
+            username='sduser', password='sdpass',
+        )
+        expired = MagicMock(status_code=403, headers={}, content=b'')
+        ok = MagicMock(status_code=200, headers={}, content=b'')
+        mock_get.side_effect = [expired, ok]
+
+        resp, token = sd_authorized_request(
+            'GET',
+            'https://json.schedulesdirect.org/20141201/lineups',
+            source=source,
+            token='stale-tok',
+        )
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(token, 'already-fresh')
+        mock_post.assert_not_called()
+        self.assertEqual(mock_get.call_args_list[1].kwargs['headers']['token'], 'already-fresh')
+
+
+class SDRequestPoolTests(TestCase):
+    """Refresh batches run concurrently but never more than the pool allows."""
+
+    def test_pool_bounds_requests_in_flight_and_returns_json(self):
+        import threading
+
+        from apps.epg.sd_tasks import _SDRequestPool
+
+        lock = threading.Lock()
+        state = {'running': 0, 'peak': 0}
+
+        def fake_sd_req(method, url, json=None, timeout=None):
+            with lock:
+                state['running'] += 1
+                state['peak'] = max(state['peak'], state['running'])
+            time.sleep(0.02)
+            with lock:
+                state['running'] -= 1
+            return MagicMock(
+                raise_for_status=MagicMock(),
+                json=MagicMock(return_value={'batch': json}),
+            )
+
+        with _SDRequestPool(fake_sd_req, max_workers=2) as pool:
+            futures = [pool.post('https://sd.example/programs', [i]) for i in range(6)]
+            results = [f.result() for f in futures]
+
+        self.assertEqual(results, [{'batch': [i]} for i in range(6)])
+        self.assertEqual(state['peak'], 2)
+
 
 class SDPosterProxyErrorHandlingTests(TestCase):
     """Poster proxy must honor SD image error codes so accounts are not blocked."""
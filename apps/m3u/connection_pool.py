@@ -13,7 +13,7 @@ from __future__ import annotations
 import hashlib
 import logging
 import re
-from typing import Literal, Optional, Tuple
+from typing import Literal, Optional, Sequence, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +23,38 @@ PROFILE_CONNECTIONS_KEY = "profile_connections:{profile_id}"
 PROFILE_CREDENTIAL_RELEASE_KEY = "profile_credential_release:{profile_id}"
 SERVER_GROUP_CONNECTIONS_KEY = "server_group_connections:{group_id}:{fingerprint}"
 
+# Walk (profile, credential) candidates in order and reserve the first one with
+# room in both counters. KEYS come in triples per candidate: profile counter,
+# credential counter (the profile counter again when unused), release key.
+# ARGV comes in pairs: max_streams, 1 when a credential counter applies.
+_RESERVE_FIRST_SLOT_LUA = """
+for i = 1, #ARGV / 2 do
+    local limit = tonumber(ARGV[2 * i - 1])
+    local pooled = ARGV[2 * i] == '1'
+    local profile_key = KEYS[3 * i - 2]
+    local cred_key = KEYS[3 * i - 1]
+    local free = true
+    if limit > 0 then
+        if tonumber(redis.call('GET', profile_key) or '0') >= limit then
+            free = false
+        elseif pooled and tonumber(redis.call('GET', cred_key) or '0') >= limit then
+            free = false
+        end
+    end
+    if free then
+        if limit > 0 then
+            redis.call('INCR', profile_key)
+            if pooled then
+                redis.call('INCR', cred_key)
+                redis.call('SET', KEYS[3 * i], cred_key)
+            end
+        end
+        return i
+    end
+end
+return 0
+"""
+
 _XC_URL_CREDENTIALS_RE = re.compile(
     r"/(?:live|movie|series)/([^/]+)/([^/]+)/",
     re.IGNORECASE,
@@ -142,6 +174,14 @@ def _credential_counter_key(profile, group) -> Optional[str]:
     return server_group_connections_key(group.id, fingerprint)
 
 
+def credential_counter_key_for_profile(profile) -> Optional[str]:
+    """Shared credential counter a reservation on this profile must also take, if any."""
+    group = get_enforced_server_group_for_profile(profile)
+    if not group or profile.max_streams == 0:
+        return None
+    return _credential_counter_key(profile, group)
+
+
 def get_profile_connection_count(profile, redis_client) -> int:
     return int(redis_client.get(profile_connections_key(profile.id)) or 0)
 
@@ -313,6 +353,36 @@ def reserve_profile_slot(
     return True, profile_count, None
 
 
+def reserve_first_available_slot(
+    candidates: Sequence[Tuple[int, int, Optional[str]]], redis_client
+) -> Optional[int]:
+    """
+    Reserve the first candidate with free profile and credential slots in one call.
+
+    ``candidates`` is an ordered sequence of ``(profile_id, max_streams,
+    credential_key)`` (see ``credential_counter_key_for_profile``). Returns the
+    index of the reserved candidate, or None when every candidate is full.
+    Release with ``release_profile_slot`` exactly as for ``reserve_profile_slot``.
+    """
+    if not candidates:
+        return None
+
+    keys = []
+    args = []
+    for profile_id, max_streams, cred_key in candidates:
+        profile_key = profile_connections_key(profile_id)
+        keys.extend([
+            profile_key,
+            cred_key or profile_key,
+            profile_credential_release_key(profile_id),
+        ])
+        args.extend([max_streams, 1 if cred_key else 0])
+
+    reserve = redis_client.register_script(_RESERVE_FIRST_SLOT_LUA)
+    position = int(reserve(keys=keys, args=args) or 0)
+    return position - 1 if position else None
+
+
 def release_profile_slot(profile_id: int, redis_client) -> None:
     """Release profile and shared credential slots after a stream end."""
     _release_credential_slot_by_profile_id(profile_id, redis_client)
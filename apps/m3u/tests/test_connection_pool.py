@@ -1,6 +1,6 @@
 """Tests for shared ServerGroup connection pools (#1137)."""
 
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
 from unittest.mock import patch
 
 from apps.m3u.connection_pool import (
@@ -15,6 +15,7 @@ from apps.m3u.connection_pool import (
     profile_connections_key,
     profile_credential_release_key,
     release_profile_slot,
+    reserve_first_available_slot,
     reserve_profile_slot,
     server_group_connections_key,
 )
@@ -592,3 +593,60 @@ class VodProfileSelectionTests(TestCase):
         self.assertIsNotNone(result)
         selected, _connections = result
         self.assertEqual(selected.id, alt.id)
+
+
+class ReserveFirstAvailableSlotTests(SimpleTestCase):
+    """The Lua allocator runs against the real Redis the suite is configured with."""
+
+    PROFILE_IDS = (990001, 990002, 990003)
+    CRED_KEY = "server_group_connections:990001:test-routing"
+
+    def setUp(self):
+        from core.utils import RedisClient
+
+        self.redis = RedisClient.get_client()
+        if self.redis is None:
+            self.skipTest("Redis unavailable")
+        self.addCleanup(self._clear)
+        self._clear()
+
+    def _clear(self):
+        keys = [self.CRED_KEY]
+        for profile_id in self.PROFILE_IDS:
+            keys += [profile_connections_key(profile_id), profile_credential_release_key(profile_id)]
+        self.redis.delete(*keys)
+
+    def test_skips_full_profiles_and_reserves_first_free_one(self):
+        first, second, third = self.PROFILE_IDS
+        self.redis.set(profile_connections_key(first), 1)
+        candidates = [(first, 1, None), (second, 2, None), (third, 0, None)]
+
+        self.assertEqual(reserve_first_available_slot(candidates, self.redis), 1)
+        self.assertEqual(int(self.redis.get(profile_connections_key(second))), 1)
+        self.assertEqual(int(self.redis.get(profile_connections_key(first))), 1)
+
+    def test_shared_credential_pool_is_checked_and_remembered(self):
+        first, second, _third = self.PROFILE_IDS
+        self.redis.set(self.CRED_KEY, 1)
+        candidates = [(first, 1, self.CRED_KEY), (second, 1, None)]
+
+        self.assertEqual(reserve_first_available_slot(candidates, self.redis), 1)
+        self.assertIsNone(self.redis.get(profile_connections_key(first)))
+
+        self.redis.set(self.CRED_KEY, 0)
+        self.redis.delete(profile_connections_key(second))
+        self.assertEqual(reserve_first_available_slot(candidates, self.redis), 0)
+        self.assertEqual(
+            self.redis.get(profile_credential_release_key(first)), self.CRED_KEY
+        )
+        release_profile_slot(first, self.redis)
+        self.assertEqual(int(self.redis.get(self.CRED_KEY)), 0)
+
+    def test_all_full_reserves_nothing(self):
+        first, second, _third = self.PROFILE_IDS
+        self.redis.set(profile_connections_key(first), 1)
+        self.redis.set(profile_connections_key(second), 3)
+        candidates = [(first, 1, None), (second, 3, None)]
+
+        self.assertIsNone(reserve_first_available_slot(candidates, self.redis))
+        self.assertEqual(int(self.redis.get(profile_connections_key(second))), 3)
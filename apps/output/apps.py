@@ -4,3 +4,7 @@ class OutputConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.output'
     verbose_name = "Output"
+
+    def ready(self):
+        # Registers the M3U account signals that invalidate XC catalog snapshots.
+        import apps.output.xc_catalog  # noqa: F401
@@ -12,6 +12,7 @@ from datetime import datetime, timedelta
 
 import regex
 
+from django.db import transaction
 from django.db.models import Prefetch
 from django.http import Http404
 from django.urls import reverse
@@ -28,7 +29,11 @@ logger = logging.getLogger(__name__)
 
 _EPG_CHANNEL_XML_BATCH_SIZE = 200
 _EPG_PROGRAM_YIELD_BATCH_SIZE = 1000
-_EPG_PROGRAM_DB_CHUNK_SIZE = 20000
+_EPG_PROGRAM_CURSOR_FETCH_SIZE = 2000
+_EPG_PROGRAM_EXPORT_FIELDS = (
+    'id', 'epg_id', 'start_time', 'end_time', 'title', 'sub_title',
+    'description', 'custom_properties',
+)
 
 
 def _programme_overlaps_export_window(start_time, end_time, lookback_cutoff, cutoff_date):
@@ -39,6 +44,20 @@ def _programme_overlaps_export_window(start_time, end_time, lookback_cutoff, cut
     return True
 
 
+def _iter_export_programmes(programs_qs):
+    """
+    Stream programme rows ordered by (epg_id, start_time, id) in one query.
+
+    ``iterator()`` reads through a named server-side cursor on PostgreSQL,
+    fetching ``_EPG_PROGRAM_CURSOR_FETCH_SIZE`` rows per round trip. Running it
+    inside a transaction keeps the cursor from being declared WITH HOLD, which
+    would make PostgreSQL materialize the whole result before the first row.
+    """
+    rows = programs_qs.order_by('epg_id', 'start_time', 'id').values(*_EPG_PROGRAM_EXPORT_FIELDS)
+    with transaction.atomic():
+        yield from rows.iterator(chunk_size=_EPG_PROGRAM_CURSOR_FETCH_SIZE)
+
+
 def _ceil_to_half_hour(dt):
     """Round a datetime up to the next :00 or :30 boundary."""
     original = dt.replace(microsecond=0)
@@ -1370,279 +1389,245 @@ def generate_epg(request, profile_name=None, user=None, *, xc_catchup_prev_days=
                     end_time__gte=lookback_cutoff,
                 )
 
-            programs_base_qs = programs_qs.order_by('epg_id', 'id').values(
-                'id', 'epg_id', 'start_time', 'end_time', 'title', 'sub_title',
-                'description', 'custom_properties',
-            )
-
             current_epg_id = None
-            channel_ids_for_epg = None
             escaped_primary_cid = None
-            pending = []
+            primary_channel_attr = None
+            copy_channel_attrs = ()
             program_batch = []
-            chunk_size = _EPG_PROGRAM_DB_CHUNK_SIZE
-            last_epg_id = 0
-            last_id = 0
             _poster_site_origin = request_origin
 
-            def flush_pending():
-                nonlocal program_batch, pending
-                if not pending:
-                    return
-                pending.sort(key=lambda row: (row[0], row[1]))
-                escaped_primary = (
-                    escaped_primary_cid if len(channel_ids_for_epg) > 1 else None
-                )
-                for _, _, xml_text in pending:
-                    program_batch.append(xml_text)
-                    if escaped_primary:
-                        for cid in channel_ids_for_epg[1:]:
-                            program_batch.append(xml_text.replace(
-                                f'channel="{escaped_primary}"',
-                                f'channel="{html.escape(cid)}"',
-                                1,
-                            ))
-                    if len(program_batch) >= batch_size:
-                        yield '\n'.join(program_batch) + '\n'
-                        program_batch = []
-                pending.clear()
-
-            while True:
-                program_chunk = list(
-                    programs_base_qs.filter(epg_id__gte=last_epg_id)
-                    .exclude(epg_id=last_epg_id, id__lte=last_id)[:chunk_size]
-                )
-                if not program_chunk:
-                    break
-
-                last_row = program_chunk[-1]
-                last_epg_id = last_row['epg_id']
-                last_id = last_row['id']
-
-                for prog in program_chunk:
-                    epg_id = prog['epg_id']
-
-                    if epg_id != current_epg_id:
-                        yield from flush_pending()
-                        current_epg_id = epg_id
-                        channel_ids_for_epg = real_epg_map[epg_id]
-                        escaped_primary_cid = html.escape(channel_ids_for_epg[0])
-
-                    # DB datetimes are UTC (USE_TZ=True, TIME_ZONE=UTC); format
-                    # directly instead of strftime("%Y%m%d%H%M%S %z"), which is
-                    # ~10x slower and dominates XML build over 750k rows.
-                    st = prog['start_time']
-                    et = prog['end_time']
-                    start_str = f"{st.year:04d}{st.month:02d}{st.day:02d}{st.hour:02d}{st.minute:02d}{st.second:02d} +0000"
-                    stop_str = f"{et.year:04d}{et.month:02d}{et.day:02d}{et.hour:02d}{et.minute:02d}{et.second:02d} +0000"
-
-                    program_xml = [f'  <programme start="{start_str}" stop="{stop_str}" channel="{escaped_primary_cid}">']
-                    program_xml.append(f'    <title>{html.escape(prog["title"])}</title>')
-
-                    if prog['sub_title']:
-                        program_xml.append(f"    <sub-title>{html.escape(prog['sub_title'])}</sub-title>")
-
-                    if prog['description']:
-                        program_xml.append(f"    <desc>{html.escape(prog['description'])}</desc>")
-
-                    custom_data = prog['custom_properties'] or {}
-                    if custom_data:
-
-                        if "categories" in custom_data and custom_data["categories"]:
-                            for category in custom_data["categories"]:
-                                program_xml.append(f"    <category>{html.escape(category)}</category>")
-
-                        if "keywords" in custom_data and custom_data["keywords"]:
-                            for keyword in custom_data["keywords"]:
-                                program_xml.append(f"    <keyword>{html.escape(keyword)}</keyword>")
-
-                        # onscreen_episode takes priority over episode for the onscreen system
-                        if "onscreen_episode" in custom_data:
-                            program_xml.append(f'    <episode-num system="onscreen">{html.escape(custom_data["onscreen_episode"])}</episode-num>')
-                        elif "episode" in custom_data:
-                            program_xml.append(f'    <episode-num system="onscreen">E{custom_data["episode"]}</episode-num>')
-
-                        # Handle dd_progid format
-                        if 'dd_progid' in custom_data:
-                            program_xml.append(f'    <episode-num system="dd_progid">{html.escape(custom_data["dd_progid"])}</episode-num>')
-
-                        # Handle external database IDs
-                        for system in ['thetvdb.com', 'themoviedb.org', 'imdb.com']:
-                            if f'{system}_id' in custom_data:
-                                program_xml.append(f'    <episode-num system="{system}">{html.escape(custom_data[f"{system}_id"])}</episode-num>')
-
-                        # Add season and episode numbers in xmltv_ns format if available
-                        if "season" in custom_data and "episode" in custom_data:
-                            season = (
-                                int(custom_data["season"]) - 1
-                                if str(custom_data["season"]).isdigit()
-                                else 0
-                            )
-                            episode = (
-                                int(custom_data["episode"]) - 1
-                                if str(custom_data["episode"]).isdigit()
-                                else 0
-                            )
-                            program_xml.append(f'    <episode-num system="xmltv_ns">{season}.{episode}.</episode-num>')
-
-                        if "language" in custom_data:
-                            program_xml.append(f'    <language>{html.escape(custom_data["language"])}</language>')
-
-                        if "original_language" in custom_data:
-                            program_xml.append(f'    <orig-language>{html.escape(custom_data["original_language"])}</orig-language>')
-
-                        if "length" in custom_data and isinstance(custom_data["length"], dict):
-                            length_value = custom_data["length"].get("value", "")
-                            length_units = custom_data["length"].get("units", "minutes")
-                            program_xml.append(f'    <length units="{html.escape(length_units)}">{html.escape(str(length_value))}</length>')
-
-                        if "video" in custom_data and isinstance(custom_data["video"], dict):
-                            program_xml.append("    <video>")
-                            for attr in ['present', 'colour', 'aspect', 'quality']:
-                                if attr in custom_data["video"]:
-                                    program_xml.append(f"      <{attr}>{html.escape(custom_data['video'][attr])}</{attr}>")
-                            program_xml.append("    </video>")
-
-                        if "audio" in custom_data and isinstance(custom_data["audio"], dict):
-                            program_xml.append("    <audio>")
-                            for attr in ['present', 'stereo']:
-                                if attr in custom_data["audio"]:
-                                    program_xml.append(f"      <{attr}>{html.escape(custom_data['audio'][attr])}</{attr}>")
-                            program_xml.append("    </audio>")
-
-                        if "subtitles" in custom_data and isinstance(custom_data["subtitles"], list):
-                            for subtitle in custom_data["subtitles"]:
-                                if isinstance(subtitle, dict):
-                                    subtitle_type = subtitle.get("type", "")
-                                    type_attr = f' type="{html.escape(subtitle_type)}"' if subtitle_type else ""
-                                    program_xml.append(f"    <subtitles{type_attr}>")
-                                    if "language" in subtitle:
-                                        program_xml.append(f"      <language>{html.escape(subtitle['language'])}</language>")
-                                    program_xml.append("    </subtitles>")
-
-                        if "rating" in custom_data:
-                            rating_system = custom_data.get("rating_system", "TV Parental Guidelines")
-                            program_xml.append(f'    <rating system="{html.escape(rating_system)}">')
-                            program_xml.append(f'      <value>{html.escape(custom_data["rating"])}</value>')
-                            program_xml.append(f"    </rating>")
-
-                        if "star_ratings" in custom_data and isinstance(custom_data["star_ratings"], list):
-                            for star_rating in custom_data["star_ratings"]:
-                                if isinstance(star_rating, dict) and "value" in star_rating:
-                                    system_attr = f' system="{html.escape(star_rating["system"])}"' if "system" in star_rating else ""
-                                    program_xml.append(f"    <star-rating{system_attr}>")
-                                    program_xml.append(f"      <value>{html.escape(star_rating['value'])}</value>")
-                                    program_xml.append("    </star-rating>")
-
-                        if "reviews" in custom_data and isinstance(custom_data["reviews"], list):
-                            for review in custom_data["reviews"]:
-                                if isinstance(review, dict) and "content" in review:
-                                    review_type = review.get("type", "text")
-                                    attrs = [f'type="{html.escape(review_type)}"']
-                                    if "source" in review:
-                                        attrs.append(f'source="{html.escape(review["source"])}"')
-                                    if "reviewer" in review:
-                                        attrs.append(f'reviewer="{html.escape(review["reviewer"])}"')
-                                    attr_str = " ".join(attrs)
-                                    program_xml.append(f'    <review {attr_str}>{html.escape(review["content"])}</review>')
-
-                        if "images" in custom_data and isinstance(custom_data["images"], list):
-                            for image in custom_data["images"]:
-                                if isinstance(image, dict) and "url" in image:
-                                    attrs = []
-                                    for attr in ['type', 'size', 'orient', 'system']:
-                                        if attr in image:
-                                            attrs.append(f'{attr}="{html.escape(image[attr])}"')
-                                    attr_str = " " + " ".join(attrs) if attrs else ""
-                                    program_xml.append(f'    <image{attr_str}>{html.escape(image["url"])}</image>')
-
-                        # Add enhanced credits handling
-                        if "credits" in custom_data:
-                            program_xml.append("    <credits>")
-                            credits = custom_data["credits"]
-
-                            for role in ['director', 'writer', 'adapter', 'producer', 'composer', 'editor', 'presenter', 'commentator', 'guest']:
-                                if role in credits:
-                                    people = credits[role]
-                                    if isinstance(people, list):
-                                        for person in people:
-                                            program_xml.append(f"      <{role}>{html.escape(person)}</{role}>")
-                                    else:
-                                        program_xml.append(f"      <{role}>{html.escape(people)}</{role}>")
-
-                            # Handle actors separately to include role and guest attributes
-                            if "actor" in credits:
-                                actors = credits["actor"]
-                                if isinstance(actors, list):
-                                    for actor in actors:
-                                        if isinstance(actor, dict):
-                                            name = actor.get("name", "")
-                                            role_attr = f' role="{html.escape(actor["role"])}"' if "role" in actor else ""
-                                            guest_attr = ' guest="yes"' if actor.get("guest") else ""
-                                            program_xml.append(f"      <actor{role_attr}{guest_attr}>{html.escape(name)}</actor>")
-                                        else:
-                                            program_xml.append(f"      <actor>{html.escape(actor)}</actor>")
+            # Rows arrive grouped by EPG and in start_time order, so each
+            # programme is written as soon as it is read, followed by a copy
+            # for every other channel sharing the EPG; nothing is buffered
+            # per EPG.
+            for prog in _iter_export_programmes(programs_qs):
+                epg_id = prog['epg_id']
+
+                if epg_id != current_epg_id:
+                    current_epg_id = epg_id
+                    channel_ids_for_epg = real_epg_map[epg_id]
+                    escaped_primary_cid = html.escape(channel_ids_for_epg[0])
+                    primary_channel_attr = f'channel="{escaped_primary_cid}"'
+                    copy_channel_attrs = [
+                        f'channel="{html.escape(cid)}"' for cid in channel_ids_for_epg[1:]
+                    ]
+
+                # DB datetimes are UTC (USE_TZ=True, TIME_ZONE=UTC); format
+                # directly instead of strftime("%Y%m%d%H%M%S %z"), which is
+                # ~10x slower and dominates XML build over 750k rows.
+                st = prog['start_time']
+                et = prog['end_time']
+                start_str = f"{st.year:04d}{st.month:02d}{st.day:02d}{st.hour:02d}{st.minute:02d}{st.second:02d} +0000"
+                stop_str = f"{et.year:04d}{et.month:02d}{et.day:02d}{et.hour:02d}{et.minute:02d}{et.second:02d} +0000"
+
+                program_xml = [f'  <programme start="{start_str}" stop="{stop_str}" channel="{escaped_primary_cid}">']
+                program_xml.append(f'    <title>{html.escape(prog["title"])}</title>')
+
+                if prog['sub_title']:
+                    program_xml.append(f"    <sub-title>{html.escape(prog['sub_title'])}</sub-title>")
+
+                if prog['description']:
+                    program_xml.append(f"    <desc>{html.escape(prog['description'])}</desc>")
+
+                custom_data = prog['custom_properties'] or {}
+                if custom_data:
+
+                    if "categories" in custom_data and custom_data["categories"]:
+                        for category in custom_data["categories"]:
+                            program_xml.append(f"    <category>{html.escape(category)}</category>")
+
+                    if "keywords" in custom_data and custom_data["keywords"]:
+                        for keyword in custom_data["keywords"]:
+                            program_xml.append(f"    <keyword>{html.escape(keyword)}</keyword>")
+
+                    # onscreen_episode takes priority over episode for the onscreen system
+                    if "onscreen_episode" in custom_data:
+                        program_xml.append(f'    <episode-num system="onscreen">{html.escape(custom_data["onscreen_episode"])}</episode-num>')
+                    elif "episode" in custom_data:
+                        program_xml.append(f'    <episode-num system="onscreen">E{custom_data["episode"]}</episode-num>')
+
+                    # Handle dd_progid format
+                    if 'dd_progid' in custom_data:
+                        program_xml.append(f'    <episode-num system="dd_progid">{html.escape(custom_data["dd_progid"])}</episode-num>')
+
+                    # Handle external database IDs
+                    for system in ['thetvdb.com', 'themoviedb.org', 'imdb.com']:
+                        if f'{system}_id' in custom_data:
+                            program_xml.append(f'    <episode-num system="{system}">{html.escape(custom_data[f"{system}_id"])}</episode-num>')
+
+                    # Add season and episode numbers in xmltv_ns format if available
+                    if "season" in custom_data and "episode" in custom_data:
+                        season = (
+                            int(custom_data["season"]) - 1
+                            if str(custom_data["season"]).isdigit()
+                            else 0
+                        )
+                        episode = (
+                            int(custom_data["episode"]) - 1
+                            if str(custom_data["episode"]).isdigit()
+                            else 0
+                        )
+                        program_xml.append(f'    <episode-num system="xmltv_ns">{season}.{episode}.</episode-num>')
+
+                    if "language" in custom_data:
+                        program_xml.append(f'    <language>{html.escape(custom_data["language"])}</language>')
+
+                    if "original_language" in custom_data:
+                        program_xml.append(f'    <orig-language>{html.escape(custom_data["original_language"])}</orig-language>')
+
+                    if "length" in custom_data and isinstance(custom_data["length"], dict):
+                        length_value = custom_data["length"].get("value", "")
+                        length_units = custom_data["length"].get("units", "minutes")
+                        program_xml.append(f'    <length units="{html.escape(length_units)}">{html.escape(str(length_value))}</length>')
+
+                    if "video" in custom_data and isinstance(custom_data["video"], dict):
+                        program_xml.append("    <video>")
+                        for attr in ['present', 'colour', 'aspect', 'quality']:
+                            if attr in custom_data["video"]:
+                                program_xml.append(f"      <{attr}>{html.escape(custom_data['video'][attr])}</{attr}>")
+                        program_xml.append("    </video>")
+
+                    if "audio" in custom_data and isinstance(custom_data["audio"], dict):
+                        program_xml.append("    <audio>")
+                        for attr in ['present', 'stereo']:
+                            if attr in custom_data["audio"]:
+                                program_xml.append(f"      <{attr}>{html.escape(custom_data['audio'][attr])}</{attr}>")
+                        program_xml.append("    </audio>")
+
+                    if "subtitles" in custom_data and isinstance(custom_data["subtitles"], list):
+                        for subtitle in custom_data["subtitles"]:
+                            if isinstance(subtitle, dict):
+                                subtitle_type = subtitle.get("type", "")
+                                type_attr = f' type="{html.escape(subtitle_type)}"' if subtitle_type else ""
+                                program_xml.append(f"    <subtitles{type_attr}>")
+                                if "language" in subtitle:
+                                    program_xml.append(f"      <language>{html.escape(subtitle['language'])}</language>")
+                                program_xml.append("    </subtitles>")
+
+                    if "rating" in custom_data:
+                        rating_system = custom_data.get("rating_system", "TV Parental Guidelines")
+                        program_xml.append(f'    <rating system="{html.escape(rating_system)}">')
+                        program_xml.append(f'      <value>{html.escape(custom_data["rating"])}</value>')
+                        program_xml.append(f"    </rating>")
+
+                    if "star_ratings" in custom_data and isinstance(custom_data["star_ratings"], list):
+                        for star_rating in custom_data["star_ratings"]:
+                            if isinstance(star_rating, dict) and "value" in star_rating:
+                                system_attr = f' system="{html.escape(star_rating["system"])}"' if "system" in star_rating else ""
+                                program_xml.append(f"    <star-rating{system_attr}>")
+                                program_xml.append(f"      <value>{html.escape(star_rating['value'])}</value>")
+                                program_xml.append("    </star-rating>")
+
+                    if "reviews" in custom_data and isinstance(custom_data["reviews"], list):
+                        for review in custom_data["reviews"]:
+                            if isinstance(review, dict) and "content" in review:
+                                review_type = review.get("type", "text")
+                                attrs = [f'type="{html.escape(review_type)}"']
+                                if "source" in review:
+                                    attrs.append(f'source="{html.escape(review["source"])}"')
+                                if "reviewer" in review:
+                                    attrs.append(f'reviewer="{html.escape(review["reviewer"])}"')
+                                attr_str = " ".join(attrs)
+                                program_xml.append(f'    <review {attr_str}>{html.escape(review["content"])}</review>')
+
+                    if "images" in custom_data and isinstance(custom_data["images"], list):
+                        for image in custom_data["images"]:
+                            if isinstance(image, dict) and "url" in image:
+                                attrs = []
+                                for attr in ['type', 'size', 'orient', 'system']:
+                                    if attr in image:
+                                        attrs.append(f'{attr}="{html.escape(image[attr])}"')
+                                attr_str = " " + " ".join(attrs) if attrs else ""
+                                program_xml.append(f'    <image{attr_str}>{html.escape(image["url"])}</image>')
+
+                    # Add enhanced credits handling
+                    if "credits" in custom_data:
+                        program_xml.append("    <credits>")
+                        credits = custom_data["credits"]
+
+                        for role in ['director', 'writer', 'adapter', 'producer', 'composer', 'editor', 'presenter', 'commentator', 'guest']:
+                            if role in credits:
+                                people = credits[role]
+                                if isinstance(people, list):
+                                    for person in people:
+                                        program_xml.append(f"      <{role}>{html.escape(person)}</{role}>")
                                 else:
-                                    program_xml.append(f"      <actor>{html.escape(actors)}</actor>")
-
-                            program_xml.append("    </credits>")
-
-                        if "date" in custom_data:
-                            program_xml.append(f'    <date>{html.escape(custom_data["date"])}</date>')
-
-                        if "country" in custom_data:
-                            program_xml.append(f'    <country>{html.escape(custom_data["country"])}</country>')
-
-                        if "icon" in custom_data:
-                            program_xml.append(f'    <icon src="{html.escape(custom_data["icon"])}" />')
-                        elif "sd_icon" in custom_data:
-                            poster_src = (
-                                f'{_poster_site_origin}'
-                                f'{sd_poster_proxy_path(prog["id"], custom_data["sd_icon"])}'
-                            )
-                            program_xml.append(
-                                f'    <icon src="{html.escape(poster_src)}" />'
-                            )
-
-                        # Add special flags as proper tags with enhanced handling
-                        if custom_data.get("previously_shown", False):
-                            prev_shown_details = custom_data.get("previously_shown_details", {})
-                            attrs = []
-                            if "start" in prev_shown_details:
-                                attrs.append(f'start="{html.escape(prev_shown_details["start"])}"')
-                            if "channel" in prev_shown_details:
-                                attrs.append(f'channel="{html.escape(prev_shown_details["channel"])}"')
-                            attr_str = " " + " ".join(attrs) if attrs else ""
-                            program_xml.append(f"    <previously-shown{attr_str} />")
-
-                        if custom_data.get("premiere", False):
-                            premiere_text = custom_data.get("premiere_text", "")
-                            if premiere_text:
-                                program_xml.append(f"    <premiere>{html.escape(premiere_text)}</premiere>")
+                                    program_xml.append(f"      <{role}>{html.escape(people)}</{role}>")
+
+                        # Handle actors separately to include role and guest attributes
+                        if "actor" in credits:
+                            actors = credits["actor"]
+                            if isinstance(actors, list):
+                                for actor in actors:
+                                    if isinstance(actor, dict):
+                                        name = actor.get("name", "")
+                                        role_attr = f' role="{html.escape(actor["role"])}"' if "role" in actor else ""
+                                        guest_attr = ' guest="yes"' if actor.get("guest") else ""
+                                        program_xml.append(f"      <actor{role_attr}{guest_attr}>{html.escape(name)}</actor>")
+                                    else:
+                                        program_xml.append(f"      <actor>{html.escape(actor)}</actor>")
                             else:
-                                program_xml.append("    <premiere />")
+                                program_xml.append(f"      <actor>{html.escape(actors)}</actor>")
 
-                        if custom_data.get("last_chance", False):
-                            last_chance_text = custom_data.get("last_chance_text", "")
-                            if last_chance_text:
-                                program_xml.append(f"    <last-chance>{html.escape(last_chance_text)}</last-chance>")
-                            else:
-                                program_xml.append("    <last-chance />")
+                        program_xml.append("    </credits>")
+
+                    if "date" in custom_data:
+                        program_xml.append(f'    <date>{html.escape(custom_data["date"])}</date>')
 
-                        if custom_data.get("new", False):
-                            program_xml.append("    <new />")
+                    if "country" in custom_data:
+                        program_xml.append(f'    <country>{html.escape(custom_data["country"])}</country>')
 
-                        if custom_data.get('live', False):
-                            program_xml.append('    <live />')
+                    if "icon" in custom_data:
+                        program_xml.append(f'    <icon src="{html.escape(custom_data["icon"])}" />')
+                    elif "sd_icon" in custom_data:
+                        poster_src = (
+                            f'{_poster_site_origin}'
+                            f'{sd_poster_proxy_path(prog["id"], custom_data["sd_icon"])}'
+                        )
+                        program_xml.append(
+                            f'    <icon src="{html.escape(poster_src)}" />'
+                        )
+
+                    # Add special flags as proper tags with enhanced handling
+                    if custom_data.get("previously_shown", False):
+                        prev_shown_details = custom_data.get("previously_shown_details", {})
+                        attrs = []
+                        if "start" in prev_shown_details:
+                            attrs.append(f'start="{html.escape(prev_shown_details["start"])}"')
+                        if "channel" in prev_shown_details:
+                            attrs.append(f'channel="{html.escape(prev_shown_details["channel"])}"')
+                        attr_str = " " + " ".join(attrs) if attrs else ""
+                        program_xml.append(f"    <previously-shown{attr_str} />")
+
+                    if custom_data.get("premiere", False):
+                        premiere_text = custom_data.get("premiere_text", "")
+                        if premiere_text:
+                            program_xml.append(f"    <premiere>{html.escape(premiere_text)}</premiere>")
+                        else:
+                            program_xml.append("    <premiere />")
+
+                    if custom_data.get("last_chance", False):
+                        last_chance_text = custom_data.get("last_chance_text", "")
+                        if last_chance_text:
+                            program_xml.append(f"    <last-chance>{html.escape(last_chance_text)}</last-chance>")
+                        else:
+                            program_xml.append("    <last-chance />")
 
-                    program_xml.append("  </programme>")
+                    if custom_data.get("new", False):
+                        program_xml.append("    <new />")
 
-                    xml_text = '\n'.join(program_xml)
-                    pending.append((prog['start_time'], prog['id'], xml_text))
+                    if custom_data.get('live', False):
+                        program_xml.append('    <live />')
 
-                del program_chunk
+                program_xml.append("  </programme>")
 
-            yield from flush_pending()
+                xml_text = '\n'.join(program_xml)
+                program_batch.append(xml_text)
+                for channel_attr in copy_channel_attrs:
+                    program_batch.append(xml_text.replace(primary_channel_attr, channel_attr, 1))
+                if len(program_batch) >= batch_size:
+                    yield '\n'.join(program_batch) + '\n'
+                    program_batch = []
 
             if program_batch:
                 yield '\n'.join(program_batch) + '\n'
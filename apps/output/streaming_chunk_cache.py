@@ -249,8 +249,11 @@ def invalidate_epg_chunk_cache():
     EPG assignment changes (channel or override) and programme imports do not
     change the cache key, so without this the next /output/epg can keep serving
     stale programmes for up to DEFAULT_CACHE_TTL while XC (uncached) is already
-    correct.
+    correct. The same events also start a new guide-grid version.
     """
+    from apps.epg.guide_grid import invalidate_guide_grid
+
+    invalidate_guide_grid()
     try:
         redis = _get_redis()
         deleted = 0
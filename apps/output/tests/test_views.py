@@ -296,6 +296,39 @@ class OutputEPGXMLEscapingTest(OutputEndpointTestMixin, TestCase):
         self.assertLess(content.find('<title>First</title>'), content.find('<title>Second</title>'))
         self.assertLess(content.find('<title>Second</title>'), content.find('<title>Third</title>'))
 
+    def test_shared_epg_programmes_stream_in_order_for_every_channel(self):
+        """Channels sharing an EPG each get every programme, in start_time order."""
+        from django.utils import timezone
+        from apps.epg.models import ProgramData
+
+        epg_source = EPGSource.objects.create(name="Shared EPG", source_type="xmltv")
+        epg_data = EPGData.objects.create(name="Station", epg_source=epg_source, tvg_id="shared")
+        self._add_channel(channel_number=10.0, name="East", tvg_id="east", epg_data=epg_data)
+        self._add_channel(channel_number=11.0, name="West & Co", tvg_id="west & co", epg_data=epg_data)
+        now = timezone.now()
+        for hours, title in ((3, "Third"), (1, "First"), (2, "Second")):
+            ProgramData.objects.create(
+                epg=epg_data,
+                start_time=now + timedelta(hours=hours),
+                end_time=now + timedelta(hours=hours, minutes=59),
+                title=title,
+                tvg_id="shared",
+            )
+
+        # One row per fetch exercises the cursor across many round trips.
+        with patch("apps.output.epg._EPG_PROGRAM_CURSOR_FETCH_SIZE", 1):
+            content = _response_text(self.client.get(self._epg_url("tvg_id_source=tvg_id&days=1")))
+
+        programmes = [
+            (programme.get("channel"), programme.findtext("title"))
+            for programme in ET.fromstring(content).findall("programme")
+        ]
+        self.assertEqual(programmes, [
+            ("east", "First"), ("west & co", "First"),
+            ("east", "Second"), ("west & co", "Second"),
+            ("east", "Third"), ("west & co", "Third"),
+        ])
+
     def test_override_epg_change_invalidates_xmltv_chunk_cache(self):
         """
         XC reads live ProgramData; XMLTV is chunk-cached. Changing the
@@ -0,0 +1,108 @@
+import json
+import os
+import shutil
+import tempfile
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+
+from apps.m3u.models import M3UAccount
+from apps.output import xc_catalog
+from apps.output.views import xc_vod_stream_entries
+from apps.vod.models import M3UMovieRelation, M3USeriesRelation, Movie, Series, VODCategory
+
+ORIGIN = "http://tv.example:9191"
+
+
+def _body(response):
+    return b"".join(response.streaming_content).decode()
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class XcCatalogSnapshotTests(TestCase):
+    def setUp(self):
+        self.snapshot_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.snapshot_dir, ignore_errors=True)
+        self.dir_override = override_settings(XC_CATALOG_SNAPSHOT_DIR=self.snapshot_dir)
+        self.dir_override.enable()
+        self.addCleanup(self.dir_override.disable)
+        cache.clear()
+
+        self.request = RequestFactory().get("/player_api.php")
+        self.account = M3UAccount.objects.create(name=f"acct-{uuid4().hex[:6]}", server_url="http://example.com")
+        self.category = VODCategory.objects.create(name="Action", category_type="movie")
+        for name, adult, category in (("Heist", False, self.category), ("Late Show", True, None)):
+            movie = Movie.objects.create(
+                name=name,
+                is_adult=adult,
+                custom_properties={"director": "Someone"},
+            )
+            M3UMovieRelation.objects.create(
+                m3u_account=self.account,
+                movie=movie,
+                category=category,
+                stream_id=f"s-{name}",
+                custom_properties={"basic_data": {"stream_icon": f"https://img.example/{name}.jpg"}},
+            )
+        series = Series.objects.create(name="Show", custom_properties={"backdrop_path": ["https://img.example/b.jpg"]})
+        M3USeriesRelation.objects.create(m3u_account=self.account, series=series, external_series_id="1")
+
+    def test_snapshot_matches_live_list_with_request_origin(self):
+        response = xc_catalog.catalog_response(self.request, "vod", ORIGIN)
+
+        live = xc_vod_stream_entries(ORIGIN)
+        self.assertEqual(json.loads(_body(response)), live)
+        self.assertTrue(live[0]["stream_icon"].startswith(ORIGIN + "/"))
+        self.assertNotIn(xc_catalog.ORIGIN_PLACEHOLDER, _body(xc_catalog.catalog_response(self.request, "vod", ORIGIN)))
+
+        series = json.loads(_body(xc_catalog.catalog_response(self.request, "series", "https://other.example")))
+        self.assertEqual(len(series), 1)
+        self.assertTrue(series[0]["backdrop_path"][0].startswith("https://other.example/"))
+
+    def test_repeat_requests_are_served_from_disk(self):
+        _body(xc_catalog.catalog_response(self.request, "vod", ORIGIN))
+
+        with self.assertNumQueries(0):
+            body = _body(xc_catalog.catalog_response(self.request, "vod", ORIGIN))
+        self.assertEqual(len(json.loads(body)), 2)
+
+    def test_visibility_classes_get_separate_snapshots(self):
+        safe = json.loads(_body(xc_catalog.catalog_response(self.request, "vod", ORIGIN, hide_adult=True)))
+        action = json.loads(
+            _body(xc_catalog.catalog_response(self.request, "vod", ORIGIN, category_id=str(self.category.id)))
+        )
+
+        self.assertEqual([entry["name"] for entry in safe], ["Heist"])
+        self.assertEqual([entry["name"] for entry in action], ["Heist"])
+        self.assertIsNone(xc_catalog.catalog_response(self.request, "vod", ORIGIN, category_id="1 OR 1=1"))
+
+    def test_account_change_invalidates_and_removes_old_versions(self):
+        first_version = xc_catalog.catalog_version()
+        _body(xc_catalog.catalog_response(self.request, "vod", ORIGIN))
+
+        self.account.is_active = False
+        self.account.save(update_fields=["is_active"])
+        self.assertNotEqual(xc_catalog.catalog_version(), first_version)
+        self.assertEqual(os.listdir(self.snapshot_dir), [])
+        self.assertEqual(json.loads(_body(xc_catalog.catalog_response(self.request, "vod", ORIGIN))), [])
+
+        version = xc_catalog.invalidate_catalog(prebuild=True)
+        self.assertEqual(
+            sorted(os.listdir(self.snapshot_dir)),
+            sorted(f"{kind}-{version}-{variant}.json" for kind, variant in (("vod", "all"), ("vod", "safe"), ("series", "all"))),
+        )
+
+    def test_status_saves_keep_the_snapshot(self):
+        version = xc_catalog.catalog_version()
+        self.account.save(update_fields=["status"])
+        self.assertEqual(xc_catalog.catalog_version(), version)
+
+    def test_matching_etag_returns_not_modified(self):
+        etag = xc_catalog.catalog_response(self.request, "vod", ORIGIN)["ETag"]
+
+        request = RequestFactory().get("/player_api.php", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(xc_catalog.catalog_response(request, "vod", ORIGIN).status_code, 304)
+        other_origin = xc_catalog.catalog_response(request, "vod", "http://elsewhere")
+        self.assertEqual(other_origin.status_code, 200)
+        other_origin.close()
@@ -8,6 +8,7 @@ from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from apps.epg.models import ProgramData
 from apps.accounts.models import User
+from apps.accounts.principal_cache import authenticate_xc
 from dispatcharr.utils import get_client_ip, network_access_allowed
 from django.utils import timezone as django_timezone
 from django.shortcuts import get_object_or_404
@@ -27,6 +28,7 @@ from core.models import CoreSettings
 from core.utils import log_system_event, build_absolute_uri_with_port
 import hashlib
 from apps.output.epg import generate_epg, generate_dummy_programs
+from apps.output.xc_catalog import catalog_response
 from apps.vod.image_proxy import (
     is_proxyable_image_url,
     prefer_relation_artwork,
@@ -361,14 +363,10 @@ def xc_get_user(request):
     if not username or not password:
         return None
 
-    user = get_object_or_404(User, username=username)
-
-    custom_properties = user.custom_properties or {}
-
-    if "xc_password" not in custom_properties:
-        return None
-
-    if custom_properties["xc_password"] != password:
+    user = authenticate_xc(username, password)
+    if user is None:
+        # Unknown usernames still answer 404; only verified logins are cached.
+        get_object_or_404(User, username=username)
         return None
 
     if not network_access_allowed(request, 'XC_API', user):
@@ -467,11 +465,24 @@ def xc_player_api(request, full=False):
     elif action == "get_vod_categories":
         return JsonResponse(xc_get_vod_categories(user), safe=False)
     elif action == "get_vod_streams":
-        return JsonResponse(xc_get_vod_streams(request, user, request.GET.get("category_id")), safe=False)
+        category_id = request.GET.get("category_id")
+        response = catalog_response(
+            request, "vod", build_absolute_uri_with_port(request, ""),
+            hide_adult=xc_hides_adult_vod(user), category_id=category_id,
+        )
+        if response is None:
+            response = JsonResponse(xc_get_vod_streams(request, user, category_id), safe=False)
+        return response
     elif action == "get_series_categories":
         return JsonResponse(xc_get_series_categories(user), safe=False)
     elif action == "get_series":
-        return JsonResponse(xc_get_series(request, user, request.GET.get("category_id")), safe=False)
+        category_id = request.GET.get("category_id")
+        response = catalog_response(
+            request, "series", build_absolute_uri_with_port(request, ""), category_id=category_id,
+        )
+        if response is None:
+            response = JsonResponse(xc_get_series(request, user, category_id), safe=False)
+        return response
     elif action == "get_series_info":
         return JsonResponse(xc_get_series_info(request, user, request.GET.get("series_id")), safe=False)
     elif action == "get_vod_info":
@@ -1077,25 +1088,30 @@ def _xc_relation_artwork_from_row(row, object_custom_properties):
     )
 
 
-def _xc_vodlogo_url_parts(request):
-    """Return (prefix, suffix) for VODLogo cache URLs.
+def _xc_vodlogo_url_parts(origin):
+    """Return (prefix, suffix) for VODLogo cache URLs under ``origin``.
 
     Precomputed once per response so each row is a string concat instead of a
     reverse() plus absolute-URI build.
     """
-    base_url = build_absolute_uri_with_port(request, "")
     sample_path = reverse("api:vod:vodlogo-cache", args=[0])
     prefix_raw, _, suffix_raw = sample_path.partition("/0/")
-    return base_url + prefix_raw + "/", "/" + suffix_raw
+    return origin + prefix_raw + "/", "/" + suffix_raw
+
+
+def _xc_image_url_parts(origin, resource):
+    """vod_image_url_parts() with ``origin`` instead of a request."""
+    prefix, suffix = vod_image_url_parts(None, resource)
+    return origin + prefix, suffix
 
 
 def _xc_cover_or_logo(
-    request, resource, pk, artwork_movie_image, *, logo_id, logo_url_parts, url_parts
+    resource, pk, artwork_movie_image, *, logo_id, logo_url_parts, url_parts
 ):
     """Relation/object still first; synced VODLogo only when no proxyable still exists."""
     if is_proxyable_image_url(artwork_movie_image):
         return rewrite_single_image_url(
-            request,
+            None,
             resource,
             pk,
             'movie_image',
@@ -1186,15 +1202,28 @@ def xc_get_vod_categories(user):
     return response
 
 
+def xc_hides_adult_vod(user):
+    """Non-admins with Hide Mature Content skip adult VODs."""
+    return user.user_level < 10 and (user.custom_properties or {}).get('hide_adult_content', False)
+
+
 def xc_get_vod_streams(request, user, category_id=None):
     """Get VOD streams (movies) for XtreamCodes API"""
+    return xc_vod_stream_entries(
+        build_absolute_uri_with_port(request, ""),
+        hide_adult=xc_hides_adult_vod(user),
+        category_id=category_id,
+    )
+
+
+def xc_vod_stream_entries(origin, hide_adult=False, category_id=None):
+    """get_vod_streams entries with artwork URLs under ``origin`` (scheme://host[:port])."""
     from apps.vod.models import M3UMovieRelation
 
     rel_filters = {"m3u_account__is_active": True}
     if category_id:
         rel_filters["category_id"] = category_id
-    # Non-admins with Hide Mature Content skip adult VODs.
-    if user.user_level < 10 and (user.custom_properties or {}).get('hide_adult_content', False):
+    if hide_adult:
         rel_filters["movie__is_adult"] = False
 
     relations = _xc_fetch_priority_distinct_relations(
@@ -1205,9 +1234,9 @@ def xc_get_vod_streams(request, user, category_id=None):
         order_by_name_field='movie__name',
     )
 
-    _logo_url_parts = _xc_vodlogo_url_parts(request)
+    _logo_url_parts = _xc_vodlogo_url_parts(origin)
     # One reverse for the fallback-icon proxy rewrites below.
-    _movie_image_parts = vod_image_url_parts(request, "movie")
+    _movie_image_parts = _xc_image_url_parts(origin, "movie")
 
     streams = []
     append = streams.append
@@ -1225,7 +1254,6 @@ def xc_get_vod_streams(request, user, category_id=None):
             "stream_type": "movie",
             "stream_id": row['movie__id'],
             "stream_icon": _xc_cover_or_logo(
-                request,
                 'movie',
                 row['movie__id'],
                 artwork['movie_image'],
@@ -1280,6 +1308,11 @@ def xc_get_series_categories(user):
 
 def xc_get_series(request, user, category_id=None):
     """Get series list for XtreamCodes API"""
+    return xc_series_entries(build_absolute_uri_with_port(request, ""), category_id=category_id)
+
+
+def xc_series_entries(origin, category_id=None):
+    """get_series entries with artwork URLs under ``origin`` (scheme://host[:port])."""
     from apps.vod.models import M3USeriesRelation
 
     rel_filters = {"m3u_account__is_active": True}
@@ -1294,9 +1327,9 @@ def xc_get_series(request, user, category_id=None):
         order_by_name_field='series__name',
     )
 
-    _logo_url_parts = _xc_vodlogo_url_parts(request)
+    _logo_url_parts = _xc_vodlogo_url_parts(origin)
     # One reverse for all series backdrop rewrites.
-    _series_image_parts = vod_image_url_parts(request, "series")
+    _series_image_parts = _xc_image_url_parts(origin, "series")
 
     series_list = []
     append = series_list.append
@@ -1313,7 +1346,6 @@ def xc_get_series(request, user, category_id=None):
             "name": row['series__name'],
             "series_id": row['id'],
             "cover": _xc_cover_or_logo(
-                request,
                 'series',
                 row['series__id'],
                 artwork['movie_image'],
@@ -1331,7 +1363,7 @@ def xc_get_series(request, user, category_id=None):
             "rating": str(rating or "0"),
             "rating_5based": str(round(float(rating or 0) / 2, 2)) if rating else "0",
             "backdrop_path": rewrite_backdrop_paths(
-                request,
+                None,
                 'series',
                 row['series__id'],
                 artwork['backdrop_path'],
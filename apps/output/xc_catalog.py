@@ -0,0 +1,225 @@
+"""Pre-serialized XC ``get_vod_streams`` / ``get_series`` catalog snapshots.
+
+Building the XC movie or series list walks every active relation, resolves
+artwork and formats URLs per row, which for a large library takes seconds and
+a lot of memory, and XC clients ask for the whole list on every launch. The
+list only changes when VOD content or M3U accounts change, so it is built
+once per catalog version and kept on disk as JSON, one entry per line:
+
+    <XC_CATALOG_SNAPSHOT_DIR>/<kind>-<version>-<variant>.json
+
+``variant`` is the visibility class (``all`` or ``safe`` for users hiding
+adult VOD, plus ``c<category_id>`` for category-filtered requests). Artwork
+URLs are written under ``ORIGIN_PLACEHOLDER`` and the requesting origin is
+substituted line by line while the file is streamed.
+
+The version is a random token kept in the cache, so a flushed cache can
+never revive an old snapshot. ``invalidate_catalog`` replaces it after
+``refresh_vod_content``, orphan cleanup, on-demand series refreshes and M3U
+account changes, and removes the snapshots of older versions. Variants nobody
+asked for are built on first request.
+"""
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import re
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.http import HttpResponseNotModified, StreamingHttpResponse
+
+logger = logging.getLogger(__name__)
+
+CATALOG_VERSION_KEY = "xc_catalog:version"
+# Never a real host (RFC 2606); JSON-encodes to itself.
+ORIGIN_PLACEHOLDER = "http://xc-origin.invalid"
+READ_CHUNK_SIZE = 256 * 1024
+
+_SNAPSHOT_RE = re.compile(r"^(vod|series)-([0-9a-f]+)-")
+
+
+def snapshot_dir():
+    return getattr(settings, "XC_CATALOG_SNAPSHOT_DIR", "/data/cache/xc_catalog")
+
+
+def _new_version():
+    return uuid.uuid4().hex[:12]
+
+
+def catalog_version():
+    """Current catalog version token, or None when the cache is unavailable."""
+    try:
+        version = cache.get(CATALOG_VERSION_KEY)
+        if version is None:
+            cache.add(CATALOG_VERSION_KEY, _new_version(), timeout=None)
+            version = cache.get(CATALOG_VERSION_KEY)
+        return version
+    except Exception as e:
+        logger.debug(f"XC catalog version unavailable: {e}")
+        return None
+
+
+def invalidate_catalog(prebuild=False):
+    """
+    Start a new catalog version and drop older snapshots; optionally build
+    the unfiltered snapshots now.
+    """
+    version = _new_version()
+    try:
+        cache.set(CATALOG_VERSION_KEY, version, timeout=None)
+    except Exception as e:
+        logger.warning(f"Could not invalidate XC catalog snapshots: {e}")
+        return None
+
+    if prebuild:
+        for kind, hide_adult in (("vod", False), ("vod", True), ("series", False)):
+            try:
+                snapshot_path(kind, version, hide_adult=hide_adult)
+            except Exception as e:
+                logger.error(f"Failed to build XC {kind} catalog snapshot: {e}", exc_info=True)
+    remove_stale_snapshots(version)
+    return version
+
+
+def _variant(kind, hide_adult, category_id):
+    variant = "safe" if kind == "vod" and hide_adult else "all"
+    if category_id:
+        variant += f"-c{category_id}"
+    return variant
+
+
+def _entries(kind, hide_adult, category_id):
+    from .views import xc_series_entries, xc_vod_stream_entries
+
+    if kind == "vod":
+        return xc_vod_stream_entries(ORIGIN_PLACEHOLDER, hide_adult=hide_adult, category_id=category_id)
+    return xc_series_entries(ORIGIN_PLACEHOLDER, category_id=category_id)
+
+
+def _write_snapshot(path, entries):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("[")
+            sep = "\n"
+            for entry in entries:
+                f.write(sep)
+                f.write(json.dumps(entry))
+                sep = ",\n"
+            f.write("\n]\n")
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def snapshot_path(kind, version, hide_adult=False, category_id=None):
+    """Path of the snapshot for one visibility class, building it if missing."""
+    directory = snapshot_dir()
+    path = os.path.join(directory, f"{kind}-{version}-{_variant(kind, hide_adult, category_id)}.json")
+    if os.path.exists(path):
+        return path
+
+    os.makedirs(directory, exist_ok=True)
+    # One builder per snapshot; concurrent requests wait and reuse its file.
+    with open(f"{path}.lock", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            if not os.path.exists(path):
+                entries = _entries(kind, hide_adult, category_id)
+                _write_snapshot(path, entries)
+                logger.info(f"Built XC {kind} catalog snapshot {version} ({len(entries)} entries)")
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+    try:
+        os.remove(f"{path}.lock")
+    except OSError:
+        pass
+    return path
+
+
+def remove_stale_snapshots(version):
+    """
+    Delete snapshots of catalog versions other than ``version``.
+
+    Files already opened by a response keep streaming; builds still in
+    progress (``.lock``/``.tmp``) are left alone and go with the next prune.
+    """
+    try:
+        names = os.listdir(snapshot_dir())
+    except FileNotFoundError:
+        return
+    for name in names:
+        match = _SNAPSHOT_RE.match(name)
+        if match and match.group(2) != version and not name.endswith((".lock", ".tmp")):
+            try:
+                os.remove(os.path.join(snapshot_dir(), name))
+            except OSError:
+                pass
+
+
+@receiver(post_save, sender="m3u.M3UAccount")
+def _account_saved(sender, instance, created, update_fields=None, **kwargs):
+    # Refresh tasks save status/last_message constantly; only visibility matters here.
+    if created or update_fields is None or {"is_active", "priority"} & set(update_fields):
+        invalidate_catalog()
+
+
+@receiver(post_delete, sender="m3u.M3UAccount")
+def _account_deleted(sender, instance, **kwargs):
+    invalidate_catalog()
+
+
+def _stream_with_origin(f, origin):
+    placeholder = ORIGIN_PLACEHOLDER.encode()
+    origin = origin.encode()
+    with f:
+        pending = b""
+        while True:
+            block = f.read(READ_CHUNK_SIZE)
+            if not block:
+                break
+            block = pending + block
+            # Substitute on whole lines so the placeholder is never split.
+            cut = block.rfind(b"\n") + 1
+            pending = block[cut:]
+            if cut:
+                yield block[:cut].replace(placeholder, origin)
+        if pending:
+            yield pending.replace(placeholder, origin)
+
+
+def catalog_response(request, kind, origin, hide_adult=False, category_id=None):
+    """
+    Stream a catalog snapshot to the client, or None to use the live builder.
+
+    Snapshots are used when the catalog version is known and ``category_id``
+    is empty or numeric.
+    """
+    if category_id and not str(category_id).isdigit():
+        return None
+    version = catalog_version()
+    if version is None:
+        return None
+    try:
+        # Opened here so a concurrent invalidation cannot remove it before streaming starts.
+        snapshot = open(snapshot_path(kind, version, hide_adult=hide_adult, category_id=category_id), "rb")
+    except Exception as e:
+        logger.error(f"XC {kind} catalog snapshot unavailable: {e}", exc_info=True)
+        return None
+
+    variant = _variant(kind, hide_adult, category_id)
+    origin_tag = hashlib.md5(origin.encode()).hexdigest()[:8]
+    etag = f'"{kind}-{version}-{variant}-{origin_tag}"'
+    if request.META.get("HTTP_IF_NONE_MATCH") == etag:
+        snapshot.close()
+        response = HttpResponseNotModified()
+    else:
+        response = StreamingHttpResponse(_stream_with_origin(snapshot, origin), content_type="application/json")
+    response["ETag"] = etag
+    return response
@@ -9,7 +9,6 @@ from drf_spectacular.utils import extend_schema, inline_serializer
 from django.core.cache import cache
 from django.conf import settings
 from django.core.files.uploadedfile import UploadedFile
-from django.http import FileResponse
 from django.utils import timezone
 import os
 import zipfile
@@ -21,6 +20,7 @@ from apps.accounts.permissions import (
     Authenticated,
     permission_classes_by_method,
 )
+from core.file_serving import serve_file
 from core.http_security import validate_outbound_http_url
 from dispatcharr.utils import network_access_allowed
 
@@ -534,7 +534,7 @@ class PluginLogoAPIView(APIView):
             return Response({"success": False, "error": "Invalid plugin path"}, status=status.HTTP_400_BAD_REQUEST)
         if not os.path.isfile(logo_path):
             return Response({"success": False, "error": "Logo not found"}, status=status.HTTP_404_NOT_FOUND)
-        return FileResponse(open(logo_path, "rb"), content_type="image/png")
+        return serve_file(request, logo_path, "image/png")
 
 
 class PluginDeleteAPIView(PluginAuthMixin, APIView):
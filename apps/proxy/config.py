@@ -15,6 +15,8 @@ class BaseConfig:
     BUFFER_CHUNK_SIZE = 188 * 1361  # ~256KB
     BUFFERING_TIMEOUT = 15  # Seconds to wait for buffering before switching streams
     BUFFER_SPEED = 1 # What speed to condsider the stream buffering, 1x is normal speed, 2x is double speed, etc.
+    BUFFER_MIN_TTL = 10  # Floor (seconds) for the budget-derived chunk retention window
+    BUFFER_BUDGET_INTERVAL = 5  # Seconds between bitrate samples / TTL rebalances per buffer
 
     # Cache for proxy settings (class-level, shared across all instances).
     # Backed by CoreSettings Redis group cache; this local copy avoids Redis
@@ -55,6 +57,9 @@ class BaseConfig:
                 "channel_init_grace_period": 60,
                 "channel_client_wait_period": 5,
                 "new_client_behind_seconds": 5,
+                "standby_channels": 0,
+                "standby_pinned_channels": "",
+                "stream_ordering": "static",
             }
 
         finally:
@@ -121,6 +126,24 @@ class TSConfig(BaseConfig):
     URL_SWITCH_TIMEOUT = 20   # Max time allowed for a stream switch operation
     MAX_KEEPALIVE_DURATION = 300         # Keepalive packets prevent _is_timeout() from firing, so without this a permanently failed stream holds clients open indefinitely.
 
+    # Owner handoff settings (worker recycle / graceful shutdown)
+    OWNER_HANDOFF_TIMEOUT = 15       # Max seconds an exiting owner keeps feeding the buffer while a peer takes over
+    OWNER_HANDOFF_CLAIM_TIMEOUT = 3  # Give up the handoff if no peer claims the channel within this time
+    OWNER_HANDOFF_READY_TIMEOUT = 10  # Seconds the new owner waits for its own upstream to produce data
+
+    # Tune latency tracing
+    TUNE_TRACE_MAXLEN = 5000  # Tunes kept in the trace stream for percentile stats (0 disables tracing)
+
+    # Warm standby pool
+    STANDBY_CHECK_INTERVAL = 30     # Seconds between standby pool reconciliations
+    STANDBY_MAX_STARTS = 2          # Standby channels started per reconciliation (avoids provider bursts)
+    STANDBY_SCORE_DECAY = 0.8       # Hourly multiplier applied to tune-frequency scores
+    STANDBY_COOLDOWN = 120          # Seconds a preempted or failed standby channel is not restarted
+
+    # Stream health (adaptive failover ordering)
+    STREAM_HEALTH_HALF_LIFE = 6 * 3600  # Seconds for connect/buffering history to lose half its weight
+    STREAM_HEALTH_TTL = 7 * 86400       # Seconds an untouched stream health record is kept
+
 
 
     # Database-dependent settings with fallbacks
@@ -154,6 +177,37 @@ class TSConfig(BaseConfig):
         settings = cls.get_proxy_settings()
         return settings.get("channel_client_wait_period", 5)
 
+    @classmethod
+    def get_standby_channels(cls):
+        """Number of most-tuned channels kept warm with no clients (0 = off)."""
+        settings = cls.get_proxy_settings()
+        try:
+            return max(0, int(settings.get("standby_channels", 0) or 0))
+        except (TypeError, ValueError):
+            return 0
+
+    @classmethod
+    def get_standby_pinned_channels(cls):
+        """Channel numbers always kept warm, parsed from a comma-separated list."""
+        settings = cls.get_proxy_settings()
+        raw = settings.get("standby_pinned_channels") or ""
+        if isinstance(raw, (list, tuple)):
+            raw = ",".join(str(value) for value in raw)
+        numbers = []
+        for part in str(raw).split(","):
+            try:
+                numbers.append(float(part.strip()))
+            except ValueError:
+                continue
+        return numbers
+
+    @classmethod
+    def get_stream_ordering(cls):
+        """Failover order: "static" (channel order) or "adaptive" (healthiest first)."""
+        settings = cls.get_proxy_settings()
+        ordering = settings.get("stream_ordering") or "static"
+        return ordering if ordering in ("static", "adaptive") else "static"
+
     # Dynamic property access for these settings
     @property
     def CHANNEL_SHUTDOWN_DELAY(self):
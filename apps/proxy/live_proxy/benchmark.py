@@ -0,0 +1,238 @@
+"""
+Synthetic-load benchmark for the live proxy data plane.
+
+A constant-bitrate MPEG-TS generator runs as a local HTTP upstream in a child
+process (so its CPU is not charged to the proxy). Each benchmark channel is
+started through ``ProxyServer.initialize_channel`` exactly like a real tune:
+a ``StreamManager`` thread reads the upstream into a ``StreamBuffer`` in
+Redis, and every client is a ``StreamGenerator`` consumed on its own thread.
+
+After a warmup the run measures, over a fixed window:
+
+* ingest: bytes committed to the Redis buffers, in MB/s;
+* delivery: per-client MB/s and inter-chunk gaps (jitter is the standard
+  deviation of the gaps; the p99 gap shows the worst stalls);
+* Redis: commands processed per second (server-wide ``INFO stats`` delta,
+  so use a Redis that is otherwise idle);
+* CPU: process CPU time per channel, as a percentage of one core.
+
+Run it with ``manage.py benchmark_live_proxy``. Benchmark channels get
+random ids and are stopped (and their Redis keys removed) when the run ends.
+"""
+
+import contextlib
+import math
+import multiprocessing
+import statistics
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from .constants import TS_PACKET_SIZE
+
+BENCHMARK_USER_AGENT = "Dispatcharr-Benchmark"
+BENCHMARK_PID = 0x100
+# 16 packets per PID make one full continuity-counter cycle, so blocks of a
+# multiple of 16 packets can be sent back to back without CC errors.
+PACKETS_PER_BLOCK = 16 * 8
+
+
+def ts_packet_block(packets=PACKETS_PER_BLOCK, pid=BENCHMARK_PID):
+    """``packets`` null-payload TS packets on ``pid`` with a valid continuity counter."""
+    payload = b"\xff" * (TS_PACKET_SIZE - 4)
+    block = bytearray()
+    for i in range(packets):
+        # sync byte, PID, payload-only adaptation control + continuity counter
+        block += bytes((0x47, (pid >> 8) & 0x1F, pid & 0xFF, 0x10 | (i % 16))) + payload
+    return bytes(block)
+
+
+class _ConstantBitrateHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.0"
+
+    def do_GET(self):
+        block = self.server.block
+        interval = len(block) * 8 / self.server.bitrate_bps
+        self.send_response(200)
+        self.send_header("Content-Type", "video/mp2t")
+        self.end_headers()
+        next_send = time.monotonic()
+        try:
+            while True:
+                self.wfile.write(block)
+                # Schedule against the start time so the rate does not drift.
+                next_send += interval
+                delay = next_send - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _serve_upstream(bitrate_bps, port_queue):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ConstantBitrateHandler)
+    server.daemon_threads = True
+    server.block = ts_packet_block()
+    server.bitrate_bps = bitrate_bps
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+class FakeTSUpstream:
+    """Constant-bitrate TS over HTTP from a child process; use as a context manager."""
+
+    def __init__(self, bitrate_kbps):
+        self.bitrate_bps = bitrate_kbps * 1000
+        self.port = None
+        self._process = None
+
+    def __enter__(self):
+        port_queue = multiprocessing.Queue()
+        self._process = multiprocessing.Process(
+            target=_serve_upstream, args=(self.bitrate_bps, port_queue), daemon=True
+        )
+        self._process.start()
+        self.port = port_queue.get(timeout=10)
+        return self
+
+    def __exit__(self, *exc):
+        self._process.terminate()
+        self._process.join(timeout=5)
+
+    def url(self, name):
+        return f"http://127.0.0.1:{self.port}/{name}.ts"
+
+
+class _Consumer(threading.Thread):
+    """Drains one client's stream generator, recording when each chunk arrived."""
+
+    def __init__(self, generate):
+        super().__init__(daemon=True)
+        self._generate = generate
+        self.arrivals = []
+
+    def run(self):
+        for chunk in self._generate():
+            self.arrivals.append((time.monotonic(), len(chunk)))
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of ``values``; 0.0 when empty."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
+
+
+def delivery_stats(arrivals, start, end):
+    """MB/s and inter-chunk gap statistics (ms) for arrivals inside [start, end]."""
+    window = [(at, size) for at, size in arrivals if start <= at <= end]
+    gaps = [(b[0] - a[0]) * 1000 for a, b in zip(window, window[1:])]
+    return {
+        "mb_per_s": sum(size for _, size in window) / 1e6 / (end - start),
+        "chunks": len(window),
+        "jitter_ms": statistics.pstdev(gaps) if len(gaps) > 1 else 0.0,
+        "gap_p99_ms": percentile(gaps, 0.99),
+        "gap_max_ms": max(gaps, default=0.0),
+    }
+
+
+@contextlib.contextmanager
+def _without_system_events():
+    # Benchmark channels are synthetic; keep them out of the system event log.
+    with contextlib.ExitStack() as stack:
+        for module in (
+            "apps.proxy.live_proxy.server",
+            "apps.proxy.live_proxy.input.manager",
+            "apps.proxy.live_proxy.output.ts.generator",
+        ):
+            stack.enter_context(mock.patch(f"{module}.log_system_event"))
+        yield
+
+
+def _redis_commands(redis_client):
+    return int(redis_client.info("stats")["total_commands_processed"])
+
+
+def run_benchmark(channels=1, clients=1, bitrate_kbps=5000, duration=30.0, warmup=10.0, log=None):
+    """Drive ``channels`` x ``clients`` streams for ``duration`` seconds and return the measurements."""
+    from .output.ts.generator import StreamGenerator
+    from .server import ProxyServer
+
+    log = log or (lambda message: None)
+    with FakeTSUpstream(bitrate_kbps) as upstream, _without_system_events():
+        proxy = ProxyServer.get_instance()
+        if proxy.redis_client is None:
+            raise RuntimeError("The live proxy benchmark needs Redis")
+
+        channel_ids = [str(uuid.uuid4()) for _ in range(channels)]
+        consumers = []
+        try:
+            for number, channel_id in enumerate(channel_ids, start=1):
+                name = f"Benchmark {number}"
+                if not proxy.initialize_channel(upstream.url(number), channel_id, channel_name=name):
+                    raise RuntimeError(f"Could not start benchmark channel {number}")
+                client_manager = proxy.client_managers[channel_id]
+                for index in range(clients):
+                    client_id = f"benchmark-{channel_id[:8]}-{index}"
+                    client_manager.add_client(client_id, "127.0.0.1", BENCHMARK_USER_AGENT)
+                    generator = StreamGenerator(
+                        channel_id,
+                        client_id,
+                        "127.0.0.1",
+                        BENCHMARK_USER_AGENT,
+                        channel_initializing=True,
+                        buffer=proxy.get_buffer(channel_id),
+                        channel_name=name,
+                    )
+                    consumer = _Consumer(generator.generate)
+                    consumer.start()
+                    consumers.append(consumer)
+            log(f"Started {channels} channel(s) with {clients} client(s) each at {bitrate_kbps} kbps; "
+                f"warming up for {warmup:.0f}s")
+
+            time.sleep(warmup)
+            buffers = [proxy.get_buffer(channel_id) for channel_id in channel_ids]
+            start_index = [buffer.index for buffer in buffers]
+            start_commands = _redis_commands(proxy.redis_client)
+            start_cpu = time.process_time()
+            start = time.monotonic()
+            log(f"Measuring for {duration:.0f}s")
+
+            time.sleep(duration)
+            end = time.monotonic()
+            cpu_seconds = time.process_time() - start_cpu
+            redis_commands = _redis_commands(proxy.redis_client) - start_commands
+            ingest_bytes = sum(
+                (buffer.index - index) * buffer.target_chunk_size
+                for buffer, index in zip(buffers, start_index)
+            )
+        finally:
+            for channel_id in channel_ids:
+                proxy.stop_channel(channel_id)
+            for consumer in consumers:
+                consumer.join(timeout=10)
+
+    elapsed = end - start
+    per_client = [delivery_stats(consumer.arrivals, start, end) for consumer in consumers]
+    return {
+        "channels": channels,
+        "clients_per_channel": clients,
+        "bitrate_kbps": bitrate_kbps,
+        "duration_s": round(elapsed, 2),
+        "expected_ingest_mb_per_s": round(channels * bitrate_kbps * 1000 / 8 / 1e6, 3),
+        "ingest_mb_per_s": round(ingest_bytes / 1e6 / elapsed, 3),
+        "delivered_mb_per_s": round(sum(c["mb_per_s"] for c in per_client), 3),
+        "client_mb_per_s_min": round(min((c["mb_per_s"] for c in per_client), default=0.0), 3),
+        "jitter_ms_median": round(statistics.median([c["jitter_ms"] for c in per_client] or [0.0]), 1),
+        "gap_p99_ms_max": round(max((c["gap_p99_ms"] for c in per_client), default=0.0), 1),
+        "stalled_clients": sum(1 for c in per_client if c["chunks"] == 0),
+        "redis_ops_per_s": round(redis_commands / elapsed, 1),
+        "cpu_percent_per_channel": round(cpu_seconds / elapsed / channels * 100, 2),
+        "cpu_percent_total": round(cpu_seconds / elapsed * 100, 2),
+    }
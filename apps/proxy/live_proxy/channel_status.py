@@ -6,6 +6,7 @@ from .constants import TS_PACKET_SIZE, ChannelMetadataField
 from redis.exceptions import ConnectionError, TimeoutError
 from .utils import get_logger
 from .client_manager import ClientManager
+from .input.budget import channel_buffer_bytes
 from django.db import DatabaseError, close_old_connections
 
 logger = get_logger()
@@ -294,6 +295,7 @@ class ChannelStatus:
         chunk_ttl_key = RedisKeys.buffer_chunk(channel_id, info['buffer_index'])
         chunk_ttl = proxy_server.redis_client.ttl(chunk_ttl_key)
         buffer_stats['latest_chunk_ttl'] = chunk_ttl
+        buffer_stats['buffer_bytes'] = channel_buffer_bytes(proxy_server.redis_client, channel_id)
 
         info['buffer_stats'] = buffer_stats
 
@@ -425,6 +427,7 @@ class ChannelStatus:
                 'client_count': client_count,
                 'uptime': uptime,
                 'started_at': created_at if created_at > 0 else None,
+                'buffer_bytes': channel_buffer_bytes(proxy_server.redis_client, channel_id),
             }
 
             channel_name = metadata.get(ChannelMetadataField.CHANNEL_NAME)
@@ -125,6 +125,41 @@ class ConfigHelper:
         """Seconds to keep a ready channel alive waiting for the first client to connect."""
         return Config.get_channel_client_wait_period()
 
+    @staticmethod
+    def tune_trace_maxlen():
+        """Tunes kept in the tune latency trace stream (0 disables tracing)"""
+        return ConfigHelper.get('TUNE_TRACE_MAXLEN', 5000)
+
+    @staticmethod
+    def stream_ordering():
+        """Failover order: "static" or "adaptive" (healthiest streams first)"""
+        return Config.get_stream_ordering()
+
+    @staticmethod
+    def standby_channels():
+        """Number of most-tuned channels kept warm with no clients (0 = off)"""
+        return Config.get_standby_channels()
+
+    @staticmethod
+    def standby_pinned_channels():
+        """Channel numbers always kept warm"""
+        return Config.get_standby_pinned_channels()
+
+    @staticmethod
+    def owner_handoff_timeout():
+        """Max seconds an exiting owner waits for a peer worker to take over its channels"""
+        return ConfigHelper.get('OWNER_HANDOFF_TIMEOUT', 15)
+
+    @staticmethod
+    def owner_handoff_claim_timeout():
+        """Seconds an exiting owner waits for any peer to claim a channel"""
+        return ConfigHelper.get('OWNER_HANDOFF_CLAIM_TIMEOUT', 3)
+
+    @staticmethod
+    def owner_handoff_ready_timeout():
+        """Seconds a new owner waits for its upstream to produce data before aborting"""
+        return ConfigHelper.get('OWNER_HANDOFF_READY_TIMEOUT', 10)
+
     @staticmethod
     def chunk_timeout():
         """
@@ -35,6 +35,7 @@ class EventType:
     CLIENT_STOP = "client_stop"
     ENSURE_OUTPUT_FORMAT = "ensure_output_format"
     ENSURE_OUTPUT_PROFILE = "ensure_output_profile"
+    OWNER_HANDOFF = "owner_handoff"
 
 # Stream types
 class StreamType:
@@ -68,6 +69,8 @@ class ChannelMetadataField:
     STATE_CHANGED_AT = "state_changed_at"
     INIT_TIME = "init_time"
     CONNECTION_READY_TIME = "connection_ready_time"
+    UPSTREAM_CONNECTED_TIME = "upstream_connected_time"
+    FIRST_DATA_TIME = "first_data_time"
 
     # Buffer and data tracking
     BUFFER_CHUNKS = "buffer_chunks"
@@ -0,0 +1,154 @@
+"""Redis memory budget for live input buffers.
+
+Every writing StreamBuffer meters its own bitrate and publishes it to one
+shared hash. From the sum of all fresh rates each buffer derives a common
+retention window, ``budget / total_rate`` seconds, clamped between
+``BUFFER_MIN_TTL`` and the configured ``redis_chunk_ttl``. New chunks are
+written with that TTL and older chunks beyond the window are trimmed, so a
+few high-bitrate channels shorten everyone's window a little instead of
+pinning gigabytes of Redis memory.
+"""
+
+import json
+import time
+
+from django.conf import settings
+
+from ..config_helper import ConfigHelper
+from ..redis_keys import RedisKeys
+from ..utils import get_logger
+
+logger = get_logger()
+
+# Entries not refreshed for this long belong to stopped buffers.
+STALE_AFTER = 30
+
+
+def budget_bytes():
+    """Global live-buffer budget in bytes; 0 disables adaptive TTLs."""
+    return max(0, int(getattr(settings, "LIVE_BUFFER_BUDGET_MB", 0) or 0)) * 1024 * 1024
+
+
+def retention_window(total_rate, max_ttl, budget, min_ttl):
+    """Seconds of buffer every channel may keep under ``budget`` bytes."""
+    if budget <= 0 or total_rate <= 0:
+        return max_ttl
+    window = int(budget / total_rate)
+    return max(min(min_ttl, max_ttl), min(max_ttl, window))
+
+
+def _decode_entry(raw):
+    if isinstance(raw, bytes):
+        raw = raw.decode()
+    try:
+        entry = json.loads(raw)
+    except (TypeError, ValueError):
+        return None
+    return entry if isinstance(entry, dict) else None
+
+
+def channel_buffer_bytes(redis_client, channel_id):
+    """Bytes currently held in Redis by a channel's input and output buffers."""
+    try:
+        entries = redis_client.hgetall(RedisKeys.buffer_budget())
+    except Exception as e:
+        logger.debug(f"Could not read buffer budget: {e}")
+        return None
+    now = time.time()
+    total = 0
+    for raw in entries.values():
+        entry = _decode_entry(raw)
+        if (
+            entry
+            and str(entry.get("channel_id")) == str(channel_id)
+            and now - entry.get("ts", 0) <= STALE_AFTER
+        ):
+            total += int(entry.get("bytes", 0))
+    return total
+
+
+class BufferBudget:
+    """Bitrate meter and TTL controller for one writing StreamBuffer."""
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.member = buffer.buffer_index_key
+        self.interval = ConfigHelper.get("BUFFER_BUDGET_INTERVAL", 5)
+        self.min_ttl = ConfigHelper.get("BUFFER_MIN_TTL", 10)
+        self.rate = 0.0
+        self._bytes = 0
+        self._since = time.time()
+
+    def record(self, nbytes):
+        self._bytes += nbytes
+
+    def due(self, now):
+        return now - self._since >= self.interval
+
+    def rebalance(self, now, max_ttl):
+        """Publish this buffer's rate, trim beyond the shared window, return the new TTL."""
+        redis_client = self.buffer.redis_client
+        elapsed = max(now - self._since, 0.001)
+        sample = self._bytes / elapsed
+        # Smooth over a few intervals so a keyframe burst does not swing every TTL.
+        self.rate = sample if not self.rate else 0.7 * self.rate + 0.3 * sample
+        self._bytes = 0
+        self._since = now
+
+        budget = budget_bytes()
+        budget_key = RedisKeys.buffer_budget()
+        try:
+            total_rate = self.rate
+            stale = []
+            for member, raw in redis_client.hgetall(budget_key).items():
+                member = member.decode() if isinstance(member, bytes) else member
+                if member == self.member:
+                    continue
+                entry = _decode_entry(raw)
+                if not entry or now - entry.get("ts", 0) > STALE_AFTER:
+                    stale.append(member)
+                    continue
+                total_rate += float(entry.get("rate", 0))
+
+            ttl = retention_window(total_rate, max_ttl, budget, self.min_ttl)
+
+            expired = []
+            pipe = redis_client.pipeline(transaction=False)
+            if stale:
+                pipe.hdel(budget_key, *stale)
+            timestamps_key = self.buffer.chunk_timestamps_key
+            if timestamps_key:
+                expired = redis_client.zrangebyscore(timestamps_key, "-inf", now - ttl)
+                if expired:
+                    pipe.delete(*(
+                        f"{self.buffer.buffer_prefix}{index.decode() if isinstance(index, bytes) else index}"
+                        for index in expired
+                    ))
+                    pipe.zremrangebyscore(timestamps_key, "-inf", now - ttl)
+                pipe.zcard(timestamps_key)
+            results = pipe.execute()
+            held_chunks = results[-1] if timestamps_key else 0
+
+            entry = {
+                "channel_id": str(self.buffer.channel_id),
+                "rate": round(self.rate, 1),
+                "ttl": ttl,
+                "bytes": int(held_chunks or 0) * self.buffer.target_chunk_size,
+                "ts": now,
+            }
+            redis_client.hset(budget_key, self.member, json.dumps(entry))
+            redis_client.expire(budget_key, STALE_AFTER * 4)
+            if expired:
+                logger.debug(
+                    f"Trimmed {len(expired)} chunks beyond {ttl}s window for channel {self.buffer.channel_id}"
+                )
+            return ttl
+        except Exception as e:
+            logger.debug(f"Buffer budget rebalance failed for channel {self.buffer.channel_id}: {e}")
+            return max_ttl
+
+    def release(self):
+        try:
+            self.buffer.redis_client.hdel(RedisKeys.buffer_budget(), self.member)
+        except Exception:
+            pass
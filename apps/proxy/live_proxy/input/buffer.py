@@ -5,6 +5,7 @@ import time
 import random
 from ..redis_keys import RedisKeys
 from ..config_helper import ConfigHelper
+from .budget import BufferBudget
 from ..constants import TS_PACKET_SIZE
 from ..utils import get_logger
 import gevent.event
@@ -27,6 +28,8 @@ class StreamBuffer:
         self.buffer_prefix = buffer_chunk_prefix or (RedisKeys.buffer_chunk_prefix(channel_id) if channel_id else "")
 
         self.chunk_ttl = ConfigHelper.redis_chunk_ttl()
+        # Created on first write so read-only worker buffers never publish a rate
+        self.budget = None
 
         # Initialize from Redis if available
         if self.redis_client and channel_id:
@@ -62,11 +65,20 @@ class StreamBuffer:
         self.fill_timers = []
         self.chunk_available = gevent.event.Event()
 
+        # Owner handoff standby: while set, the outgoing owner still writes the
+        # shared index, so incoming data is only used to prove the upstream works.
+        self.hold_writes = False
+        self.handoff_ready = threading.Event()
+
     def add_chunk(self, chunk):
         """Add data with optimized Redis storage and TS packet alignment"""
         if not chunk or self.stopping:
             return False
 
+        if self.hold_writes:
+            self.handoff_ready.set()
+            return True
+
         try:
             # Accumulate partial packets between chunks
             if not hasattr(self, '_partial_packet'):
@@ -121,6 +133,9 @@ class StreamBuffer:
                         self.index = chunk_index
                         writes_done += 1
 
+            if self.redis_client:
+                self._apply_budget(len(chunk))
+
             if writes_done > 0:
                 logger.debug(f"Added {writes_done} chunks ({self.target_chunk_size} bytes each) to Redis for channel {self.channel_id} at index {self.index}")
 
@@ -133,6 +148,15 @@ class StreamBuffer:
             logger.error(f"Error adding chunk to buffer: {e}")
             return False
 
+    def _apply_budget(self, nbytes):
+        """Meter the input rate and periodically re-derive chunk_ttl from the global budget."""
+        if self.budget is None:
+            self.budget = BufferBudget(self)
+        self.budget.record(nbytes)
+        now = time.time()
+        if self.budget.due(now):
+            self.chunk_ttl = self.budget.rebalance(now, ConfigHelper.redis_chunk_ttl())
+
     def reset_buffer_position(self):
         """
         Reset internal buffers for a clean stream transition (failover).
@@ -308,6 +332,9 @@ class StreamBuffer:
         # Clear timer list
         self.fill_timers.clear()
 
+        if self.budget is not None:
+            self.budget.release()
+
         try:
             with self.lock:
                 if hasattr(self, '_write_buffer') and len(self._write_buffer) > 0:
@@ -16,6 +16,7 @@ from ..utils import detect_stream_type, get_logger
 from ..redis_keys import RedisKeys
 from ..constants import ChannelState, EventType, StreamType, ChannelMetadataField, TS_PACKET_SIZE
 from ..config_helper import ConfigHelper
+from ..stream_health import record_buffering, record_connect, record_session
 from ..url_utils import get_alternate_streams, get_stream_info_for_switch, get_stream_object
 from ..utils import resolve_channel_display_name
 
@@ -62,6 +63,14 @@ class StreamManager:
         self.buffering_start_time = None
         # Store worker_id for ownership checks
         self.worker_id = worker_id
+        # Outgoing owner while this manager is the standby side of a handoff
+        self.handoff_from = None
+        # Startup phase boundaries already stamped for tune tracing
+        self._startup_marked = set()
+        # Current upstream attempt, fed to the stream health model
+        self._attempt_stream_id = None
+        self._attempt_started_at = None
+        self._first_data_at = None
 
         # Sockets used for transcode jobs
         self.socket = None
@@ -191,6 +200,35 @@ class StreamManager:
         self.retry_count = 0
         self._last_failure_time = None
 
+    def _mark_startup(self, field):
+        """Stamp a startup phase boundary in channel metadata, once per upstream."""
+        if field in self._startup_marked or self.handoff_from:
+            return
+        self._startup_marked.add(field)
+        redis_client = getattr(self.buffer, 'redis_client', None)
+        if not redis_client:
+            return
+        try:
+            redis_client.hset(
+                RedisKeys.channel_metadata(self.channel_id), field, str(time.time())
+            )
+        except Exception as e:
+            logger.debug(f"Could not stamp {field} for channel {self.channel_id}: {e}")
+
+    def _record_upstream_health(self):
+        """Feed the stream health model once an upstream connection attempt ends."""
+        redis_client = getattr(self.buffer, 'redis_client', None)
+        stream_id = self._attempt_stream_id
+        first_data_at, self._first_data_at = self._first_data_at, None
+        # A session ended by the last viewer leaving or stop_channel measures
+        # how long people watched, not how stable the upstream was.
+        if not redis_client or not stream_id or self.stop_requested or not self.running:
+            return
+        if first_data_at is not None:
+            record_session(redis_client, stream_id, time.time() - first_data_at)
+        else:
+            record_connect(redis_client, stream_id, success=False)
+
     def _note_stable_connection(self):
         """Reset stream-switch bookkeeping after sustained successful playback."""
         if self.current_stream_id:
@@ -294,7 +332,8 @@ class StreamManager:
         current_owner = self._decode_redis_value(current_owner)
 
         if current_owner and current_owner != self.worker_id:
-            return False
+            # Handoff standby: the previous owner keeps the key until cutover.
+            return bool(self.handoff_from) and current_owner == self.handoff_from
 
         if not current_owner:
             if client_count == 0 and state not in ChannelState.PRE_ACTIVE:
@@ -467,6 +506,9 @@ class StreamManager:
 
                     # Handle connection based on whether we transcode or not
                     connection_result = False
+                    self._attempt_stream_id = self.current_stream_id
+                    self._attempt_started_at = time.time()
+                    self._first_data_at = None
                     try:
                         if self.transcode:
                             connection_result = self._establish_transcode_connection()
@@ -476,6 +518,7 @@ class StreamManager:
                         if connection_result:
                             # Store connection start time to measure success duration
                             connection_start_time = time.time()
+                            self._mark_startup(ChannelMetadataField.UPSTREAM_CONNECTED_TIME)
 
                             # Log reconnection event if this is a retry (not first attempt)
                             if self.retry_count > 0:
@@ -499,6 +542,7 @@ class StreamManager:
 
                             if self.needs_stream_switch:
                                 logger.info(f"Stream needs to switch after {connection_duration:.1f} seconds for channel: {self.channel_id}")
+                                self._record_upstream_health()
                                 break  # Exit to switch streams
                             if connection_duration >= stable_threshold:
                                 logger.info(
@@ -508,6 +552,8 @@ class StreamManager:
                                 self._note_stable_connection()
                                 stream_switch_attempts = 0
 
+                        self._record_upstream_health()
+
                         # Connection failed or ended - decide what to do next
                         if self.stop_requested or not self.running:
                             # Normal shutdown requested
@@ -559,6 +605,7 @@ class StreamManager:
 
                     except Exception as e:
                         logger.error(f"Connection error on channel: {self.channel_id}: {e}", exc_info=True)
+                        self._record_upstream_health()
                         self.connected = False
                         failures = self._record_connection_failure()
 
@@ -1165,6 +1212,7 @@ class StreamManager:
                     self.buffering = True
                     self.buffering_start_time = time.time()
                     logger.warning(f"Buffering started for channel {self.channel_id} - speed: {ffmpeg_speed}x")
+                    record_buffering(getattr(self.buffer, 'redis_client', None), self.current_stream_id)
 
                     # Log system event for buffering
                     try:
@@ -1317,6 +1365,17 @@ class StreamManager:
                    and not self.needs_stream_switch and not self.needs_reconnect):
                 if self.fetch_chunk():
                     self.last_data_time = time.time()
+                    if ChannelMetadataField.FIRST_DATA_TIME not in self._startup_marked:
+                        self._mark_startup(ChannelMetadataField.FIRST_DATA_TIME)
+                    if self._first_data_at is None:
+                        self._first_data_at = self.last_data_time
+                        if self._attempt_started_at is not None:
+                            record_connect(
+                                getattr(self.buffer, 'redis_client', None),
+                                self._attempt_stream_id,
+                                success=True,
+                                ttfb=self._first_data_at - self._attempt_started_at,
+                            )
                 else:
                     # fetch_chunk() returned False - could be timeout, no data, or error
                     if not self.running:
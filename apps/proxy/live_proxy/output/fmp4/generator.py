@@ -18,6 +18,7 @@ from ...constants import ChannelMetadataField
 from .buffer import FMP4StreamBuffer
 from .manager import FMP4_STATE_ACTIVE, INIT_SEGMENT_TIMEOUT
 from ...config_helper import ConfigHelper
+from ...standby import is_standby_channel
 from ...utils import get_logger, resolve_channel_display_name
 
 logger = get_logger()
@@ -32,6 +33,7 @@ def create_fmp4_stream_generator(
     user=None,
     fmt='fmp4',
     channel_name=None,
+    trace=None,
 ):
     gen = FMP4StreamGenerator(
         channel_id,
@@ -42,6 +44,7 @@ def create_fmp4_stream_generator(
         user,
         fmt=fmt,
         channel_name=channel_name,
+        trace=trace,
     )
     return gen.generate
 
@@ -58,6 +61,7 @@ class FMP4StreamGenerator:
         user=None,
         fmt='fmp4',
         channel_name=None,
+        trace=None,
     ):
         self.channel_id = channel_id
         self.client_id = client_id
@@ -66,6 +70,7 @@ class FMP4StreamGenerator:
         self.channel_initializing = channel_initializing
         self.user = user
         self.fmt = fmt
+        self.trace = trace
         self.channel_name = resolve_channel_display_name(channel_id, channel_name=channel_name)
 
         self.stream_start_time = time.time()
@@ -124,6 +129,8 @@ class FMP4StreamGenerator:
                 return
             yield init_segment
             self.bytes_sent += len(init_segment)
+            if self.trace:
+                self.trace.finish(self.proxy_server.redis_client)
 
             # Main data loop
             for chunk in self._stream_data_generator():
@@ -372,6 +379,7 @@ class FMP4StreamGenerator:
                                 client_count <= 1
                                 and proxy_server.am_i_owner(self.channel_id)
                                 and ConfigHelper.channel_shutdown_delay() <= 0
+                                and not is_standby_channel(proxy_server.redis_client, self.channel_id)
                             ):
                                 try:
                                     try:
@@ -14,6 +14,7 @@ from ...utils import create_ts_packet, get_logger, resolve_channel_display_name
 from ...redis_keys import RedisKeys
 from ...constants import ChannelMetadataField
 from ...config_helper import ConfigHelper
+from ...standby import is_standby_channel
 
 logger = get_logger()
 
@@ -33,6 +34,7 @@ class StreamGenerator:
         user=None,
         buffer=None,
         channel_name=None,
+        trace=None,
     ):
         """
         Initialize the stream generator with client and channel details.
@@ -47,6 +49,7 @@ class StreamGenerator:
             buffer: Source StreamBuffer to read from. Resolved via ProxyServer.get_buffer()
                     before construction; passed in so the generator is buffer-agnostic.
             channel_name: Optional display name (avoids ORM during construction)
+            trace: Optional TuneTrace, recorded once the first chunk reaches the client
         """
         self.channel_id = channel_id
         self.client_id = client_id
@@ -55,6 +58,7 @@ class StreamGenerator:
         self.channel_initializing = channel_initializing
         self.user = user
         self._source_buffer = buffer
+        self.trace = trace
         self.channel_name = resolve_channel_display_name(channel_id, channel_name=channel_name)
 
         # Performance and state tracking
@@ -471,6 +475,8 @@ class StreamGenerator:
                 yield chunk
                 self.bytes_sent += len(chunk)
                 self.chunks_sent += 1
+                if self.trace and not self.trace.finished:
+                    self.trace.finish(proxy_server.redis_client)
                 logger.debug(f"[{self.client_id}] Sent chunk {self.chunks_sent} ({len(chunk)} bytes) for channel {self.channel_id} to client")
 
                 current_time = time.time()
@@ -612,7 +618,11 @@ class StreamGenerator:
                         client_count = proxy_server.client_managers[self.channel_id].get_total_client_count()
                         # Pool slots are global; the last client on any worker must release.
                         # During shutdown_delay, keep the slot until coordinated stop runs.
-                        if client_count <= 1 and ConfigHelper.channel_shutdown_delay() <= 0:
+                        if (
+                            client_count <= 1
+                            and ConfigHelper.channel_shutdown_delay() <= 0
+                            and not is_standby_channel(proxy_server.redis_client, self.channel_id)
+                        ):
                             try:
                                 try:
                                     obj = Channel.objects.get(uuid=self.channel_id)
@@ -665,6 +675,7 @@ def create_stream_generator(
     user=None,
     buffer=None,
     channel_name=None,
+    trace=None,
 ):
     """
     Factory function to create a new stream generator.
@@ -679,5 +690,6 @@ def create_stream_generator(
         user=user,
         buffer=buffer,
         channel_name=channel_name,
+        trace=trace,
     )
     return generator.generate
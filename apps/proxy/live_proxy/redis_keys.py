@@ -74,6 +74,51 @@ class RedisKeys:
         """Key for stream switch status"""
         return f"live:channel:{channel_id}:switch_status"
 
+    @staticmethod
+    def owner_handoff(channel_id):
+        """Hash tracking an in-flight ownership handoff (from/to worker, state)"""
+        return f"live:channel:{channel_id}:owner_handoff"
+
+    @staticmethod
+    def buffer_budget():
+        """Hash of per-buffer bitrate, TTL and held bytes for the live buffer memory budget"""
+        return "live:buffer:budget"
+
+    @staticmethod
+    def tune_traces():
+        """Capped stream of per-tune startup phase timings"""
+        return "live:tune_traces"
+
+    @staticmethod
+    def stream_health(stream_id):
+        """Hash of decaying connect/buffering/session statistics for one stream"""
+        return f"live:stream_health:{stream_id}"
+
+    @staticmethod
+    def standby_channels():
+        """Set of channel UUIDs kept warm by the standby pool"""
+        return "live:standby:channels"
+
+    @staticmethod
+    def standby_tune_scores():
+        """Sorted set of decaying tune counts per channel UUID"""
+        return "live:standby:tune_scores"
+
+    @staticmethod
+    def standby_leader():
+        """Worker ID reconciling the standby pool"""
+        return "live:standby:leader"
+
+    @staticmethod
+    def standby_decay():
+        """Marker set while the hourly tune-score decay is not yet due"""
+        return "live:standby:decay"
+
+    @staticmethod
+    def standby_cooldown(channel_id):
+        """Set after a standby channel was preempted or failed to start"""
+        return f"live:standby:cooldown:{channel_id}"
+
     @staticmethod
     def worker_heartbeat(worker_id):
         """Key for worker heartbeat"""
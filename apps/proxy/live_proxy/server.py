@@ -7,6 +7,7 @@ Handles live TS stream proxying with support for:
 - Connection state tracking
 """
 
+import atexit
 import threading
 import socket
 import random
@@ -27,6 +28,7 @@ from .output.profile.manager import OutputProfileManager, PROFILE_STATE_ACTIVE
 from .redis_keys import RedisKeys
 from .constants import ChannelState, EventType, StreamType, ChannelMetadataField, REDIS_TTL_DEFAULT
 from .config_helper import ConfigHelper
+from .standby import StandbyManager, is_standby_channel
 from .utils import get_logger
 
 logger = get_logger()
@@ -36,6 +38,22 @@ class ProxyServer:
     _instance = None
     _INITIALIZING = object()  # sentinel for gevent-safe singleton
 
+    # Claim an offered handoff: only the first peer wins, only for the offering owner.
+    _CLAIM_HANDOFF_LUA = """
+    if redis.call('HGET', KEYS[1], 'from') ~= ARGV[1] then return 0 end
+    if redis.call('HEXISTS', KEYS[1], 'to') == 1 then return 0 end
+    redis.call('HSET', KEYS[1], 'to', ARGV[2], 'state', 'claimed')
+    return 1
+    """
+
+    # Compare-and-set the owner key from the outgoing to the incoming worker.
+    _TRANSFER_OWNERSHIP_LUA = """
+    if redis.call('GET', KEYS[1]) ~= ARGV[1] then return 0 end
+    redis.call('SET', KEYS[1], ARGV[2], 'EX', tonumber(ARGV[3]))
+    redis.call('HSET', KEYS[2], 'state', 'transferred')
+    return 1
+    """
+
     @classmethod
     def get_instance(cls):
         inst = cls._instance
@@ -110,6 +128,12 @@ class ProxyServer:
         # Start event listener for Redis pubsub messages
         self._start_event_listener()
 
+        # Hand owned channels to a peer when this worker is recycled
+        self._register_shutdown_handoff()
+
+        # Keep the most-watched channels warm (uWSGI workers only, not Celery)
+        self._start_standby_manager()
+
     def _setup_redis_connection(self):
         """Setup Redis connection with retry logic"""
         # Try to use get_redis_client utility instead of direct connection
@@ -227,6 +251,11 @@ class ProxyServer:
                             channel_id = data.get("channel_id")
 
                             if channel_id and event_type:
+                                # Handoff offers are for peers, never the current owner
+                                if event_type == EventType.OWNER_HANDOFF:
+                                    self._on_owner_handoff(channel_id, data)
+                                    continue
+
                                 # For owner, update client status immediately
                                 if self.am_i_owner(channel_id):
                                     if event_type == EventType.CLIENT_CONNECTED:
@@ -567,6 +596,238 @@ class ProxyServer:
             logger.error(f"Error extending ownership: {e}")
             return False
 
+    def _start_standby_manager(self):
+        """Run the standby pool reconciler in streaming workers."""
+        try:
+            import uwsgi  # noqa: F401
+        except ImportError:
+            return
+        if self.redis_client:
+            StandbyManager(self).start()
+
+    def _register_shutdown_handoff(self):
+        """Run handoff_owned_channels() when uWSGI recycles this worker."""
+        try:
+            import uwsgi
+        except ImportError:
+            atexit.register(self.handoff_owned_channels)
+            return
+
+        previous = getattr(uwsgi, "atexit", None)
+
+        def _uwsgi_atexit():
+            try:
+                self.handoff_owned_channels()
+            finally:
+                if callable(previous):
+                    previous()
+
+        uwsgi.atexit = _uwsgi_atexit
+
+    def handoff_owned_channels(self, timeout=None):
+        """
+        Offer every owned channel with viewers to a peer worker before exiting.
+
+        The local upstream keeps feeding the shared buffer until the peer's own
+        upstream produces data and it swaps the owner key; only then are local
+        writes halted, so the buffer index continues without a gap or overlap.
+        Channels nobody claims fall back to the normal zombie-owner recovery.
+        Returns the channel ids that were handed off.
+        """
+        if not self.redis_client:
+            return []
+
+        offered = {}
+        for channel_id in list(self.stream_managers.keys()):
+            manager = self.stream_managers.get(channel_id)
+            try:
+                if not self.am_i_owner(channel_id) or channel_id in self._stopping_channels:
+                    continue
+                if not self.redis_client.scard(RedisKeys.clients(channel_id)):
+                    continue
+                if not self._offer_owner_handoff(channel_id, manager):
+                    continue
+                offered[channel_id] = time.time()
+            except Exception as e:
+                logger.error(f"Error offering handoff for channel {channel_id}: {e}")
+
+        if not offered:
+            return []
+
+        logger.info(f"Worker {self.worker_id} offering {len(offered)} channel(s) to peer workers")
+        timeout = ConfigHelper.owner_handoff_timeout() if timeout is None else timeout
+        claim_timeout = ConfigHelper.owner_handoff_claim_timeout()
+        deadline = time.time() + timeout
+        handed_off = []
+
+        while offered and time.time() < deadline:
+            for channel_id, offered_at in list(offered.items()):
+                try:
+                    handoff = self.redis_client.hgetall(RedisKeys.owner_handoff(channel_id))
+                    if handoff.get("state") == "transferred":
+                        self._release_handed_off_channel(channel_id)
+                        handed_off.append(channel_id)
+                        del offered[channel_id]
+                    elif not handoff.get("to") and time.time() - offered_at > claim_timeout:
+                        logger.warning(f"No peer worker claimed channel {channel_id}; giving up handoff")
+                        self.redis_client.delete(RedisKeys.owner_handoff(channel_id))
+                        del offered[channel_id]
+                except Exception as e:
+                    logger.error(f"Error waiting for handoff of channel {channel_id}: {e}")
+                    del offered[channel_id]
+            if offered:
+                time.sleep(0.1)
+
+        for channel_id in offered:
+            logger.warning(f"Handoff of channel {channel_id} did not complete within {timeout}s")
+
+        return handed_off
+
+    def _offer_owner_handoff(self, channel_id, manager):
+        """Record and publish a handoff offer; the payload lets a peer start the same upstream."""
+        url = getattr(manager, "url", None)
+        if not url:
+            return False
+
+        handoff_key = RedisKeys.owner_handoff(channel_id)
+        ttl = ConfigHelper.owner_handoff_timeout() + ConfigHelper.owner_handoff_ready_timeout() + 10
+        pipe = self.redis_client.pipeline()
+        pipe.delete(handoff_key)
+        pipe.hset(handoff_key, mapping={"from": self.worker_id, "state": "offered"})
+        pipe.expire(handoff_key, ttl)
+        pipe.execute()
+
+        payload = {
+            "event": EventType.OWNER_HANDOFF,
+            "channel_id": channel_id,
+            "worker_id": self.worker_id,
+            "url": url,
+            "user_agent": getattr(manager, "user_agent", None),
+            "transcode": bool(getattr(manager, "transcode", False)),
+            "stream_id": getattr(manager, "current_stream_id", None),
+            "timestamp": time.time(),
+        }
+        self.redis_client.publish(RedisKeys.events_channel(channel_id), json.dumps(payload))
+        logger.info(f"Offered ownership of channel {channel_id} to peer workers")
+        return True
+
+    def _release_handed_off_channel(self, channel_id):
+        """Stop local writes after a peer took ownership, without touching shared Redis state."""
+        self._signal_upstream_shutdown(channel_id)
+        try:
+            self.redis_client.hset(RedisKeys.owner_handoff(channel_id), "state", "released")
+        except Exception as e:
+            logger.error(f"Error marking handoff released for channel {channel_id}: {e}")
+        self._stop_local_stream_activity(channel_id)
+        logger.info(f"Handed off channel {channel_id}; local upstream stopped")
+
+    def _on_owner_handoff(self, channel_id, data):
+        """Event listener hook: start a takeover attempt for a peer's handoff offer."""
+        from_worker = data.get("worker_id")
+        if not from_worker or from_worker == self.worker_id:
+            return
+        if channel_id in self.stream_managers or channel_id in self._live_stream_managers:
+            return
+
+        thread = threading.Thread(
+            target=self._take_over_channel, args=(channel_id, from_worker, data), daemon=True
+        )
+        thread.name = f"handoff-{channel_id}"
+        thread.start()
+
+    def _take_over_channel(self, channel_id, from_worker, data):
+        """Claim a handoff, bring up a standby upstream, then swap ownership on first data."""
+        try:
+            # Peers already serving viewers of the channel claim first.
+            client_manager = self.client_managers.get(channel_id)
+            if client_manager is None or client_manager.get_client_count() == 0:
+                time.sleep(0.5)
+
+            handoff_key = RedisKeys.owner_handoff(channel_id)
+            claim = self.redis_client.register_script(self._CLAIM_HANDOFF_LUA)
+            if not claim(keys=[handoff_key], args=[from_worker, self.worker_id]):
+                return
+            logger.info(f"Worker {self.worker_id} claimed handoff of channel {channel_id} from {from_worker}")
+
+            buffer = self.stream_buffers.get(channel_id)
+            if buffer is None:
+                buffer = StreamBuffer(channel_id=channel_id, redis_client=RedisClient.get_buffer())
+                self.stream_buffers[channel_id] = buffer
+            buffer.handoff_ready.clear()
+            buffer.hold_writes = True
+
+            if channel_id not in self.client_managers:
+                self.client_managers[channel_id] = ClientManager(
+                    channel_id=channel_id, redis_client=self.redis_client, worker_id=self.worker_id
+                )
+
+            stream_manager = StreamManager(
+                channel_id,
+                data.get("url"),
+                buffer,
+                user_agent=data.get("user_agent"),
+                transcode=bool(data.get("transcode")),
+                stream_id=data.get("stream_id"),
+                worker_id=self.worker_id,
+                channel_name=self._channel_names.get(channel_id),
+            )
+            stream_manager.handoff_from = from_worker
+            self.stream_managers[channel_id] = stream_manager
+            self._live_stream_managers[channel_id] = stream_manager
+            thread = threading.Thread(target=stream_manager.run, daemon=True)
+            thread.name = f"stream-{channel_id}"
+            thread.start()
+
+            if not buffer.handoff_ready.wait(ConfigHelper.owner_handoff_ready_timeout()):
+                logger.warning(f"Standby upstream for channel {channel_id} produced no data; aborting handoff")
+                self._abort_take_over(channel_id, stream_manager)
+                return
+
+            transfer = self.redis_client.register_script(self._TRANSFER_OWNERSHIP_LUA)
+            transferred = transfer(
+                keys=[RedisKeys.channel_owner(channel_id), handoff_key],
+                args=[from_worker, self.worker_id, 30],
+            )
+            if not transferred:
+                logger.warning(f"Owner of channel {channel_id} changed during handoff; aborting")
+                self._abort_take_over(channel_id, stream_manager)
+                return
+
+            self.redis_client.hset(
+                RedisKeys.channel_metadata(channel_id), ChannelMetadataField.OWNER, self.worker_id
+            )
+
+            # Wait for the outgoing owner to halt its writes (or to die) before
+            # appending to the shared index, so chunks never interleave.
+            deadline = time.time() + ConfigHelper.owner_handoff_timeout()
+            while time.time() < deadline:
+                state = self.redis_client.hget(handoff_key, "state")
+                if state == "released" or not self.redis_client.exists(
+                    RedisKeys.worker_heartbeat(from_worker)
+                ):
+                    break
+                time.sleep(0.05)
+
+            buffer.reset_buffer_position()
+            buffer.hold_writes = False
+            stream_manager.handoff_from = None
+            self.redis_client.delete(handoff_key)
+            logger.info(f"Worker {self.worker_id} took over channel {channel_id} from {from_worker}")
+        except Exception as e:
+            logger.error(f"Error taking over channel {channel_id}: {e}", exc_info=True)
+        finally:
+            close_old_connections()
+
+    def _abort_take_over(self, channel_id, stream_manager):
+        """Drop a standby upstream; local clients keep reading the previous owner's chunks."""
+        stream_manager.stop()
+        self.stream_managers.pop(channel_id, None)
+        self._live_stream_managers.pop(channel_id, None)
+        buffer = self.stream_buffers.get(channel_id)
+        if buffer is not None:
+            buffer.hold_writes = False
+            buffer.stopping = False
+
     def initialize_channel(
         self,
         url,
@@ -1181,6 +1442,10 @@ class ProxyServer:
                         self.stop_output_profile(channel_id, pid)
 
             if total == 0:
+                if is_standby_channel(self.redis_client, channel_id):
+                    logger.debug(f"No clients left on standby channel {channel_id} - keeping it warm")
+                    return
+
                 logger.debug(f"No clients left after disconnect event - stopping channel {channel_id}")
 
                 shutdown_delay = ConfigHelper.channel_shutdown_delay()
@@ -1532,10 +1797,12 @@ class ProxyServer:
         channel_name = self._channel_names.pop(channel_id, None) or str(channel_id)
         runtime = None
         total_bytes = None
+        stream_id = None
         if self.redis_client:
             metadata_key = RedisKeys.channel_metadata(channel_id)
             metadata = self.redis_client.hgetall(metadata_key)
             if metadata:
+                stream_id = metadata.get(ChannelMetadataField.STREAM_ID) or None
                 if 'init_time' in metadata:
                     try:
                         init_time = float(metadata['init_time'])
@@ -1552,6 +1819,8 @@ class ProxyServer:
             'channel_name': channel_name,
             'runtime': runtime,
             'total_bytes': total_bytes,
+            # The stream's keys are gone by the time Connect delivers the event.
+            'stream_id': stream_id,
         }
 
     def _spawn_channel_stop_event(self, stop_event_data):
@@ -1948,6 +2217,12 @@ class ProxyServer:
                                                 start_time,
                                             )
                                         )
+                                        if (
+                                            should_stop
+                                            and reason == "client_wait"
+                                            and is_standby_channel(self.redis_client, channel_id)
+                                        ):
+                                            should_stop = False
                                         if should_stop:
                                             if reason == "client_wait":
                                                 time_since_ready = time.time() - connection_ready_time
@@ -1983,6 +2258,11 @@ class ProxyServer:
                                 disconnect_key = RedisKeys.last_client_disconnect(channel_id)
                                 disconnect_time = None
 
+                                # Standby channels stay up with no clients
+                                if is_standby_channel(self.redis_client, channel_id):
+                                    self.redis_client.delete(disconnect_key)
+                                    continue
+
                                 if self.redis_client:
                                     disconnect_value = self.redis_client.get(disconnect_key)
                                     if disconnect_value:
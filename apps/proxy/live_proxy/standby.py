@@ -0,0 +1,337 @@
+"""Warm standby pool for the most-watched live channels.
+
+When ``standby_channels`` is set, every tune bumps a decaying per-channel
+score. One worker at a time (a short Redis leader lease) reconciles the
+pool: the pinned channels plus the top-N by score are started with no
+clients, using only slots the provider profile has spare, and kept in
+``RedisKeys.standby_channels()``. Members of that set are exempt from the
+zero-client shutdown timers, so their buffers keep filling and a tune
+attaches to an already-hot channel.
+
+A standby channel never holds a slot a viewer needs: when ``get_stream``
+finds every candidate profile full it calls ``preempt_standby_channel``,
+which frees an idle standby slot on the spot and stops that channel in the
+background. Channels that fall out of the pool are simply removed from the
+set; the normal shutdown timers then stop them if nobody is watching.
+"""
+
+import threading
+import time
+
+import gevent
+from django.db import close_old_connections
+
+from .config_helper import ConfigHelper
+from .constants import ChannelMetadataField, ChannelState
+from .redis_keys import RedisKeys
+from .utils import get_logger
+
+logger = get_logger()
+
+# Scores below this after decay are dropped from the tune-frequency set.
+MIN_TUNE_SCORE = 0.05
+DECAY_PERIOD = 3600
+
+_RUNNING_STATES = ChannelState.PRE_ACTIVE | {ChannelState.ACTIVE}
+
+
+def _decode(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def record_tune(redis_client, channel_id):
+    """Count a tune towards the channel's standby score (no-op when the pool is off)."""
+    if not redis_client or ConfigHelper.standby_channels() <= 0:
+        return
+    try:
+        redis_client.zincrby(RedisKeys.standby_tune_scores(), 1, str(channel_id))
+    except Exception as e:
+        logger.debug(f"Could not record tune for channel {channel_id}: {e}")
+
+
+def is_standby_channel(redis_client, channel_id):
+    """True when the channel is kept warm by the standby pool."""
+    if not redis_client:
+        return False
+    try:
+        return bool(redis_client.sismember(RedisKeys.standby_channels(), str(channel_id)))
+    except Exception:
+        return False
+
+
+def channel_is_running(redis_client, channel_id):
+    state = _decode(redis_client.hget(RedisKeys.channel_metadata(channel_id), ChannelMetadataField.STATE))
+    return state in _RUNNING_STATES
+
+
+def preempt_standby_channel(profile_ids, redis_client, exclude_channel_id=None):
+    """
+    Give a viewer the slot of an idle standby channel on one of ``profile_ids``.
+
+    The slot is released immediately so the caller can reserve it again;
+    the standby channel itself is stopped in the background. Returns the
+    preempted channel UUID, or None when no standby channel qualified.
+    """
+    from apps.channels.models import Channel
+
+    try:
+        members = redis_client.smembers(RedisKeys.standby_channels())
+    except Exception as e:
+        logger.debug(f"Could not read standby channels: {e}")
+        return None
+
+    profile_ids = {int(profile_id) for profile_id in profile_ids}
+    for member in members:
+        channel_id = _decode(member)
+        if channel_id == str(exclude_channel_id):
+            continue
+        profile_id = _decode(
+            redis_client.hget(RedisKeys.channel_metadata(channel_id), ChannelMetadataField.M3U_PROFILE)
+        )
+        try:
+            if int(profile_id) not in profile_ids:
+                continue
+        except (TypeError, ValueError):
+            continue
+        if redis_client.scard(RedisKeys.clients(channel_id)):
+            continue
+        # SREM is the claim: concurrent tunes never preempt the same channel twice.
+        if not redis_client.srem(RedisKeys.standby_channels(), channel_id):
+            continue
+
+        redis_client.setex(
+            RedisKeys.standby_cooldown(channel_id),
+            ConfigHelper.get("STANDBY_COOLDOWN", 120),
+            str(time.time()),
+        )
+        channel = Channel.objects.filter(uuid=channel_id).first()
+        if channel is not None and channel.release_stream():
+            # The owner's teardown would otherwise release the same slot again
+            # through the metadata fallback in release_stream().
+            redis_client.hdel(
+                RedisKeys.channel_metadata(channel_id),
+                ChannelMetadataField.STREAM_ID,
+                ChannelMetadataField.M3U_PROFILE,
+            )
+        gevent.spawn(_stop_preempted_channel, channel_id)
+        logger.info(f"Preempted standby channel {channel_id} to free a slot on profile {profile_id}")
+        return channel_id
+
+    return None
+
+
+def _stop_preempted_channel(channel_id):
+    from .services.channel_service import ChannelService
+
+    try:
+        ChannelService.stop_channel(channel_id)
+    except Exception as e:
+        logger.error(f"Error stopping preempted standby channel {channel_id}: {e}")
+
+
+def decay_tune_scores(redis_client, factor):
+    """Multiply every tune score by ``factor`` and drop the ones that faded out."""
+    key = RedisKeys.standby_tune_scores()
+    redis_client.zunionstore(key, {key: factor})
+    redis_client.zremrangebyscore(key, "-inf", MIN_TUNE_SCORE)
+
+
+def desired_standby_channels(redis_client, limit, pinned_channel_ids=()):
+    """Pinned channels first, then the ``limit`` highest-scoring ones not in cooldown."""
+    desired = []
+    for channel_id in pinned_channel_ids:
+        channel_id = str(channel_id)
+        if channel_id not in desired and not redis_client.exists(RedisKeys.standby_cooldown(channel_id)):
+            desired.append(channel_id)
+
+    if limit > 0:
+        ranked = redis_client.zrevrange(RedisKeys.standby_tune_scores(), 0, limit + len(desired) * 2 + 10)
+        picked = 0
+        for member in ranked:
+            channel_id = _decode(member)
+            if picked >= limit:
+                break
+            if channel_id in desired or redis_client.exists(RedisKeys.standby_cooldown(channel_id)):
+                continue
+            desired.append(channel_id)
+            picked += 1
+    return desired
+
+
+class StandbyManager:
+    """Background reconciler that keeps the standby pool at its configured size."""
+
+    def __init__(self, proxy_server):
+        self.server = proxy_server
+        self.redis_client = proxy_server.redis_client
+        self.interval = ConfigHelper.get("STANDBY_CHECK_INTERVAL", 30)
+
+    def start(self):
+        thread = threading.Thread(target=self._run, daemon=True)
+        thread.name = "ts-proxy-standby"
+        thread.start()
+        logger.info(f"Started standby pool thread (interval: {self.interval}s)")
+
+    def _run(self):
+        while True:
+            try:
+                close_old_connections()
+                self.reconcile()
+            except Exception as e:
+                logger.error(f"Error in standby pool reconciliation: {e}", exc_info=True)
+            gevent.sleep(self.interval)
+
+    def _is_leader(self):
+        key = RedisKeys.standby_leader()
+        ttl = self.interval * 3
+        worker_id = self.server.worker_id
+        if self.redis_client.set(key, worker_id, nx=True, ex=ttl):
+            return True
+        if _decode(self.redis_client.get(key)) == worker_id:
+            self.redis_client.expire(key, ttl)
+            return True
+        return False
+
+    def _pinned_channel_ids(self):
+        from apps.channels.models import Channel
+
+        numbers = ConfigHelper.standby_pinned_channels()
+        if not numbers:
+            return []
+        rows = Channel.objects.filter(channel_number__in=numbers).values_list("channel_number", "uuid")
+        by_number = {}
+        for number, channel_uuid in rows:
+            by_number.setdefault(number, str(channel_uuid))
+        return [by_number[number] for number in numbers if number in by_number]
+
+    def reconcile(self):
+        """One pass: decay scores, drop stale members, start missing channels."""
+        if not self.redis_client:
+            return
+        limit = ConfigHelper.standby_channels()
+        pinned = self._pinned_channel_ids()
+        pool_key = RedisKeys.standby_channels()
+
+        if limit <= 0 and not pinned:
+            # Pool switched off: released channels fall back to the normal timers.
+            self.redis_client.delete(pool_key)
+            return
+        if not self._is_leader():
+            return
+
+        if self.redis_client.set(RedisKeys.standby_decay(), "1", nx=True, ex=DECAY_PERIOD):
+            decay_tune_scores(self.redis_client, ConfigHelper.get("STANDBY_SCORE_DECAY", 0.8))
+
+        desired = desired_standby_channels(self.redis_client, limit, pinned)
+        members = {_decode(member) for member in self.redis_client.smembers(pool_key)}
+
+        for channel_id in members:
+            if channel_id not in desired:
+                self.redis_client.srem(pool_key, channel_id)
+                logger.info(f"Channel {channel_id} left the standby pool")
+            elif not channel_is_running(self.redis_client, channel_id):
+                # Stopped or failed upstream; retry after the cooldown.
+                self.redis_client.srem(pool_key, channel_id)
+                self._cool_down(channel_id)
+
+        starts = 0
+        max_starts = ConfigHelper.get("STANDBY_MAX_STARTS", 2)
+        for channel_id in desired:
+            if self.redis_client.sismember(pool_key, channel_id):
+                continue
+            if channel_is_running(self.redis_client, channel_id):
+                # Already up for a viewer: keep it warm when they leave.
+                self.redis_client.sadd(pool_key, channel_id)
+                continue
+            if starts >= max_starts:
+                continue
+            starts += 1
+            self.start_standby_channel(channel_id)
+
+    def _cool_down(self, channel_id):
+        self.redis_client.setex(
+            RedisKeys.standby_cooldown(channel_id),
+            ConfigHelper.get("STANDBY_COOLDOWN", 120),
+            str(time.time()),
+        )
+
+    def start_standby_channel(self, channel_id):
+        """Start a channel with no clients on a spare slot; never preempts anyone."""
+        from apps.channels.models import Channel
+        from .services.channel_service import ChannelService
+        from .url_utils import generate_stream_url
+
+        channel = Channel.objects.filter(uuid=channel_id).first()
+        if channel is None:
+            self.redis_client.zrem(RedisKeys.standby_tune_scores(), channel_id)
+            return False
+        if channel.get_stream_profile().is_redirect():
+            # Redirect profiles have no proxy buffer to keep warm.
+            self._cool_down(channel_id)
+            return False
+
+        server = self.server
+        init_lock = server._get_channel_init_lock(channel_id)
+        init_lock.acquire()
+        try:
+            if channel_id in server._channels_setting_up or not server.try_acquire_ownership(channel_id):
+                return False
+            server._channels_setting_up.add(channel_id)
+        finally:
+            server._finish_channel_init_lock(channel_id, init_lock)
+
+        started = False
+        slot_reserved = False
+        try:
+            (
+                stream_url,
+                stream_user_agent,
+                transcode,
+                profile_value,
+                slot_reserved,
+                error_reason,
+            ) = generate_stream_url(channel_id, standby=True)
+            if stream_url is None:
+                logger.debug(f"No spare slot to keep channel {channel_id} on standby: {error_reason}")
+                self._cool_down(channel_id)
+                return False
+
+            stream_id = m3u_profile_id = None
+            stream_id_value = self.redis_client.get(f"channel_stream:{channel.id}")
+            if stream_id_value:
+                stream_id = int(stream_id_value)
+                profile_id_value = self.redis_client.get(f"stream_profile:{stream_id}")
+                if profile_id_value:
+                    m3u_profile_id = int(profile_id_value)
+
+            # Join the pool before the channel exists so no shutdown timer sees it unprotected.
+            self.redis_client.sadd(RedisKeys.standby_channels(), channel_id)
+            started = ChannelService.initialize_channel(
+                channel_id,
+                stream_url,
+                stream_user_agent,
+                transcode,
+                profile_value,
+                stream_id,
+                m3u_profile_id,
+                channel_name=channel.name,
+            )
+            if started:
+                logger.info(f"Started standby channel {channel_id} ({channel.name})")
+            else:
+                self.redis_client.srem(RedisKeys.standby_channels(), channel_id)
+                self._cool_down(channel_id)
+                if slot_reserved and not channel.release_stream():
+                    logger.debug(f"release_stream found no keys after failed standby start of {channel_id}")
+            return started
+        except Exception as e:
+            logger.error(f"Error starting standby channel {channel_id}: {e}")
+            self.redis_client.srem(RedisKeys.standby_channels(), channel_id)
+            self._cool_down(channel_id)
+            if slot_reserved:
+                channel.release_stream()
+            return False
+        finally:
+            server._clear_channel_setting_up(channel_id)
+            if not started:
+                server.release_ownership(channel_id, signal_stopping=False)
@@ -0,0 +1,201 @@
+"""Per-stream health used to order failover candidates.
+
+Every upstream connect attempt, first-byte latency, buffering episode and
+finished session updates a small Redis hash per stream
+(``RedisKeys.stream_health``) in one Lua script, so concurrent workers
+never overwrite each other's samples. Counters decay exponentially with
+``STREAM_HEALTH_HALF_LIFE`` so a source that failed all morning recovers
+its standing once it behaves again; latency and session length are
+exponential moving averages.
+
+With the ``stream_ordering`` proxy setting on "adaptive", ``get_stream``
+and the failover path try streams by health bucket first and keep the
+channel's own order inside a bucket, so similarly healthy streams are
+never reshuffled.
+"""
+
+import time
+import weakref
+
+from .config_helper import ConfigHelper
+from .redis_keys import RedisKeys
+from .utils import get_logger
+
+logger = get_logger()
+
+# Weight of the newest sample in the time-to-first-byte / session averages.
+EWMA_ALPHA = 0.3
+# Health scores are compared in buckets this wide; ties keep channel order.
+SCORE_BUCKETS = 5
+SLOW_START_SECONDS = 10.0
+LONG_SESSION_SECONDS = 600.0
+
+
+def adaptive_ordering_enabled():
+    return ConfigHelper.stream_ordering() == "adaptive"
+
+
+def _decode(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _parse(raw):
+    health = {}
+    for field, value in (raw or {}).items():
+        try:
+            health[_decode(field)] = float(_decode(value))
+        except (TypeError, ValueError):
+            continue
+    return health
+
+
+# Decays the counters, then applies (op, field, value) triples from ARGV[5:]:
+# "incr" adds to a counter, "ewma" folds a sample into a moving average.
+_UPDATE_LUA = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local alpha = tonumber(ARGV[4])
+local updated = tonumber(redis.call('HGET', key, 'updated')) or now
+local factor = 0.5 ^ (math.max(0, now - updated) / tonumber(ARGV[2]))
+
+local values = {}
+local counters = {'attempts', 'successes', 'buffering'}
+local current = redis.call('HMGET', key, unpack(counters))
+for i, field in ipairs(counters) do
+    values[field] = (tonumber(current[i]) or 0) * factor
+end
+for i = 5, #ARGV, 3 do
+    local op, field, sample = ARGV[i], ARGV[i + 1], tonumber(ARGV[i + 2])
+    if op == 'incr' then
+        values[field] = values[field] + sample
+    else
+        local previous = tonumber(redis.call('HGET', key, field))
+        values[field] = previous and ((1 - alpha) * previous + alpha * sample) or sample
+    end
+end
+values['updated'] = now
+
+for field, value in pairs(values) do
+    redis.call('HSET', key, field, string.format('%.4f', value))
+end
+redis.call('EXPIRE', key, tonumber(ARGV[3]))
+return 1
+"""
+
+
+# Script objects per Redis client, registered on first use.
+_update_scripts = weakref.WeakKeyDictionary()
+
+
+def _update_script(redis_client):
+    script = _update_scripts.get(redis_client)
+    if script is None:
+        script = _update_scripts[redis_client] = redis_client.register_script(_UPDATE_LUA)
+    return script
+
+
+def _update(redis_client, stream_id, ops):
+    if not redis_client or not stream_id:
+        return
+    args = [
+        time.time(),
+        ConfigHelper.get("STREAM_HEALTH_HALF_LIFE", 6 * 3600),
+        ConfigHelper.get("STREAM_HEALTH_TTL", 7 * 86400),
+        EWMA_ALPHA,
+    ]
+    for op in ops:
+        args.extend(op)
+    try:
+        _update_script(redis_client)(keys=[RedisKeys.stream_health(stream_id)], args=args)
+    except Exception as e:
+        logger.debug(f"Could not update health for stream {stream_id}: {e}")
+
+
+def record_connect(redis_client, stream_id, success, ttfb=None):
+    """Count one upstream connect attempt; ``ttfb`` is seconds until the first data."""
+    ops = [("incr", "attempts", 1)]
+    if success:
+        ops.append(("incr", "successes", 1))
+        if ttfb is not None:
+            ops.append(("ewma", "ttfb", max(0.0, ttfb)))
+    _update(redis_client, stream_id, ops)
+
+
+def record_buffering(redis_client, stream_id):
+    _update(redis_client, stream_id, [("incr", "buffering", 1)])
+
+
+def record_session(redis_client, stream_id, duration):
+    """Fold the length of a finished upstream session into the session average."""
+    _update(redis_client, stream_id, [("ewma", "session", max(0.0, duration))])
+
+
+def get_health(redis_client, stream_ids):
+    """``{stream_id: health dict}`` for ``stream_ids`` in one round trip."""
+    stream_ids = list(stream_ids)
+    if not redis_client or not stream_ids:
+        return {}
+    pipe = redis_client.pipeline(transaction=False)
+    for stream_id in stream_ids:
+        pipe.hgetall(RedisKeys.stream_health(stream_id))
+    return {stream_id: _parse(raw) for stream_id, raw in zip(stream_ids, pipe.execute())}
+
+
+def health_score(health):
+    """
+    0..1 estimate of how well a stream starts and plays.
+
+    Connect success uses a uniform prior, so a stream with no history
+    scores 0.5 and a single failure or success moves it only one bucket.
+    Slow starts, buffering per successful connect and short sessions
+    discount that rate.
+    """
+    attempts = health.get("attempts", 0.0)
+    successes = min(health.get("successes", 0.0), attempts)
+    score = (successes + 1) / (attempts + 2)
+
+    ttfb = health.get("ttfb")
+    if ttfb is not None:
+        score *= 1 - 0.5 * min(ttfb, SLOW_START_SECONDS) / SLOW_START_SECONDS
+
+    buffering = health.get("buffering", 0.0)
+    if buffering:
+        score /= 1 + buffering / max(successes, 1.0)
+
+    session = health.get("session")
+    if session is not None:
+        score *= 0.75 + 0.25 * min(session / LONG_SESSION_SECONDS, 1.0)
+    return score
+
+
+def _bucket(health):
+    return min(int(health_score(health) * SCORE_BUCKETS), SCORE_BUCKETS - 1)
+
+
+def order_stream_ids(stream_ids, redis_client):
+    """``stream_ids`` healthiest bucket first; original order within a bucket."""
+    stream_ids = list(stream_ids)
+    try:
+        health = get_health(redis_client, dict.fromkeys(stream_ids))
+    except Exception as e:
+        logger.debug(f"Could not read stream health: {e}")
+        return stream_ids
+    # sorted() is stable, so streams in the same bucket keep their order.
+    return sorted(stream_ids, key=lambda stream_id: -_bucket(health.get(stream_id, {})))
+
+
+def order_candidates(candidates, redis_client):
+    """Reorder routing-table candidates by stream health, keeping each stream's profile order."""
+    by_stream = {}
+    for candidate in candidates:
+        by_stream.setdefault(candidate[0], []).append(candidate)
+    ordered = []
+    for stream_id in order_stream_ids(by_stream, redis_client):
+        ordered.extend(by_stream[stream_id])
+    return ordered
+
+
+def order_alternates(alternate_streams, redis_client):
+    """Reorder ``get_alternate_streams`` entries by stream health."""
+    by_stream = {entry["stream_id"]: entry for entry in alternate_streams}
+    return [by_stream[stream_id] for stream_id in order_stream_ids(by_stream, redis_client)]
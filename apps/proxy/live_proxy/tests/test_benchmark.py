@@ -0,0 +1,61 @@
+"""
+Live proxy benchmark harness: the synthetic TS upstream and the delivery
+statistics it reports.
+"""
+
+import time
+import urllib.request
+
+from django.test import SimpleTestCase
+
+from apps.proxy.live_proxy.benchmark import (
+    BENCHMARK_PID,
+    PACKETS_PER_BLOCK,
+    FakeTSUpstream,
+    delivery_stats,
+    percentile,
+    ts_packet_block,
+)
+from apps.proxy.live_proxy.constants import TS_PACKET_SIZE
+
+
+class TSPacketBlockTests(SimpleTestCase):
+    def test_packets_are_aligned_with_a_continuous_counter(self):
+        block = ts_packet_block()
+        self.assertEqual(len(block), PACKETS_PER_BLOCK * TS_PACKET_SIZE)
+
+        packets = [block[i:i + TS_PACKET_SIZE] for i in range(0, len(block), TS_PACKET_SIZE)]
+        self.assertTrue(all(packet[0] == 0x47 for packet in packets))
+        self.assertTrue(all(((p[1] & 0x1F) << 8 | p[2]) == BENCHMARK_PID for p in packets))
+        counters = [packet[3] & 0x0F for packet in packets + packets[:1]]
+        self.assertTrue(all((b - a) % 16 == 1 for a, b in zip(counters, counters[1:])))
+
+
+class DeliveryStatsTests(SimpleTestCase):
+    def test_percentile(self):
+        self.assertEqual(percentile([], 0.99), 0.0)
+        self.assertEqual(percentile([5, 1, 3, 2, 4], 0.5), 3)
+        self.assertEqual(percentile(range(1, 101), 0.99), 99)
+
+    def test_stats_cover_only_the_window(self):
+        arrivals = [(0.5, 999), (1.0, 1_000_000), (2.0, 1_000_000), (3.5, 1_000_000), (9.0, 999)]
+        stats = delivery_stats(arrivals, 1.0, 4.0)
+
+        self.assertEqual(stats["chunks"], 3)
+        self.assertAlmostEqual(stats["mb_per_s"], 1.0)
+        self.assertAlmostEqual(stats["jitter_ms"], 250.0)
+        self.assertAlmostEqual(stats["gap_max_ms"], 1500.0)
+
+
+class FakeTSUpstreamTests(SimpleTestCase):
+    def test_serves_ts_at_the_configured_rate(self):
+        with FakeTSUpstream(bitrate_kbps=8000) as upstream:
+            with urllib.request.urlopen(upstream.url(1), timeout=5) as response:
+                started = time.monotonic()
+                data = response.read(TS_PACKET_SIZE * 5000)
+                elapsed = time.monotonic() - started
+
+        self.assertEqual(data[0], 0x47)
+        self.assertEqual(len(data), TS_PACKET_SIZE * 5000)
+        # 0.94 MB at 1 MB/s; allow for the first block going out immediately.
+        self.assertGreater(elapsed, 0.8)
@@ -0,0 +1,79 @@
+"""
+Live buffer memory budget: chunk TTLs shrink with total bitrate, chunks
+beyond the shared window are trimmed, and held bytes are reported.
+"""
+
+import json
+import time
+from unittest.mock import MagicMock
+
+from django.test import SimpleTestCase, override_settings
+
+from apps.proxy.live_proxy.input import budget
+from apps.proxy.live_proxy.input.buffer import StreamBuffer
+from apps.proxy.live_proxy.redis_keys import RedisKeys
+
+CHANNEL_ID = "11111111-2222-3333-4444-555555555555"
+MB = 1024 * 1024
+
+
+class RetentionWindowTests(SimpleTestCase):
+    def test_window_is_budget_over_total_rate_within_bounds(self):
+        self.assertEqual(budget.retention_window(10 * MB, 60, 200 * MB, 10), 20)
+        self.assertEqual(budget.retention_window(1 * MB, 60, 200 * MB, 10), 60)
+        self.assertEqual(budget.retention_window(100 * MB, 60, 200 * MB, 10), 10)
+
+    def test_disabled_budget_keeps_configured_ttl(self):
+        self.assertEqual(budget.retention_window(100 * MB, 60, 0, 10), 60)
+
+
+@override_settings(LIVE_BUFFER_BUDGET_MB=100)
+class RebalanceTests(SimpleTestCase):
+    def _buffer(self, redis):
+        redis.get.return_value = None
+        buffer = StreamBuffer(CHANNEL_ID, redis_client=redis)
+        buffer.target_chunk_size = MB
+        return buffer
+
+    def test_shared_rate_shortens_ttl_and_trims_old_chunks(self):
+        now = time.time()
+        redis = MagicMock()
+        redis.hgetall.return_value = {
+            b"live:channel:other:input:buffer:index": json.dumps(
+                {"channel_id": "other", "rate": 4 * MB, "ttl": 60, "bytes": 0, "ts": now}
+            ).encode(),
+            b"live:channel:gone:input:buffer:index": json.dumps(
+                {"channel_id": "gone", "rate": 50 * MB, "ttl": 60, "bytes": 0, "ts": now - 120}
+            ).encode(),
+        }
+        redis.zrangebyscore.return_value = [b"7", b"8"]
+        pipe = redis.pipeline.return_value
+        pipe.execute.return_value = [1, 2, 2, 3]
+        buffer = self._buffer(redis)
+        meter = budget.BufferBudget(buffer)
+        meter._since = now - 5
+        meter.record(5 * MB)  # 1 MB/s of our own
+
+        ttl = meter.rebalance(now, max_ttl=60)
+
+        self.assertEqual(ttl, 20)  # 100 MB / (1 + 4) MB/s; stale 50 MB/s ignored
+        pipe.hdel.assert_called_once_with(
+            RedisKeys.buffer_budget(), "live:channel:gone:input:buffer:index"
+        )
+        pipe.delete.assert_called_once_with(
+            f"{buffer.buffer_prefix}7", f"{buffer.buffer_prefix}8"
+        )
+        member, payload = redis.hset.call_args.args[1:]
+        self.assertEqual(member, buffer.buffer_index_key)
+        self.assertEqual(json.loads(payload)["bytes"], 3 * MB)
+
+    def test_channel_buffer_bytes_sums_fresh_entries_for_channel(self):
+        now = time.time()
+        redis = MagicMock()
+        redis.hgetall.return_value = {
+            "input": json.dumps({"channel_id": CHANNEL_ID, "bytes": 5 * MB, "ts": now}),
+            "profile": json.dumps({"channel_id": CHANNEL_ID, "bytes": 2 * MB, "ts": now}),
+            "stale": json.dumps({"channel_id": CHANNEL_ID, "bytes": 9 * MB, "ts": now - 600}),
+            "other": json.dumps({"channel_id": "other", "bytes": 9 * MB, "ts": now}),
+        }
+        self.assertEqual(budget.channel_buffer_bytes(redis, CHANNEL_ID), 7 * MB)
@@ -47,6 +47,11 @@ def _make_manager(**overrides):
     sm.tried_stream_ids = {100}
     sm.last_data_time = 0.0
     sm._buffer_check_timers = []
+    sm._startup_marked = set()
+    sm._attempt_stream_id = None
+    sm._attempt_started_at = None
+    sm._first_data_at = None
+    sm.handoff_from = None
     sm.transcode_process_active = False
     sm.buffer = _Buffer()
     for key, value in overrides.items():
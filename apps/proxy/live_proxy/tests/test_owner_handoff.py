@@ -0,0 +1,161 @@
+"""
+Owner handoff on worker recycle: the exiting owner keeps feeding the shared
+buffer until a peer's upstream produces data and swaps the owner key, and
+only one worker ever appends to the buffer index at a time.
+"""
+
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase
+
+from apps.proxy.live_proxy.constants import EventType
+from apps.proxy.live_proxy.redis_keys import RedisKeys
+from apps.proxy.live_proxy.tests.test_ghost_session_cleanup import (
+    CHANNEL_ID,
+    make_proxy_server,
+)
+
+
+class StandbyBufferTests(SimpleTestCase):
+    def test_held_writes_signal_ready_without_touching_index(self):
+        from apps.proxy.live_proxy.input.buffer import StreamBuffer
+
+        redis = MagicMock()
+        redis.get.return_value = "41"
+        buffer = StreamBuffer(CHANNEL_ID, redis_client=redis)
+        buffer.hold_writes = True
+
+        self.assertTrue(buffer.add_chunk(b"\x47" * 188 * 10))
+        self.assertTrue(buffer.handoff_ready.is_set())
+        redis.incr.assert_not_called()
+        self.assertEqual(buffer.index, 41)
+
+
+class StandbyOwnershipTests(SimpleTestCase):
+    def _manager(self, handoff_from):
+        from apps.proxy.live_proxy.input.manager import StreamManager
+
+        manager = StreamManager.__new__(StreamManager)
+        manager.channel_id = CHANNEL_ID
+        manager.worker_id = "peer:2"
+        manager.handoff_from = handoff_from
+        return manager
+
+    def _redis(self, owner):
+        redis = MagicMock()
+        redis.pipeline.return_value.execute.return_value = [
+            0, 1, 3, owner, None, "active",
+        ]
+        return redis
+
+    def test_standby_tolerates_outgoing_owner(self):
+        manager = self._manager("old:1")
+        self.assertTrue(manager._evaluate_ownership_from_redis(self._redis("old:1")))
+        self.assertFalse(manager._evaluate_ownership_from_redis(self._redis("other:3")))
+
+    def test_regular_manager_still_yields_to_other_owner(self):
+        manager = self._manager(None)
+        self.assertFalse(manager._evaluate_ownership_from_redis(self._redis("old:1")))
+
+
+class HandoffOwnedChannelsTests(SimpleTestCase):
+    def _server(self, redis):
+        server = make_proxy_server(redis)
+        server.stream_managers[CHANNEL_ID] = MagicMock(
+            url="http://provider/live.ts", user_agent="VLC", transcode=False,
+            current_stream_id=9,
+        )
+        server._release_handed_off_channel = MagicMock()
+        return server
+
+    @patch("apps.proxy.live_proxy.server.time.sleep")
+    def test_releases_channel_once_peer_transferred_ownership(self, _mock_sleep):
+        redis = MagicMock()
+        redis.get.return_value = "test-host:1"
+        redis.scard.return_value = 2
+        redis.hgetall.side_effect = [
+            {"from": "test-host:1", "to": "peer:2", "state": "claimed"},
+            {"from": "test-host:1", "to": "peer:2", "state": "transferred"},
+        ]
+        server = self._server(redis)
+
+        self.assertEqual(server.handoff_owned_channels(timeout=5), [CHANNEL_ID])
+        server._release_handed_off_channel.assert_called_once_with(CHANNEL_ID)
+        channel, message = redis.publish.call_args.args
+        self.assertEqual(channel, RedisKeys.events_channel(CHANNEL_ID))
+        self.assertIn(EventType.OWNER_HANDOFF, message)
+        self.assertIn("http://provider/live.ts", message)
+
+    @patch("apps.proxy.live_proxy.server.ConfigHelper.owner_handoff_claim_timeout", return_value=0)
+    @patch("apps.proxy.live_proxy.server.time.sleep")
+    def test_unclaimed_offer_is_withdrawn(self, _mock_sleep, _mock_claim_timeout):
+        redis = MagicMock()
+        redis.get.return_value = "test-host:1"
+        redis.scard.return_value = 1
+        redis.hgetall.return_value = {"from": "test-host:1", "state": "offered"}
+        server = self._server(redis)
+
+        self.assertEqual(server.handoff_owned_channels(timeout=5), [])
+        server._release_handed_off_channel.assert_not_called()
+        redis.delete.assert_called_with(RedisKeys.owner_handoff(CHANNEL_ID))
+
+    def test_channels_without_viewers_are_not_offered(self):
+        redis = MagicMock()
+        redis.get.return_value = "test-host:1"
+        redis.scard.return_value = 0
+        server = self._server(redis)
+
+        self.assertEqual(server.handoff_owned_channels(timeout=5), [])
+        redis.publish.assert_not_called()
+
+
+@patch("apps.proxy.live_proxy.server.close_old_connections")
+@patch("apps.proxy.live_proxy.server.threading.Thread")
+@patch("apps.proxy.live_proxy.server.StreamManager")
+class TakeOverChannelTests(SimpleTestCase):
+    OFFER = {"url": "http://provider/live.ts", "user_agent": "VLC", "stream_id": 9}
+
+    def _server(self, claim_result, transfer_result=1):
+        redis = MagicMock()
+        redis.register_script.side_effect = [
+            MagicMock(return_value=claim_result),
+            MagicMock(return_value=transfer_result),
+        ]
+        redis.hget.return_value = "released"
+        server = make_proxy_server(redis)
+        server.worker_id = "peer:2"
+        server.client_managers[CHANNEL_ID] = MagicMock(**{"get_client_count.return_value": 1})
+        buffer = MagicMock(hold_writes=False)
+        buffer.handoff_ready.wait.return_value = True
+        server.stream_buffers[CHANNEL_ID] = buffer
+        return server, buffer
+
+    def test_swaps_ownership_then_resumes_writes(self, mock_manager, _mock_thread, _mock_close):
+        server, buffer = self._server(claim_result=1)
+
+        server._take_over_channel(CHANNEL_ID, "old:1", self.OFFER)
+
+        self.assertIs(server.stream_managers[CHANNEL_ID], mock_manager.return_value)
+        self.assertIsNone(mock_manager.return_value.handoff_from)
+        self.assertFalse(buffer.hold_writes)
+        buffer.reset_buffer_position.assert_called_once()
+        server.redis_client.hset.assert_called_once_with(
+            RedisKeys.channel_metadata(CHANNEL_ID), "owner", "peer:2"
+        )
+
+    def test_lost_claim_starts_nothing(self, mock_manager, mock_thread, _mock_close):
+        server, _buffer = self._server(claim_result=0)
+
+        server._take_over_channel(CHANNEL_ID, "old:1", self.OFFER)
+
+        mock_manager.assert_not_called()
+        mock_thread.assert_not_called()
+
+    def test_failed_transfer_drops_standby_upstream(self, mock_manager, _mock_thread, _mock_close):
+        server, buffer = self._server(claim_result=1, transfer_result=0)
+
+        server._take_over_channel(CHANNEL_ID, "old:1", self.OFFER)
+
+        mock_manager.return_value.stop.assert_called_once()
+        self.assertNotIn(CHANNEL_ID, server.stream_managers)
+        self.assertFalse(buffer.hold_writes)
@@ -34,6 +34,19 @@ class TSConfigProxySettingsDefaultsTests(SimpleTestCase):
         self.assertEqual(TSConfig.get_channel_init_grace_period(), 120)
         self.assertEqual(TSConfig.get_channel_client_wait_period(), 15)
 
+    @patch.object(
+        TSConfig,
+        "get_proxy_settings",
+        return_value={"standby_channels": "4", "standby_pinned_channels": "7, 12.5, ,x"},
+    )
+    def test_standby_settings_are_parsed(self, _mock_settings):
+        self.assertEqual(TSConfig.get_standby_channels(), 4)
+        self.assertEqual(TSConfig.get_standby_pinned_channels(), [7.0, 12.5])
+
+    @patch.object(TSConfig, "get_proxy_settings", return_value={"stream_ordering": "bogus"})
+    def test_unknown_stream_ordering_falls_back_to_static(self, _mock_settings):
+        self.assertEqual(TSConfig.get_stream_ordering(), "static")
+
 
 class ProxySettingsSerializerTests(SimpleTestCase):
     def _valid_payload(self, **overrides):
@@ -67,6 +80,32 @@ class ProxySettingsSerializerTests(SimpleTestCase):
         self.assertFalse(serializer.is_valid())
         self.assertIn("channel_init_grace_period", serializer.errors)
 
+    def test_standby_pinned_channels_accepts_channel_numbers(self):
+        serializer = ProxySettingsSerializer(
+            data=self._valid_payload(standby_channels=3, standby_pinned_channels="101, 5.1")
+        )
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(serializer.validated_data["standby_channels"], 3)
+
+    def test_standby_pinned_channels_rejects_names(self):
+        serializer = ProxySettingsSerializer(
+            data=self._valid_payload(standby_pinned_channels="101,News")
+        )
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("standby_pinned_channels", serializer.errors)
+
+    def test_stream_ordering_defaults_to_static(self):
+        serializer = ProxySettingsSerializer(data=self._valid_payload())
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(serializer.validated_data["stream_ordering"], "static")
+
+    def test_stream_ordering_rejects_unknown_mode(self):
+        serializer = ProxySettingsSerializer(
+            data=self._valid_payload(stream_ordering="random")
+        )
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("stream_ordering", serializer.errors)
+
 
 class CoreSettingsProxyDefaultsTests(TestCase):
     def test_get_proxy_settings_defaults_when_missing(self):
@@ -0,0 +1,161 @@
+"""
+Warm standby pool: tune scoring, pool selection, preemption of idle standby
+channels, and the zero-client shutdown exemption.
+"""
+
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase
+
+from apps.proxy.live_proxy.constants import ChannelMetadataField, ChannelState
+from apps.proxy.live_proxy.redis_keys import RedisKeys
+from apps.proxy.live_proxy.standby import (
+    StandbyManager,
+    decay_tune_scores,
+    desired_standby_channels,
+    preempt_standby_channel,
+)
+
+HOT = "aaaaaaaa-0000-0000-0000-000000000001"
+WARM = "aaaaaaaa-0000-0000-0000-000000000002"
+COLD = "aaaaaaaa-0000-0000-0000-000000000003"
+PINNED = "aaaaaaaa-0000-0000-0000-000000000004"
+
+
+class StandbyRedisTestCase(SimpleTestCase):
+    """Runs against the real Redis the suite is configured with."""
+
+    def setUp(self):
+        from core.utils import RedisClient
+
+        self.redis = RedisClient.get_client()
+        if self.redis is None:
+            self.skipTest("Redis unavailable")
+        self.addCleanup(self._clear)
+        self._clear()
+
+    def _clear(self):
+        keys = [RedisKeys.standby_channels(), RedisKeys.standby_tune_scores()]
+        for channel_id in (HOT, WARM, COLD, PINNED):
+            keys += [
+                RedisKeys.standby_cooldown(channel_id),
+                RedisKeys.channel_metadata(channel_id),
+                RedisKeys.clients(channel_id),
+            ]
+        self.redis.delete(*keys)
+
+
+class DesiredStandbyChannelsTests(StandbyRedisTestCase):
+    def test_pinned_first_then_top_scores_outside_cooldown(self):
+        self.redis.zadd(RedisKeys.standby_tune_scores(), {HOT: 9, WARM: 5, COLD: 1, PINNED: 7})
+        self.redis.setex(RedisKeys.standby_cooldown(WARM), 60, "1")
+
+        desired = desired_standby_channels(self.redis, 2, [PINNED])
+
+        self.assertEqual(desired, [PINNED, HOT, COLD])
+
+    def test_decay_scales_scores_and_drops_faded_channels(self):
+        self.redis.zadd(RedisKeys.standby_tune_scores(), {HOT: 10, COLD: 0.05})
+
+        decay_tune_scores(self.redis, 0.5)
+
+        self.assertEqual(self.redis.zscore(RedisKeys.standby_tune_scores(), HOT), 5.0)
+        self.assertIsNone(self.redis.zscore(RedisKeys.standby_tune_scores(), COLD))
+
+
+@patch("apps.proxy.live_proxy.standby.gevent.spawn")
+@patch("apps.channels.models.Channel.objects")
+class PreemptStandbyChannelTests(StandbyRedisTestCase):
+    def _standby(self, channel_id, profile_id, clients=()):
+        self.redis.sadd(RedisKeys.standby_channels(), channel_id)
+        self.redis.hset(
+            RedisKeys.channel_metadata(channel_id),
+            mapping={
+                ChannelMetadataField.STATE: ChannelState.WAITING_FOR_CLIENTS,
+                ChannelMetadataField.M3U_PROFILE: str(profile_id),
+                ChannelMetadataField.STREAM_ID: "77",
+            },
+        )
+        for client_id in clients:
+            self.redis.sadd(RedisKeys.clients(channel_id), client_id)
+
+    def test_frees_idle_standby_slot_on_candidate_profile(self, mock_objects, mock_spawn):
+        self._standby(HOT, 4, clients=["viewer"])
+        self._standby(WARM, 4)
+        self._standby(COLD, 9)
+        channel = mock_objects.filter.return_value.first.return_value
+        channel.release_stream.return_value = True
+
+        preempted = preempt_standby_channel({4}, self.redis)
+
+        self.assertEqual(preempted, WARM)
+        channel.release_stream.assert_called_once()
+        mock_spawn.assert_called_once()
+        self.assertFalse(self.redis.sismember(RedisKeys.standby_channels(), WARM))
+        self.assertTrue(self.redis.exists(RedisKeys.standby_cooldown(WARM)))
+        self.assertIsNone(
+            self.redis.hget(RedisKeys.channel_metadata(WARM), ChannelMetadataField.M3U_PROFILE)
+        )
+
+    def test_returns_none_when_no_standby_channel_matches(self, mock_objects, mock_spawn):
+        self._standby(HOT, 4, clients=["viewer"])
+
+        self.assertIsNone(preempt_standby_channel({4, 5}, self.redis))
+        mock_spawn.assert_not_called()
+        self.assertTrue(self.redis.sismember(RedisKeys.standby_channels(), HOT))
+
+
+class StandbyReconcileTests(StandbyRedisTestCase):
+    def _manager(self):
+        server = MagicMock()
+        server.redis_client = self.redis
+        server.worker_id = "test-worker"
+        manager = StandbyManager(server)
+        manager._is_leader = MagicMock(return_value=True)
+        manager._pinned_channel_ids = MagicMock(return_value=[])
+        manager.start_standby_channel = MagicMock(return_value=True)
+        return manager
+
+    @patch("apps.proxy.live_proxy.standby.ConfigHelper.standby_channels", return_value=2)
+    def test_adopts_running_channels_starts_missing_and_drops_stale(self, _mock_limit):
+        self.redis.zadd(RedisKeys.standby_tune_scores(), {HOT: 9, WARM: 5, COLD: 1})
+        self.redis.hset(RedisKeys.channel_metadata(HOT), ChannelMetadataField.STATE, ChannelState.ACTIVE)
+        self.redis.sadd(RedisKeys.standby_channels(), COLD)
+        manager = self._manager()
+
+        manager.reconcile()
+
+        manager.start_standby_channel.assert_called_once_with(WARM)
+        members = self.redis.smembers(RedisKeys.standby_channels())
+        self.assertEqual({m.decode() if isinstance(m, bytes) else m for m in members}, {HOT})
+
+    @patch("apps.proxy.live_proxy.standby.ConfigHelper.standby_channels", return_value=0)
+    def test_disabled_pool_releases_every_member(self, _mock_limit):
+        self.redis.sadd(RedisKeys.standby_channels(), HOT)
+        manager = self._manager()
+
+        manager.reconcile()
+
+        self.assertFalse(self.redis.exists(RedisKeys.standby_channels()))
+        manager.start_standby_channel.assert_not_called()
+
+
+class StandbyShutdownExemptionTests(SimpleTestCase):
+    def test_last_client_leaving_a_standby_channel_keeps_it_running(self):
+        from apps.proxy.live_proxy.server import ProxyServer
+
+        server = ProxyServer.__new__(ProxyServer)
+        server.client_managers = {HOT: MagicMock()}
+        server.stream_managers = {}
+        server._live_stream_managers = {}
+        server.profile_managers = {}
+        server.output_managers = {}
+        server.redis_client = MagicMock()
+        server.redis_client.scard.return_value = 0
+        server.redis_client.sismember.return_value = True
+        server._coordinated_stop_channel = MagicMock()
+
+        server.handle_client_disconnect(HOT)
+
+        server._coordinated_stop_channel.assert_not_called()
+        server.redis_client.setex.assert_not_called()
@@ -0,0 +1,137 @@
+"""Tests for decaying per-stream health and adaptive failover ordering."""
+import time
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase
+
+from apps.proxy.live_proxy import stream_health
+from apps.proxy.live_proxy.input.manager import StreamManager
+from apps.proxy.live_proxy.redis_keys import RedisKeys
+
+STREAM_IDS = (990001, 990002, 990003)
+
+
+class StreamHealthTests(SimpleTestCase):
+    def setUp(self):
+        from core.utils import RedisClient
+
+        self.redis = RedisClient.get_client()
+        if self.redis is None:
+            self.skipTest("Redis unavailable")
+        keys = [RedisKeys.stream_health(stream_id) for stream_id in STREAM_IDS]
+        self.redis.delete(*keys)
+        self.addCleanup(self.redis.delete, *keys)
+
+    def _fail(self, stream_id, times):
+        for _ in range(times):
+            stream_health.record_connect(self.redis, stream_id, success=False)
+
+    def test_connect_results_are_counted(self):
+        stream_health.record_connect(self.redis, STREAM_IDS[0], success=True, ttfb=1.5)
+        self._fail(STREAM_IDS[0], 1)
+
+        health = stream_health.get_health(self.redis, [STREAM_IDS[0]])[STREAM_IDS[0]]
+        self.assertAlmostEqual(health["attempts"], 2, places=2)
+        self.assertAlmostEqual(health["successes"], 1, places=2)
+        self.assertAlmostEqual(health["ttfb"], 1.5, places=2)
+        self.assertGreater(self.redis.ttl(RedisKeys.stream_health(STREAM_IDS[0])), 0)
+
+    def test_concurrent_updates_are_not_lost(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: self._fail(STREAM_IDS[0], 5), range(8)))
+
+        health = stream_health.get_health(self.redis, [STREAM_IDS[0]])[STREAM_IDS[0]]
+        self.assertAlmostEqual(health["attempts"], 40, places=1)
+
+    def test_session_length_is_a_moving_average(self):
+        stream_health.record_session(self.redis, STREAM_IDS[0], 100)
+        stream_health.record_session(self.redis, STREAM_IDS[0], 200)
+
+        health = stream_health.get_health(self.redis, [STREAM_IDS[0]])[STREAM_IDS[0]]
+        self.assertAlmostEqual(health["session"], 130, places=2)
+        self.assertAlmostEqual(health["attempts"], 0, places=2)
+
+    def test_update_script_is_registered_once_per_client(self):
+        client = type(self.redis)(connection_pool=self.redis.connection_pool)
+        with patch.object(client, "register_script", wraps=client.register_script) as register:
+            for _ in range(3):
+                stream_health.record_connect(client, STREAM_IDS[0], success=False)
+        register.assert_called_once_with(stream_health._UPDATE_LUA)
+
+    def test_counters_decay_with_half_life(self):
+        self._fail(STREAM_IDS[0], 4)
+        key = RedisKeys.stream_health(STREAM_IDS[0])
+        updated = float(self.redis.hget(key, "updated"))
+        self.redis.hset(key, "updated", updated - 6 * 3600)
+
+        with patch.object(stream_health.ConfigHelper, "get", side_effect=lambda name, default=None: 6 * 3600):
+            stream_health.record_buffering(self.redis, STREAM_IDS[0])
+
+        health = stream_health.get_health(self.redis, [STREAM_IDS[0]])[STREAM_IDS[0]]
+        self.assertAlmostEqual(health["attempts"], 2, places=1)
+        self.assertAlmostEqual(health["buffering"], 1, places=2)
+
+    def test_score_penalises_failures_slow_starts_and_buffering(self):
+        unknown = stream_health.health_score({})
+        self.assertAlmostEqual(unknown, 0.5)
+        self.assertLess(stream_health.health_score({"attempts": 5, "successes": 0}), unknown)
+        good = {"attempts": 5, "successes": 5, "ttfb": 0.5}
+        self.assertGreater(stream_health.health_score(good), unknown)
+        self.assertLess(stream_health.health_score(dict(good, ttfb=8)), stream_health.health_score(good))
+        self.assertLess(stream_health.health_score(dict(good, buffering=5)), stream_health.health_score(good))
+
+    def test_failing_stream_moves_behind_similar_streams(self):
+        first, second, third = STREAM_IDS
+        self._fail(first, 5)
+        stream_health.record_connect(self.redis, third, success=False)
+
+        # One failure does not leave the default bucket, so 2 and 3 keep channel order.
+        self.assertEqual(stream_health.order_stream_ids(STREAM_IDS, self.redis), [second, third, first])
+
+    def test_order_candidates_keeps_profile_order_per_stream(self):
+        first, second, _third = STREAM_IDS
+        self._fail(first, 5)
+        candidates = [(first, 1, "a"), (first, 2, "b"), (second, 1, "c"), (second, 3, "d")]
+
+        ordered = stream_health.order_candidates(candidates, self.redis)
+
+        self.assertEqual(ordered, [(second, 1, "c"), (second, 3, "d"), (first, 1, "a"), (first, 2, "b")])
+
+    def test_order_alternates_without_history_is_unchanged(self):
+        alternates = [{"stream_id": stream_id, "profile_id": 1} for stream_id in STREAM_IDS]
+        self.assertEqual(stream_health.order_alternates(alternates, self.redis), alternates)
+
+
+class UpstreamHealthRecordingTests(SimpleTestCase):
+    def _manager(self, **overrides):
+        sm = StreamManager.__new__(StreamManager)
+        sm.buffer = MagicMock()
+        sm._attempt_stream_id = STREAM_IDS[0]
+        sm._first_data_at = time.time() - 30
+        sm.running = True
+        sm.stop_requested = False
+        for key, value in overrides.items():
+            setattr(sm, key, value)
+        return sm
+
+    @patch("apps.proxy.live_proxy.input.manager.record_session")
+    def test_upstream_ending_on_its_own_records_the_session(self, record_session):
+        sm = self._manager()
+        sm._record_upstream_health()
+
+        record_session.assert_called_once()
+        self.assertAlmostEqual(record_session.call_args.args[2], 30, delta=1)
+        self.assertIsNone(sm._first_data_at)
+
+    @patch("apps.proxy.live_proxy.input.manager.record_connect")
+    @patch("apps.proxy.live_proxy.input.manager.record_session")
+    def test_stopped_sessions_are_not_recorded(self, record_session, record_connect):
+        for overrides in ({"stop_requested": True}, {"running": False}, {"running": False, "_first_data_at": None}):
+            sm = self._manager(**overrides)
+            sm._record_upstream_health()
+            self.assertIsNone(sm._first_data_at)
+
+        record_session.assert_not_called()
+        record_connect.assert_not_called()
@@ -0,0 +1,113 @@
+"""
+Tune latency tracing: per-phase spans from request and upstream boundaries,
+one capped stream entry per tune, and percentile summaries.
+"""
+
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase
+
+from apps.proxy.live_proxy.constants import ChannelMetadataField
+from apps.proxy.live_proxy.redis_keys import RedisKeys
+from apps.proxy.live_proxy.tune_trace import TuneTrace, percentile, summarize_traces
+
+CHANNEL_ID = "11111111-2222-3333-4444-555555555555"
+
+
+class TuneTraceSpanTests(SimpleTestCase):
+    def test_cold_tune_spans_follow_phase_order(self):
+        trace = TuneTrace(CHANNEL_ID, "client_1", started=100.0)
+        trace.mark("resolve", 100.05)
+        trace.mark("allocate", 100.2)
+        trace.mark("initialize", 100.3)
+        upstream = {"connect": 101.0, "first_data": 101.4, "buffer_ready": 102.0}
+
+        spans = trace.spans(upstream, finished_at=102.1)
+
+        self.assertEqual(list(spans), [
+            "resolve", "allocate", "initialize", "connect", "first_data", "buffer_ready", "deliver",
+        ])
+        self.assertAlmostEqual(spans["connect"], 700.0)
+        self.assertAlmostEqual(spans["deliver"], 100.0)
+
+    def test_upstream_stamps_before_the_tune_are_ignored(self):
+        trace = TuneTrace(CHANNEL_ID, "client_2", started=200.0)
+        trace.mark("resolve", 200.01)
+        upstream = {"connect": 150.0, "first_data": 150.5, "buffer_ready": 151.0}
+
+        spans = trace.spans(upstream, finished_at=200.05)
+
+        self.assertEqual(set(spans), {"resolve", "deliver"})
+
+    @patch("apps.proxy.live_proxy.tune_trace.ConfigHelper.tune_trace_maxlen", return_value=100)
+    def test_finish_appends_one_capped_entry(self, _mock_maxlen):
+        redis = MagicMock()
+        redis.hmget.return_value = [None, None, None, "9", "4", "News"]
+        trace = TuneTrace(CHANNEL_ID, "client_3")
+        trace.cold = True
+
+        entry = trace.finish(redis)
+        trace.finish(redis)
+
+        redis.xadd.assert_called_once()
+        key, fields = redis.xadd.call_args.args
+        self.assertEqual(key, RedisKeys.tune_traces())
+        self.assertEqual(redis.xadd.call_args.kwargs["maxlen"], 100)
+        self.assertEqual(fields["m3u_profile_id"], "4")
+        self.assertEqual(fields["cold"], 1)
+        self.assertIn("deliver_ms", entry)
+        self.assertEqual(
+            redis.hmget.call_args.args[1], ChannelMetadataField.UPSTREAM_CONNECTED_TIME
+        )
+
+
+class SummarizeTracesTests(SimpleTestCase):
+    def _entry(self, channel_id, profile_id, ttfb, connect):
+        return {
+            "channel_id": channel_id, "channel_name": channel_id.upper(),
+            "m3u_profile_id": profile_id, "cold": True, "ts": 1.0,
+            "ttfb_ms": ttfb, "resolve_ms": 5.0, "connect_ms": connect,
+        }
+
+    def test_nearest_rank_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertIsNone(percentile([], 95))
+
+    def test_groups_by_channel_and_provider_slowest_first(self):
+        entries = [
+            self._entry("fast", 1, 300.0, 200.0),
+            self._entry("slow", 2, 4000.0, 3500.0),
+            self._entry("slow", 2, 2000.0, 1800.0),
+        ]
+
+        summary = summarize_traces(entries, {1: (10, "Acme"), 2: (20, "Slowco")})
+
+        self.assertEqual(summary["overall"]["tunes"], 3)
+        self.assertEqual([c["channel_id"] for c in summary["channels"]], ["slow", "fast"])
+        slow = summary["channels"][0]
+        self.assertEqual(slow["ttfb_ms"]["p50"], 2000.0)
+        self.assertEqual(slow["ttfb_ms"]["p95"], 4000.0)
+        self.assertEqual(slow["dominant_phase"], "connect")
+        self.assertEqual(summary["providers"][0]["name"], "Slowco")
+        self.assertEqual(sum(b["count"] for b in summary["overall"]["histogram"]), 3)
+
+
+class StartupMarkTests(SimpleTestCase):
+    def test_stream_manager_stamps_each_boundary_once(self):
+        from apps.proxy.live_proxy.input.manager import StreamManager
+
+        manager = StreamManager.__new__(StreamManager)
+        manager.channel_id = CHANNEL_ID
+        manager.handoff_from = None
+        manager._startup_marked = set()
+        manager.buffer = MagicMock()
+
+        manager._mark_startup(ChannelMetadataField.FIRST_DATA_TIME)
+        manager._mark_startup(ChannelMetadataField.FIRST_DATA_TIME)
+
+        manager.buffer.redis_client.hset.assert_called_once()
+        key, field, _value = manager.buffer.redis_client.hset.call_args.args
+        self.assertEqual(key, RedisKeys.channel_metadata(CHANNEL_ID))
+        self.assertEqual(field, ChannelMetadataField.FIRST_DATA_TIME)
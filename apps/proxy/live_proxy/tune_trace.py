@@ -0,0 +1,269 @@
+"""Startup-phase latency tracing for live channel tunes.
+
+A ``TuneTrace`` follows one client request from ``stream_ts`` to the first
+media byte written to it. The request side marks its own phase boundaries
+(``resolve``, ``allocate``, ``initialize``); the owner's StreamManager
+stamps the upstream ones (``connect``, ``first_data``) into channel
+metadata, and ``promote_channel_when_buffer_ready`` already stamps
+``buffer_ready``. When the generator sends the first chunk, the trace reads
+those stamps, keeps the ones that fall inside this tune, and appends one
+entry to a capped Redis stream. ``summarize_traces`` turns the stream into
+per-channel and per-provider percentiles.
+"""
+
+import math
+import time
+
+from .config_helper import ConfigHelper
+from .constants import ChannelMetadataField
+from .redis_keys import RedisKeys
+from .utils import get_logger
+
+logger = get_logger()
+
+# Startup phases in the order their boundaries are reached. Each phase's
+# duration runs from the previous recorded boundary to its own.
+PHASES = (
+    "resolve",       # channel lookup, user limits, channel state checks
+    "allocate",      # init lock and generate_stream_url incl. connection-limit retries
+    "initialize",    # ChannelService.initialize_channel
+    "connect",       # upstream HTTP/FFmpeg connection established
+    "first_data",    # first upstream bytes read
+    "buffer_ready",  # initial buffer threshold met
+    "deliver",       # client setup and first chunk written to the client
+)
+
+_UPSTREAM_FIELDS = {
+    "connect": ChannelMetadataField.UPSTREAM_CONNECTED_TIME,
+    "first_data": ChannelMetadataField.FIRST_DATA_TIME,
+    "buffer_ready": ChannelMetadataField.CONNECTION_READY_TIME,
+}
+
+# Upper bounds (ms) of the time-to-first-byte histogram buckets.
+HISTOGRAM_BUCKETS_MS = (250, 500, 1000, 2000, 4000, 8000, 15000)
+PERCENTILES = (50, 95, 99)
+
+
+class TuneTrace:
+    """Phase boundaries for one client tune, flushed once on first byte."""
+
+    def __init__(self, channel_id, client_id, started=None):
+        self.channel_id = str(channel_id)
+        self.client_id = client_id
+        self.started = started or time.time()
+        self.cold = False  # This request started the upstream
+        self.output_format = None
+        self.marks = {}
+        self.finished = False
+
+    def mark(self, phase, at=None):
+        self.marks[phase] = at or time.time()
+
+    def spans(self, upstream_marks, finished_at):
+        """Per-phase milliseconds between consecutive boundaries inside this tune."""
+        boundaries = dict(self.marks)
+        for phase, at in upstream_marks.items():
+            if at and self.started <= at <= finished_at:
+                boundaries[phase] = at
+        boundaries["deliver"] = finished_at
+
+        spans = {}
+        previous = self.started
+        for phase in PHASES:
+            at = boundaries.get(phase)
+            if at is None or at < previous:
+                continue
+            spans[phase] = round((at - previous) * 1000, 1)
+            previous = at
+        return spans
+
+    def finish(self, redis_client):
+        """Record the trace; called when the first chunk reached the client."""
+        if self.finished:
+            return None
+        self.finished = True
+        maxlen = ConfigHelper.tune_trace_maxlen()
+        if not redis_client or maxlen <= 0:
+            return None
+
+        finished_at = time.time()
+        try:
+            upstream_fields = list(_UPSTREAM_FIELDS.values())
+            values = redis_client.hmget(
+                RedisKeys.channel_metadata(self.channel_id),
+                *upstream_fields,
+                ChannelMetadataField.STREAM_ID,
+                ChannelMetadataField.M3U_PROFILE,
+                ChannelMetadataField.CHANNEL_NAME,
+            )
+            upstream = {
+                phase: _to_float(value)
+                for phase, value in zip(_UPSTREAM_FIELDS, values[: len(upstream_fields)])
+            }
+            stream_id, m3u_profile_id, channel_name = values[len(upstream_fields):]
+
+            entry = {
+                "channel_id": self.channel_id,
+                "channel_name": channel_name or "",
+                "stream_id": stream_id or "",
+                "m3u_profile_id": m3u_profile_id or "",
+                "cold": int(self.cold),
+                "format": self.output_format or "",
+                "ts": round(finished_at, 3),
+                "ttfb_ms": round((finished_at - self.started) * 1000, 1),
+            }
+            for phase, ms in self.spans(upstream, finished_at).items():
+                entry[f"{phase}_ms"] = ms
+            redis_client.xadd(
+                RedisKeys.tune_traces(), entry, maxlen=maxlen, approximate=True
+            )
+            return entry
+        except Exception as e:
+            logger.debug(f"[{self.client_id}] Could not record tune trace: {e}")
+            return None
+
+
+def _to_float(value):
+    try:
+        return float(value) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def _distribution(values):
+    values = sorted(values)
+    result = {"count": len(values)}
+    for pct in PERCENTILES:
+        result[f"p{pct}"] = percentile(values, pct)
+    return result
+
+
+def _histogram(values):
+    counts = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+    for value in values:
+        for i, bound in enumerate(HISTOGRAM_BUCKETS_MS):
+            if value <= bound:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+    return [
+        {"le": bound, "count": count}
+        for bound, count in zip(list(HISTOGRAM_BUCKETS_MS) + [None], counts)
+    ]
+
+
+def _group_stats(entries):
+    ttfb = [entry["ttfb_ms"] for entry in entries]
+    phases = {}
+    totals = {}
+    for phase in PHASES:
+        values = [entry[f"{phase}_ms"] for entry in entries if f"{phase}_ms" in entry]
+        if values:
+            phases[phase] = _distribution(values)
+            totals[phase] = sum(values)
+    return {
+        "tunes": len(entries),
+        "cold_tunes": sum(1 for entry in entries if entry["cold"]),
+        "ttfb_ms": _distribution(ttfb),
+        "histogram": _histogram(ttfb),
+        "phases_ms": phases,
+        "dominant_phase": max(totals, key=totals.get) if totals else None,
+    }
+
+
+def read_traces(redis_client, limit=None):
+    """Newest-first decoded trace entries from the stream."""
+    raw = redis_client.xrevrange(
+        RedisKeys.tune_traces(), count=limit or ConfigHelper.tune_trace_maxlen()
+    )
+    entries = []
+    for _entry_id, fields in raw:
+        fields = {
+            (k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v)
+            for k, v in fields.items()
+        }
+        try:
+            entry = {
+                "channel_id": fields["channel_id"],
+                "channel_name": fields.get("channel_name") or "",
+                "m3u_profile_id": int(fields["m3u_profile_id"]) if fields.get("m3u_profile_id") else None,
+                "cold": fields.get("cold") == "1",
+                "ts": float(fields["ts"]),
+                "ttfb_ms": float(fields["ttfb_ms"]),
+            }
+            for phase in PHASES:
+                if f"{phase}_ms" in fields:
+                    entry[f"{phase}_ms"] = float(fields[f"{phase}_ms"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        entries.append(entry)
+    return entries
+
+
+def _slowest_first(stats):
+    return -(stats["ttfb_ms"]["p95"] or 0)
+
+
+def summarize_traces(entries, provider_for_profile=None):
+    """
+    Percentiles overall, per channel and per provider.
+
+    ``provider_for_profile`` maps an M3U profile id to ``(account_id, name)``;
+    traces whose profile is unknown are grouped under no provider.
+    """
+    provider_for_profile = provider_for_profile or {}
+    by_channel = {}
+    by_provider = {}
+    for entry in entries:
+        by_channel.setdefault(entry["channel_id"], []).append(entry)
+        provider = provider_for_profile.get(entry["m3u_profile_id"])
+        if provider:
+            by_provider.setdefault(provider, []).append(entry)
+
+    channels = []
+    for channel_id, group in by_channel.items():
+        stats = _group_stats(group)
+        stats["channel_id"] = channel_id
+        stats["channel_name"] = next((e["channel_name"] for e in group if e["channel_name"]), "")
+        channels.append(stats)
+    providers = []
+    for (account_id, name), group in by_provider.items():
+        stats = _group_stats(group)
+        stats["m3u_account_id"] = account_id
+        stats["name"] = name
+        providers.append(stats)
+
+    return {
+        "phases": list(PHASES),
+        "overall": _group_stats(entries) if entries else None,
+        "channels": sorted(channels, key=_slowest_first),
+        "providers": sorted(providers, key=_slowest_first),
+        "since": min((entry["ts"] for entry in entries), default=None),
+    }
+
+
+def build_tune_stats(redis_client, limit=None, channel_id=None):
+    """Tune latency summary for the stats API, optionally for one channel."""
+    from apps.m3u.models import M3UAccountProfile
+
+    entries = read_traces(redis_client, limit=limit)
+    if channel_id:
+        entries = [entry for entry in entries if entry["channel_id"] == str(channel_id)]
+
+    profile_ids = {entry["m3u_profile_id"] for entry in entries if entry["m3u_profile_id"]}
+    provider_for_profile = {
+        profile_id: (account_id, name)
+        for profile_id, account_id, name in M3UAccountProfile.objects.filter(
+            id__in=profile_ids
+        ).values_list("id", "m3u_account_id", "m3u_account__name")
+    }
+    return summarize_traces(entries, provider_for_profile)
@@ -12,6 +12,7 @@ from apps.m3u.connection_pool import (
     get_profile_connection_count,
     profile_available_for_channel_switch,
 )
+from .stream_health import adaptive_ordering_enabled, order_alternates
 from .utils import get_logger
 import requests
 
@@ -60,10 +61,13 @@ def get_stream_object(id: str):
 
 def generate_stream_url(
     channel_id: str,
+    standby: bool = False,
 ) -> Tuple[str, str, bool, Optional[int], bool, Optional[str]]:
     """
     Generate the appropriate stream URL for a channel or stream based on its profile settings.
 
+    ``standby`` starts use spare slots only and never preempt other standby channels.
+
     Returns:
         Tuple: (stream_url, user_agent, transcode_flag, profile_id, slot_reserved, error_reason)
     """
@@ -113,7 +117,9 @@ def generate_stream_url(
         channel = channel_or_stream
 
         # Get stream and profile for this channel
-        stream_id, profile_id, error_reason, slot_reserved = channel.get_stream()
+        stream_id, profile_id, error_reason, slot_reserved = channel.get_stream(
+            preempt_standby=not standby
+        )
 
         if not stream_id or not profile_id:
             logger.error(f"No stream available for channel {channel_id}: {error_reason}")
@@ -462,9 +468,12 @@ def get_alternate_streams(channel_id: str, current_stream_id: Optional[int] = No
         else:
             logger.warning(f"No alternate streams with available connections found for channel {channel_id}")
 
-        return order_alternates_from_current(
+        alternate_streams = order_alternates_from_current(
             alternate_streams, ordered_stream_ids, current_stream_id
         )
+        if adaptive_ordering_enabled():
+            alternate_streams = order_alternates(alternate_streams, redis_client)
+        return alternate_streams
     except Exception as e:
         logger.error(f"Error getting alternate streams for channel {channel_id}: {e}", exc_info=True)
         return []
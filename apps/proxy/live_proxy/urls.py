@@ -8,6 +8,7 @@ urlpatterns = [
     path('change_stream/<str:channel_id>', views.change_stream, name='change_stream'),
     path('status', views.channel_status, name='channel_status'),
     path('status/<str:channel_id>', views.channel_status, name='channel_status_detail'),
+    path('tune_stats', views.tune_stats, name='tune_stats'),
     path('stop/<str:channel_id>', views.stop_channel, name='stop_channel'),
     path('stop_client/<str:channel_id>', views.stop_client, name='stop_client'),
     path('next_stream/<str:channel_id>', views.next_stream, name='next_stream'),
@@ -21,6 +21,7 @@ from dispatcharr.utils import get_client_ip, network_access_allowed
 from .redis_keys import RedisKeys
 from apps.channels.models import Channel
 from apps.accounts.models import User
+from apps.accounts.principal_cache import authenticate_xc
 from core.models import CoreSettings, PROXY_PROFILE_NAME
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
@@ -32,6 +33,8 @@ from apps.accounts.permissions import (
 )
 from .constants import ChannelState, ChannelMetadataField
 from .services.channel_service import ChannelService
+from .tune_trace import TuneTrace, build_tune_stats
+from .standby import record_tune
 from core.utils import send_websocket_update
 from .url_utils import (
     generate_stream_url,
@@ -158,6 +161,7 @@ def stream_ts(request, channel_id, user=None, force_output_format=None):
         return JsonResponse({"error": "Forbidden"}, status=403)
 
     """Stream TS data to client with immediate response and keep-alive packets during initialization"""
+    request_started = time.time()
     if user is None and hasattr(request, 'user') and request.user.is_authenticated:
         user = request.user
 
@@ -179,6 +183,9 @@ def stream_ts(request, channel_id, user=None, force_output_format=None):
         client_id = f"client_{int(time.time() * 1000)}_{random.randint(1000, 9999)}"
         client_ip = get_client_ip(request)
         logger.info(f"[{client_id}] Requested stream for channel {channel_id}")
+        trace = TuneTrace(channel_id, client_id, started=request_started)
+        if isinstance(channel, Channel):
+            record_tune(proxy_server.redis_client, channel_id)
 
         # Extract client user agent early
         for header in ["HTTP_USER_AGENT", "User-Agent", "user-agent"]:
@@ -227,6 +234,7 @@ def stream_ts(request, channel_id, user=None, force_output_format=None):
         resolved_output_profile = None
         resolved_output_format = None
         output_options_resolved = False
+        trace.mark("resolve")
 
         # Start initialization if needed
         if needs_initialization:
@@ -389,6 +397,8 @@ def stream_ts(request, channel_id, user=None, force_output_format=None):
                             {"error": error_msg, "waited": wait_duration}, status=503
                         )  # 503 Service Unavailable is appropriate here
 
+                    trace.mark("allocate")
+
                     # generate_stream_url() called get_stream() which allocated a connection
                     # slot (INCR'd profile_connections) - track this for cleanup on error
                     if needs_initialization and slot_reserved:
@@ -533,6 +543,8 @@ def stream_ts(request, channel_id, user=None, force_output_format=None):
                         )
 
                     # Channel initialized: lifecycle owns the connection and ownership lock
+                    trace.mark("initialize")
+                    trace.cold = True
                     connection_allocated = False
                     owned_for_init = False
 
@@ -656,6 +668,7 @@ def stream_ts(request, channel_id, user=None, force_output_format=None):
             f'{resolved_output_format}:p{resolved_output_profile.id}'
             if resolved_output_profile else resolved_output_format
         )
+        trace.output_format = resolved_format
 
         # Pre-register before slow setup (ensure_output_profile) so the non-owner
         # cleanup thread does not tear down local resources while connecting.
@@ -723,6 +736,7 @@ def stream_ts(request, channel_id, user=None, force_output_format=None):
                 channel_id, client_id, client_ip, client_user_agent, channel_initializing, user=user,
                 fmt=resolved_format,
                 channel_name=channel_display_name,
+                trace=trace,
             )
             content_type = "video/mp4"
         else:
@@ -735,6 +749,7 @@ def stream_ts(request, channel_id, user=None, force_output_format=None):
                 user=user,
                 buffer=source_buffer,
                 channel_name=channel_display_name,
+                trace=trace,
             )
             content_type = "video/mp2t"
 
@@ -775,7 +790,10 @@ def stream_ts(request, channel_id, user=None, force_output_format=None):
 @permission_classes([AllowAny])
 def stream_xc(request, username, password, channel_id):
     try:
-        user = get_object_or_404(User, username=username)
+        user = authenticate_xc(username, password)
+        if user is None:
+            get_object_or_404(User, username=username)
+            return Response({"error": "Invalid credentials"}, status=401)
 
         extension = pathlib.Path(channel_id).suffix
         channel_id = pathlib.Path(channel_id).stem
@@ -783,14 +801,6 @@ def stream_xc(request, username, password, channel_id):
         if not network_access_allowed(request, 'STREAMS', user):
             return Response({"error": "Forbidden"}, status=403)
 
-        custom_properties = user.custom_properties or {}
-
-        if "xc_password" not in custom_properties:
-            return Response({"error": "Invalid credentials"}, status=401)
-
-        if custom_properties["xc_password"] != password:
-            return Response({"error": "Invalid credentials"}, status=401)
-
         if user.user_level < 10:
             user_profile_count = user.channel_profiles.count()
 
@@ -983,6 +993,39 @@ def channel_status(request, channel_id=None):
         close_old_connections()
 
 
+@api_view(["GET"])
+@permission_classes([IsAdmin])
+def tune_stats(request):
+    """
+    Time-to-first-byte percentiles and per-phase breakdown of recent tunes,
+    overall, per channel and per provider. Optional query params:
+    ``channel_id`` and ``limit`` (most recent tunes to include).
+    """
+    proxy_server = ProxyServer.get_instance()
+
+    try:
+        if not proxy_server.redis_client:
+            return JsonResponse({"error": "Redis connection not available"}, status=500)
+
+        try:
+            limit = int(request.GET.get("limit") or 0) or None
+        except ValueError:
+            return JsonResponse({"error": "limit must be an integer"}, status=400)
+
+        return JsonResponse(
+            build_tune_stats(
+                proxy_server.redis_client,
+                limit=limit,
+                channel_id=request.GET.get("channel_id"),
+            )
+        )
+    except Exception as e:
+        logger.error(f"Error in tune_stats: {e}", exc_info=True)
+        return JsonResponse({"error": str(e)}, status=500)
+    finally:
+        close_old_connections()
+
+
 @csrf_exempt
 @api_view(["POST", "DELETE"])
 @permission_classes([IsAdmin])
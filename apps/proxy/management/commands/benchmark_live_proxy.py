@@ -0,0 +1,56 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.proxy.live_proxy.benchmark import run_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the live proxy data plane against a local constant-bitrate '
+        'TS upstream and Redis'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--channels', type=int, default=1, help='Number of channels to run')
+        parser.add_argument('--clients', type=int, default=1, help='Clients per channel')
+        parser.add_argument('--bitrate', type=int, default=5000, help='Upstream bitrate per channel in kbps')
+        parser.add_argument('--duration', type=float, default=30.0, help='Measurement window in seconds')
+        parser.add_argument('--warmup', type=float, default=10.0, help='Seconds to run before measuring')
+        parser.add_argument('--json', action='store_true', help='Print the results as JSON')
+
+    def handle(self, *args, **options):
+        if min(options['channels'], options['clients'], options['bitrate']) < 1 or options['duration'] <= 0:
+            raise CommandError('--channels, --clients, --bitrate and --duration must be positive')
+
+        try:
+            results = run_benchmark(
+                channels=options['channels'],
+                clients=options['clients'],
+                bitrate_kbps=options['bitrate'],
+                duration=options['duration'],
+                warmup=max(0.0, options['warmup']),
+                log=lambda message: self.stderr.write(message),
+            )
+        except RuntimeError as e:
+            raise CommandError(str(e))
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        self.stdout.write(
+            f"{results['channels']} channel(s) x {results['clients_per_channel']} client(s) "
+            f"at {results['bitrate_kbps']} kbps over {results['duration_s']}s"
+        )
+        rows = [
+            ('Ingest', f"{results['ingest_mb_per_s']} MB/s (expected {results['expected_ingest_mb_per_s']} MB/s)"),
+            ('Delivered', f"{results['delivered_mb_per_s']} MB/s, slowest client {results['client_mb_per_s_min']} MB/s"),
+            ('Jitter', f"{results['jitter_ms_median']} ms median, worst p99 gap {results['gap_p99_ms_max']} ms"),
+            ('Stalled clients', results['stalled_clients']),
+            ('Redis', f"{results['redis_ops_per_s']} ops/s"),
+            ('CPU', f"{results['cpu_percent_per_channel']}% of a core per channel "
+                    f"({results['cpu_percent_total']}% total)"),
+        ]
+        for label, value in rows:
+            self.stdout.write(f"  {label:<16} {value}")
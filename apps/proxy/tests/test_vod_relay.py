@@ -0,0 +1,116 @@
+"""VOD relay reads, byte accounting and stop signalling."""
+
+import gzip
+import io
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase
+
+from apps.proxy.vod_proxy import multi_worker_connection_manager as manager
+from apps.proxy.vod_proxy.multi_worker_connection_manager import (
+    RELAY_MAX_READ_SIZE,
+    RELAY_MIN_READ_SIZE,
+    RedisBackedVODConnection,
+    SerializableConnectionState,
+    VODStopListener,
+    iter_upstream_chunks,
+    signal_vod_client_stop,
+)
+
+
+class _Upstream:
+    def __init__(self, body, headers=None):
+        self.raw = io.BytesIO(body)
+        self.headers = headers or {}
+        self.body = body
+
+    def iter_content(self, chunk_size):
+        data = gzip.decompress(self.body)
+        for i in range(0, len(data), chunk_size):
+            yield data[i:i + chunk_size]
+
+
+class IterUpstreamChunksTests(SimpleTestCase):
+    def test_read_size_grows_to_the_cap(self):
+        body = bytes(range(256)) * (12 * 1024)  # 3 MiB
+        chunks = list(iter_upstream_chunks(_Upstream(body)))
+
+        self.assertEqual(b"".join(chunks), body)
+        sizes = [len(chunk) for chunk in chunks]
+        self.assertEqual(sizes[:5], [RELAY_MIN_READ_SIZE * 2 ** i for i in range(5)])
+        self.assertEqual(max(sizes), RELAY_MAX_READ_SIZE)
+
+    def test_slow_reads_shrink_the_read_size(self):
+        clock = iter(range(0, 1000, 1))  # every read appears to take one second
+        with patch.object(manager.time, "monotonic", lambda: next(clock)):
+            chunks = list(iter_upstream_chunks(_Upstream(b"x" * RELAY_MIN_READ_SIZE * 3)))
+
+        self.assertEqual([len(chunk) for chunk in chunks], [RELAY_MIN_READ_SIZE] * 3)
+
+    def test_blocks_from_read_are_yielded_without_copying(self):
+        upstream = _Upstream(b"")
+        blocks = [b"a" * RELAY_MIN_READ_SIZE, b"tail", b""]
+        upstream.raw = MagicMock()
+        upstream.raw.read.side_effect = blocks
+
+        chunks = list(iter_upstream_chunks(upstream))
+
+        self.assertTrue(all(chunk is block for chunk, block in zip(chunks, blocks)))
+        self.assertEqual(
+            [call.args[0] for call in upstream.raw.read.call_args_list],
+            [RELAY_MIN_READ_SIZE, RELAY_MIN_READ_SIZE * 2, RELAY_MIN_READ_SIZE * 2],
+        )
+        upstream.raw.readinto.assert_not_called()
+
+    def test_encoded_bodies_are_decoded(self):
+        upstream = _Upstream(gzip.compress(b"movie" * 1000), {"content-encoding": "gzip"})
+        self.assertEqual(b"".join(iter_upstream_chunks(upstream)), b"movie" * 1000)
+
+
+class StopSignalTests(SimpleTestCase):
+    def test_signal_sets_key_and_publishes(self):
+        redis_client = MagicMock()
+        stop_key = signal_vod_client_stop(redis_client, "client-1")
+
+        redis_client.setex.assert_called_once_with(stop_key, 60, "true")
+        redis_client.publish.assert_called_once_with(manager.VOD_STOP_CHANNEL, "client-1")
+
+    def test_listener_flags_only_watched_clients(self):
+        listener = VODStopListener()
+        with patch.object(manager.threading, "Thread"):
+            listener.watch("a")
+            listener.watch("a")
+
+        listener.handle_message(b"a")
+        listener.handle_message("b")
+        self.assertTrue(listener.stop_requested("a"))
+        self.assertFalse(listener.stop_requested("b"))
+
+        listener.unwatch("a")
+        self.assertTrue(listener.stop_requested("a"))
+        listener.unwatch("a")
+        self.assertFalse(listener.stop_requested("a"))
+
+
+class ByteAccountingTests(SimpleTestCase):
+    def setUp(self):
+        self.scripts = {"meta_save": MagicMock(return_value=1), "add_bytes": MagicMock(return_value=4096)}
+        self.connection = RedisBackedVODConnection("session-1", redis_client=MagicMock())
+        patcher = patch.object(RedisBackedVODConnection, "_vod_scripts", return_value=self.scripts)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_metadata_saves_leave_counters_alone(self):
+        state = SerializableConnectionState("session-1", "http://provider/movie.mkv", {})
+        state.bytes_sent = 123
+        self.connection._save_connection_state(state)
+
+        fields = self.scripts["meta_save"].call_args.kwargs["args"][1::2]
+        self.assertNotIn("bytes_sent", fields)
+        self.assertNotIn("active_streams", fields)
+
+    def test_add_bytes_sent_uses_the_counter_script(self):
+        self.assertTrue(self.connection.add_bytes_sent(4096))
+        self.assertEqual(self.scripts["add_bytes"].call_args.kwargs["args"][0], "4096")
+        self.assertFalse(self.connection.add_bytes_sent(0))
+        self.assertEqual(self.scripts["add_bytes"].call_count, 1)
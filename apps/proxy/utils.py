@@ -1,7 +1,7 @@
 import logging
 import re
 from core.utils import RedisClient
-from apps.proxy.vod_proxy.multi_worker_connection_manager import MultiWorkerVODConnectionManager, get_vod_client_stop_key
+from apps.proxy.vod_proxy.multi_worker_connection_manager import MultiWorkerVODConnectionManager, signal_vod_client_stop
 from apps.timeshift.redis_keys import (
     TimeshiftRedisKeys,
     parse_stats_channel_id,
@@ -221,8 +221,7 @@ def attempt_stream_termination(user_id, requesting_client_id, active_connections
                     logger.warning(f"VOD connection not found: {t['client_id']}")
                     continue
 
-                stop_key = get_vod_client_stop_key(t['client_id'])
-                redis_client.setex(stop_key, 60, "true")  # 60 second TTL
+                signal_vod_client_stop(redis_client, t['client_id'])
 
         return True
     except Exception as e:
@@ -84,6 +84,19 @@ end
 return 1
 """
 
+# Relay byte accounting: HINCRBY only while the session hash exists, so a
+# flush racing idle cleanup cannot recreate it.
+_LUA_ADD_BYTES_SENT = """
+-- vod_add_bytes
+local key = KEYS[1]
+if redis.call('EXISTS', key) == 0 then
+  return -1
+end
+local total = redis.call('HINCRBY', key, 'bytes_sent', ARGV[1])
+redis.call('HSET', key, 'last_activity', ARGV[2])
+return total
+"""
+
 # Cache register_script handles per redis client (EVALSHA thereafter).
 _vod_script_cache: Dict[int, Dict[str, Any]] = {}
 
@@ -93,6 +106,134 @@ def get_vod_client_stop_key(client_id):
     return f"vod_proxy:client:{client_id}:stop"
 
 
+VOD_STOP_CHANNEL = "vod_proxy:stop"
+
+# Relay tuning: reads start small so playback starts quickly, double while the
+# provider keeps filling them and halve when a read stalls.
+RELAY_MIN_READ_SIZE = 64 * 1024
+RELAY_MAX_READ_SIZE = 1024 * 1024
+RELAY_SLOW_READ_SECONDS = 0.5
+# How often a relay flushes its byte counter (and, without pub/sub, polls the stop key).
+RELAY_FLUSH_INTERVAL = 5.0
+
+
+def signal_vod_client_stop(redis_client, client_id):
+    """Ask the worker relaying ``client_id`` to stop; returns the stop key.
+
+    The key (60s TTL) still covers relays whose worker has no pub/sub
+    subscription; the publish reaches the others immediately.
+    """
+    stop_key = get_vod_client_stop_key(client_id)
+    redis_client.setex(stop_key, 60, "true")
+    try:
+        redis_client.publish(VOD_STOP_CHANNEL, client_id)
+    except Exception as e:
+        logger.warning(f"[{client_id}] Could not publish VOD stop signal: {e}")
+    return stop_key
+
+
+class VODStopListener:
+    """Per-process subscription to VOD stop signals.
+
+    Relays register their client id with ``watch`` and check
+    ``stop_requested`` between reads, which is a local set lookup instead of
+    a Redis round-trip. ``subscribed`` is False while the subscription is
+    down, and relays then fall back to polling the stop key.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._watched: Dict[str, int] = {}
+        self._stopped = set()
+        self._thread = None
+        self.subscribed = False
+
+    def watch(self, client_id):
+        with self._lock:
+            self._watched[client_id] = self._watched.get(client_id, 0) + 1
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._listen, name="vod-stop-listener", daemon=True)
+                self._thread.start()
+
+    def unwatch(self, client_id):
+        with self._lock:
+            remaining = self._watched.get(client_id, 0) - 1
+            if remaining > 0:
+                self._watched[client_id] = remaining
+            else:
+                self._watched.pop(client_id, None)
+                self._stopped.discard(client_id)
+
+    def stop_requested(self, client_id) -> bool:
+        return client_id in self._stopped
+
+    def handle_message(self, data):
+        client_id = data.decode() if isinstance(data, bytes) else str(data)
+        with self._lock:
+            if client_id in self._watched:
+                self._stopped.add(client_id)
+
+    def _listen(self):
+        while True:
+            pubsub = None
+            try:
+                pubsub = RedisClient.get_pubsub_client().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(VOD_STOP_CHANNEL)
+                self.subscribed = True
+                for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self.handle_message(message["data"])
+            except Exception as e:
+                logger.warning(f"VOD stop listener disconnected, retrying: {e}")
+            finally:
+                self.subscribed = False
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+            time.sleep(5)
+
+
+def iter_upstream_chunks(upstream_response):
+    """Yield the provider body in adaptively sized blocks.
+
+    Each block is one ``raw.read(size)`` on the urllib3 response, which
+    allocates the bytes handed to the client and nothing else (urllib3's
+    ``readinto`` reads into a fresh buffer and copies it over, and slicing a
+    reused buffer would copy again). Encoded (e.g. gzip) bodies go through
+    ``iter_content`` so they are decoded.
+    """
+    raw = getattr(upstream_response, "raw", None)
+    encoding = (upstream_response.headers.get("content-encoding") or "identity").lower()
+    if raw is None or not hasattr(raw, "read") or encoding != "identity":
+        yield from upstream_response.iter_content(chunk_size=RELAY_MIN_READ_SIZE)
+        return
+
+    size = RELAY_MIN_READ_SIZE
+    while True:
+        started = time.monotonic()
+        chunk = raw.read(size)
+        if not chunk:
+            return
+        elapsed = time.monotonic() - started
+        yield chunk
+        if elapsed > RELAY_SLOW_READ_SECONDS:
+            size = max(RELAY_MIN_READ_SIZE, size // 2)
+        elif len(chunk) == size:
+            size = min(RELAY_MAX_READ_SIZE, size * 2)
+
+
 def infer_content_type_from_url(url: str) -> Optional[str]:
     """
     Infer MIME type from file extension in URL
@@ -302,9 +443,10 @@ class RedisBackedVODConnection:
                                include_active_streams: bool = False):
         """Save connection state to Redis.
 
-        By default omits ``active_streams`` so metadata writes (ownership,
-        seek info, get_stream headers) cannot clobber the atomic counter
-        maintained by ``increment_active_streams`` / ``decrement_*``.
+        By default omits ``active_streams`` and ``bytes_sent`` so metadata
+        writes (ownership, seek info, get_stream headers) cannot clobber the
+        atomic counters maintained by ``increment_active_streams`` /
+        ``decrement_*`` and ``add_bytes_sent``.
         Pass ``include_active_streams=True`` only when creating a new session.
 
         Metadata saves are applied only if the session hash still exists, so a
@@ -317,6 +459,7 @@ class RedisBackedVODConnection:
             data = state.to_dict()
             if not include_active_streams:
                 data.pop('active_streams', None)
+                data.pop('bytes_sent', None)
 
             # Log the data being saved for debugging
             logger.trace(f"[{self.session_id}] Saving connection state: {data}")
@@ -392,6 +535,7 @@ class RedisBackedVODConnection:
                 'decr': client.register_script(_LUA_DECR_ACTIVE_STREAMS),
                 'cleanup': client.register_script(_LUA_CLEANUP_IF_IDLE),
                 'meta_save': client.register_script(_LUA_META_SAVE_IF_EXISTS),
+                'add_bytes': client.register_script(_LUA_ADD_BYTES_SENT),
             }
             _vod_script_cache[cache_key] = cached
         return cached
@@ -686,6 +830,22 @@ class RedisBackedVODConnection:
             # not double-release the profile slot; callers still log loudly.
             return False, True
 
+    def add_bytes_sent(self, count: int) -> bool:
+        """Add relayed bytes to the session counter (Lua HINCRBY, no session lock)."""
+        if not self.redis_client or count <= 0:
+            return False
+        try:
+            total = int(
+                self._vod_scripts()['add_bytes'](
+                    keys=[self.connection_key],
+                    args=[str(count), str(time.time())],
+                )
+            )
+            return total >= 0
+        except Exception as e:
+            logger.error(f"[{self.session_id}] Error adding bytes_sent: {e}")
+            return False
+
     def has_active_streams(self) -> bool:
         """Check if connection has any active streams (single HGET, not full hash)."""
         if not self.redis_client:
@@ -1144,39 +1304,42 @@ class MultiWorkerVODConnectionManager:
                         logger.debug(f"[{client_id}] Active streams already incremented in connection reuse path")
 
                     bytes_sent = 0
-                    chunk_count = 0
+                    unflushed_bytes = 0
+                    next_flush = time.monotonic() + RELAY_FLUSH_INTERVAL
 
-                    # Get the stop signal key for this client
+                    # Stop signals arrive over pub/sub; the key is only checked
+                    # at start and, while this worker is not subscribed, per flush.
                     stop_key = get_vod_client_stop_key(client_id)
-
-                    for chunk in upstream_response.iter_content(chunk_size=8192):
-                        if chunk:
+                    stop_listener = VODStopListener.get_instance()
+                    stop_listener.watch(client_id)
+                    try:
+                        # A stop sent between two range requests of this client
+                        # was published while nobody was watching.
+                        stop_signal_detected = bool(self.redis_client and self.redis_client.exists(stop_key))
+                        chunks = () if stop_signal_detected else iter_upstream_chunks(upstream_response)
+                        for chunk in chunks:
                             yield chunk
                             bytes_sent += len(chunk)
-                            chunk_count += 1
-
-                            # Check for stop signal every 100 chunks
-                            if chunk_count % 100 == 0:
-                                # Check if stop signal has been set
-                                if self.redis_client and self.redis_client.exists(stop_key):
-                                    logger.info(f"[{client_id}] Worker {self.worker_id} - Stop signal detected, terminating stream")
-                                    # Delete the stop key
-                                    self.redis_client.delete(stop_key)
+                            unflushed_bytes += len(chunk)
+
+                            if stop_listener.stop_requested(client_id):
+                                stop_signal_detected = True
+                                break
+                            if time.monotonic() >= next_flush:
+                                next_flush = time.monotonic() + RELAY_FLUSH_INTERVAL
+                                redis_connection.add_bytes_sent(unflushed_bytes)
+                                unflushed_bytes = 0
+                                if not stop_listener.subscribed and self.redis_client and self.redis_client.exists(stop_key):
                                     stop_signal_detected = True
                                     break
 
-                                # Update the connection state
-                                logger.debug(f"Client: [{client_id}] Worker: {self.worker_id} sent {chunk_count} chunks for VOD: {content_name}")
-                                if redis_connection._acquire_lock():
-                                    try:
-                                        state = redis_connection._get_connection_state()
-                                        if state:
-                                            state.last_activity = time.time()
-                                            # Store cumulative bytes sent in connection state
-                                            state.bytes_sent = bytes_sent  # Use cumulative bytes_sent, not chunk size
-                                            redis_connection._save_connection_state(state)
-                                    finally:
-                                        redis_connection._release_lock()
+                        if stop_signal_detected:
+                            logger.info(f"[{client_id}] Worker {self.worker_id} - Stop signal detected, terminating stream")
+                            if self.redis_client:
+                                self.redis_client.delete(stop_key)
+                    finally:
+                        stop_listener.unwatch(client_id)
+                        redis_connection.add_bytes_sent(unflushed_bytes)
 
                     if stop_signal_detected:
                         logger.info(f"[{client_id}] Worker {self.worker_id} - Stream stopped by signal: {bytes_sent} bytes sent")
@@ -14,11 +14,12 @@ from django.shortcuts import get_object_or_404
 from django.views.decorators.csrf import csrf_exempt
 from apps.vod.models import Movie, Series, Episode, M3UMovieRelation, M3UEpisodeRelation
 from apps.m3u.models import M3UAccountProfile
-from apps.proxy.vod_proxy.multi_worker_connection_manager import MultiWorkerVODConnectionManager, infer_content_type_from_url, get_vod_client_stop_key
+from apps.proxy.vod_proxy.multi_worker_connection_manager import MultiWorkerVODConnectionManager, infer_content_type_from_url, signal_vod_client_stop
 from .utils import get_client_info
 from rest_framework.decorators import api_view, authentication_classes, permission_classes
 from rest_framework.permissions import AllowAny
 from apps.accounts.models import User
+from apps.accounts.principal_cache import authenticate_xc
 from apps.accounts.permissions import IsAdmin
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from apps.accounts.authentication import ApiKeyAuthentication, QueryParamJWTAuthentication
@@ -1366,9 +1367,8 @@ def stop_vod_client(request):
             logger.warning(f"VOD connection not found: {client_id}")
             return JsonResponse({'error': 'Connection not found'}, status=404)
 
-        # Set a stop signal key that the worker will check
-        stop_key = get_vod_client_stop_key(client_id)
-        redis_client.setex(stop_key, 60, "true")  # 60 second TTL
+        # Signal the worker relaying this client to stop
+        stop_key = signal_vod_client_stop(redis_client, client_id)
 
         logger.info(f"Set stop signal for VOD client: {client_id}")
 
@@ -1393,19 +1393,14 @@ def stream_xc_movie(request, username, password, stream_id, extension):
     session_id = request.GET.get('session_id')
     profile_id = request.GET.get('profile_id')
 
-    user = get_object_or_404(User, username=username)
+    user = authenticate_xc(username, password)
+    if user is None:
+        get_object_or_404(User, username=username)
+        return Response({"error": "Invalid credentials"}, status=401)
 
     if not network_access_allowed(request, 'STREAMS', user):
         return Response({"error": "Forbidden"}, status=403)
 
-    custom_properties = user.custom_properties or {}
-
-    if "xc_password" not in custom_properties:
-        return Response({"error": "Invalid credentials"}, status=401)
-
-    if custom_properties["xc_password"] != password:
-        return Response({"error": "Invalid credentials"}, status=401)
-
     # All authenticated users get access to VOD from all active M3U accounts
     filters = {"movie_id": stream_id, "m3u_account__is_active": True}
 
@@ -1430,19 +1425,14 @@ def stream_xc_episode(request, username, password, stream_id, extension):
     session_id = request.GET.get('session_id')
     profile_id = request.GET.get('profile_id')
 
-    user = get_object_or_404(User, username=username)
+    user = authenticate_xc(username, password)
+    if user is None:
+        get_object_or_404(User, username=username)
+        return Response({"error": "Invalid credentials"}, status=401)
 
     if not network_access_allowed(request, 'STREAMS', user):
         return Response({"error": "Forbidden"}, status=403)
 
-    custom_properties = user.custom_properties or {}
-
-    if "xc_password" not in custom_properties:
-        return Response({"error": "Invalid credentials"}, status=401)
-
-    if custom_properties["xc_password"] != password:
-        return Response({"error": "Invalid credentials"}, status=401)
-
     # All authenticated users get access to series/episodes from all active M3U accounts
     filters = {"episode_id": stream_id, "m3u_account__is_active": True}
 
@@ -0,0 +1,470 @@
+"""Shared on-disk byte-range cache for catch-up archives.
+
+Archives are keyed by ``(Dispatcharr stream id, programme timestamp, duration)``
+and stored as fixed-size aligned blocks under ``CATCHUP_CACHE_DIR``. The
+provider stream that is already open for a viewer tees its bytes into the
+cache; later requests for the same bytes (a second viewer, or a scrub back
+over already-watched ranges) are served from disk without reserving a
+provider slot.
+
+Block lifecycle (one directory per archive, shared by every worker):
+
+* ``{index}.part`` is created with ``O_EXCL`` by the single writer that claims
+  the block, and grows as upstream bytes arrive. Readers may follow it.
+* ``{index}.blk`` is the committed block (atomic rename once full, or at EOF).
+* A ``.part`` whose mtime stops moving for ``PART_STALE_SECONDS`` is treated
+  as abandoned and may be reclaimed by another writer.
+
+Least-recently-used blocks are evicted once the cache exceeds
+``CATCHUP_CACHE_MAX_MB``; every read refreshes a block's mtime.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+
+from django.conf import settings
+
+from apps.timeshift.redis_keys import TimeshiftRedisKeys
+
+logger = logging.getLogger(__name__)
+
+BLOCK_SIZE = 4 * 1024 * 1024
+PART_STALE_SECONDS = 30
+_FOLLOW_POLL_SECONDS = 0.1
+_EVICT_INTERVAL_SECONDS = 30
+_EVICT_LOCK_TTL = 120
+_EVICT_LOW_WATER = 0.9  # Evict down to 90% of the cap to avoid thrashing.
+_META_FILENAME = "meta.json"
+
+# Process-local throttle so every committed block does not walk the cache.
+_last_evict_check = 0.0
+
+
+def max_cache_bytes():
+    """Configured cache cap in bytes (``0`` disables the cache)."""
+    try:
+        max_mb = int(getattr(settings, "CATCHUP_CACHE_MAX_MB", 0) or 0)
+    except (TypeError, ValueError):
+        return 0
+    return max(max_mb, 0) * 1024 * 1024
+
+
+def cache_enabled():
+    return bool(getattr(settings, "CATCHUP_CACHE_DIR", None)) and max_cache_bytes() > 0
+
+
+def programme_cache_key(stream_id, timestamp, duration_minutes):
+    """Stable archive identity for one catch-up stream/programme window."""
+    raw = f"{stream_id}:{timestamp}:{duration_minutes}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _entry_dir(key):
+    return os.path.join(settings.CATCHUP_CACHE_DIR, key[:2], key)
+
+
+def _block_path(key, index):
+    return os.path.join(_entry_dir(key), f"{index}.blk")
+
+
+def _part_path(key, index):
+    return os.path.join(_entry_dir(key), f"{index}.part")
+
+
+def _part_is_fresh(path, now=None):
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return False
+    return (now or time.time()) - mtime < PART_STALE_SECONDS
+
+
+def read_meta(key):
+    """Return ``{"length", "content_type", "virtual_channel_id"}`` or None."""
+    try:
+        with open(os.path.join(_entry_dir(key), _META_FILENAME), "r") as fh:
+            meta = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    try:
+        meta["length"] = int(meta["length"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if meta["length"] <= 0:
+        return None
+    return meta
+
+
+def write_meta(key, *, length, content_type, virtual_channel_id):
+    """Record the archive size/type once; returns False on conflict or error."""
+    existing = read_meta(key)
+    if existing is not None:
+        # A different size means the provider re-encoded the archive; refuse
+        # to mix blocks from two files.
+        return existing["length"] == int(length)
+    entry_dir = _entry_dir(key)
+    tmp_path = os.path.join(entry_dir, f"{_META_FILENAME}.{os.getpid()}.tmp")
+    try:
+        os.makedirs(entry_dir, exist_ok=True)
+        with open(tmp_path, "w") as fh:
+            json.dump({
+                "length": int(length),
+                "content_type": content_type or "video/mp2t",
+                "virtual_channel_id": virtual_channel_id,
+                "created_at": time.time(),
+            }, fh)
+        os.replace(tmp_path, os.path.join(entry_dir, _META_FILENAME))
+        return True
+    except OSError as exc:
+        logger.debug("Catch-up cache meta write failed for %s: %s", key, exc)
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        return False
+
+
+def lookup(key, offset):
+    """Return ``"hit"``, ``"follow"`` or None for the block holding *offset*."""
+    index = offset // BLOCK_SIZE
+    if os.path.exists(_block_path(key, index)):
+        return "hit"
+    if _part_is_fresh(_part_path(key, index)):
+        return "follow"
+    return None
+
+
+class RangeCacheWriter:
+    """Tee a sequential upstream byte stream into aligned cache blocks.
+
+    Only whole blocks are committed (plus the short final block at EOF), so a
+    writer that starts mid-block skips ahead to the next boundary. Blocks that
+    are already committed or claimed by another live writer are skipped too.
+    Any filesystem error disables the writer; streaming is never affected.
+    """
+
+    def __init__(self, key, start_offset, length, *, redis_client=None):
+        self.key = key
+        self.offset = int(start_offset)
+        self.length = int(length)
+        self.redis_client = redis_client
+        self.bytes_written = 0
+        self._fd = None
+        self._index = None
+        self._skip_until = None
+        self._disabled = False
+
+    def feed(self, data):
+        if self._disabled or not data:
+            return
+        try:
+            self._feed(memoryview(data))
+        except OSError as exc:
+            logger.debug("Catch-up cache write failed for %s: %s", self.key, exc)
+            self._abort()
+            self._disabled = True
+
+    def _feed(self, view):
+        while len(view):
+            if self._skip_until is not None:
+                skip = min(len(view), self._skip_until - self.offset)
+                view = view[skip:]
+                self.offset += skip
+                if self.offset >= self._skip_until:
+                    self._skip_until = None
+                continue
+            if self._fd is None:
+                within = self.offset % BLOCK_SIZE
+                if within:
+                    self._skip_until = self.offset - within + BLOCK_SIZE
+                    continue
+                if not self._claim(self.offset // BLOCK_SIZE):
+                    self._skip_until = self.offset + BLOCK_SIZE
+                    continue
+            block_end = min((self._index + 1) * BLOCK_SIZE, self.length)
+            take = min(len(view), block_end - self.offset)
+            if take <= 0:
+                # Upstream sent more than the advertised length; stop caching.
+                self._abort()
+                self._disabled = True
+                return
+            os.write(self._fd, view[:take])
+            view = view[take:]
+            self.offset += take
+            self.bytes_written += take
+            if self.offset >= block_end:
+                self._commit()
+
+    def _claim(self, index):
+        if index * BLOCK_SIZE >= self.length:
+            return False
+        if os.path.exists(_block_path(self.key, index)):
+            return False
+        part = _part_path(self.key, index)
+        flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL
+        try:
+            fd = os.open(part, flags, 0o644)
+        except FileExistsError:
+            if _part_is_fresh(part):
+                return False
+            # Abandoned by a writer that died mid-block: take it over.
+            try:
+                os.unlink(part)
+                fd = os.open(part, flags, 0o644)
+            except OSError:
+                return False
+        self._fd = fd
+        self._index = index
+        return True
+
+    def _commit(self):
+        os.close(self._fd)
+        self._fd = None
+        os.replace(
+            _part_path(self.key, self._index),
+            _block_path(self.key, self._index),
+        )
+        self._index = None
+        maybe_evict(self.redis_client)
+
+    def _abort(self):
+        if self._fd is None:
+            return
+        try:
+            os.close(self._fd)
+        except OSError:
+            pass
+        try:
+            os.unlink(_part_path(self.key, self._index))
+        except OSError:
+            pass
+        self._fd = None
+        self._index = None
+
+    def close(self):
+        """Drop the in-progress block (partial blocks are never committed)."""
+        self._abort()
+        self._disabled = True
+
+
+def iter_range(key, start, end, *, chunk_size, should_stop=None):
+    """Yield cached bytes ``start..end`` (inclusive) for archive *key*.
+
+    Committed blocks are read directly; a block still being written by another
+    request is followed as it grows. Iteration ends early at the first gap, or
+    when a followed writer stalls or aborts, so the client reconnects with a
+    Range and the caller's normal provider path picks up from there.
+    """
+    position = int(start)
+    while position <= end:
+        if should_stop is not None and should_stop():
+            return
+        index = position // BLOCK_SIZE
+        block_end = min((index + 1) * BLOCK_SIZE - 1, end)
+        block = _block_path(key, index)
+        try:
+            fh = open(block, "rb")
+        except OSError:
+            fh = None
+        if fh is not None:
+            with fh:
+                try:
+                    os.utime(block)  # LRU: refresh on every read.
+                except OSError:
+                    pass
+                fh.seek(position - index * BLOCK_SIZE)
+                while position <= block_end:
+                    data = fh.read(min(chunk_size, block_end - position + 1))
+                    if not data:
+                        return  # Short block before EOF: treat as a gap.
+                    position += len(data)
+                    yield data
+            continue
+        followed = yield from _follow_part(
+            key, index, position, block_end,
+            chunk_size=chunk_size, should_stop=should_stop,
+        )
+        if followed is None:
+            return
+        position = followed
+
+
+def _follow_part(key, index, position, block_end, *, chunk_size, should_stop):
+    """Follow a growing ``.part``; return the next position, or None to stop."""
+    part = _part_path(key, index)
+    try:
+        fh = open(part, "rb")
+    except OSError:
+        return None
+    with fh:
+        fh.seek(position - index * BLOCK_SIZE)
+        last_progress = time.time()
+        while position <= block_end:
+            data = fh.read(min(chunk_size, block_end - position + 1))
+            if data:
+                position += len(data)
+                last_progress = time.time()
+                yield data
+                continue
+            if os.path.exists(_block_path(key, index)):
+                # Committed while we were reading; continue from the block.
+                return position
+            if not os.path.exists(part):
+                return None  # Writer aborted (its client went away).
+            if time.time() - last_progress >= PART_STALE_SECONDS:
+                return None
+            if should_stop is not None and should_stop():
+                return None
+            time.sleep(_FOLLOW_POLL_SECONDS)
+    return position
+
+
+def maybe_evict(redis_client=None, *, force=False):
+    """Evict LRU blocks when over the cap (throttled, one worker at a time)."""
+    global _last_evict_check
+    now = time.time()
+    if not force and now - _last_evict_check < _EVICT_INTERVAL_SECONDS:
+        return
+    _last_evict_check = now
+    if redis_client is not None:
+        try:
+            if not redis_client.set(
+                TimeshiftRedisKeys.cache_evict_lock(), "1",
+                nx=True, ex=_EVICT_LOCK_TTL,
+            ):
+                return
+        except Exception:
+            pass
+    try:
+        size = evict(max_cache_bytes())
+    finally:
+        if redis_client is not None:
+            try:
+                redis_client.delete(TimeshiftRedisKeys.cache_evict_lock())
+            except Exception:
+                pass
+    if redis_client is not None and size is not None:
+        try:
+            redis_client.hset(TimeshiftRedisKeys.cache_stats(), "size_bytes", str(size))
+        except Exception:
+            pass
+
+
+def evict(max_bytes):
+    """Delete least-recently-read blocks until the cache fits; return its size."""
+    root = getattr(settings, "CATCHUP_CACHE_DIR", None)
+    if not root or not os.path.isdir(root):
+        return 0
+    blocks = []
+    total = 0
+    entry_dirs = []
+    for prefix in os.listdir(root):
+        prefix_dir = os.path.join(root, prefix)
+        if not os.path.isdir(prefix_dir):
+            continue
+        for key in os.listdir(prefix_dir):
+            entry_dir = os.path.join(prefix_dir, key)
+            entry_dirs.append(entry_dir)
+            try:
+                names = os.listdir(entry_dir)
+            except OSError:
+                continue
+            for name in names:
+                if not name.endswith((".blk", ".part")):
+                    continue
+                path = os.path.join(entry_dir, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                total += st.st_size
+                if name.endswith(".blk"):
+                    blocks.append((st.st_mtime, st.st_size, path))
+
+    if total > max_bytes:
+        target = int(max_bytes * _EVICT_LOW_WATER)
+        blocks.sort()
+        for _mtime, size, path in blocks:
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+            except OSError:
+                continue
+
+    # Drop archive directories with nothing left to serve or follow.
+    now = time.time()
+    for entry_dir in entry_dirs:
+        try:
+            names = os.listdir(entry_dir)
+        except OSError:
+            continue
+        live = any(
+            name.endswith(".blk")
+            or (
+                name.endswith(".part")
+                and _part_is_fresh(os.path.join(entry_dir, name), now)
+            )
+            for name in names
+        )
+        if not live:
+            shutil.rmtree(entry_dir, ignore_errors=True)
+    return total
+
+
+def record_lookup(redis_client, hit):
+    """Count one cache-eligible request as a hit or a miss."""
+    if redis_client is None:
+        return
+    try:
+        redis_client.hincrby(
+            TimeshiftRedisKeys.cache_stats(), "hits" if hit else "misses", 1,
+        )
+    except Exception as exc:
+        logger.debug("Catch-up cache stats update failed: %s", exc)
+
+
+def record_bytes_saved(redis_client, nbytes):
+    """Count bytes served from disk instead of the provider."""
+    if redis_client is None or nbytes <= 0:
+        return
+    try:
+        redis_client.hincrby(TimeshiftRedisKeys.cache_stats(), "bytes_saved", int(nbytes))
+    except Exception as exc:
+        logger.debug("Catch-up cache stats update failed: %s", exc)
+
+
+def cache_stats(redis_client):
+    """Hit rate / bytes saved summary for the timeshift stats payload."""
+    stats = {
+        "enabled": cache_enabled(),
+        "hits": 0,
+        "misses": 0,
+        "hit_rate": 0.0,
+        "bytes_saved": 0,
+        "size_bytes": 0,
+        "max_bytes": max_cache_bytes(),
+    }
+    if redis_client is None:
+        return stats
+    try:
+        raw = redis_client.hgetall(TimeshiftRedisKeys.cache_stats()) or {}
+    except Exception:
+        return stats
+    for field in ("hits", "misses", "bytes_saved", "size_bytes"):
+        value = raw.get(field, raw.get(field.encode()))
+        if isinstance(value, bytes):
+            value = value.decode()
+        try:
+            stats[field] = int(value or 0)
+        except (TypeError, ValueError):
+            stats[field] = 0
+    lookups = stats["hits"] + stats["misses"]
+    if lookups:
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4)
+    return stats
@@ -64,6 +64,14 @@ class TimeshiftRedisKeys:
     def format_cache(account_id):
         return f"timeshift:format_idx:{account_id}"
 
+    @staticmethod
+    def cache_stats():
+        return "timeshift:cache:stats"
+
+    @staticmethod
+    def cache_evict_lock():
+        return "timeshift:cache:evict_lock"
+
 
 def mint_session_id():
     """Opaque per-viewer session id (URL query param and pool key suffix)."""
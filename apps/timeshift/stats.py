@@ -11,6 +11,7 @@ from datetime import timezone as dt_timezone
 from apps.channels.models import Channel
 from apps.m3u.models import M3UAccountProfile
 from apps.proxy.live_proxy.constants import ChannelMetadataField
+from apps.timeshift import range_cache
 from apps.timeshift.redis_keys import TimeshiftRedisKeys, parse_stats_channel_id
 from apps.timeshift.helpers import parse_catchup_timestamp
 from core.utils import RedisClient
@@ -373,6 +374,7 @@ def build_timeshift_stats_data(redis_client):
     empty = {
         "timeshift_sessions": [],
         "total_connections": 0,
+        "cache": range_cache.cache_stats(redis_client),
         "timestamp": time.time(),
     }
     if redis_client is None:
@@ -575,6 +577,7 @@ def build_timeshift_stats_data(redis_client):
         return {
             "timeshift_sessions": list(session_stats.values()),
             "total_connections": len(connections),
+            "cache": range_cache.cache_stats(redis_client),
             "timestamp": current_time,
         }
     except Exception as exc:
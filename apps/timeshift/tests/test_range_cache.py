@@ -0,0 +1,181 @@
+"""Tests for the shared catch-up byte-range disk cache."""
+
+import os
+import shutil
+import tempfile
+import time
+from unittest.mock import MagicMock, patch
+
+from django.test import TestCase, override_settings
+
+from apps.timeshift import range_cache, views
+from apps.timeshift.tests.test_views import _FakeRedis
+
+BLOCK = 16
+
+
+class RangeCacheTestMixin:
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp(prefix="catchup-cache-")
+        self.addCleanup(shutil.rmtree, self.cache_dir, ignore_errors=True)
+        settings_patch = override_settings(
+            CATCHUP_CACHE_DIR=self.cache_dir, CATCHUP_CACHE_MAX_MB=1,
+        )
+        settings_patch.enable()
+        self.addCleanup(settings_patch.disable)
+        block_patch = patch.object(range_cache, "BLOCK_SIZE", BLOCK)
+        block_patch.start()
+        self.addCleanup(block_patch.stop)
+        self.key = range_cache.programme_cache_key(7, "2026-06-08:17-00", 75)
+        self.payload = bytes(range(256))[:40]
+        range_cache.write_meta(
+            self.key,
+            length=len(self.payload),
+            content_type="video/mp2t",
+            virtual_channel_id="8_2026-06-08-17-00_111",
+        )
+
+    def _fill(self, start=0, data=None):
+        data = self.payload[start:] if data is None else data
+        writer = range_cache.RangeCacheWriter(self.key, start, len(self.payload))
+        writer.feed(data)
+        writer.close()
+        return writer
+
+    def _read(self, start, end, chunk_size=5):
+        return b"".join(
+            range_cache.iter_range(self.key, start, end, chunk_size=chunk_size)
+        )
+
+
+class RangeCacheWriterTests(RangeCacheTestMixin, TestCase):
+    def test_full_stream_commits_blocks_including_short_tail(self):
+        self._fill()
+        for offset in (0, 16, 32, 39):
+            self.assertEqual(range_cache.lookup(self.key, offset), "hit")
+        self.assertEqual(self._read(0, 39), self.payload)
+        self.assertEqual(self._read(10, 20), self.payload[10:21])
+
+    def test_unaligned_start_skips_to_next_block(self):
+        self._fill(start=5)
+        self.assertIsNone(range_cache.lookup(self.key, 5))
+        self.assertEqual(range_cache.lookup(self.key, 16), "hit")
+        self.assertEqual(self._read(16, 39), self.payload[16:])
+
+    def test_partial_block_discarded_on_close(self):
+        self._fill(data=self.payload[:20])
+        self.assertEqual(range_cache.lookup(self.key, 0), "hit")
+        self.assertIsNone(range_cache.lookup(self.key, 16))
+        self.assertFalse(os.path.exists(range_cache._part_path(self.key, 1)))
+
+    def test_read_stops_at_first_gap(self):
+        self._fill(data=self.payload[:16])
+        self.assertEqual(self._read(4, 39), self.payload[4:16])
+
+    def test_fresh_part_of_other_writer_is_skipped(self):
+        first = range_cache.RangeCacheWriter(self.key, 0, len(self.payload))
+        first.feed(self.payload[:4])
+        second = self._fill()
+        self.assertEqual(second.bytes_written, len(self.payload) - BLOCK)
+        self.assertEqual(range_cache.lookup(self.key, 0), "follow")
+        first.close()
+
+    def test_stale_part_is_reclaimed(self):
+        abandoned = range_cache.RangeCacheWriter(self.key, 0, len(self.payload))
+        abandoned.feed(self.payload[:4])
+        part = range_cache._part_path(self.key, 0)
+        old = time.time() - range_cache.PART_STALE_SECONDS - 1
+        os.utime(part, (old, old))
+        self._fill()
+        self.assertEqual(self._read(0, 39), self.payload)
+
+    def test_meta_length_mismatch_refuses_writer(self):
+        self.assertFalse(range_cache.write_meta(
+            self.key, length=99, content_type="video/mp2t", virtual_channel_id="x",
+        ))
+
+    def test_reader_follows_growing_block(self):
+        writer = range_cache.RangeCacheWriter(self.key, 0, len(self.payload))
+        writer.feed(self.payload[:6])
+        self.assertEqual(range_cache.lookup(self.key, 0), "follow")
+        reader = range_cache.iter_range(self.key, 0, 15, chunk_size=32)
+        self.assertEqual(next(reader), self.payload[:6])
+        writer.feed(self.payload[6:20])
+        self.assertEqual(b"".join(reader), self.payload[6:16])
+        writer.close()
+
+
+class RangeCacheEvictionTests(RangeCacheTestMixin, TestCase):
+    def test_evicts_least_recently_read_blocks(self):
+        self._fill()
+        now = time.time()
+        for index, age in ((0, 30), (1, 10), (2, 20)):
+            path = range_cache._block_path(self.key, index)
+            os.utime(path, (now - age, now - age))
+        size = range_cache.evict(BLOCK + 8)
+        self.assertLessEqual(size, BLOCK + 8)
+        self.assertFalse(os.path.exists(range_cache._block_path(self.key, 0)))
+        self.assertFalse(os.path.exists(range_cache._block_path(self.key, 2)))
+        self.assertTrue(os.path.exists(range_cache._block_path(self.key, 1)))
+
+    def test_empty_archive_directory_is_removed(self):
+        self._fill()
+        range_cache.evict(0)
+        self.assertIsNone(range_cache.read_meta(self.key))
+
+
+class RangeCacheStatsTests(TestCase):
+    def test_hit_rate_and_bytes_saved(self):
+        redis = _FakeRedis()
+        range_cache.record_lookup(redis, hit=True)
+        range_cache.record_lookup(redis, hit=True)
+        range_cache.record_lookup(redis, hit=False)
+        range_cache.record_bytes_saved(redis, 4096)
+        stats = range_cache.cache_stats(redis)
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["misses"], 1)
+        self.assertAlmostEqual(stats["hit_rate"], 0.6667, places=4)
+        self.assertEqual(stats["bytes_saved"], 4096)
+
+
+class ServeFromRangeCacheTests(RangeCacheTestMixin, TestCase):
+    def _serve(self, range_header):
+        stream = MagicMock(id=7, stream_stats={})
+        channel = MagicMock(id=8, uuid="uuid-8")
+        channel.name = "Cached"
+        return views._serve_from_range_cache(
+            _FakeRedis(),
+            catchup_streams=[stream],
+            channel=channel,
+            safe_ts="2026-06-08-17-00",
+            timestamp="2026-06-08:17-00",
+            duration_minutes=75,
+            client_id="client1",
+            client_ip="1.2.3.4",
+            client_user_agent="test-agent",
+            range_header=range_header,
+            channel_logo_id=None,
+            user=MagicMock(id=5, username="viewer"),
+            debug=False,
+        )
+
+    @patch.object(views, "_heartbeat_stats_client")
+    @patch.object(views, "_register_stats_client")
+    @patch.object(views, "reserve_profile_slot")
+    def test_cached_range_served_without_provider_slot(
+        self, mock_reserve, mock_register, _mock_heartbeat,
+    ):
+        self._fill()
+        response = self._serve("bytes=20-")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], "bytes 20-39/40")
+        self.assertEqual(response["Content-Length"], "20")
+        self.assertEqual(b"".join(response.streaming_content), self.payload[20:])
+        mock_reserve.assert_not_called()
+        mock_register.assert_called_once()
+
+    @patch.object(views, "_register_stats_client")
+    def test_uncached_range_falls_through(self, mock_register):
+        self._fill(data=self.payload[:16])
+        self.assertIsNone(self._serve("bytes=20-"))
+        mock_register.assert_not_called()
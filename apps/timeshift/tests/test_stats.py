@@ -329,6 +329,17 @@ class BuildTimeshiftStatsDataTests(TestCase):
         self.assertEqual(session["logo_id"], 77)
         self.assertNotIn("logo_url", session)
 
+    @patch("apps.timeshift.stats.Channel")
+    def test_build_timeshift_stats_reports_range_cache(self, mock_channel_model):
+        mock_channel_model.objects.filter.return_value = []
+        self.redis.hincrby(RedisKeys.cache_stats(), "hits", 3)
+        self.redis.hincrby(RedisKeys.cache_stats(), "misses", 1)
+        self.redis.hincrby(RedisKeys.cache_stats(), "bytes_saved", 1024)
+        cache_stats = build_timeshift_stats_data(self.redis)["cache"]
+        self.assertEqual(cache_stats["hits"], 3)
+        self.assertEqual(cache_stats["hit_rate"], 0.75)
+        self.assertEqual(cache_stats["bytes_saved"], 1024)
+
     def test_find_stats_channel_for_session(self):
         found = find_stats_channel_for_session(self.redis, self.session_id)
         self.assertEqual(found, self.stats_channel_id)
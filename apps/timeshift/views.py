@@ -1,6 +1,5 @@
 """Catch-up (timeshift) proxy with multi-provider failover."""
 
-import hmac
 import json
 import logging
 import secrets
@@ -30,6 +29,7 @@ from drf_spectacular.utils import OpenApiParameter, extend_schema
 
 from apps.accounts.authentication import ApiKeyAuthentication, QueryParamJWTAuthentication
 from apps.accounts.models import User
+from apps.accounts.principal_cache import authenticate_xc
 from apps.channels.models import Channel
 from apps.channels.utils import get_channel_catchup_streams, is_catchup_enabled
 from apps.m3u.connection_pool import (
@@ -70,6 +70,7 @@ from .helpers import (
     parse_catchup_timestamp,
     resolve_catchup_duration,
 )
+from . import range_cache
 from .sessions import catchup_session_exists, delete_catchup_session, resolve_catchup_playback
 from .stats import (
     EOF_PROBE_TAIL_BYTES,
@@ -533,6 +534,27 @@ def _serve_catchup(request, user, channel, timestamp, client_duration_hint=None)
     ):
         pool_busy = True
 
+    # Bytes another viewer (or this one, before a scrub) already pulled are
+    # served from the shared disk cache without reserving a provider slot.
+    if not pool_busy and _range_cache_eligible(pool, session_entry, media_id):
+        cached_response = _serve_from_range_cache(
+            redis_client,
+            catchup_streams=catchup_streams,
+            channel=channel,
+            safe_ts=safe_ts,
+            timestamp=timestamp,
+            duration_minutes=duration_minutes,
+            client_id=client_id,
+            client_ip=client_ip,
+            client_user_agent=client_user_agent,
+            range_header=range_header,
+            channel_logo_id=channel_logo_id,
+            user=user,
+            debug=debug,
+        )
+        if cached_response is not None:
+            return _finalize_timeshift_response(cached_response)
+
     acquired = None
     if pool_exists:
         if not pool_busy:
@@ -716,6 +738,12 @@ def _serve_catchup(request, user, channel, timestamp, client_duration_hint=None)
                 pool_session_id=effective_session_id,
                 stats_stream_id=target.catchup_stream.id,
                 stream_stats=target.catchup_stream.stream_stats,
+                range_cache_key=(
+                    range_cache.programme_cache_key(
+                        target.catchup_stream.id, timestamp, duration_minutes,
+                    )
+                    if range_cache.cache_enabled() else None
+                ),
             )
         except Exception:
             _discard_pool_session(redis_client, effective_session_id, reserved_profile.id)
@@ -756,16 +784,7 @@ def _serve_catchup(request, user, channel, timestamp, client_duration_hint=None)
 
 
 def _authenticate_user(username, password):
-    try:
-        user = User.objects.get(username=username)
-    except User.DoesNotExist:
-        return None
-    expected = (user.custom_properties or {}).get("xc_password")
-    if not expected:
-        return None
-    if not hmac.compare_digest(str(expected), str(password)):
-        return None
-    return user
+    return authenticate_xc(username, password)
 
 
 def _user_can_access_channel(user, channel):
@@ -2664,6 +2683,7 @@ def _attempt_timeshift_stream(
     presentation_remaining=None,
     presentation_byte_base=None,
     relative_presentation_range=False,
+    range_cache_key=None,
 ):
     """Build the provider URL set for one (account, profile, stream) and stream it."""
     server_url, xc_username, xc_password = get_transformed_credentials(
@@ -2727,6 +2747,7 @@ def _attempt_timeshift_stream(
         presentation_remaining=presentation_remaining,
         presentation_byte_base=presentation_byte_base,
         relative_presentation_range=relative_presentation_range,
+        range_cache_key=range_cache_key,
     )
 
 
@@ -2874,6 +2895,18 @@ def _stream_reused_session(
         except (TypeError, ValueError):
             stats_stream_id = None
 
+    # Only cache when byte offsets address the archive of *this* timestamp
+    # (a scrub reuses the anchor programme's CDN file).
+    range_cache_key = None
+    if (
+        stats_stream_id is not None
+        and (scrub_info is None or scrub_info["kind"] == "same")
+        and range_cache.cache_enabled()
+    ):
+        range_cache_key = range_cache.programme_cache_key(
+            stats_stream_id, timestamp, duration_minutes,
+        )
+
     try:
         response = _attempt_timeshift_stream(
             m3u_account=m3u_account,
@@ -2901,6 +2934,7 @@ def _stream_reused_session(
             presentation_remaining=presentation_remaining,
             presentation_byte_base=presentation_byte_base,
             relative_presentation_range=relative_presentation_range,
+            range_cache_key=range_cache_key,
         )
     except Exception:
         _discard_pool_session(redis_client, session_id, profile.id)
@@ -3162,6 +3196,235 @@ def _passthrough_response(status, content_range=None):
     return response
 
 
+def _range_cache_eligible(pool, session_entry, media_id):
+    """True when client Ranges are absolute offsets into *media_id*'s archive."""
+    if not range_cache.cache_enabled():
+        return False
+    entry = (pool or {}).get("entry") or session_entry
+    if not entry:
+        return True
+    # A pool anchored on another programme (or a scrub window) maps client
+    # Ranges through its own archive; leave those to the provider path.
+    if str(entry.get("media_id") or "") != str(media_id):
+        return False
+    return not _pool_int_field(entry.get("presentation_byte_base"))
+
+
+def _open_range_cache_writer(
+    redis_client, *, key, upstream, representation_length, content_type,
+    virtual_channel_id,
+):
+    """Return a cache tee for *upstream*, or None when offsets are unknown."""
+    if upstream.status_code == 200:
+        start = 0
+    else:
+        parsed = _parse_content_range_header(
+            upstream.headers.get("Content-Range", ""),
+        )
+        if not parsed:
+            return None
+        start = parsed["start"]
+    # The TS sync probe may have dropped leading junk from the peek bytes.
+    start += getattr(upstream, "_peek_skipped", 0) or 0
+    if not range_cache.write_meta(
+        key,
+        length=representation_length,
+        content_type=content_type,
+        virtual_channel_id=virtual_channel_id,
+    ):
+        return None
+    return range_cache.RangeCacheWriter(
+        key, start, representation_length, redis_client=redis_client,
+    )
+
+
+def _serve_from_range_cache(
+    redis_client,
+    *,
+    catchup_streams,
+    channel,
+    safe_ts,
+    timestamp,
+    duration_minutes,
+    client_id,
+    client_ip,
+    client_user_agent,
+    range_header,
+    channel_logo_id,
+    user,
+    debug,
+):
+    """Stream the requested range from the catch-up cache, or return None.
+
+    Hits need the block holding the range start to be committed, or still
+    being written by another request (which this one then follows). The
+    response ends at the first uncached byte; the client's Range reconnect
+    falls through to the provider path.
+    """
+    client_range = None
+    if range_header:
+        client_range = _parse_client_range(range_header)
+        if client_range is None:
+            return None
+    start = client_range[0] if client_range else 0
+
+    hit = None
+    for catchup_stream in catchup_streams:
+        key = range_cache.programme_cache_key(
+            catchup_stream.id, timestamp, duration_minutes,
+        )
+        meta = range_cache.read_meta(key)
+        if meta is None or start >= meta["length"]:
+            continue
+        state = range_cache.lookup(key, start)
+        if state:
+            hit = (catchup_stream, key, meta, state)
+            break
+    if hit is None:
+        range_cache.record_lookup(redis_client, hit=False)
+        return None
+    range_cache.record_lookup(redis_client, hit=True)
+
+    catchup_stream, key, meta, state = hit
+    length = meta["length"]
+    end = length - 1
+    if client_range and client_range[1] is not None:
+        end = min(client_range[1], end)
+    if range_header:
+        status = 206
+        content_range = f"bytes {start}-{end}/{length}"
+    else:
+        status = 200
+        content_range = None
+    client_length_headers = _build_downstream_length_headers(
+        range_header=range_header,
+        status_code=status,
+        representation_length=length,
+        upstream_content_range=content_range,
+        upstream_content_length=None,
+        streaming=True,
+    )
+
+    virtual_channel_id = meta.get("virtual_channel_id") or make_virtual_channel_id(
+        channel.id, safe_ts, catchup_stream.id,
+    )
+    stats_channel_id = make_stats_channel_id(channel.id, client_id)
+    programme_duration_secs = (
+        float(duration_minutes) * 60.0 if duration_minutes else None
+    )
+    _register_stats_client(
+        redis_client,
+        stats_channel_id,
+        client_id,
+        client_ip,
+        client_user_agent,
+        user,
+        channel_display_name=channel.name,
+        timestamp_utc=timestamp,
+        primary_url=None,
+        channel_logo_id=channel_logo_id,
+        programme_vid=virtual_channel_id,
+        channel_id=channel.id,
+        channel_uuid=channel.uuid,
+        stats_stream_id=catchup_stream.id,
+        stream_stats=catchup_stream.stream_stats,
+        range_start=_parse_range_start(range_header),
+        representation_length=length,
+        programme_duration_secs=programme_duration_secs,
+        emit_stats_update=True,
+    )
+    if debug:
+        logger.debug(
+            "Timeshift cache %s: client=%s vid=%s range=%s",
+            state, client_id, virtual_channel_id, range_header or "(none)",
+        )
+
+    chunk_size = max(ConfigHelper.chunk_size(), 262144)
+
+    def stream_generator():
+        stop_key = TimeshiftRedisKeys.client_stop(virtual_channel_id, client_id)
+        stream_generation = _allocate_stream_generation(
+            redis_client, virtual_channel_id, client_id,
+        )
+        stop_state = {"reuse": False}
+
+        def _should_stop():
+            should_stop, is_reuse = _stream_stop_requested(
+                redis_client, stop_key, stream_generation,
+            )
+            if should_stop:
+                stop_state["reuse"] = is_reuse
+                if not is_reuse:
+                    redis_client.delete(stop_key)
+            return should_stop
+
+        last_heartbeat = time.time()
+        loop_start = last_heartbeat
+        bytes_since_heartbeat = 0
+        total_yielded = 0
+        try:
+            for data in range_cache.iter_range(
+                key, start, end, chunk_size=chunk_size, should_stop=_should_stop,
+            ):
+                yield data
+                bytes_since_heartbeat += len(data)
+                total_yielded += len(data)
+                now = time.time()
+                if now - last_heartbeat >= 5:
+                    _heartbeat_stats_client(
+                        redis_client, stats_channel_id, client_id,
+                        bytes_delta=bytes_since_heartbeat,
+                        programme_vid=virtual_channel_id,
+                    )
+                    range_cache.record_bytes_saved(redis_client, bytes_since_heartbeat)
+                    last_heartbeat = now
+                    bytes_since_heartbeat = 0
+        except GeneratorExit:
+            pass
+        except Exception:
+            logger.exception("Timeshift cache stream loop error")
+        finally:
+            if bytes_since_heartbeat > 0:
+                _heartbeat_stats_client(
+                    redis_client, stats_channel_id, client_id,
+                    bytes_delta=bytes_since_heartbeat,
+                    programme_vid=virtual_channel_id,
+                )
+                range_cache.record_bytes_saved(redis_client, bytes_since_heartbeat)
+            elapsed = time.time() - loop_start
+            if debug:
+                logger.debug(
+                    "Timeshift cache disconnect: vid=%s client=%s served=%d bytes in %.1fs",
+                    virtual_channel_id, client_id, total_yielded, elapsed,
+                )
+            stopped_for_reuse = stop_state["reuse"]
+            if not stopped_for_reuse:
+                if not _is_timeshift_startup_probe(total_yielded, elapsed):
+                    _cleanup_stream_generation(
+                        redis_client, virtual_channel_id, client_id,
+                    )
+                if _should_schedule_stats_disconnect_grace(
+                    total_yielded,
+                    elapsed,
+                    stopped_for_reuse=stopped_for_reuse,
+                    redis_client=redis_client,
+                    client_id=client_id,
+                ):
+                    _schedule_stats_disconnect_grace(
+                        redis_client, stats_channel_id, client_id,
+                    )
+
+    response = StreamingHttpResponse(
+        _SlotReleasingStream(stream_generator(), lambda: None),
+        content_type=meta.get("content_type") or "video/mp2t",
+        status=status,
+    )
+    response["X-Accel-Buffering"] = "no"
+    for header_name, header_value in client_length_headers.items():
+        response[header_name] = header_value
+    return response
+
+
 def _stream_from_provider(
     *,
     candidate_urls,
@@ -3192,6 +3455,7 @@ def _stream_from_provider(
     presentation_remaining=None,
     presentation_byte_base=None,
     relative_presentation_range=False,
+    range_cache_key=None,
 ):
     """Try each upstream URL until one returns streamable MPEG-TS.
 
@@ -3208,6 +3472,10 @@ def _stream_from_provider(
     Sets ``timeshift_decisive`` on auth/ban-class failures (401/403/406) so the
     failover loop skips the rest of that account's streams. ``release_cb`` frees
     the provider slot when the streaming response is closed.
+
+    ``range_cache_key`` tees the streamed archive bytes into the shared
+    catch-up range cache; callers only pass it when upstream offsets are
+    absolute positions in that archive (no scrub/presentation rewrite).
     """
     chunk_size = max(ConfigHelper.chunk_size(), 262144)
     if release_cb is None:
@@ -3286,6 +3554,7 @@ def _stream_from_provider(
             is_partial = response.status_code == 206 and bool(range_header)
             if is_partial and peek and "html" not in content_type and "json" not in content_type:
                 response._peek_data = peek
+                response._peek_skipped = 0
                 upstream = response
                 winning_index = orig_idx
                 used_cached_final = cached_final
@@ -3293,6 +3562,7 @@ def _stream_from_provider(
             sync_offset = find_ts_sync(peek) if peek else -1
             if sync_offset >= 0:
                 response._peek_data = peek[sync_offset:]
+                response._peek_skipped = sync_offset
                 upstream = response
                 winning_index = orig_idx
                 used_cached_final = cached_final
@@ -3458,6 +3728,21 @@ def _stream_from_provider(
     )
 
     peek_data = getattr(upstream, "_peek_data", None)
+    cache_writer = None
+    if (
+        range_cache_key
+        and representation_length
+        and not rewrite_plain_get
+        and not relative_presentation_range
+    ):
+        cache_writer = _open_range_cache_writer(
+            redis_client,
+            key=range_cache_key,
+            upstream=upstream,
+            representation_length=representation_length,
+            content_type=content_type,
+            virtual_channel_id=virtual_channel_id,
+        )
     _register_active_upstream(virtual_channel_id, client_id, upstream)
 
     session_closed = {"done": False}
@@ -3506,6 +3791,8 @@ def _stream_from_provider(
                         client_id, virtual_channel_id, range_header or "(none)",
                         status, stream_generation,
                     )
+                if cache_writer is not None:
+                    cache_writer.feed(data)
                 yield data
                 bytes_since_heartbeat += len(data)
                 total_yielded += len(data)
@@ -3544,6 +3831,8 @@ def _stream_from_provider(
         except Exception:
             logger.exception("Timeshift stream loop error")
         finally:
+            if cache_writer is not None:
+                cache_writer.close()
             elapsed = time.time() - loop_start
             if bytes_since_heartbeat > 0:
                 _heartbeat_stats_client(
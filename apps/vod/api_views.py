@@ -37,7 +37,8 @@ from .image_proxy import (
     vod_image_url_parts,
     vodlogo_cache_url,
 )
-from .tasks import refresh_series_episodes, refresh_movie_advanced_data
+from .browse import browse_queryset, browse_table_ready, decode_cursor, encode_cursor
+from .tasks import queue_vod_browse_rebuild, refresh_series_episodes, refresh_movie_advanced_data
 from django.utils import timezone
 from datetime import timedelta
 
@@ -716,199 +717,244 @@ class UnifiedContentViewSet(viewsets.ReadOnlyModelViewSet):
             return [Authenticated()]
 
     def list(self, request, *args, **kwargs):
-        """Override list to handle unified content properly - database-level approach"""
-        import logging
-        from django.db import connection
-
-        logger = logging.getLogger(__name__)
-        logger.error("=== UnifiedContentViewSet.list() called ===")
+        """
+        Unified movie + series listing from the VOD browse table.
 
+        Pages are addressed by ``cursor`` (keyset on ``(sort_name, id)``,
+        returned as ``next_cursor``); ``page`` still works for direct jumps.
+        """
         try:
-            # Get pagination parameters
             page_size = int(request.query_params.get('page_size', 24))
             page_number = int(request.query_params.get('page', 1))
+            search = request.query_params.get('search', '')
+            category = request.query_params.get('category', '')
 
-            logger.error(f"Page {page_number}, page_size {page_size}")
+            if not browse_table_ready():
+                # First start after upgrading: fill the table in the background
+                # and answer from the catalog tables until it is there.
+                queue_vod_browse_rebuild(rerun_if_running=False)
+                offset = (page_number - 1) * page_size
+                return self._list_from_catalog(request, page_number, page_size, offset, search, category)
+
+            queryset = browse_queryset(search=search, category=category)
+            total_count = queryset.count()
+
+            cursor = request.query_params.get('cursor')
+            position = decode_cursor(cursor) if cursor else None
+            if position:
+                sort_name, entry_id = position
+                page = queryset.filter(Q(sort_name__gt=sort_name) | Q(sort_name=sort_name, id__gt=entry_id))
+            else:
+                page = queryset[(page_number - 1) * page_size:]
+            entries = list(page[:page_size + 1])
+            has_next = len(entries) > page_size
+            entries = entries[:page_size]
 
-            # Calculate offset for unified pagination
-            offset = (page_number - 1) * page_size
+            return Response({
+                'count': total_count,
+                'next': has_next,
+                'previous': page_number > 1,
+                'next_cursor': encode_cursor(entries[-1]) if has_next else None,
+                'results': [self._format_entry(request, entry) for entry in entries],
+            })
 
-            # For high page numbers, use raw SQL for efficiency
-            # This avoids loading and sorting massive amounts of data in Python
+        except Exception as e:
+            logger.error(f"Error in UnifiedContentViewSet.list(): {e}", exc_info=True)
+            return Response({'error': str(e)}, status=500)
 
-            search = request.query_params.get('search', '')
-            category = request.query_params.get('category', '')
+    @staticmethod
+    def _format_entry(request, entry):
+        logo_data = None
+        if entry.logo_id:
+            logo_data = {
+                'id': entry.logo_id,
+                'name': entry.logo.name,
+                'url': entry.logo.url,
+                'cache_url': vodlogo_cache_url(request, entry.logo),
+                'movie_count': 0,
+                'series_count': 0,
+                'is_used': True
+            }
+        return {
+            'id': entry.content_id,
+            'uuid': str(entry.uuid),
+            'name': entry.name,
+            'description': entry.description or '',
+            'year': entry.year,
+            'rating': float(entry.rating) if entry.rating else 0.0,
+            'genre': entry.genre or '',
+            'duration': entry.duration_secs,
+            'created_at': entry.created_at.isoformat() if entry.created_at else None,
+            'updated_at': entry.updated_at.isoformat() if entry.updated_at else None,
+            'custom_properties': entry.custom_properties or {},
+            'logo': logo_data,
+            'content_type': entry.content_type
+        }
 
-            # Build WHERE clauses
-            where_conditions = [
-                # Only active content
-                "movies.id IN (SELECT DISTINCT movie_id FROM vod_m3umovierelation mmr JOIN m3u_m3uaccount ma ON mmr.m3u_account_id = ma.id WHERE ma.is_active = true)",
-                "series.id IN (SELECT DISTINCT series_id FROM vod_m3useriesrelation msr JOIN m3u_m3uaccount ma ON msr.m3u_account_id = ma.id WHERE ma.is_active = true)"
-            ]
-
-            movie_params = []
-            series_params = []
-
-            if search:
-                where_conditions[0] += " AND LOWER(movies.name) LIKE %s"
-                where_conditions[1] += " AND LOWER(series.name) LIKE %s"
-                search_param = f"%{search.lower()}%"
-                movie_params.append(search_param)
-                series_params.append(search_param)
-
-            if category:
-                if '|' in category:
-                    cat_name, cat_type = category.rsplit('|', 1)
-                    if cat_type == 'movie':
-                        where_conditions[0] += " AND movies.id IN (SELECT movie_id FROM vod_m3umovierelation mmr JOIN vod_vodcategory c ON mmr.category_id = c.id WHERE c.name = %s)"
-                        where_conditions[1] = "1=0"  # Exclude series
-                        movie_params.append(cat_name)
-                        series_params = []  # no params needed for "1=0"
-                    elif cat_type == 'series':
-                        where_conditions[1] += " AND series.id IN (SELECT series_id FROM vod_m3useriesrelation msr JOIN vod_vodcategory c ON msr.category_id = c.id WHERE c.name = %s)"
-                        where_conditions[0] = "1=0"  # Exclude movies
-                        series_params.append(cat_name)
-                        movie_params = []  # no params needed for "1=0"
-                else:
+    def _list_from_catalog(self, request, page_number, page_size, offset, search, category):
+        """UNION over the movie and series tables, used until the browse table is built."""
+        from django.db import connection
+
+        # Build WHERE clauses
+        where_conditions = [
+            # Only active content
+            "movies.id IN (SELECT DISTINCT movie_id FROM vod_m3umovierelation mmr JOIN m3u_m3uaccount ma ON mmr.m3u_account_id = ma.id WHERE ma.is_active = true)",
+            "series.id IN (SELECT DISTINCT series_id FROM vod_m3useriesrelation msr JOIN m3u_m3uaccount ma ON msr.m3u_account_id = ma.id WHERE ma.is_active = true)"
+        ]
+
+        movie_params = []
+        series_params = []
+
+        if search:
+            where_conditions[0] += " AND LOWER(movies.name) LIKE %s"
+            where_conditions[1] += " AND LOWER(series.name) LIKE %s"
+            search_param = f"%{search.lower()}%"
+            movie_params.append(search_param)
+            series_params.append(search_param)
+
+        if category:
+            if '|' in category:
+                cat_name, cat_type = category.rsplit('|', 1)
+                if cat_type == 'movie':
                     where_conditions[0] += " AND movies.id IN (SELECT movie_id FROM vod_m3umovierelation mmr JOIN vod_vodcategory c ON mmr.category_id = c.id WHERE c.name = %s)"
+                    where_conditions[1] = "1=0"  # Exclude series
+                    movie_params.append(cat_name)
+                    series_params = []  # no params needed for "1=0"
+                elif cat_type == 'series':
                     where_conditions[1] += " AND series.id IN (SELECT series_id FROM vod_m3useriesrelation msr JOIN vod_vodcategory c ON msr.category_id = c.id WHERE c.name = %s)"
-                    movie_params.append(category)
-                    series_params.append(category)
-
-            params = movie_params + series_params
-
-            # Use UNION ALL with ORDER BY and LIMIT/OFFSET for true unified pagination
-            # This is much more efficient than Python sorting
-            sql = f"""
-            WITH unified_content AS (
-                SELECT
-                    movies.id,
-                    movies.uuid,
-                    movies.name,
-                    movies.description,
-                    movies.year,
-                    movies.rating,
-                    movies.genre,
-                    movies.duration_secs as duration,
-                    movies.created_at,
-                    movies.updated_at,
-                    movies.custom_properties,
-                    movies.logo_id,
-                    logo.name as logo_name,
-                    logo.url as logo_url,
-                    'movie' as content_type
-                FROM vod_movie movies
-                LEFT JOIN vod_vodlogo logo ON movies.logo_id = logo.id
-                WHERE {where_conditions[0]}
-
-                UNION ALL
-
-                SELECT
-                    series.id,
-                    series.uuid,
-                    series.name,
-                    series.description,
-                    series.year,
-                    series.rating,
-                    series.genre,
-                    NULL as duration,
-                    series.created_at,
-                    series.updated_at,
-                    series.custom_properties,
-                    series.logo_id,
-                    logo.name as logo_name,
-                    logo.url as logo_url,
-                    'series' as content_type
-                FROM vod_series series
-                LEFT JOIN vod_vodlogo logo ON series.logo_id = logo.id
-                WHERE {where_conditions[1]}
-            )
-            SELECT * FROM unified_content
-            ORDER BY LOWER(name), id
-            LIMIT %s OFFSET %s
-            """
-
-            params.extend([page_size, offset])
-
-            logger.error(f"Executing SQL with LIMIT {page_size} OFFSET {offset}")
-
-            with connection.cursor() as cursor:
-                cursor.execute(sql, params)
-                columns = [col[0] for col in cursor.description]
-                results = []
-
-                for row in cursor.fetchall():
-                    item_dict = dict(zip(columns, row))
-
-                    # Build logo object in the format expected by frontend
-                    logo_data = None
-                    if item_dict['logo_id']:
-                        logo_data = {
-                            'id': item_dict['logo_id'],
-                            'name': item_dict['logo_name'],
-                            'url': item_dict['logo_url'],
-                            'cache_url': vodlogo_cache_url(
-                                request,
-                                SimpleNamespace(
-                                    id=item_dict['logo_id'],
-                                    url=item_dict['logo_url'],
-                                ),
+                    where_conditions[0] = "1=0"  # Exclude movies
+                    series_params.append(cat_name)
+                    movie_params = []  # no params needed for "1=0"
+            else:
+                where_conditions[0] += " AND movies.id IN (SELECT movie_id FROM vod_m3umovierelation mmr JOIN vod_vodcategory c ON mmr.category_id = c.id WHERE c.name = %s)"
+                where_conditions[1] += " AND series.id IN (SELECT series_id FROM vod_m3useriesrelation msr JOIN vod_vodcategory c ON msr.category_id = c.id WHERE c.name = %s)"
+                movie_params.append(category)
+                series_params.append(category)
+
+        params = movie_params + series_params
+
+        # Use UNION ALL with ORDER BY and LIMIT/OFFSET for true unified pagination
+        # This is much more efficient than Python sorting
+        sql = f"""
+        WITH unified_content AS (
+            SELECT
+                movies.id,
+                movies.uuid,
+                movies.name,
+                movies.description,
+                movies.year,
+                movies.rating,
+                movies.genre,
+                movies.duration_secs as duration,
+                movies.created_at,
+                movies.updated_at,
+                movies.custom_properties,
+                movies.logo_id,
+                logo.name as logo_name,
+                logo.url as logo_url,
+                'movie' as content_type
+            FROM vod_movie movies
+            LEFT JOIN vod_vodlogo logo ON movies.logo_id = logo.id
+            WHERE {where_conditions[0]}
+
+            UNION ALL
+
+            SELECT
+                series.id,
+                series.uuid,
+                series.name,
+                series.description,
+                series.year,
+                series.rating,
+                series.genre,
+                NULL as duration,
+                series.created_at,
+                series.updated_at,
+                series.custom_properties,
+                series.logo_id,
+                logo.name as logo_name,
+                logo.url as logo_url,
+                'series' as content_type
+            FROM vod_series series
+            LEFT JOIN vod_vodlogo logo ON series.logo_id = logo.id
+            WHERE {where_conditions[1]}
+        )
+        SELECT * FROM unified_content
+        ORDER BY LOWER(name), id
+        LIMIT %s OFFSET %s
+        """
+
+        params.extend([page_size, offset])
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            columns = [col[0] for col in cursor.description]
+            results = []
+
+            for row in cursor.fetchall():
+                item_dict = dict(zip(columns, row))
+
+                # Build logo object in the format expected by frontend
+                logo_data = None
+                if item_dict['logo_id']:
+                    logo_data = {
+                        'id': item_dict['logo_id'],
+                        'name': item_dict['logo_name'],
+                        'url': item_dict['logo_url'],
+                        'cache_url': vodlogo_cache_url(
+                            request,
+                            SimpleNamespace(
+                                id=item_dict['logo_id'],
+                                url=item_dict['logo_url'],
                             ),
-                            'movie_count': 0,  # We don't calculate this in raw SQL
-                            'series_count': 0,  # We don't calculate this in raw SQL
-                            'is_used': True
-                        }
-
-                    # Convert to the format expected by frontend
-                    formatted_item = {
-                        'id': item_dict['id'],
-                        'uuid': str(item_dict['uuid']),
-                        'name': item_dict['name'],
-                        'description': item_dict['description'] or '',
-                        'year': item_dict['year'],
-                        'rating': float(item_dict['rating']) if item_dict['rating'] else 0.0,
-                        'genre': item_dict['genre'] or '',
-                        'duration': item_dict['duration'],
-                        'created_at': item_dict['created_at'].isoformat() if item_dict['created_at'] else None,
-                        'updated_at': item_dict['updated_at'].isoformat() if item_dict['updated_at'] else None,
-                        'custom_properties': item_dict['custom_properties'] or {},
-                        'logo': logo_data,
-                        'content_type': item_dict['content_type']
+                        ),
+                        'movie_count': 0,  # We don't calculate this in raw SQL
+                        'series_count': 0,  # We don't calculate this in raw SQL
+                        'is_used': True
                     }
-                    results.append(formatted_item)
-
-            logger.error(f"Retrieved {len(results)} results via SQL")
 
-            # Get total count estimate (for pagination info)
-            # Use a separate efficient count query
-            count_sql = f"""
-            SELECT COUNT(*) FROM (
-                SELECT 1 FROM vod_movie movies WHERE {where_conditions[0]}
-                UNION ALL
-                SELECT 1 FROM vod_series series WHERE {where_conditions[1]}
-            ) as total_count
-            """
+                # Convert to the format expected by frontend
+                formatted_item = {
+                    'id': item_dict['id'],
+                    'uuid': str(item_dict['uuid']),
+                    'name': item_dict['name'],
+                    'description': item_dict['description'] or '',
+                    'year': item_dict['year'],
+                    'rating': float(item_dict['rating']) if item_dict['rating'] else 0.0,
+                    'genre': item_dict['genre'] or '',
+                    'duration': item_dict['duration'],
+                    'created_at': item_dict['created_at'].isoformat() if item_dict['created_at'] else None,
+                    'updated_at': item_dict['updated_at'].isoformat() if item_dict['updated_at'] else None,
+                    'custom_properties': item_dict['custom_properties'] or {},
+                    'logo': logo_data,
+                    'content_type': item_dict['content_type']
+                }
+                results.append(formatted_item)
 
-            count_params = params[:-2]  # Remove LIMIT and OFFSET params
+        # Get total count estimate (for pagination info)
+        # Use a separate efficient count query
+        count_sql = f"""
+        SELECT COUNT(*) FROM (
+            SELECT 1 FROM vod_movie movies WHERE {where_conditions[0]}
+            UNION ALL
+            SELECT 1 FROM vod_series series WHERE {where_conditions[1]}
+        ) as total_count
+        """
 
-            with connection.cursor() as cursor:
-                cursor.execute(count_sql, count_params)
-                total_count = cursor.fetchone()[0]
+        count_params = params[:-2]  # Remove LIMIT and OFFSET params
 
-            response_data = {
-                'count': total_count,
-                'next': offset + page_size < total_count,
-                'previous': page_number > 1,
-                'results': results
-            }
+        with connection.cursor() as cursor:
+            cursor.execute(count_sql, count_params)
+            total_count = cursor.fetchone()[0]
 
-            return Response(response_data)
+        response_data = {
+            'count': total_count,
+            'next': offset + page_size < total_count,
+            'previous': page_number > 1,
+            'results': results
+        }
 
-        except Exception as e:
-            logger.error(f"Error in UnifiedContentViewSet.list(): {e}")
-            import traceback
-            logger.error(traceback.format_exc())
-            return Response({'error': str(e)}, status=500)
+        return Response(response_data)
 
 
 class VODLogoPagination(PageNumberPagination):
@@ -10,3 +10,5 @@ class VODConfig(AppConfig):
         """Initialize VOD app when Django is ready"""
         # Import models to ensure they're registered
         from . import models
+        # Keeps the browse table in step with M3U account (de)activation.
+        from . import signals
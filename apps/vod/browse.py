@@ -0,0 +1,192 @@
+"""
+Maintenance and queries for the denormalized VOD browse table.
+
+``VODBrowseEntry`` holds one row per movie or series that has a relation on
+an active M3U account, with its display fields, logo and category
+memberships. The library "All" view reads it with keyset pagination on
+``(sort_name, id)``; search is a substring match on ``sort_name``, which is
+trigram-indexed on PostgreSQL.
+
+Rows are written by ``sync_browse_entries``: VOD refreshes resync the
+content of the refreshed account, advanced-data refreshes resync a single
+title, and M3U account changes trigger a full rebuild. Syncing compares the
+wanted rows against the stored ones and only writes differences.
+"""
+import base64
+import json
+import logging
+
+from django.db import transaction
+from django.db.models import Q
+
+from .models import M3UMovieRelation, M3USeriesRelation, Movie, Series, VODBrowseEntry
+
+logger = logging.getLogger(__name__)
+
+SYNC_CHUNK_SIZE = 2000
+
+_CONTENT = {
+    'movie': (Movie, M3UMovieRelation, 'movie_id', 'duration_secs'),
+    'series': (Series, M3USeriesRelation, 'series_id', None),
+}
+_ENTRY_FIELDS = (
+    'uuid', 'name', 'sort_name', 'description', 'year', 'rating', 'genre',
+    'duration_secs', 'logo_id', 'custom_properties', 'created_at', 'updated_at',
+)
+
+
+def _visible_ids(content_type):
+    _model, relation_model, content_field, _duration = _CONTENT[content_type]
+    return relation_model.objects.filter(m3u_account__is_active=True).values(content_field)
+
+
+def account_content_ids(account_id):
+    """``(movie_ids, series_ids)`` with a relation on the account, visible or not."""
+    return (
+        set(M3UMovieRelation.objects.filter(m3u_account_id=account_id).values_list('movie_id', flat=True)),
+        set(M3USeriesRelation.objects.filter(m3u_account_id=account_id).values_list('series_id', flat=True)),
+    )
+
+
+def _wanted_rows(content_type, ids):
+    model, relation_model, content_field, duration_field = _CONTENT[content_type]
+    columns = ['id', 'uuid', 'name', 'description', 'year', 'rating', 'genre',
+               'logo_id', 'custom_properties', 'created_at', 'updated_at']
+    if duration_field:
+        columns.append(duration_field)
+    rows = {}
+    visible = model.objects.filter(id__in=ids).filter(id__in=_visible_ids(content_type))
+    for row in visible.values(*columns):
+        row['sort_name'] = (row['name'] or '').lower()
+        row['duration_secs'] = row.pop(duration_field) if duration_field else None
+        rows[row.pop('id')] = row
+
+    categories = {}
+    for content_id, category_id in (
+        relation_model.objects
+        .filter(**{f'{content_field}__in': list(rows)}, m3u_account__is_active=True, category__isnull=False)
+        .values_list(content_field, 'category_id')
+        .distinct()
+    ):
+        categories.setdefault(content_id, set()).add(category_id)
+    return rows, categories
+
+
+def _sync_chunk(content_type, ids):
+    rows, categories = _wanted_rows(content_type, ids)
+    existing = {
+        entry.content_id: entry
+        for entry in VODBrowseEntry.objects.filter(content_type=content_type, content_id__in=ids)
+    }
+
+    to_create, to_update = [], []
+    for content_id, row in rows.items():
+        entry = existing.get(content_id)
+        if entry is None:
+            to_create.append(VODBrowseEntry(content_type=content_type, content_id=content_id, **row))
+        elif any(getattr(entry, field) != row[field] for field in _ENTRY_FIELDS):
+            for field in _ENTRY_FIELDS:
+                setattr(entry, field, row[field])
+            to_update.append(entry)
+    gone = [entry.id for content_id, entry in existing.items() if content_id not in rows]
+
+    Through = VODBrowseEntry.categories.through
+    with transaction.atomic():
+        if gone:
+            VODBrowseEntry.objects.filter(id__in=gone).delete()
+        if to_update:
+            VODBrowseEntry.objects.bulk_update(to_update, _ENTRY_FIELDS)
+        if to_create:
+            VODBrowseEntry.objects.bulk_create(to_create)
+            # bulk_create does not return ids on every backend; look them up.
+            for entry in VODBrowseEntry.objects.filter(
+                content_type=content_type, content_id__in=[e.content_id for e in to_create]
+            ).only('id', 'content_id'):
+                existing[entry.content_id] = entry
+
+        entry_ids = {content_id: existing[content_id].id for content_id in rows}
+        current = set(
+            Through.objects.filter(vodbrowseentry_id__in=entry_ids.values())
+            .values_list('vodbrowseentry_id', 'vodcategory_id')
+        )
+        wanted = {
+            (entry_ids[content_id], category_id)
+            for content_id, category_ids in categories.items()
+            for category_id in category_ids
+        }
+        stale = current - wanted
+        if stale:
+            condition = Q()
+            for entry_id, category_id in stale:
+                condition |= Q(vodbrowseentry_id=entry_id, vodcategory_id=category_id)
+            Through.objects.filter(condition).delete()
+        if wanted - current:
+            Through.objects.bulk_create([
+                Through(vodbrowseentry_id=entry_id, vodcategory_id=category_id)
+                for entry_id, category_id in wanted - current
+            ])
+    return len(to_create) + len(to_update) + len(gone)
+
+
+def sync_browse_entries(content_type, ids):
+    """Resync the browse rows of ``ids``; returns the number of rows written or removed."""
+    ids = sorted(set(ids))
+    changed = 0
+    for start in range(0, len(ids), SYNC_CHUNK_SIZE):
+        changed += _sync_chunk(content_type, ids[start:start + SYNC_CHUNK_SIZE])
+    return changed
+
+
+def rebuild_browse_entries():
+    """Resync every visible title and drop rows that are no longer visible."""
+    changed = 0
+    for content_type, (model, _relation, _field, _duration) in _CONTENT.items():
+        removed, _ = (
+            VODBrowseEntry.objects.filter(content_type=content_type)
+            .exclude(content_id__in=_visible_ids(content_type))
+            .delete()
+        )
+        changed += removed
+        ids = model.objects.filter(id__in=_visible_ids(content_type)).values_list('id', flat=True)
+        changed += sync_browse_entries(content_type, ids)
+    return changed
+
+
+def browse_table_ready():
+    """False while the table is empty but there is visible content to fill it with."""
+    if VODBrowseEntry.objects.exists():
+        return True
+    return not (
+        M3UMovieRelation.objects.filter(m3u_account__is_active=True).exists()
+        or M3USeriesRelation.objects.filter(m3u_account__is_active=True).exists()
+    )
+
+
+def encode_cursor(entry):
+    raw = json.dumps([entry.sort_name, entry.id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """``(sort_name, id)`` from a cursor, or None when it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        sort_name, entry_id = json.loads(raw)
+        return str(sort_name), int(entry_id)
+    except (ValueError, TypeError):
+        return None
+
+
+def browse_queryset(search='', category=''):
+    """Browse rows filtered like the legacy unified view, in (sort_name, id) order."""
+    queryset = VODBrowseEntry.objects.select_related('logo')
+    if search:
+        queryset = queryset.filter(sort_name__contains=search.lower())
+    if category:
+        if '|' in category:
+            cat_name, cat_type = category.rsplit('|', 1)
+            if cat_type in _CONTENT:
+                queryset = queryset.filter(content_type=cat_type, categories__name=cat_name).distinct()
+        else:
+            queryset = queryset.filter(categories__name=category).distinct()
+    return queryset.order_by('sort_name', 'id')
@@ -0,0 +1,63 @@
+import django.db.models.deletion
+from django.db import migrations, models, transaction
+
+
+def create_trigram_index(apps, schema_editor):
+    """Trigram index for substring search on PostgreSQL (pg_trgm is a trusted extension)."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    try:
+        with transaction.atomic(), schema_editor.connection.cursor() as cursor:
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS vod_browse_name_trgm_idx "
+                "ON vod_vodbrowseentry USING gin (sort_name gin_trgm_ops)"
+            )
+    except Exception as e:
+        # Search still works without it, just as a sequential scan.
+        print(f"\n  Skipping VOD browse trigram index: {e}")
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("DROP INDEX IF EXISTS vod_browse_name_trgm_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vod', '0005_movie_is_adult'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VODBrowseEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_type', models.CharField(choices=[('movie', 'Movie'), ('series', 'Series')], max_length=10)),
+                ('content_id', models.IntegerField()),
+                ('uuid', models.UUIDField()),
+                ('name', models.CharField(max_length=255)),
+                ('sort_name', models.CharField(max_length=255)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('year', models.IntegerField(blank=True, null=True)),
+                ('rating', models.CharField(blank=True, max_length=10, null=True)),
+                ('genre', models.CharField(blank=True, max_length=255, null=True)),
+                ('duration_secs', models.IntegerField(blank=True, null=True)),
+                ('custom_properties', models.JSONField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(blank=True, null=True)),
+                ('categories', models.ManyToManyField(blank=True, related_name='browse_entries', to='vod.vodcategory')),
+                ('logo', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='vod.vodlogo')),
+            ],
+            options={
+                'verbose_name': 'VOD Browse Entry',
+                'verbose_name_plural': 'VOD Browse Entries',
+                'indexes': [models.Index(fields=['sort_name', 'id'], name='vod_browse_sort_idx'), models.Index(fields=['content_type', 'sort_name', 'id'], name='vod_browse_type_sort_idx')],
+                'constraints': [models.UniqueConstraint(fields=('content_type', 'content_id'), name='vod_browse_unique_content')],
+            },
+        ),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -334,3 +334,48 @@ class M3UVODCategoryRelation(models.Model):
 
     def __str__(self):
         return f"{self.m3u_account.name} - {self.category.name}"
+
+
+class VODBrowseEntry(models.Model):
+    """
+    One row per movie or series visible through an active M3U account.
+
+    Denormalized copy of the display fields the library "All" view needs,
+    kept in sync by apps.vod.browse so browsing, category filtering and
+    search hit a single indexed table instead of a UNION over both catalogs.
+    """
+    CONTENT_TYPES = [
+        ('movie', 'Movie'),
+        ('series', 'Series'),
+    ]
+
+    content_type = models.CharField(max_length=10, choices=CONTENT_TYPES)
+    content_id = models.IntegerField()
+    uuid = models.UUIDField()
+    name = models.CharField(max_length=255)
+    # LOWER(name): the sort key and the trigram-indexed search column.
+    sort_name = models.CharField(max_length=255)
+    description = models.TextField(blank=True, null=True)
+    year = models.IntegerField(blank=True, null=True)
+    rating = models.CharField(max_length=10, blank=True, null=True)
+    genre = models.CharField(max_length=255, blank=True, null=True)
+    duration_secs = models.IntegerField(blank=True, null=True)
+    logo = models.ForeignKey(VODLogo, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    custom_properties = models.JSONField(blank=True, null=True)
+    categories = models.ManyToManyField(VODCategory, blank=True, related_name='browse_entries')
+    created_at = models.DateTimeField(blank=True, null=True)
+    updated_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        verbose_name = 'VOD Browse Entry'
+        verbose_name_plural = 'VOD Browse Entries'
+        constraints = [
+            models.UniqueConstraint(fields=['content_type', 'content_id'], name='vod_browse_unique_content'),
+        ]
+        indexes = [
+            models.Index(fields=['sort_name', 'id'], name='vod_browse_sort_idx'),
+            models.Index(fields=['content_type', 'sort_name', 'id'], name='vod_browse_type_sort_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.content_type}: {self.name}"
@@ -0,0 +1,23 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.m3u.models import M3UAccount
+from .tasks import queue_vod_browse_rebuild
+
+
+def _queue_browse_rebuild():
+    transaction.on_commit(lambda: queue_vod_browse_rebuild(countdown=5))
+
+
+@receiver(post_save, sender=M3UAccount)
+def rebuild_browse_on_account_change(sender, instance, created, update_fields=None, **kwargs):
+    # New accounts have no VOD yet, and status saves during refreshes do not
+    # change which titles are visible; only (de)activation does.
+    if not created and (update_fields is None or 'is_active' in update_fields):
+        _queue_browse_rebuild()
+
+
+@receiver(post_delete, sender=M3UAccount)
+def rebuild_browse_on_account_delete(sender, instance, **kwargs):
+    _queue_browse_rebuild()
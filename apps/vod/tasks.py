@@ -9,6 +9,7 @@ from .models import (
     VODCategory, Series, Movie, Episode, VODLogo,
     M3USeriesRelation, M3UMovieRelation, M3UEpisodeRelation, M3UVODCategoryRelation
 )
+from .browse import account_content_ids, rebuild_browse_entries, sync_browse_entries
 from datetime import datetime
 import logging
 import json
@@ -104,11 +105,22 @@ def refresh_vod_content(account_id):
 
         logger.info(f"Batch VOD refresh completed for account {account.name} in {duration:.2f} seconds")
 
+        # Titles this account touched, collected before cleanup drops stale relations,
+        # so the browse table also loses titles that disappeared from the provider.
+        browse_movie_ids, browse_series_ids = account_content_ids(account_id)
+
         # Cleanup orphaned VOD content after refresh (scoped to this account only)
         logger.info(f"Starting cleanup of orphaned VOD content for account {account.name}")
         cleanup_result = cleanup_orphaned_vod_content(account_id=account_id, scan_start_time=start_time)
         logger.info(f"VOD cleanup completed: {cleanup_result}")
 
+        sync_vod_browse('movie', browse_movie_ids)
+        sync_vod_browse('series', browse_series_ids)
+
+        # Rebuild the pre-serialized XC movie/series lists for the new catalog.
+        from apps.output.xc_catalog import invalidate_catalog
+        invalidate_catalog(prebuild=True)
+
         # Send completion notification
         send_m3u_update(account_id, "vod_refresh", 100, status="success",
                        message=f"VOD refresh completed in {duration:.2f} seconds")
@@ -1357,6 +1369,8 @@ def refresh_series_episodes(account, series, external_series_id, episodes_data=N
 
                         if updated:
                             series.save()
+                            sync_vod_browse('series', {series.id})
+                            queue_catalog_invalidation()
 
                     episodes_data = series_info.get('episodes', {})
                 else:
@@ -1731,6 +1745,95 @@ def batch_refresh_series_episodes(account_id, series_ids=None):
         return f"Batch episode refresh failed: {str(e)}"
 
 
+def sync_vod_browse(content_type, ids):
+    """Resync browse rows for the given titles; failures are logged, never raised."""
+    try:
+        changed = sync_browse_entries(content_type, ids)
+        logger.debug(f"VOD browse sync: {changed} {content_type} rows changed")
+    except Exception as e:
+        logger.error(f"Failed to sync VOD browse entries for {content_type}: {e}", exc_info=True)
+
+
+# Set while a rebuild is queued but has not started.
+BROWSE_REBUILD_QUEUED_KEY = 'vod_browse:rebuild_queued'
+# Set when a change arrives while a rebuild is running; it then runs once more.
+BROWSE_REBUILD_DIRTY_KEY = 'vod_browse:rebuild_dirty'
+
+
+def queue_vod_browse_rebuild(countdown=0, rerun_if_running=True):
+    """
+    Queue one browse-table rebuild, however often this is called.
+
+    While a rebuild is running, the change is recorded so that run repeats
+    once at the end (``rerun_if_running=False`` skips that, for callers that
+    only need the table filled). While one is queued, further calls are no-ops.
+    """
+    from django.core.cache import cache
+    from core.utils import is_task_lock_held
+
+    if is_task_lock_held('rebuild_vod_browse_entries', 'all'):
+        if rerun_if_running:
+            cache.set(BROWSE_REBUILD_DIRTY_KEY, True, timeout=3600)
+        return
+    if cache.add(BROWSE_REBUILD_QUEUED_KEY, True, timeout=600):
+        rebuild_vod_browse_entries.apply_async(countdown=countdown)
+
+
+@shared_task
+def rebuild_vod_browse_entries():
+    """Resync the whole VOD browse table, e.g. after M3U accounts change."""
+    from django.core.cache import cache
+    from core.utils import TaskLockRenewer, acquire_task_lock, release_task_lock
+
+    if not acquire_task_lock('rebuild_vod_browse_entries', 'all'):
+        # The running rebuild picks up changes through BROWSE_REBUILD_DIRTY_KEY.
+        return "VOD browse rebuild already running, skipped"
+    try:
+        cache.delete(BROWSE_REBUILD_QUEUED_KEY)
+        changed = 0
+        with TaskLockRenewer('rebuild_vod_browse_entries', 'all'):
+            while True:
+                cache.delete(BROWSE_REBUILD_DIRTY_KEY)
+                changed += rebuild_browse_entries()
+                if not cache.get(BROWSE_REBUILD_DIRTY_KEY):
+                    break
+                logger.info("VOD content changed during the browse rebuild, running it again")
+        logger.info(f"VOD browse rebuild complete: {changed} rows changed")
+        return f"VOD browse rebuild complete: {changed} rows changed"
+    finally:
+        release_task_lock('rebuild_vod_browse_entries', 'all')
+
+
+# Set while a catalog invalidation is queued but has not run.
+CATALOG_INVALIDATION_QUEUED_KEY = 'xc_catalog:invalidation_queued'
+CATALOG_INVALIDATION_DELAY = 60
+
+
+def queue_catalog_invalidation(countdown=CATALOG_INVALIDATION_DELAY):
+    """
+    Invalidate the XC catalog snapshots once after a burst of changes.
+
+    On-demand series refreshes arrive one title at a time while a client
+    browses; each would otherwise start a new catalog version.
+    """
+    from django.core.cache import cache
+
+    if cache.add(CATALOG_INVALIDATION_QUEUED_KEY, True, timeout=countdown + 600):
+        invalidate_xc_catalog.apply_async(countdown=countdown)
+
+
+@shared_task
+def invalidate_xc_catalog():
+    """Start a new XC catalog version (see ``queue_catalog_invalidation``)."""
+    from django.core.cache import cache
+    from apps.output.xc_catalog import invalidate_catalog
+
+    # Cleared first so changes made while invalidating queue another run.
+    cache.delete(CATALOG_INVALIDATION_QUEUED_KEY)
+    version = invalidate_catalog()
+    return f"XC catalog version {version}"
+
+
 @shared_task
 def cleanup_orphaned_vod_content(stale_days=0, scan_start_time=None, account_id=None):
     """Clean up VOD content that has no M3U relations or has stale relations"""
@@ -1799,6 +1902,10 @@ def cleanup_orphaned_vod_content(stale_days=0, scan_start_time=None, account_id=
               f"{orphaned_series_count} orphaned series")
 
     logger.info(result)
+    # refresh_vod_content rebuilds the XC snapshots itself after its scoped cleanup.
+    if not account_id and (stale_movie_count or stale_series_count):
+        from apps.output.xc_catalog import invalidate_catalog
+        invalidate_catalog()
     return result
 
 
@@ -2216,6 +2323,7 @@ def refresh_movie_advanced_data(m3u_movie_relation_id, force_refresh=False):
 
         account = relation.m3u_account
         movie = relation.movie
+        original_movie_id = movie.id
 
         from core.xtream_codes import Client as XtreamCodesClient
 
@@ -2368,6 +2476,9 @@ def refresh_movie_advanced_data(m3u_movie_relation_id, force_refresh=False):
                 relation.last_advanced_refresh = now
                 relation.save(update_fields=['custom_properties', 'last_advanced_refresh'])
 
+                # An ID conflict may have merged the relation into another movie.
+                sync_vod_browse('movie', {original_movie_id, movie.id})
+
         return "Advanced data refreshed."
     except Exception as e:
         logger.error(f"Error refreshing advanced movie data for relation {m3u_movie_relation_id}: {str(e)}")
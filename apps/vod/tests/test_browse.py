@@ -0,0 +1,218 @@
+"""VOD browse table sync and the keyset-paginated unified listing."""
+
+from unittest.mock import MagicMock, patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.m3u.models import M3UAccount
+from apps.vod import tasks
+from apps.vod.browse import rebuild_browse_entries, sync_browse_entries
+from apps.vod.models import (
+    M3UMovieRelation,
+    M3USeriesRelation,
+    Movie,
+    Series,
+    VODBrowseEntry,
+    VODCategory,
+    VODLogo,
+)
+
+User = get_user_model()
+
+
+class VODBrowseSyncTests(TestCase):
+    def setUp(self):
+        self.account = M3UAccount.objects.create(name='Provider', server_url='http://example.com')
+        self.action = VODCategory.objects.create(name='Action', category_type='movie')
+        self.drama = VODCategory.objects.create(name='Drama', category_type='movie')
+        self.logo = VODLogo.objects.create(name='Poster', url='http://img.example/p.jpg')
+        self.movie = Movie.objects.create(name='Heist', year=2020, duration_secs=5400, logo=self.logo)
+        self.relation = M3UMovieRelation.objects.create(
+            m3u_account=self.account, movie=self.movie, category=self.action, stream_id='1'
+        )
+
+    def test_sync_creates_then_updates_only_changed_rows(self):
+        self.assertEqual(sync_browse_entries('movie', [self.movie.id]), 1)
+
+        entry = VODBrowseEntry.objects.get(content_type='movie', content_id=self.movie.id)
+        self.assertEqual((entry.sort_name, entry.duration_secs, entry.logo_id), ('heist', 5400, self.logo.id))
+        self.assertEqual(list(entry.categories.all()), [self.action])
+
+        self.assertEqual(sync_browse_entries('movie', [self.movie.id]), 0)
+
+        Movie.objects.filter(id=self.movie.id).update(name='The Heist')
+        M3UMovieRelation.objects.filter(id=self.relation.id).update(category=self.drama)
+        self.assertEqual(sync_browse_entries('movie', [self.movie.id]), 1)
+        entry.refresh_from_db()
+        self.assertEqual(entry.sort_name, 'the heist')
+        self.assertEqual(list(entry.categories.all()), [self.drama])
+
+    def test_titles_without_active_relations_are_removed(self):
+        sync_browse_entries('movie', [self.movie.id])
+
+        self.relation.delete()
+        self.assertEqual(sync_browse_entries('movie', [self.movie.id]), 1)
+        self.assertFalse(VODBrowseEntry.objects.exists())
+
+    def test_rebuild_follows_account_activation(self):
+        series = Series.objects.create(name='Show')
+        M3USeriesRelation.objects.create(m3u_account=self.account, series=series, external_series_id='9')
+        rebuild_browse_entries()
+        self.assertEqual(VODBrowseEntry.objects.count(), 2)
+
+        M3UAccount.objects.filter(id=self.account.id).update(is_active=False)
+        rebuild_browse_entries()
+        self.assertFalse(VODBrowseEntry.objects.exists())
+
+    def test_series_detail_refresh_updates_the_browse_row(self):
+        series = Series.objects.create(name='Show')
+        M3USeriesRelation.objects.create(m3u_account=self.account, series=series, external_series_id='9')
+        sync_browse_entries('series', [series.id])
+
+        client = MagicMock()
+        client.__enter__.return_value.get_series_info.return_value = {
+            'info': {'plot': 'A show.', 'genre': 'Drama', 'releaseDate': '2019-04-01'},
+            'episodes': {},
+        }
+        with patch('apps.vod.tasks.XtreamCodesClient', return_value=client), \
+                patch('apps.vod.tasks.queue_catalog_invalidation') as invalidate:
+            tasks.refresh_series_episodes(self.account, series, '9')
+
+        entry = VODBrowseEntry.objects.get(content_type='series', content_id=series.id)
+        self.assertEqual((entry.description, entry.genre, entry.year), ('A show.', 'Drama', 2019))
+        invalidate.assert_called_once_with()
+
+
+class BrowseRebuildQueueTests(TestCase):
+    def setUp(self):
+        for key in (tasks.BROWSE_REBUILD_QUEUED_KEY, tasks.BROWSE_REBUILD_DIRTY_KEY):
+            cache.delete(key)
+            self.addCleanup(cache.delete, key)
+
+    def test_queues_once_until_the_rebuild_starts(self):
+        with patch('apps.vod.tasks.rebuild_vod_browse_entries.apply_async') as rebuild:
+            for _ in range(3):
+                tasks.queue_vod_browse_rebuild(countdown=5)
+        rebuild.assert_called_once_with(countdown=5)
+
+    def test_changes_during_a_rebuild_run_it_again_instead_of_queueing(self):
+        with patch('core.utils.is_task_lock_held', return_value=True), \
+                patch('apps.vod.tasks.rebuild_vod_browse_entries.apply_async') as rebuild:
+            tasks.queue_vod_browse_rebuild(rerun_if_running=False)
+            self.assertIsNone(cache.get(tasks.BROWSE_REBUILD_DIRTY_KEY))
+            tasks.queue_vod_browse_rebuild()
+        rebuild.assert_not_called()
+        self.assertTrue(cache.get(tasks.BROWSE_REBUILD_DIRTY_KEY))
+
+        passes = []
+
+        def rebuild_pass():
+            passes.append(1)
+            if len(passes) == 1:
+                # A change lands during the first pass.
+                cache.set(tasks.BROWSE_REBUILD_DIRTY_KEY, True)
+            return 1
+
+        cache.set(tasks.BROWSE_REBUILD_QUEUED_KEY, True)
+        with patch('apps.vod.tasks.rebuild_browse_entries', side_effect=rebuild_pass), \
+                patch('core.utils.acquire_task_lock', return_value=True), \
+                patch('core.utils.release_task_lock'), patch('core.utils.TaskLockRenewer'):
+            result = tasks.rebuild_vod_browse_entries()
+        self.assertEqual(len(passes), 2)
+        self.assertIn("2 rows changed", result)
+        self.assertIsNone(cache.get(tasks.BROWSE_REBUILD_QUEUED_KEY))
+
+    def test_duplicate_run_is_dropped(self):
+        with patch('core.utils.acquire_task_lock', return_value=False), \
+                patch('apps.vod.tasks.rebuild_vod_browse_entries.apply_async') as rebuild, \
+                patch('apps.vod.tasks.rebuild_browse_entries') as rebuild_pass:
+            tasks.rebuild_vod_browse_entries()
+        rebuild.assert_not_called()
+        rebuild_pass.assert_not_called()
+
+
+class CatalogInvalidationQueueTests(TestCase):
+    def setUp(self):
+        cache.delete(tasks.CATALOG_INVALIDATION_QUEUED_KEY)
+        self.addCleanup(cache.delete, tasks.CATALOG_INVALIDATION_QUEUED_KEY)
+
+    def test_burst_of_series_refreshes_invalidates_once(self):
+        with patch('apps.vod.tasks.invalidate_xc_catalog.apply_async') as invalidate:
+            for _ in range(3):
+                tasks.queue_catalog_invalidation()
+        invalidate.assert_called_once_with(countdown=tasks.CATALOG_INVALIDATION_DELAY)
+
+        with patch('apps.output.xc_catalog.invalidate_catalog') as invalidate_catalog:
+            tasks.invalidate_xc_catalog()
+        invalidate_catalog.assert_called_once_with()
+        self.assertIsNone(cache.get(tasks.CATALOG_INVALIDATION_QUEUED_KEY))
+
+
+class UnifiedContentListTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username='vodbrowser', password='testpass123')
+        user.user_level = 10
+        user.save()
+        self.client = APIClient()
+        self.client.force_authenticate(user=user)
+
+        account = M3UAccount.objects.create(name='Provider', server_url='http://example.com')
+        self.category = VODCategory.objects.create(name='Action', category_type='movie')
+        for i, name in enumerate(['delta', 'Alpha', 'charlie', 'Bravo', 'echo']):
+            movie = Movie.objects.create(name=name)
+            M3UMovieRelation.objects.create(
+                m3u_account=account,
+                movie=movie,
+                category=self.category if name in ('Alpha', 'echo') else None,
+                stream_id=str(i),
+            )
+        series = Series.objects.create(name='Bravo Show')
+        M3USeriesRelation.objects.create(m3u_account=account, series=series, external_series_id='1')
+        rebuild_browse_entries()
+
+    def _names(self, response):
+        return [item['name'] for item in response.data['results']]
+
+    def test_cursor_pages_through_the_library_in_name_order(self):
+        first = self.client.get('/api/vod/all/', {'page_size': 4})
+        self.assertEqual(self._names(first), ['Alpha', 'Bravo', 'Bravo Show', 'charlie'])
+        self.assertEqual(first.data['count'], 6)
+        self.assertTrue(first.data['next'])
+
+        second = self.client.get(
+            '/api/vod/all/', {'page_size': 4, 'page': 2, 'cursor': first.data['next_cursor']}
+        )
+        self.assertEqual(self._names(second), ['delta', 'echo'])
+        self.assertFalse(second.data['next'])
+        self.assertIsNone(second.data['next_cursor'])
+
+        by_offset = self.client.get('/api/vod/all/', {'page_size': 4, 'page': 2})
+        self.assertEqual(self._names(by_offset), ['delta', 'echo'])
+
+    def test_search_and_category_filters(self):
+        search = self.client.get('/api/vod/all/', {'search': 'BRAV'})
+        self.assertEqual(
+            [(item['name'], item['content_type']) for item in search.data['results']],
+            [('Bravo', 'movie'), ('Bravo Show', 'series')],
+        )
+
+        action = self.client.get('/api/vod/all/', {'category': 'Action|movie'})
+        self.assertEqual(self._names(action), ['Alpha', 'echo'])
+        self.assertEqual(self._names(self.client.get('/api/vod/all/', {'category': 'Action|series'})), [])
+
+    def test_empty_table_falls_back_and_queues_a_rebuild(self):
+        VODBrowseEntry.objects.all().delete()
+        cache.delete(tasks.BROWSE_REBUILD_QUEUED_KEY)
+        self.addCleanup(cache.delete, tasks.BROWSE_REBUILD_QUEUED_KEY)
+
+        with patch('apps.vod.tasks.rebuild_vod_browse_entries.apply_async') as rebuild:
+            response = self.client.get('/api/vod/all/', {'page_size': 2})
+            # Further page loads during the cold start do not queue more rebuilds.
+            self.client.get('/api/vod/all/', {'page_size': 2, 'page': 2})
+
+        rebuild.assert_called_once()
+        self.assertEqual(self._names(response), ['Alpha', 'Bravo'])
+        self.assertEqual(response.data['count'], 6)
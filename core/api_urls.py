@@ -12,7 +12,8 @@ from .api_views import (
     version,
     rehash_streams_endpoint,
     TimezoneListView,
-    get_system_events
+    get_system_events,
+    redis_command_stats,
 )
 
 router = DefaultRouter()
@@ -27,5 +28,6 @@ urlpatterns = [
     path('rehash-streams/', rehash_streams_endpoint, name='rehash_streams'),
     path('timezones/', TimezoneListView.as_view(), name='timezones'),
     path('system-events/', get_system_events, name='system_events'),
+    path('redis-stats/', redis_command_stats, name='redis_command_stats'),
     path('', include(router.urls)),
 ]
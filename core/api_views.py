@@ -229,6 +229,9 @@ class ProxySettingsViewSet(viewsets.ViewSet):
                 "channel_init_grace_period": 60,
                 "channel_client_wait_period": 5,
                 "new_client_behind_seconds": 5,
+                "standby_channels": 0,
+                "standby_pinned_channels": "",
+                "stream_ordering": "static",
             }
             settings_obj, created = CoreSettings.objects.get_or_create(
                 key=PROXY_SETTINGS_KEY,
@@ -584,6 +587,53 @@ def get_system_events(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+# ─────────────────────────────
+# Redis Command Stats API
+# ─────────────────────────────
+@extend_schema(
+    description=(
+        "Redis commands, bytes and latency per command and key family, merged "
+        "across processes, plus the busiest keys and Redis' own INFO counters. "
+        "Needs DISPATCHARR_REDIS_COMMAND_STATS=true. DELETE resets the counters."
+    ),
+)
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAdmin])
+def redis_command_stats(request):
+    """
+    Query Parameters:
+        limit: Rows per table (default: 50, max: 500)
+        sort: time, calls, bytes_in or bytes_out (default: time)
+    """
+    from core.redis_stats import collect_stats, reset_stats, server_stats, stats_enabled
+    from core.utils import RedisClient
+
+    client = RedisClient.get_client()
+    if client is None:
+        return Response({'error': 'Redis is not available'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    if request.method == 'DELETE':
+        reset_stats(client)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    try:
+        limit = max(1, min(int(request.GET.get('limit', 50)), 500))
+    except ValueError:
+        return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+    sort = request.GET.get('sort', 'time')
+    if sort not in ('time', 'calls', 'bytes_in', 'bytes_out'):
+        return Response({'error': 'sort must be time, calls, bytes_in or bytes_out'},
+                        status=status.HTTP_400_BAD_REQUEST)
+
+    return Response({
+        'enabled': stats_enabled(),
+        'interval': getattr(django_settings, 'REDIS_COMMAND_STATS_INTERVAL', 60),
+        'sort': sort,
+        **collect_stats(client, sort=sort, limit=limit),
+        'server': server_stats(client, limit=limit),
+    })
+
+
 # ─────────────────────────────
 # System Notifications API
 # ─────────────────────────────
@@ -0,0 +1,134 @@
+"""Serve local files without pushing their bytes through a Django worker.
+
+Behind the bundled nginx (``USE_NGINX_ACCEL=true``) files under
+``ACCEL_DATA_ROOT`` are handed off with ``X-Accel-Redirect``: Django only
+checks access and sets the headers, and nginx streams the file from the
+internal ``ACCEL_PREFIX`` location, answering ``Range`` requests itself.
+
+Without nginx, whole files go out as ``FileResponse`` so the WSGI server's
+``wsgi.file_wrapper`` can use sendfile(2), and byte ranges are read with
+``os.pread`` in large blocks instead of small buffered reads.
+"""
+
+from __future__ import annotations
+
+import logging
+import mimetypes
+import os
+from urllib.parse import quote
+
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+
+logger = logging.getLogger(__name__)
+
+# Must match the internal location in docker/nginx.conf.
+ACCEL_DATA_ROOT = "/data"
+ACCEL_PREFIX = "/protected-data/"
+RANGE_BLOCK_SIZE = 1024 * 1024
+
+
+def nginx_accel_enabled() -> bool:
+    return os.environ.get("USE_NGINX_ACCEL", "").lower() == "true"
+
+
+def _accel_uri(path: str) -> str | None:
+    """Internal nginx URI for *path*, or None when it is outside the accel root."""
+    root = os.path.realpath(ACCEL_DATA_ROOT)
+    real = os.path.realpath(path)
+    if not real.startswith(root + os.sep):
+        return None
+    return ACCEL_PREFIX + quote(os.path.relpath(real, root))
+
+
+def parse_range_header(header: str, file_size: int) -> tuple[int, int] | None:
+    """``(start, end)`` of a single ``bytes=`` range, or None to send the whole file.
+
+    Multi-range and malformed headers are ignored. Raises ``ValueError`` when
+    the range cannot be satisfied.
+    """
+    if not header or not header.startswith("bytes=") or "," in header or not file_size:
+        return None
+    try:
+        start_str, end_str = header[len("bytes="):].strip().split("-", 1)
+        if not start_str:
+            # Suffix range: the last N bytes.
+            length = int(end_str)
+            return (max(0, file_size - length), file_size - 1) if length > 0 else None
+        start = int(start_str)
+        end = min(int(end_str), file_size - 1) if end_str else file_size - 1
+    except ValueError:
+        return None
+    if start >= file_size or end < start:
+        raise ValueError("unsatisfiable range")
+    return start, end
+
+
+def _pread_iterator(path: str, start: int, end: int):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        offset = start
+        while offset <= end:
+            data = os.pread(fd, min(RANGE_BLOCK_SIZE, end - offset + 1), offset)
+            if not data:
+                break
+            offset += len(data)
+            yield data
+    finally:
+        os.close(fd)
+
+
+def serve_file(
+    request,
+    path: str,
+    content_type: str | None = None,
+    *,
+    filename: str | None = None,
+    disposition: str = "inline",
+    headers: dict | None = None,
+    accel: bool = True,
+):
+    """Response serving the local file *path*, with ``Range`` support.
+
+    The caller is responsible for authorization and for confining *path*;
+    this only chooses how the bytes are delivered. *request* may be None
+    when there is no ``Range`` header to honour.
+
+    nginx drops most response headers on an internal redirect (it keeps
+    Content-Type, Content-Disposition, Cache-Control, Expires, Accept-Ranges
+    and Set-Cookie). Pass ``accel=False`` when other headers, such as a
+    Content-Security-Policy, must reach the client.
+    """
+    if content_type is None:
+        content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    filename = filename or os.path.basename(path)
+
+    accel_uri = _accel_uri(path) if accel and nginx_accel_enabled() else None
+    if accel_uri:
+        response = HttpResponse(content_type=content_type)
+        response["X-Accel-Redirect"] = accel_uri
+    else:
+        file_size = os.path.getsize(path)
+        try:
+            range_header = request.META.get("HTTP_RANGE", "").strip() if request is not None else ""
+            byte_range = parse_range_header(range_header, file_size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{file_size}"
+            return response
+
+        if byte_range:
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                _pread_iterator(path, start, end), status=206, content_type=content_type
+            )
+            response["Content-Range"] = f"bytes {start}-{end}/{file_size}"
+            response["Content-Length"] = str(end - start + 1)
+        else:
+            response = FileResponse(open(path, "rb"), content_type=content_type)
+            response["Content-Length"] = str(file_size)
+
+    response["Accept-Ranges"] = "bytes"
+    response["Content-Disposition"] = f'{disposition}; filename="{filename}"'
+    for name, value in (headers or {}).items():
+        response[name] = value
+    return response
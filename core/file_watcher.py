@@ -0,0 +1,338 @@
+"""Watch-folder watcher for the M3U, EPG and logo drop directories.
+
+Feeds file events into ``core.tasks.process_watched_files`` so a dropped file
+is ingested within about a second instead of on the next 20s beat scan, and
+so an idle install does not ``stat`` every file in the logo tree all day.
+
+Linux inotify is used directly through libc (close-write, moved-to and
+directory create events). Where inotify is unavailable (non-Linux hosts,
+exhausted watch limits) the watcher falls back to polling directory
+snapshots in memory, which needs no Redis round-trip per file. While the
+watcher heartbeat key is live, ``scan_and_process_files`` only runs a full
+reconciliation pass every ``WATCH_RECONCILE_INTERVAL`` seconds.
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, name length
+
+HEARTBEAT_TTL = 60
+HEARTBEAT_INTERVAL = 20
+DEBOUNCE_SECONDS = 0.5
+MAX_BATCH_DELAY = 2.0
+POLL_INTERVAL = 10.0
+
+MODE_AUTO = "auto"
+MODE_INOTIFY = "inotify"
+MODE_POLL = "poll"
+MODE_OFF = "off"
+MODES = (MODE_AUTO, MODE_INOTIFY, MODE_POLL, MODE_OFF)
+
+
+def watch_targets():
+    """``[(directory, kind, recursive)]`` for the configured watch folders."""
+    from core.tasks import EPG_WATCH_DIR, LOGO_WATCH_DIR, M3U_WATCH_DIR
+
+    return [
+        (M3U_WATCH_DIR, "m3u", False),
+        (EPG_WATCH_DIR, "epg", False),
+        (LOGO_WATCH_DIR, "logo", True),
+    ]
+
+
+class InotifyWatcher:
+    """Minimal inotify binding; ``poll()`` returns ``[(kind, path)]``."""
+
+    def __init__(self, targets):
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("inotify is not available on this platform")
+        fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self.fd = fd
+        self.overflowed = False
+        self._watches = {}
+        try:
+            for directory, kind, recursive in targets:
+                if os.path.isdir(directory):
+                    self._add_tree(directory, kind, recursive)
+                else:
+                    logger.warning(f"Watch directory {directory} does not exist; not watching it")
+        except OSError:
+            # Typically ENOSPC from fs.inotify.max_user_watches on a huge logo tree.
+            self.close()
+            raise
+
+    def _add_watch(self, directory, kind, recursive):
+        wd = self._libc.inotify_add_watch(
+            self.fd, os.fsencode(directory), WATCH_MASK,
+        )
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_add_watch({directory}): {os.strerror(err)}")
+        self._watches[wd] = (directory, kind, recursive)
+
+    def _add_tree(self, directory, kind, recursive):
+        self._add_watch(directory, kind, recursive)
+        if not recursive:
+            return
+        for root, dirs, _files in os.walk(directory):
+            for name in dirs:
+                self._add_watch(os.path.join(root, name), kind, True)
+
+    def _adopt_new_directory(self, path, kind):
+        """Watch a directory created/moved into a recursive tree and report its files."""
+        found = []
+        try:
+            self._add_tree(path, kind, True)
+            for root, _dirs, files in os.walk(path):
+                found.extend((kind, os.path.join(root, name)) for name in files)
+        except OSError as e:
+            logger.warning(f"Could not watch new directory {path}: {e}")
+        return found
+
+    def poll(self, timeout):
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            buf = os.read(self.fd, 65536)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(buf):
+            wd, mask, _cookie, name_len = _EVENT_HEADER.unpack_from(buf, offset)
+            offset += _EVENT_HEADER.size
+            name = buf[offset:offset + name_len].split(b"\0", 1)[0]
+            offset += name_len
+            if mask & IN_Q_OVERFLOW:
+                self.overflowed = True
+                continue
+            watch = self._watches.get(wd)
+            if watch is None:
+                continue
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            directory, kind, recursive = watch
+            path = os.path.join(directory, os.fsdecode(name))
+            if mask & IN_ISDIR:
+                if recursive and mask & (IN_CREATE | IN_MOVED_TO):
+                    events.extend(self._adopt_new_directory(path, kind))
+                continue
+            # Plain IN_CREATE is followed by IN_CLOSE_WRITE once the writer is
+            # done; ingesting on create would read a half-written file.
+            if mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                events.append((kind, path))
+        return events
+
+    def close(self):
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+class PollingWatcher:
+    """Snapshot-diff fallback; a changed file is reported once it stops changing."""
+
+    def __init__(self, targets, interval=POLL_INTERVAL):
+        self.targets = list(targets)
+        self.interval = interval
+        self.overflowed = False
+        self._snapshot = self._scan()
+        self._pending = {}
+
+    def _scan(self):
+        snapshot = {}
+        for directory, kind, recursive in self.targets:
+            stack = [directory]
+            while stack:
+                current = stack.pop()
+                try:
+                    entries = list(os.scandir(current))
+                except OSError:
+                    continue
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if recursive:
+                                stack.append(entry.path)
+                            continue
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    snapshot[entry.path] = (kind, st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def poll(self, timeout):
+        time.sleep(max(timeout, self.interval))
+        current = self._scan()
+        events = []
+        for path, state in current.items():
+            if self._snapshot.get(path) != state:
+                self._pending[path] = state
+            elif self._pending.get(path) == state:
+                # Unchanged for a full interval: the writer is done.
+                del self._pending[path]
+                events.append((state[0], path))
+        for path in list(self._pending):
+            if path not in current:
+                del self._pending[path]
+        self._snapshot = current
+        return events
+
+    def close(self):
+        pass
+
+
+def open_watcher(mode, targets):
+    """Return an inotify watcher, or a polling one for ``poll``/fallback."""
+    if mode in (MODE_AUTO, MODE_INOTIFY):
+        try:
+            return InotifyWatcher(targets)
+        except OSError as e:
+            if mode == MODE_INOTIFY:
+                raise
+            logger.warning(f"inotify unavailable ({e}); falling back to polling watch folders")
+    return PollingWatcher(targets)
+
+
+class FileWatcherService:
+    """Single-instance watcher loop with a Redis heartbeat and event batching."""
+
+    def __init__(self, mode=MODE_AUTO, targets=None, redis_client=None, stop_event=None):
+        self.mode = mode
+        self.targets = targets if targets is not None else watch_targets()
+        self.redis_client = redis_client
+        self.stop_event = stop_event or threading.Event()
+        self.token = uuid.uuid4().hex
+        self._pending = {}
+
+    def _heartbeat(self):
+        """Claim or refresh the heartbeat key; False when another watcher owns it."""
+        from core.tasks import WATCHER_HEARTBEAT_KEY
+
+        if self.redis_client is None:
+            return True
+        try:
+            owner = self.redis_client.get(WATCHER_HEARTBEAT_KEY)
+            if isinstance(owner, bytes):
+                owner = owner.decode()
+            if owner == self.token:
+                self.redis_client.expire(WATCHER_HEARTBEAT_KEY, HEARTBEAT_TTL)
+                return True
+            return bool(self.redis_client.set(
+                WATCHER_HEARTBEAT_KEY, self.token, nx=True, ex=HEARTBEAT_TTL,
+            ))
+        except Exception as e:
+            logger.warning(f"File watcher heartbeat failed: {e}")
+            return False
+
+    def _release(self):
+        from core.tasks import WATCHER_HEARTBEAT_KEY
+
+        if self.redis_client is None:
+            return
+        try:
+            owner = self.redis_client.get(WATCHER_HEARTBEAT_KEY)
+            if isinstance(owner, bytes):
+                owner = owner.decode()
+            if owner == self.token:
+                self.redis_client.delete(WATCHER_HEARTBEAT_KEY)
+        except Exception:
+            pass
+
+    def _request_reconcile(self):
+        """Missed events (queue overflow): let the next beat run a full scan."""
+        from core.tasks import WATCH_RECONCILE_KEY
+
+        if self.redis_client is None:
+            return
+        try:
+            self.redis_client.delete(WATCH_RECONCILE_KEY)
+        except Exception:
+            pass
+
+    def flush(self):
+        from django.db import close_old_connections
+        from core.tasks import process_watched_files
+
+        pending, self._pending = self._pending, {}
+        for kind, paths in pending.items():
+            logger.debug(f"File watcher: ingesting {len(paths)} {kind} file(s)")
+            try:
+                process_watched_files(kind, sorted(paths))
+            except Exception as e:
+                logger.error(f"File watcher failed to process {kind} files: {e}", exc_info=True)
+            finally:
+                close_old_connections()
+
+    def run(self):
+        while not self.stop_event.is_set() and not self._heartbeat():
+            # Another container/process already watches these folders.
+            self.stop_event.wait(HEARTBEAT_INTERVAL)
+        if self.stop_event.is_set():
+            return
+
+        watcher = open_watcher(self.mode, self.targets)
+        logger.info(f"File watcher started ({type(watcher).__name__})")
+        last_heartbeat = time.time()
+        first_event_at = last_event_at = None
+        try:
+            while not self.stop_event.is_set():
+                timeout = DEBOUNCE_SECONDS if self._pending else HEARTBEAT_INTERVAL
+                events = watcher.poll(timeout)
+                now = time.time()
+                for kind, path in events:
+                    self._pending.setdefault(kind, set()).add(path)
+                if events:
+                    last_event_at = now
+                    if first_event_at is None:
+                        first_event_at = now
+                if watcher.overflowed:
+                    watcher.overflowed = False
+                    logger.warning("File watcher event queue overflowed; requesting a full scan")
+                    self._request_reconcile()
+
+                # Batch bursts (e.g. copying a logo pack) into one ingest pass.
+                if self._pending and (
+                    now - last_event_at >= DEBOUNCE_SECONDS
+                    or now - first_event_at >= MAX_BATCH_DELAY
+                ):
+                    self.flush()
+                    first_event_at = last_event_at = None
+                if now - last_heartbeat >= HEARTBEAT_INTERVAL:
+                    if not self._heartbeat():
+                        logger.warning("File watcher lost its heartbeat key; stopping")
+                        break
+                    last_heartbeat = now
+        finally:
+            if self._pending:
+                self.flush()
+            watcher.close()
+            self._release()
@@ -9,9 +9,10 @@ import time
 from urllib.parse import urljoin
 
 import requests
-from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.http import Http404, HttpResponse
 from django.utils.http import http_date
 
+from core.file_serving import serve_file
 from core.http_security import validate_outbound_http_url
 from core.models import CoreSettings
 from core.utils import resolve_safe_local_data_path
@@ -202,15 +203,17 @@ def serve_local_or_remote_image(
             if not content_type:
                 content_type = "image/jpeg"
 
-            # StreamingHttpResponse closes the file when the response finishes.
-            response = StreamingHttpResponse(
-                open(safe_path, "rb"),
-                content_type=content_type,
-            )
-            response["Cache-Control"] = "public, max-age=14400"
-            response["Last-Modified"] = http_date(stat.st_mtime)
-            response["Content-Disposition"] = 'inline; filename="{}"'.format(
-                os.path.basename(safe_path)
+            response = serve_file(
+                None,
+                safe_path,
+                content_type,
+                headers={
+                    "Cache-Control": "public, max-age=14400",
+                    "Last-Modified": http_date(stat.st_mtime),
+                },
+                # The SVG sandbox CSP would not survive an nginx internal
+                # redirect, so SVGs are always sent from here.
+                accel=not content_type.startswith("image/svg"),
             )
             _apply_image_security_headers(response, content_type)
             return response
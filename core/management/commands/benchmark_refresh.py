@@ -0,0 +1,101 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from core.refresh_benchmark import PHASES, ensure_dataset, run_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark M3U/XC refresh, EPG import and XMLTV export against '
+        'synthetic large-scale provider data'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--streams', type=int, default=100_000, help='Streams in the M3U playlist')
+        parser.add_argument('--xc-streams', type=int, default=100_000, help='Streams in the XC catalog')
+        parser.add_argument('--epg-channels', type=int, default=10_000, help='Channels in the XMLTV guide')
+        parser.add_argument('--days', type=int, default=14, help='Days of programmes in the XMLTV guide')
+        parser.add_argument(
+            '--mapped-channels', type=int, default=None,
+            help='EPG entries to map to channels before the programme import (default: all)',
+        )
+        parser.add_argument('--seed', type=int, default=0, help='Seed for the synthetic data')
+        parser.add_argument(
+            '--data-dir', default=None,
+            help='Keep the generated files here and reuse them when the parameters match',
+        )
+        parser.add_argument(
+            '--phase', action='append', choices=PHASES, dest='phases',
+            help='Phase to run; repeat for several (default: all)',
+        )
+        parser.add_argument(
+            '--generate-only', action='store_true',
+            help='Only write the synthetic data to --data-dir',
+        )
+        parser.add_argument('--json', action='store_true', help='Print the results as JSON')
+
+    def handle(self, *args, **options):
+        sizes = (options['streams'], options['xc_streams'], options['epg_channels'], options['days'])
+        if min(sizes) < 0 or options['days'] < 1:
+            raise CommandError('Dataset sizes cannot be negative and --days must be at least 1')
+        log = self.stderr.write
+
+        if options['generate_only']:
+            if not options['data_dir']:
+                raise CommandError('--generate-only needs --data-dir')
+            manifest = ensure_dataset(
+                options['data_dir'], options['streams'], options['xc_streams'],
+                options['epg_channels'], options['days'], options['seed'], log,
+            )
+            self.stdout.write(json.dumps(manifest, indent=2))
+            return
+
+        if connection.vendor != 'postgresql':
+            raise CommandError(
+                f'The refresh benchmark needs PostgreSQL (configured database: {connection.vendor})'
+            )
+
+        phases = options['phases'] or PHASES
+        for phase, size in (('m3u_refresh', 'streams'), ('xc_refresh', 'xc_streams')):
+            if phase in phases and not options[size]:
+                raise CommandError(f'--{size.replace("_", "-")} must be positive to run {phase}')
+        if any(p.startswith('epg_') for p in phases) and not options['epg_channels']:
+            raise CommandError('--epg-channels must be positive to run the EPG phases')
+
+        try:
+            results = run_benchmark(
+                streams=options['streams'],
+                xc_streams=options['xc_streams'],
+                epg_channels=options['epg_channels'],
+                days=options['days'],
+                mapped_channels=options['mapped_channels'],
+                seed=options['seed'],
+                data_dir=options['data_dir'],
+                phases=phases,
+                log=log,
+            )
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        dataset = results['dataset']
+        self.stdout.write(
+            f"Dispatcharr {results['dispatcharr_version']} on {results['database']['vendor']} "
+            f"{results['database'].get('server_version', '')}".rstrip()
+        )
+        self.stdout.write(
+            f"{dataset['streams']} M3U / {dataset['xc_streams']} XC streams, "
+            f"{dataset['epg_channels']} EPG channels x {dataset['days']} days "
+            f"({dataset['programmes']} programmes, {dataset['mapped_channels']} mapped), seed {dataset['seed']}"
+        )
+        self.stdout.write(f"  {'Phase':<16} {'Wall s':>9} {'Peak RSS MB':>12} {'Queries':>9} {'Rows written':>13}")
+        for phase in results['phases']:
+            self.stdout.write(
+                f"  {phase['phase']:<16} {phase['wall_s']:>9.2f} {phase['peak_rss_mb']:>12.1f} "
+                f"{phase['queries']:>9} {phase['rows_written']:>13}"
+            )
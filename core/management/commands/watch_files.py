@@ -0,0 +1,46 @@
+import logging
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.file_watcher import MODE_OFF, MODES, FileWatcherService
+from core.utils import RedisClient
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Watch the M3U/EPG/logo folders and ingest dropped files immediately"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--mode",
+            choices=MODES,
+            default=None,
+            help="auto (inotify, polling fallback), inotify, poll or off. "
+                 "Defaults to DISPATCHARR_FILE_WATCHER.",
+        )
+
+    def handle(self, *args, **options):
+        mode = options["mode"] or settings.FILE_WATCHER_MODE
+        if mode not in MODES:
+            raise CommandError(f"Unknown file watcher mode: {mode}")
+
+        stop_event = threading.Event()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(sig, lambda *_args: stop_event.set())
+
+        if mode == MODE_OFF:
+            # Stay idle instead of exiting so process supervisors (uWSGI
+            # attach-daemon) do not keep respawning the command.
+            logger.info("File watcher disabled; watch folders are scanned by Celery beat only")
+            stop_event.wait()
+            return
+
+        FileWatcherService(
+            mode=mode,
+            redis_client=RedisClient.get_client(),
+            stop_event=stop_event,
+        ).run()
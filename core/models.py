@@ -623,6 +623,7 @@ class CoreSettings(models.Model):
             "comskip_custom_path": "",
             "comskip_mode": "cut",
             "comskip_hw_accel": "none",
+            "finalize_mode": "concat",
             "pre_offset_minutes": 0,
             "post_offset_minutes": 0,
             "series_rules": [],
@@ -675,6 +676,17 @@ class CoreSettings(models.Model):
         cls._update_group(DVR_SETTINGS_KEY, "DVR Settings", {"comskip_custom_path": value})
         return value
 
+    @classmethod
+    def get_dvr_finalize_mode(cls):
+        """How a finished recording becomes playable.
+
+        "concat" joins the HLS segments into a single MKV (one full read and
+        write of the recording); "hls" keeps the segment set and closes its
+        playlist, so finalization costs no bulk I/O.
+        """
+        mode = cls.get_dvr_settings().get("finalize_mode", "concat")
+        return mode if mode in ("concat", "hls") else "concat"
+
     @classmethod
     def get_dvr_pre_offset_minutes(cls):
         return int(cls.get_dvr_settings().get("pre_offset_minutes", 0) or 0)
@@ -708,6 +720,9 @@ class CoreSettings(models.Model):
             "channel_init_grace_period": 60,
             "channel_client_wait_period": 5,
             "new_client_behind_seconds": 5,
+            "standby_channels": 0,
+            "standby_pinned_channels": "",
+            "stream_ordering": "static",
         })
 
     @classmethod
@@ -0,0 +1,416 @@
+"""
+Opt-in Redis command accounting for the clients ``RedisClient`` hands out.
+
+With ``DISPATCHARR_REDIS_COMMAND_STATS=true`` the decoded and binary clients
+are ``InstrumentedRedis`` instances. Every command, including each command in
+a pipeline, is counted per command and key family: the key with its
+variable segments (ids, UUIDs, chunk numbers) replaced by ``*``, e.g.
+``GET live:channel:*:input:buffer:chunk:*``. For each pair the counters hold
+calls, errors, bytes sent (arguments) and received (reply), and total and
+maximum latency as seen by the client. The busiest exact keys are tracked
+separately as hot keys.
+
+Each process publishes its counters to Redis every
+``REDIS_COMMAND_STATS_INTERVAL`` seconds and logs a one-line summary of the
+interval. ``collect_stats`` merges the published counters of all processes
+(web, Celery, proxy workers) for the admin API.
+
+Only traffic through ``RedisClient`` is counted. The Celery broker, channel
+layers, Django cache and the proxy's dedicated pub/sub client open their own
+connections; ``server_stats`` reports Redis' own ``INFO`` counters, which
+cover everything.
+"""
+
+import json
+import logging
+import os
+import re
+import socket
+import threading
+import time
+
+import redis
+from django.conf import settings
+from redis.client import Pipeline
+
+logger = logging.getLogger(__name__)
+
+STATS_KEY_PREFIX = "redis_stats:process:"
+RESET_KEY = "redis_stats:reset_at"
+
+NO_KEY = "-"
+OTHER_FAMILY = "(other)"
+# Distinct (command, family) pairs per process; the rest is folded into OTHER_FAMILY.
+MAX_FAMILIES = 1000
+# Exact keys tracked for the hot-key list; halved to the busiest when full.
+HOT_KEY_CAPACITY = 2048
+HOT_KEYS_PUBLISHED = 50
+_MAX_FAMILY_LENGTH = 120
+
+# Commands whose first argument is not a key.
+_KEYLESS_COMMANDS = frozenset({
+    "AUTH", "CLIENT", "COMMAND", "CONFIG", "DBSIZE", "DISCARD", "ECHO", "EXEC",
+    "FLUSHALL", "FLUSHDB", "HELLO", "INFO", "LASTSAVE", "MEMORY", "MULTI",
+    "PING", "PUBSUB", "READONLY", "SCAN", "SCRIPT", "SELECT", "SLOWLOG",
+    "TIME", "UNWATCH", "WAIT",
+})
+# Commands with "numkeys key [key ...]" after the script or function name.
+_NUMKEYS_COMMANDS = frozenset({"EVAL", "EVALSHA", "EVAL_RO", "EVALSHA_RO", "FCALL", "FCALL_RO"})
+
+_UUID_RE = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", re.IGNORECASE)
+_NUMBERED_SUFFIX_RE = re.compile(r"_\d+$")
+# Hashes, client ids and similar generated tokens (no word separators).
+_TOKEN_RE = re.compile(r"^[0-9A-Za-z\-]+$")
+
+# Field order of a counter entry.
+_CALLS, _ERRORS, _BYTES_OUT, _BYTES_IN, _TOTAL_US, _MAX_US = range(6)
+_FIELDS = ("calls", "errors", "bytes_out", "bytes_in", "total_us", "max_us")
+
+
+def stats_enabled():
+    return getattr(settings, "REDIS_COMMAND_STATS", False)
+
+
+def _is_variable_segment(segment):
+    return (
+        segment.isdigit()
+        or bool(_UUID_RE.match(segment))
+        or (len(segment) >= 8 and bool(_TOKEN_RE.match(segment)) and any(ch.isdigit() for ch in segment))
+        or len(segment) > 40
+        or "=" in segment
+        or "/" in segment
+    )
+
+
+def key_family(key):
+    """
+    ``key`` with its variable parts replaced by ``*``.
+
+    Colon-separated segments that look like ids, UUIDs, numbers, hashes or
+    parameters become ``*`` (runs of them collapse into one), and a trailing
+    ``_<number>`` becomes ``_*``, so ``live:channel:<uuid>:clients`` and
+    ``task_lock_refresh_single_m3u_account_12`` group with their siblings.
+    """
+    if isinstance(key, (bytes, bytearray, memoryview)):
+        key = bytes(key).decode("utf-8", "replace")
+    else:
+        key = str(key)
+    segments = []
+    for segment in key.split(":"):
+        segment = _NUMBERED_SUFFIX_RE.sub("_*", segment)
+        if _is_variable_segment(segment):
+            segment = "*"
+        if segment == "*" and segments and segments[-1] == "*":
+            continue
+        segments.append(segment)
+    return ":".join(segments)[:_MAX_FAMILY_LENGTH]
+
+
+def command_key(args):
+    """The command name and its first key (None when the command takes none)."""
+    if not args:
+        return "?", None
+    command = str(args[0]).upper()
+    name = command.split(" ", 1)[0]
+    if name in _KEYLESS_COMMANDS:
+        return command, None
+    if name in _NUMKEYS_COMMANDS:
+        try:
+            return command, args[3] if int(args[2]) > 0 else None
+        except (IndexError, TypeError, ValueError):
+            return command, None
+    return command, args[1] if len(args) > 1 else None
+
+
+def payload_size(value):
+    """Approximate wire size of a command argument or reply in bytes."""
+    if value is None:
+        return 0
+    if isinstance(value, (bytes, bytearray, memoryview, str)):
+        return len(value)
+    if isinstance(value, (int, float)):
+        return len(str(value))
+    if isinstance(value, dict):
+        return sum(payload_size(k) + payload_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return sum(payload_size(item) for item in value)
+    return 0
+
+
+def _key_text(key):
+    if isinstance(key, (bytes, bytearray, memoryview)):
+        return bytes(key).decode("utf-8", "replace")
+    return str(key)
+
+
+class CommandStats:
+    """Per-process counters keyed by (command, key family), plus hot exact keys."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reporter = None
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self.started_at = time.time()
+        self._families = {}
+        self._hot_keys = {}
+        self._last_logged = {}
+
+    def reset(self):
+        with self._lock:
+            self._reset()
+
+    @property
+    def process_id(self):
+        return f"{socket.gethostname()}:{self._pid}"
+
+    def record(self, args, response, seconds, error=False):
+        command, key = command_key(args)
+        bytes_out = sum(payload_size(arg) for arg in args)
+        bytes_in = 0 if error else payload_size(response)
+        self.add(command, key, bytes_out, bytes_in, seconds, error)
+
+    def add(self, command, key, bytes_out, bytes_in, seconds, error=False):
+        if self._pid != os.getpid():
+            # Forked child: the parent's counters and reporter are not ours.
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._reset()
+                    self._reporter = None
+        if self._reporter is None:
+            self._start_reporter()
+        family = NO_KEY if key is None else key_family(key)
+        micros = int(seconds * 1_000_000)
+        with self._lock:
+            entry = self._families.get((command, family))
+            if entry is None:
+                if len(self._families) >= MAX_FAMILIES:
+                    family = OTHER_FAMILY
+                entry = self._families.setdefault((command, family), [0, 0, 0, 0, 0, 0])
+            entry[_CALLS] += 1
+            entry[_ERRORS] += error
+            entry[_BYTES_OUT] += bytes_out
+            entry[_BYTES_IN] += bytes_in
+            entry[_TOTAL_US] += micros
+            if micros > entry[_MAX_US]:
+                entry[_MAX_US] = micros
+            if key is not None:
+                key = _key_text(key)
+                self._hot_keys[key] = self._hot_keys.get(key, 0) + 1
+                if len(self._hot_keys) > HOT_KEY_CAPACITY:
+                    busiest = sorted(self._hot_keys.items(), key=lambda item: item[1], reverse=True)
+                    self._hot_keys = dict(busiest[:HOT_KEY_CAPACITY // 2])
+
+    def snapshot(self):
+        with self._lock:
+            families = [
+                {"command": command, "family": family, **dict(zip(_FIELDS, entry))}
+                for (command, family), entry in self._families.items()
+            ]
+            hot_keys = sorted(self._hot_keys.items(), key=lambda item: item[1], reverse=True)
+        return {
+            "process": self.process_id,
+            "started_at": self.started_at,
+            "updated_at": time.time(),
+            "families": families,
+            "hot_keys": hot_keys[:HOT_KEYS_PUBLISHED],
+        }
+
+    def _start_reporter(self):
+        with self._lock:
+            if self._reporter is not None:
+                return
+            self._reporter = threading.Thread(
+                target=self._report_forever, name="redis-command-stats", daemon=True
+            )
+        self._reporter.start()
+
+    def _report_forever(self):
+        interval = max(5, int(getattr(settings, "REDIS_COMMAND_STATS_INTERVAL", 60)))
+        me = threading.current_thread()
+        while self._reporter is me:
+            time.sleep(interval)
+            try:
+                self.publish(interval)
+                self.log_interval(interval)
+            except Exception as e:
+                logger.warning(f"Could not publish Redis command stats: {e}")
+
+    def publish(self, interval):
+        """Write this process's counters to Redis, after honouring a pending reset."""
+        from core.utils import RedisClient
+
+        client = RedisClient.get_client()
+        if client is None:
+            return
+        reset_at = client.get(RESET_KEY)
+        if reset_at and float(reset_at) > self.started_at:
+            self.reset()
+        client.setex(f"{STATS_KEY_PREFIX}{self.process_id}", interval * 3, json.dumps(self.snapshot()))
+
+    def log_interval(self, interval):
+        """Log the commands, traffic and Redis time since the previous call."""
+        with self._lock:
+            current = {pair: list(entry) for pair, entry in self._families.items()}
+            previous, self._last_logged = self._last_logged, current
+        deltas = []
+        for pair, entry in current.items():
+            before = previous.get(pair, [0] * len(_FIELDS))
+            delta = [now - then for now, then in zip(entry, before)]
+            if delta[_CALLS] > 0:
+                deltas.append((pair, delta))
+        if not deltas:
+            return
+        calls = sum(delta[_CALLS] for _, delta in deltas)
+        bytes_out = sum(delta[_BYTES_OUT] for _, delta in deltas)
+        bytes_in = sum(delta[_BYTES_IN] for _, delta in deltas)
+        total_us = sum(delta[_TOTAL_US] for _, delta in deltas)
+        busiest = sorted(deltas, key=lambda item: item[1][_TOTAL_US], reverse=True)[:3]
+        top = "; ".join(
+            f"{command} {family} {delta[_CALLS]} cmds {delta[_TOTAL_US] / 1000:.0f} ms"
+            for (command, family), delta in busiest
+        )
+        logger.info(
+            f"Redis command stats for {self.process_id} over {interval}s: {calls} cmds "
+            f"({calls / interval:.0f}/s), {bytes_out / 1e6:.2f} MB out, {bytes_in / 1e6:.2f} MB in, "
+            f"{total_us / 1e6:.2f}s waiting on Redis; busiest: {top}"
+        )
+
+
+command_stats = CommandStats()
+
+
+class InstrumentedPipeline(Pipeline):
+    """Pipeline that records every queued command when the batch executes."""
+
+    def execute(self, raise_on_error=True):
+        stack = [args for args, _ in self.command_stack]
+        started = time.perf_counter()
+        try:
+            responses = super().execute(raise_on_error)
+        except Exception:
+            seconds = (time.perf_counter() - started) / max(1, len(stack))
+            for args in stack:
+                command_stats.record(args, None, seconds, error=True)
+            raise
+        # One round trip serves the whole batch; share its latency out evenly.
+        seconds = (time.perf_counter() - started) / max(1, len(stack))
+        for args, response in zip(stack, responses):
+            command_stats.record(args, response, seconds, error=isinstance(response, Exception))
+        return responses
+
+
+class InstrumentedRedis(redis.Redis):
+    """``redis.Redis`` that records each command in ``command_stats``."""
+
+    def execute_command(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            response = super().execute_command(*args, **options)
+        except Exception:
+            command_stats.record(args, None, time.perf_counter() - started, error=True)
+            raise
+        command_stats.record(args, response, time.perf_counter() - started)
+        return response
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        return InstrumentedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+
+_SORT_FIELDS = {"time": "total_us", "calls": "calls", "bytes_in": "bytes_in", "bytes_out": "bytes_out"}
+
+
+def _rollup(rows, key_fields):
+    merged = {}
+    for row in rows:
+        key = tuple(row[field] for field in key_fields)
+        entry = merged.setdefault(key, dict(zip(key_fields, key), **{field: 0 for field in _FIELDS}))
+        for field in _FIELDS:
+            if field == "max_us":
+                entry[field] = max(entry[field], row[field])
+            else:
+                entry[field] += row[field]
+    for entry in merged.values():
+        entry["avg_us"] = round(entry["total_us"] / entry["calls"], 1) if entry["calls"] else 0.0
+    return list(merged.values())
+
+
+def collect_stats(client, sort="time", limit=50):
+    """
+    Merge the counters every process has published.
+
+    Returns the top ``limit`` rows per (command, family), per family and per
+    command, sorted by ``sort`` (``time``, ``calls``, ``bytes_in`` or
+    ``bytes_out``), plus the hot keys across processes.
+    """
+    sort_field = _SORT_FIELDS.get(sort, "total_us")
+    snapshots = []
+    for key in client.scan_iter(match=f"{STATS_KEY_PREFIX}*", count=100):
+        raw = client.get(key)
+        if raw:
+            try:
+                snapshots.append(json.loads(raw))
+            except ValueError:
+                continue
+
+    rows = [row for snapshot in snapshots for row in snapshot.get("families", [])]
+    hot_keys = {}
+    for snapshot in snapshots:
+        for key, calls in snapshot.get("hot_keys", []):
+            hot_keys[key] = hot_keys.get(key, 0) + calls
+
+    def top(entries):
+        return sorted(entries, key=lambda entry: entry[sort_field], reverse=True)[:limit]
+
+    return {
+        "processes": sorted(
+            (
+                {"process": s["process"], "started_at": s["started_at"], "updated_at": s["updated_at"]}
+                for s in snapshots
+            ),
+            key=lambda p: p["process"],
+        ),
+        "totals": {field: sum(row[field] for row in rows) for field in _FIELDS if field != "max_us"},
+        "commands_by_family": top(_rollup(rows, ("command", "family"))),
+        "families": top(_rollup(rows, ("family",))),
+        "commands": top(_rollup(rows, ("command",))),
+        "hot_keys": [
+            {"key": key, "calls": calls}
+            for key, calls in sorted(hot_keys.items(), key=lambda item: item[1], reverse=True)[:limit]
+        ],
+    }
+
+
+def reset_stats(client):
+    """Drop published counters and ask every process to restart its own."""
+    client.set(RESET_KEY, time.time())
+    keys = list(client.scan_iter(match=f"{STATS_KEY_PREFIX}*", count=100))
+    if keys:
+        client.delete(*keys)
+    command_stats.reset()
+
+
+def server_stats(client, limit=20):
+    """Redis' own counters, covering connections that are not instrumented."""
+    stats = client.info("stats")
+    memory = client.info("memory")
+    commands = client.info("commandstats")
+    busiest = sorted(commands.items(), key=lambda item: item[1].get("usec", 0), reverse=True)[:limit]
+    return {
+        "instantaneous_ops_per_sec": stats.get("instantaneous_ops_per_sec"),
+        "total_commands_processed": stats.get("total_commands_processed"),
+        "total_net_input_bytes": stats.get("total_net_input_bytes"),
+        "total_net_output_bytes": stats.get("total_net_output_bytes"),
+        "used_memory": memory.get("used_memory"),
+        "commands": [
+            {
+                "command": name.removeprefix("cmdstat_").upper(),
+                "calls": values.get("calls", 0),
+                "usec": values.get("usec", 0),
+                "usec_per_call": values.get("usec_per_call", 0),
+            }
+            for name, values in busiest
+        ],
+    }
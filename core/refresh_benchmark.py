@@ -0,0 +1,463 @@
+"""
+Large-dataset benchmark for M3U and EPG refresh and XMLTV export.
+
+Runs the production code paths against synthetic provider data (see
+``core.synthetic_data``) in the configured database:
+
+* ``m3u_refresh``: ``refresh_single_m3u_account`` for a file-based M3U account;
+* ``xc_refresh``: the same for an Xtream Codes account, served by a local
+  HTTP stand-in for ``player_api.php``;
+* ``epg_channels``: ``parse_channels_only`` for an XMLTV source;
+* ``epg_programmes``: ``parse_programs_for_source`` once benchmark channels
+  are mapped to the guide's EPG entries;
+* ``epg_index``: ``build_programme_index``;
+* ``epg_export``: ``generate_epg`` for a profile holding the benchmark
+  channels, consumed to the end.
+
+Each phase reports wall time, peak RSS of this process while it ran, the
+number of SQL queries (from every thread) and the rows they inserted,
+updated or deleted. Everything the run creates is removed afterwards.
+
+Run it with ``manage.py benchmark_refresh`` against a scratch Postgres
+database; the numbers are only comparable between runs with the same
+dataset parameters on the same machine.
+"""
+
+import contextlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+import psutil
+from django.db import connection, connections
+from django.db.backends.signals import connection_created
+
+from core import synthetic_data
+
+PHASES = (
+    "m3u_refresh",
+    "xc_refresh",
+    "epg_channels",
+    "epg_programmes",
+    "epg_index",
+    "epg_export",
+)
+
+_WRITE_SQL = re.compile(r"^\s*(INSERT|UPDATE|DELETE)\b", re.IGNORECASE)
+
+
+class QueryCounter:
+    """
+    Counts SQL statements and the rows written by them on every connection.
+
+    Installed as an execute wrapper on the current thread's connections and
+    on each connection opened while it is active, so queries from refresh
+    worker threads are included.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.rows_written = 0
+        self._lock = threading.Lock()
+        self._wrapped = []
+
+    def __call__(self, execute, sql, params, many, context):
+        result = execute(sql, params, many, context)
+        rows = 0
+        if _WRITE_SQL.match(sql):
+            rows = max(0, context["cursor"].rowcount or 0)
+        with self._lock:
+            self.queries += 1
+            self.rows_written += rows
+        return result
+
+    def _attach(self, db_connection):
+        if self not in db_connection.execute_wrappers:
+            db_connection.execute_wrappers.append(self)
+            self._wrapped.append(db_connection)
+
+    def _on_connection_created(self, sender, connection, **kwargs):
+        self._attach(connection)
+
+    def __enter__(self):
+        connection_created.connect(self._on_connection_created, weak=False)
+        for db_connection in connections.all():
+            self._attach(db_connection)
+        return self
+
+    def __exit__(self, *exc):
+        connection_created.disconnect(self._on_connection_created)
+        for db_connection in self._wrapped:
+            if self in db_connection.execute_wrappers:
+                db_connection.execute_wrappers.remove(self)
+        self._wrapped = []
+
+    def snapshot(self):
+        with self._lock:
+            return self.queries, self.rows_written
+
+
+class PeakRSS(threading.Thread):
+    """Samples this process's resident set size until stopped and keeps the peak."""
+
+    def __init__(self, interval=0.05):
+        super().__init__(daemon=True)
+        self._process = psutil.Process()
+        self._interval = interval
+        self._stop_event = threading.Event()
+        self.start_bytes = self.peak_bytes = self._process.memory_info().rss
+
+    def run(self):
+        while not self._stop_event.wait(self._interval):
+            self.peak_bytes = max(self.peak_bytes, self._process.memory_info().rss)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        self.peak_bytes = max(self.peak_bytes, self._process.memory_info().rss)
+
+
+@contextlib.contextmanager
+def measure_phase(name, counter, results):
+    """Append the measurements of the enclosed block to ``results`` as ``name``."""
+    phase = {"phase": name}
+    rss = PeakRSS()
+    rss.start()
+    queries, rows_written = counter.snapshot()
+    started = time.perf_counter()
+    try:
+        yield phase
+    finally:
+        wall = time.perf_counter() - started
+        rss.stop()
+        end_queries, end_rows_written = counter.snapshot()
+        phase.update({
+            "wall_s": round(wall, 3),
+            "peak_rss_mb": round(rss.peak_bytes / 1024 / 1024, 1),
+            "rss_growth_mb": round((rss.peak_bytes - rss.start_bytes) / 1024 / 1024, 1),
+            "queries": end_queries - queries,
+            "rows_written": end_rows_written - rows_written,
+        })
+        results.append(phase)
+
+
+class _XCHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.0"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        action = parse_qs(url.query).get("action", [""])[0]
+        if url.path.rstrip("/") != "/player_api.php":
+            self.send_error(404)
+            return
+        body = self.server.responses.get(action)
+        if body is None:
+            body = b"[]"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeXCProvider:
+    """Serves a synthetic XC live catalog on localhost; use as a context manager."""
+
+    def __init__(self, catalog_path):
+        with open(catalog_path, "rb") as f:
+            catalog = json.load(f)
+        self._responses = {
+            "": json.dumps({
+                "user_info": {
+                    "username": synthetic_data.PROVIDER_USERNAME,
+                    "password": synthetic_data.PROVIDER_PASSWORD,
+                    "auth": 1,
+                    "status": "Active",
+                    "max_connections": "1",
+                    "allowed_output_formats": ["ts"],
+                },
+                "server_info": {"url": "127.0.0.1", "server_protocol": "http"},
+            }).encode(),
+            "get_live_categories": json.dumps(catalog["categories"]).encode(),
+            "get_live_streams": json.dumps(catalog["streams"]).encode(),
+        }
+        self._server = None
+
+    def __enter__(self):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _XCHandler)
+        self._server.daemon_threads = True
+        self._server.responses = self._responses
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+
+@contextlib.contextmanager
+def _without_background_work():
+    # The benchmark drives each phase itself; keep save signals and the XC
+    # refresh from queueing Celery tasks that would race it or outlive it.
+    with contextlib.ExitStack() as stack:
+        for target in (
+            "apps.m3u.signals.refresh_m3u_groups",
+            "apps.m3u.tasks.refresh_account_profiles",
+            "apps.epg.signals.refresh_epg_data",
+        ):
+            stack.enter_context(mock.patch(target))
+        yield
+
+
+def ensure_dataset(directory, streams, xc_streams, epg_channels, days, seed, log):
+    """Reuse the dataset in ``directory`` when its manifest matches, else generate it."""
+    wanted = {
+        "generator_version": synthetic_data.GENERATOR_VERSION,
+        "seed": seed,
+        "streams": streams,
+        "xc_streams": xc_streams,
+        "epg_channels": epg_channels,
+        "days": days,
+        "guide_start": synthetic_data.default_guide_start().isoformat(),
+    }
+    manifest = synthetic_data.load_manifest(directory)
+    if manifest and all(manifest.get(key) == value for key, value in wanted.items()):
+        log(f"Reusing synthetic data in {directory}")
+        return manifest
+    log(f"Generating synthetic data in {directory} ({streams} M3U streams, {xc_streams} XC streams, "
+        f"{epg_channels} EPG channels x {days} days)")
+    started = time.perf_counter()
+    manifest = synthetic_data.generate_dataset(directory, streams, xc_streams, epg_channels, days, seed)
+    log(f"Generated in {time.perf_counter() - started:.1f}s")
+    return manifest
+
+
+def _database_info():
+    info = {"vendor": connection.vendor}
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("SHOW server_version")
+            info["server_version"] = cursor.fetchone()[0]
+    return info
+
+
+def _create_m3u_account(name, **fields):
+    from apps.m3u.models import M3UAccount
+
+    return M3UAccount.objects.create(name=name, max_streams=0, **fields)
+
+
+def _map_benchmark_channels(epg_source, limit, run_id):
+    """Create channels for up to ``limit`` of the source's EPG entries and a profile holding them."""
+    from apps.channels.models import Channel, ChannelProfile, ChannelProfileMembership
+    from apps.epg.models import EPGData
+
+    epg_entries = list(
+        EPGData.objects.filter(epg_source=epg_source).order_by("id").values("id", "tvg_id", "name")[:limit]
+    )
+    # bulk_create skips the save signals that queue per-channel programme refreshes.
+    channels = Channel.objects.bulk_create(
+        [
+            Channel(
+                channel_number=100000 + number,
+                name=f"{run_id} {entry['name']}",
+                tvg_id=entry["tvg_id"],
+                epg_data_id=entry["id"],
+            )
+            for number, entry in enumerate(epg_entries, start=1)
+        ],
+        batch_size=1000,
+    )
+    profile = ChannelProfile.objects.create(name=f"benchmark-{run_id}")
+    # Creating a profile enrols every existing channel; keep only ours.
+    ChannelProfileMembership.objects.filter(channel_profile=profile).delete()
+    ChannelProfileMembership.objects.bulk_create(
+        [ChannelProfileMembership(channel_profile=profile, channel=channel) for channel in channels],
+        batch_size=1000,
+    )
+    return profile, [channel.id for channel in channels]
+
+
+def _consume_epg_export(profile_name):
+    from django.test import RequestFactory
+
+    from apps.output.epg import generate_epg
+
+    request = RequestFactory().get("/output/epg", {"tvg_id_source": "tvg_id"})
+    response = generate_epg(request, profile_name=profile_name)
+    size = programmes = 0
+    for chunk in response.streaming_content:
+        size += len(chunk)
+        programmes += chunk.count(b"<programme ")
+    return size, programmes
+
+
+def _cleanup(created, log):
+    from apps.channels.models import Channel, ChannelGroup, ChannelProfile
+    from apps.epg.models import EPGSource
+    from apps.m3u.models import M3UAccount
+    from apps.output.streaming_chunk_cache import invalidate_epg_chunk_cache
+
+    log("Removing benchmark data")
+    Channel.objects.filter(id__in=created["channels"]).delete()
+    ChannelProfile.objects.filter(id__in=created["profiles"]).delete()
+    M3UAccount.objects.filter(id__in=created["accounts"]).delete()
+    # Forget the file paths first: deleting a source removes its files, and
+    # they belong to the (possibly reused) dataset directory.
+    EPGSource.objects.filter(id__in=created["sources"]).update(file_path=None, extracted_file_path=None)
+    EPGSource.objects.filter(id__in=created["sources"]).delete()
+    ChannelGroup.objects.exclude(id__in=created["existing_groups"]).filter(
+        channels__isnull=True, streams__isnull=True, m3u_accounts__isnull=True
+    ).delete()
+    invalidate_epg_chunk_cache()
+
+
+def run_benchmark(
+    streams=100_000,
+    xc_streams=100_000,
+    epg_channels=10_000,
+    days=14,
+    mapped_channels=None,
+    seed=0,
+    data_dir=None,
+    phases=PHASES,
+    log=None,
+):
+    """
+    Generate (or reuse) a dataset, run the requested ``phases`` and return the results.
+
+    ``mapped_channels`` limits how many EPG entries get a channel before the
+    programme import (default: all of them). ``data_dir`` keeps the
+    generated files for later runs; without it they go to a temporary
+    directory that is removed afterwards.
+    """
+    from apps.channels.models import ChannelGroup, Stream
+    from apps.epg.models import EPGData, EPGSource, EPGSourceIndex, ProgramData
+    from apps.epg.tasks import build_programme_index, parse_channels_only, parse_programs_for_source
+    from apps.m3u.models import M3UAccount
+    from apps.m3u.tasks import refresh_single_m3u_account
+
+    from version import __version__
+
+    log = log or (lambda message: None)
+    unknown = set(phases) - set(PHASES)
+    if unknown:
+        raise ValueError(f"Unknown phase(s): {', '.join(sorted(unknown))}")
+    epg_phases = [phase for phase in phases if phase.startswith("epg_")]
+    if "m3u_refresh" not in phases:
+        streams = 0
+    if "xc_refresh" not in phases:
+        xc_streams = 0
+    if not epg_phases:
+        epg_channels = 0
+
+    directory = data_dir or tempfile.mkdtemp(prefix="dispatcharr-benchmark-")
+    run_id = uuid.uuid4().hex[:8]
+    created = {
+        "accounts": [],
+        "sources": [],
+        "channels": [],
+        "profiles": [],
+        "existing_groups": list(ChannelGroup.objects.values_list("id", flat=True)),
+    }
+    results = []
+    try:
+        manifest = ensure_dataset(directory, streams, xc_streams, epg_channels, days, seed, log)
+        files = {key: os.path.join(directory, name) for key, name in manifest["files"].items()}
+
+        with QueryCounter() as counter, _without_background_work():
+            if "m3u_refresh" in phases:
+                account = _create_m3u_account(
+                    f"Benchmark M3U {run_id}", file_path=files["playlist"]
+                )
+                created["accounts"].append(account.id)
+                log(f"Running m3u_refresh ({streams} streams)")
+                with measure_phase("m3u_refresh", counter, results) as phase:
+                    refresh_single_m3u_account(account.id)
+                account.refresh_from_db()
+                phase["status"] = account.status
+                phase["streams"] = Stream.objects.filter(m3u_account=account).count()
+
+            if "xc_refresh" in phases:
+                with FakeXCProvider(files["xc_catalog"]) as provider:
+                    account = _create_m3u_account(
+                        f"Benchmark XC {run_id}",
+                        account_type=M3UAccount.Types.XC,
+                        server_url=provider.url,
+                        username=synthetic_data.PROVIDER_USERNAME,
+                        password=synthetic_data.PROVIDER_PASSWORD,
+                    )
+                    created["accounts"].append(account.id)
+                    log(f"Running xc_refresh ({xc_streams} streams)")
+                    with measure_phase("xc_refresh", counter, results) as phase:
+                        refresh_single_m3u_account(account.id)
+                account.refresh_from_db()
+                phase["status"] = account.status
+                phase["streams"] = Stream.objects.filter(m3u_account=account).count()
+
+            if epg_phases:
+                source = EPGSource.objects.create(
+                    name=f"Benchmark XMLTV {run_id}", source_type="xmltv", file_path=files["xmltv"]
+                )
+                created["sources"].append(source.id)
+                log("Running epg_channels")
+                with measure_phase("epg_channels", counter, results) as phase:
+                    parse_channels_only(source)
+                phase["epg_entries"] = EPGData.objects.filter(epg_source=source).count()
+
+                # Programme import and export only cover channels mapped to the guide.
+                profile, channel_ids = _map_benchmark_channels(
+                    source, epg_channels if mapped_channels is None else mapped_channels, run_id
+                )
+                created["profiles"].append(profile.id)
+                created["channels"].extend(channel_ids)
+
+                if "epg_programmes" in phases:
+                    log(f"Running epg_programmes ({len(channel_ids)} mapped channels, "
+                        f"{manifest.get('programmes', 0)} programmes in the guide)")
+                    with measure_phase("epg_programmes", counter, results) as phase:
+                        parse_programs_for_source(source)
+                    phase["programmes"] = ProgramData.objects.filter(epg__epg_source=source).count()
+
+                if "epg_index" in phases:
+                    log("Running epg_index")
+                    with measure_phase("epg_index", counter, results) as phase:
+                        build_programme_index(source.id)
+                    index = EPGSourceIndex.objects.filter(source=source).values_list("data", flat=True).first()
+                    phase["indexed_channels"] = len((index or {}).get("channels", {}))
+
+                if "epg_export" in phases:
+                    log("Running epg_export")
+                    with measure_phase("epg_export", counter, results) as phase:
+                        size, programmes = _consume_epg_export(profile.name)
+                    phase["bytes"] = size
+                    phase["programmes"] = programmes
+    finally:
+        _cleanup(created, log)
+        if data_dir is None:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    return {
+        "dispatcharr_version": __version__,
+        "database": _database_info(),
+        "dataset": {
+            key: manifest[key]
+            for key in ("generator_version", "seed", "streams", "xc_streams", "epg_channels", "days")
+        } | {"programmes": manifest.get("programmes", 0), "mapped_channels": len(created["channels"])},
+        "phases": results,
+    }
@@ -99,6 +99,11 @@ class ProxySettingsSerializer(serializers.Serializer):
     channel_init_grace_period = serializers.IntegerField(min_value=0, max_value=300)
     channel_client_wait_period = serializers.IntegerField(min_value=0, max_value=300, required=False, default=5)
     new_client_behind_seconds = serializers.IntegerField(min_value=0, max_value=120, required=False, default=5)
+    standby_channels = serializers.IntegerField(min_value=0, max_value=50, required=False, default=0)
+    standby_pinned_channels = serializers.CharField(required=False, allow_blank=True, default="")
+    stream_ordering = serializers.ChoiceField(
+        choices=["static", "adaptive"], required=False, default="static"
+    )
 
     def validate_buffering_timeout(self, value):
         if value < 0 or value > 300:
@@ -139,6 +144,19 @@ class ProxySettingsSerializer(serializers.Serializer):
             raise serializers.ValidationError("New client buffer must be between 0 and 120 seconds")
         return value
 
+    def validate_standby_pinned_channels(self, value):
+        for part in value.split(","):
+            part = part.strip()
+            if not part:
+                continue
+            try:
+                float(part)
+            except ValueError:
+                raise serializers.ValidationError(
+                    "Pinned standby channels must be a comma-separated list of channel numbers"
+                )
+        return value
+
 
 class SystemNotificationSerializer(serializers.ModelSerializer):
     """Serializer for system notifications."""
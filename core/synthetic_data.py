@@ -0,0 +1,363 @@
+"""
+Seeded synthetic provider data for refresh benchmarks.
+
+Generates catalogs shaped like real IPTV providers, so M3U and EPG refresh can
+be measured at production scale without a provider account:
+
+* an M3U playlist and the equivalent Xtream Codes live catalog
+  (categories + streams), 100k-1M entries;
+* an XMLTV guide for the same stations (10k channels x 14 days is a typical
+  large guide).
+
+Streams are variants of a smaller set of stations (country, genre, quality
+and backup feeds), most carry a ``tvg-id``, groups follow a
+``"<country> | <genre>"`` naming with long-tailed sizes, and programme
+lengths depend on the genre. Output depends only on the seed and the
+arguments, so two runs with the same parameters produce byte-identical
+files (the guide also depends on ``start``, which defaults to today).
+
+See ``core.refresh_benchmark`` and ``manage.py benchmark_refresh``.
+"""
+
+import json
+import os
+import random
+from datetime import datetime, time as dt_time, timezone
+from xml.sax.saxutils import escape, quoteattr
+
+GENERATOR_VERSION = 1
+
+PLAYLIST_FILENAME = "playlist.m3u"
+XC_CATALOG_FILENAME = "xc_catalog.json"
+XMLTV_FILENAME = "guide.xml"
+MANIFEST_FILENAME = "manifest.json"
+
+PROVIDER_URL = "http://provider.invalid:8080"
+PROVIDER_USERNAME = "bench"
+PROVIDER_PASSWORD = "bench"
+
+# (code, weight, accented letters used in some names)
+_COUNTRIES = (
+    ("US", 30, ""), ("UK", 14, ""), ("CA", 8, "é"), ("DE", 7, "äöüß"),
+    ("FR", 7, "éèà"), ("ES", 6, "ñá"), ("IT", 5, "àè"), ("NL", 4, ""),
+    ("BR", 4, "ãç"), ("IN", 4, ""), ("PT", 3, "ãç"), ("MX", 3, "ñ"),
+    ("AR", 2, "ñ"), ("PL", 2, "łż"), ("TR", 2, "şğ"),
+)
+
+# (genre, weight, brand stems, programme lengths in minutes)
+_GENRES = (
+    ("General", 20, ("One", "Prime", "Nation", "Metro", "Star"), (30, 30, 60, 60, 90)),
+    ("News", 12, ("News", "Headlines", "World", "Report", "24"), (30, 30, 60)),
+    ("Sports", 14, ("Sport", "Arena", "Goal", "Racing", "Fight"), (60, 120, 120, 180)),
+    ("Movies", 12, ("Cinema", "Movies", "Film", "Classics", "Premiere"), (90, 105, 120, 150)),
+    ("Entertainment", 10, ("Comedy", "Drama", "Reality", "Life", "Style"), (30, 60, 60)),
+    ("Kids", 6, ("Kids", "Cartoon", "Junior", "Toons", "Family"), (15, 15, 30, 30)),
+    ("Documentary", 6, ("Discovery", "History", "Nature", "Science", "Planet"), (30, 60, 60, 90)),
+    ("Music", 4, ("Hits", "Music", "Beats", "Country", "Rock"), (30, 60, 120)),
+    ("Local", 8, ("ABC", "CBS", "NBC", "FOX", "PBS"), (30, 30, 60)),
+    ("Religious", 2, ("Faith", "Word", "Hope", "Gospel", "Light"), (30, 60)),
+    ("PPV", 4, ("Event", "PPV", "Fight Night", "Main Card", "Live"), (120, 180, 240)),
+    ("24/7", 4, ("24/7", "Marathon", "Binge", "Classic TV", "Retro"), (30, 30, 60)),
+    ("Adult", 1, ("Night", "After Dark", "Late", "Velvet", "Private"), (60, 90)),
+)
+
+_CITIES = (
+    "New York", "Los Angeles", "Chicago", "Houston", "Phoenix", "Philadelphia",
+    "San Antonio", "San Diego", "Dallas", "Austin", "Seattle", "Denver",
+    "Boston", "Detroit", "Atlanta", "Miami", "Portland", "Las Vegas",
+)
+
+# (suffix, weight); most stations come in two or three qualities.
+_QUALITIES = (("HD", 40), ("FHD", 20), ("SD", 15), ("4K", 5), ("HEVC", 5), ("", 15))
+
+_WORDS = (
+    "the", "a", "of", "and", "in", "new", "life", "world", "night", "city",
+    "story", "secret", "last", "first", "home", "road", "game", "house",
+    "family", "friends", "wild", "war", "love", "time", "river", "north",
+    "inside", "final", "season", "live", "special", "island", "kitchen",
+    "mystery", "legend", "power", "street", "detective", "summer", "winter",
+)
+
+_M3U_HEADER = '#EXTM3U x-tvg-url="" url-tvg=""\n'
+
+
+def _weighted(choices):
+    values = tuple(c[0] for c in choices)
+    weights = tuple(c[1] for c in choices)
+    return values, weights
+
+
+_COUNTRY_CODES, _COUNTRY_WEIGHTS = _weighted(_COUNTRIES)
+_COUNTRY_ACCENTS = {code: accents for code, _, accents in _COUNTRIES}
+_GENRE_NAMES, _GENRE_WEIGHTS = _weighted(_GENRES)
+_GENRE_BRANDS = {genre: brands for genre, _, brands, _ in _GENRES}
+_GENRE_LENGTHS = {genre: lengths for genre, _, _, lengths in _GENRES}
+_QUALITY_NAMES, _QUALITY_WEIGHTS = _weighted(_QUALITIES)
+
+
+def iter_stations(count, seed=0):
+    """Yield ``count`` station dicts; the first ``k`` do not depend on ``count``."""
+    rng = random.Random(f"stations:{seed}")
+    for number in range(1, count + 1):
+        country = rng.choices(_COUNTRY_CODES, _COUNTRY_WEIGHTS)[0]
+        genre = rng.choices(_GENRE_NAMES, _GENRE_WEIGHTS)[0]
+        brand = rng.choice(_GENRE_BRANDS[genre])
+        accents = _COUNTRY_ACCENTS[country]
+        if accents and rng.random() < 0.15:
+            brand = f"{brand} {rng.choice(accents).upper()}{rng.choice(_WORDS)}"
+        name = f"{brand} {number}"
+        if genre == "Local" and country == "US":
+            group = f"US | Locals - {rng.choice(_CITIES)}"
+        elif genre == "Local":
+            group = f"{country} | Regional"
+        else:
+            group = f"{country} | {genre}"
+        slug = "".join(ch for ch in brand.lower() if ch.isascii() and ch.isalnum())
+        yield {
+            "number": number,
+            "name": name,
+            "country": country,
+            "genre": genre,
+            "group": group,
+            "tvg_id": f"{slug}{number}.{country.lower()}",
+            "logo": f"https://logos.invalid/{country.lower()}/{slug}{number}.png" if rng.random() < 0.9 else "",
+            "is_adult": genre == "Adult",
+        }
+
+
+def iter_catalog(count, seed=0):
+    """
+    Yield ``count`` stream entries for a provider catalog.
+
+    About a third as many stations as streams; each stream is one quality or
+    backup variant of a station. 85% carry the station's ``tvg-id``.
+    """
+    stations = list(iter_stations(max(1, count // 3), seed))
+    rng = random.Random(f"catalog:{seed}")
+    added = int(datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp())
+    for stream_id in range(1, count + 1):
+        # Popular stations get more variants: triangular bias toward low numbers.
+        station = stations[int(rng.triangular(0, len(stations), 0)) % len(stations)]
+        quality = rng.choices(_QUALITY_NAMES, _QUALITY_WEIGHTS)[0]
+        name = f"{station['country']}: {station['name']}"
+        if quality:
+            name = f"{name} {quality}"
+        if rng.random() < 0.05:
+            name = f"{name} (Backup {rng.randint(1, 3)})"
+        if rng.random() < 0.03:
+            name = f"{name} ᴿᴬᵂ"
+        yield {
+            "stream_id": stream_id,
+            "name": name,
+            "tvg_id": station["tvg_id"] if rng.random() < 0.85 else "",
+            "tvg_name": name,
+            "logo": station["logo"],
+            "group": station["group"],
+            "chno": str(rng.randint(1, 9999)) if rng.random() < 0.3 else "",
+            "is_adult": station["is_adult"],
+            "added": str(added + rng.randint(0, 60 * 60 * 24 * 600)),
+        }
+
+
+def write_m3u(path, count, seed=0):
+    """Write an extended M3U playlist of ``count`` streams; returns the entry count."""
+    written = 0
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        f.write(_M3U_HEADER)
+        lines = []
+        for entry in iter_catalog(count, seed):
+            attributes = [
+                f'tvg-id="{entry["tvg_id"]}"',
+                f'tvg-name="{entry["tvg_name"]}"',
+                f'tvg-logo="{entry["logo"]}"',
+            ]
+            if entry["chno"]:
+                attributes.append(f'tvg-chno="{entry["chno"]}"')
+            attributes.append(f'group-title="{entry["group"]}"')
+            lines.append(f'#EXTINF:-1 {" ".join(attributes)},{entry["name"]}\n')
+            lines.append(
+                f"{PROVIDER_URL}/live/{PROVIDER_USERNAME}/{PROVIDER_PASSWORD}/{entry['stream_id']}.ts\n"
+            )
+            written += 1
+            if len(lines) >= 20000:
+                f.write("".join(lines))
+                lines = []
+        f.write("".join(lines))
+    return written
+
+
+def xc_catalog(count, seed=0):
+    """The same catalog as ``write_m3u`` as Xtream Codes ``get_live_categories`` / ``get_live_streams`` payloads."""
+    categories = {}
+    streams = []
+    for entry in iter_catalog(count, seed):
+        category_id = categories.setdefault(entry["group"], str(len(categories) + 1))
+        streams.append({
+            "num": entry["stream_id"],
+            "name": entry["name"],
+            "stream_type": "live",
+            "stream_id": entry["stream_id"],
+            "stream_icon": entry["logo"],
+            "epg_channel_id": entry["tvg_id"] or None,
+            "added": entry["added"],
+            "is_adult": int(entry["is_adult"]),
+            "category_id": category_id,
+            "category_ids": [int(category_id)],
+            "custom_sid": "",
+            "tv_archive": 0,
+            "direct_source": "",
+            "tv_archive_duration": 0,
+        })
+    return {
+        "categories": [
+            {"category_id": category_id, "category_name": name, "parent_id": 0}
+            for name, category_id in categories.items()
+        ],
+        "streams": streams,
+    }
+
+
+def write_xc_catalog(path, count, seed=0):
+    """Write ``xc_catalog`` as JSON; returns the stream count."""
+    catalog = xc_catalog(count, seed)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(catalog, f, ensure_ascii=False, separators=(",", ":"))
+    return len(catalog["streams"])
+
+
+class _TextPool:
+    """Seeded titles and word runs to draw programme text from cheaply."""
+
+    def __init__(self, seed):
+        rng = random.Random(f"text:{seed}")
+        words = [rng.choice(_WORDS) for _ in range(20000)]
+        self.text = " ".join(words)
+        self.word_starts = [0]
+        for word in words[:-1]:
+            self.word_starts.append(self.word_starts[-1] + len(word) + 1)
+        self.titles = [
+            escape(" ".join(rng.choice(_WORDS) for _ in range(rng.randint(1, 4))).title())
+            for _ in range(3000)
+        ]
+
+    def sentence(self, rng, low, high):
+        first = rng.randrange(len(self.word_starts) - high - 1)
+        last = first + rng.randint(low, high)
+        return escape(self.text[self.word_starts[first]:self.word_starts[last] - 1].capitalize())
+
+
+def _xmltv_time(minutes):
+    return datetime.fromtimestamp(minutes * 60, timezone.utc).strftime("%Y%m%d%H%M%S +0000")
+
+
+def _programme_xml(rng, text, genre, channel_attr, start, stop):
+    parts = [
+        f'  <programme start="{start}" stop="{stop}" channel={channel_attr}>\n',
+        f'    <title lang="en">{rng.choice(text.titles)}</title>\n',
+    ]
+    if rng.random() < 0.4:
+        parts.append(f'    <sub-title lang="en">{text.sentence(rng, 2, 6)}</sub-title>\n')
+    parts.append(f'    <desc lang="en">{text.sentence(rng, 12, 60)}.</desc>\n')
+    parts.append(f"    <category>{escape(genre)}</category>\n")
+    if genre in ("General", "Entertainment", "Kids", "Documentary", "24/7") and rng.random() < 0.6:
+        season, episode = rng.randint(0, 14), rng.randint(0, 24)
+        parts.append(f'    <episode-num system="xmltv_ns">{season}.{episode}.</episode-num>\n')
+    if rng.random() < 0.25:
+        parts.append(f'    <icon src="https://images.invalid/{rng.getrandbits(48):012x}.jpg" />\n')
+    if genre in ("News", "Sports") and rng.random() < 0.5:
+        parts.append("    <live />\n")
+    elif rng.random() < 0.2:
+        parts.append("    <new />\n")
+    parts.append("  </programme>\n")
+    return "".join(parts)
+
+
+def default_guide_start():
+    """Midnight UTC today, so generated guides overlap the export window."""
+    return datetime.combine(datetime.now(timezone.utc).date(), dt_time(0), tzinfo=timezone.utc)
+
+
+def write_xmltv(path, channels, days=14, seed=0, start=None):
+    """
+    Write an XMLTV guide for the first ``channels`` stations, ``days`` days from ``start``.
+
+    Programmes are grouped by channel, as most providers emit them. Returns
+    the number of programmes written.
+    """
+    start = start or default_guide_start()
+    start_minute = int(start.timestamp()) // 60
+    end_minute = start_minute + days * 24 * 60
+    stations = list(iter_stations(channels, seed))
+    text = _TextPool(seed)
+    programmes = 0
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        f.write('<tv generator-info-name="Dispatcharr synthetic data">\n')
+        for station in stations:
+            f.write(f'  <channel id={quoteattr(station["tvg_id"])}>\n')
+            f.write(f'    <display-name>{escape(station["name"])}</display-name>\n')
+            if station["logo"]:
+                f.write(f'    <icon src={quoteattr(station["logo"])} />\n')
+            f.write("  </channel>\n")
+        for station in stations:
+            rng = random.Random(f"guide:{seed}:{station['tvg_id']}")
+            lengths = _GENRE_LENGTHS[station["genre"]]
+            channel_attr = quoteattr(station["tvg_id"])
+            # Stagger the first programme so channels do not all change on the hour.
+            at = start_minute - rng.choice((0, 15, 30, 45))
+            at_text = _xmltv_time(at)
+            chunk = []
+            while at < end_minute:
+                stop = at + rng.choice(lengths)
+                stop_text = _xmltv_time(stop)
+                chunk.append(_programme_xml(rng, text, station["genre"], channel_attr, at_text, stop_text))
+                at, at_text = stop, stop_text
+            programmes += len(chunk)
+            f.write("".join(chunk))
+        f.write("</tv>\n")
+    return programmes
+
+
+def generate_dataset(directory, streams, xc_streams, epg_channels, days=14, seed=0, start=None):
+    """
+    Write the playlist, XC catalog and guide into ``directory`` with a manifest.
+
+    ``xc_streams`` or ``epg_channels`` of 0 skips that file. The manifest
+    records the parameters and counts, and ``load_manifest`` uses it to reuse
+    an existing dataset.
+    """
+    os.makedirs(directory, exist_ok=True)
+    start = start or default_guide_start()
+    manifest = {
+        "generator_version": GENERATOR_VERSION,
+        "seed": seed,
+        "streams": streams,
+        "xc_streams": xc_streams,
+        "epg_channels": epg_channels,
+        "days": days,
+        "guide_start": start.isoformat(),
+        "files": {},
+    }
+    if streams:
+        write_m3u(os.path.join(directory, PLAYLIST_FILENAME), streams, seed)
+        manifest["files"]["playlist"] = PLAYLIST_FILENAME
+    if xc_streams:
+        write_xc_catalog(os.path.join(directory, XC_CATALOG_FILENAME), xc_streams, seed)
+        manifest["files"]["xc_catalog"] = XC_CATALOG_FILENAME
+    if epg_channels:
+        manifest["programmes"] = write_xmltv(
+            os.path.join(directory, XMLTV_FILENAME), epg_channels, days, seed, start
+        )
+        manifest["files"]["xmltv"] = XMLTV_FILENAME
+    with open(os.path.join(directory, MANIFEST_FILENAME), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def load_manifest(directory):
+    """The manifest of a dataset written by ``generate_dataset``, or None."""
+    try:
+        with open(os.path.join(directory, MANIFEST_FILENAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
@@ -26,6 +26,12 @@ STARTUP_SKIP_AGE = 30
 REDIS_PREFIX = "processed_file:"
 REDIS_TTL = 60 * 60 * 24 * 3  # expire keys after 3 days (optional)
 SUPPORTED_LOGO_FORMATS = ['.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp', '.svg']
+EPG_WATCH_EXTENSIONS = ('.xml', '.gz', '.zip', '.xz')
+# Watch-folder watcher (core/file_watcher.py): while its heartbeat key is live,
+# the beat scan only runs as a reconciliation pass every WATCH_RECONCILE_INTERVAL.
+WATCHER_HEARTBEAT_KEY = "file_watcher:heartbeat"
+WATCH_RECONCILE_KEY = "file_watcher:last_reconcile"
+WATCH_RECONCILE_INTERVAL = 15 * 60
 
 # Store the last known value to compare with new data
 last_known_data = {}
@@ -52,67 +58,128 @@ def beat_periodic_task():
     fetch_channel_stats()
     scan_and_process_files()
 
-@shared_task
-def scan_and_process_files():
-    global _first_scan_completed
-    redis_client = RedisClient.get_client()
-    now = time.time()
+def _skip_log(message):
+    """Trace after the first scan so periodic reconciliation stays quiet."""
+    if _first_scan_completed:
+        logger.trace(message)
+    else:
+        logger.debug(message)
 
-    # Check if directories exist
-    dirs_exist = all(os.path.exists(d) for d in [M3U_WATCH_DIR, EPG_WATCH_DIR, LOGO_WATCH_DIR])
-    if not dirs_exist:
-        throttled_log(logger.warning, f"Watch directories missing: M3U ({os.path.exists(M3U_WATCH_DIR)}), EPG ({os.path.exists(EPG_WATCH_DIR)}), LOGO ({os.path.exists(LOGO_WATCH_DIR)})", "watch_dirs_missing")
 
-    # Process M3U files
-    m3u_files = [f for f in os.listdir(M3U_WATCH_DIR)
-                if os.path.isfile(os.path.join(M3U_WATCH_DIR, f)) and
-                (f.endswith('.m3u') or f.endswith('.m3u8'))]
+def _process_m3u_file(redis_client, filepath, now, *, settled=False):
+    """Create/refresh the M3U account for one watched file.
 
-    m3u_processed = 0
-    m3u_skipped = 0
+    Returns ``"processed"``, ``"skipped"`` or ``"error"``. ``settled`` means the
+    writer already closed the file (inotify close-write/move), so the
+    still-being-written age check is not needed.
+    """
+    filename = os.path.basename(filepath)
+    mtime = os.path.getmtime(filepath)
+    age = now - mtime
+    redis_key = REDIS_PREFIX + filepath
+    stored_mtime = redis_client.get(redis_key)
+
+    # Instead of assuming old files were processed, check if they exist in the database
+    if not stored_mtime and age > STARTUP_SKIP_AGE:
+        # Check if this file is already in the database
+        existing_m3u = M3UAccount.objects.filter(file_path=filepath).exists()
+        if existing_m3u:
+            _skip_log(f"Skipping {filename}: Already exists in database")
+            redis_client.set(redis_key, mtime, ex=REDIS_TTL)
+            return "skipped"
+        else:
+            logger.debug(f"Processing {filename} despite age: Not found in database")
+            # Continue processing this file even though it's old
 
-    for filename in m3u_files:
-        filepath = os.path.join(M3U_WATCH_DIR, filename)
-        mtime = os.path.getmtime(filepath)
-        age = now - mtime
-        redis_key = REDIS_PREFIX + filepath
-        stored_mtime = redis_client.get(redis_key)
-
-        # Instead of assuming old files were processed, check if they exist in the database
-        if not stored_mtime and age > STARTUP_SKIP_AGE:
-            # Check if this file is already in the database
-            existing_m3u = M3UAccount.objects.filter(file_path=filepath).exists()
-            if existing_m3u:
-                # Use trace level if not first scan
-                if _first_scan_completed:
-                    logger.trace(f"Skipping {filename}: Already exists in database")
-                else:
-                    logger.debug(f"Skipping {filename}: Already exists in database")
-                redis_client.set(redis_key, mtime, ex=REDIS_TTL)
-                m3u_skipped += 1
-                continue
-            else:
-                logger.debug(f"Processing {filename} despite age: Not found in database")
-                # Continue processing this file even though it's old
+    # File too new — probably still being written
+    if not settled and age < MIN_AGE_SECONDS:
+        logger.debug(f"Skipping {filename}: Too new (age={age}s)")
+        return "skipped"
 
-        # File too new — probably still being written
-        if age < MIN_AGE_SECONDS:
-            logger.debug(f"Skipping {filename}: Too new (age={age}s)")
-            m3u_skipped += 1
-            continue
+    # Skip if we've already processed this mtime
+    if stored_mtime and float(stored_mtime) >= mtime:
+        _skip_log(f"Skipping {filename}: Already processed this version")
+        return "skipped"
 
-        # Skip if we've already processed this mtime
-        if stored_mtime and float(stored_mtime) >= mtime:
-            # Use trace level if not first scan
-            if _first_scan_completed:
-                logger.trace(f"Skipping {filename}: Already processed this version")
-            else:
-                logger.debug(f"Skipping {filename}: Already processed this version")
-            m3u_skipped += 1
-            continue
+    m3u_account, created = M3UAccount.objects.get_or_create(file_path=filepath, defaults={
+        "name": filename,
+        "is_active": CoreSettings.get_auto_import_mapped_files() in [True, "true", "True"],
+    })
 
-        m3u_account, created = M3UAccount.objects.get_or_create(file_path=filepath, defaults={
+    redis_client.set(redis_key, mtime, ex=REDIS_TTL)
+
+    # More descriptive creation logging that includes active status
+    if created:
+        if m3u_account.is_active:
+            logger.info(f"Created new M3U account '{filename}' (active)")
+        else:
+            logger.info(f"Created new M3U account '{filename}' (inactive due to auto-import setting)")
+
+    if not m3u_account.is_active:
+        _skip_log(f"Skipping {filename}: M3U account is inactive")
+        return "skipped"
+
+    # Log update for existing files (we've already logged creation above)
+    if not created:
+        logger.info(f"Detected update to existing M3U file: {filename}")
+
+    logger.info(f"Queueing refresh for M3U file: {filename}")
+    refresh_single_m3u_account.delay(m3u_account.id)
+
+    channel_layer = get_channel_layer()
+    async_to_sync(channel_layer.group_send)(
+        "updates",
+        {
+            "type": "update",
+            "data": {"success": True, "type": "m3u_file", "filename": filename}
+        },
+    )
+    return "processed"
+
+
+def _process_epg_file(redis_client, filepath, now, *, settled=False):
+    """Create/refresh the EPG source for one watched file (see ``_process_m3u_file``)."""
+    filename = os.path.basename(filepath)
+
+    if not os.path.isfile(filepath):
+        _skip_log(f"Skipping {filename}: Not a file")
+        return "skipped"
+
+    if not filename.endswith(EPG_WATCH_EXTENSIONS):
+        _skip_log(f"Skipping {filename}: Not an XML, GZ, ZIP, or XZ file")
+        return "skipped"
+
+    mtime = os.path.getmtime(filepath)
+    age = now - mtime
+    redis_key = REDIS_PREFIX + filepath
+    stored_mtime = redis_client.get(redis_key)
+
+    # Instead of assuming old files were processed, check if they exist in the database
+    if not stored_mtime and age > STARTUP_SKIP_AGE:
+        # Check if this file is already in the database
+        existing_epg = EPGSource.objects.filter(file_path=filepath).exists()
+        if existing_epg:
+            _skip_log(f"Skipping {filename}: Already exists in database")
+            redis_client.set(redis_key, mtime, ex=REDIS_TTL)
+            return "skipped"
+        else:
+            logger.debug(f"Processing {filename} despite age: Not found in database")
+            # Continue processing this file even though it's old
+
+    # File too new — probably still being written
+    if not settled and age < MIN_AGE_SECONDS:
+        _skip_log(f"Skipping {filename}: Too new, possibly still being written (age={age}s)")
+        return "skipped"
+
+    # Skip if we've already processed this mtime
+    if stored_mtime and float(stored_mtime) >= mtime:
+        _skip_log(f"Skipping {filename}: Already processed this version")
+        return "skipped"
+
+    try:
+        epg_source, created = EPGSource.objects.get_or_create(file_path=filepath, defaults={
             "name": filename,
+            "source_type": "xmltv",
             "is_active": CoreSettings.get_auto_import_mapped_files() in [True, "true", "True"],
         })
 
@@ -120,36 +187,196 @@ def scan_and_process_files():
 
         # More descriptive creation logging that includes active status
         if created:
-            if m3u_account.is_active:
-                logger.info(f"Created new M3U account '{filename}' (active)")
+            if epg_source.is_active:
+                logger.info(f"Created new EPG source '{filename}' (active)")
             else:
-                logger.info(f"Created new M3U account '{filename}' (inactive due to auto-import setting)")
+                logger.info(f"Created new EPG source '{filename}' (inactive due to auto-import setting)")
 
-        if not m3u_account.is_active:
-            # Use trace level if not first scan
-            if _first_scan_completed:
-                logger.trace(f"Skipping {filename}: M3U account is inactive")
-            else:
-                logger.debug(f"Skipping {filename}: M3U account is inactive")
-            m3u_skipped += 1
-            continue
+        if not epg_source.is_active:
+            _skip_log(f"Skipping {filename}: EPG source is marked as inactive")
+            return "skipped"
 
         # Log update for existing files (we've already logged creation above)
         if not created:
-            logger.info(f"Detected update to existing M3U file: {filename}")
+            logger.info(f"Detected update to existing EPG file: {filename}")
+
+        logger.info(f"Queueing refresh for EPG file: {filename}")
+        refresh_epg_data.delay(epg_source.id)  # Trigger Celery task
+        return "processed"
+
+    except Exception as e:
+        logger.error(f"Error processing EPG file {filename}: {str(e)}", exc_info=True)
+        return "error"
+
+
+def _process_logo_file(redis_client, filepath, now, *, settled=False):
+    """Create the Logo row for one watched image (see ``_process_m3u_file``)."""
+    filename = os.path.basename(filepath)
+
+    if not os.path.isfile(filepath):
+        _skip_log(f"Skipping {filename}: Not a file")
+        return "skipped"
+
+    # Check if file has supported logo extension
+    file_ext = os.path.splitext(filename)[1].lower()
+    if file_ext not in SUPPORTED_LOGO_FORMATS:
+        _skip_log(f"Skipping {filename}: Not a supported logo format")
+        return "skipped"
+
+    mtime = os.path.getmtime(filepath)
+    age = now - mtime
+    redis_key = REDIS_PREFIX + filepath
+    stored_mtime = redis_client.get(redis_key)
+
+    # Check if logo already exists in database
+    if not stored_mtime and age > STARTUP_SKIP_AGE:
+        from apps.channels.models import Logo
+        existing_logo = Logo.objects.filter(url=filepath).exists()
+        if existing_logo:
+            _skip_log(f"Skipping {filename}: Already exists in database")
+            redis_client.set(redis_key, mtime, ex=REDIS_TTL)
+            return "skipped"
+        else:
+            logger.debug(f"Processing {filename} despite age: Not found in database")
+
+    # File too new — probably still being written
+    if not settled and age < MIN_AGE_SECONDS:
+        _skip_log(f"Skipping {filename}: Too new, possibly still being written (age={age}s)")
+        return "skipped"
+
+    # Skip if we've already processed this mtime
+    if stored_mtime and float(stored_mtime) >= mtime:
+        _skip_log(f"Skipping {filename}: Already processed this version")
+        return "skipped"
+
+    try:
+        from apps.channels.models import Logo
+
+        # Create logo entry with just the filename (without extension) as name
+        logo_name = os.path.splitext(filename)[0]
+
+        logo, created = Logo.objects.get_or_create(
+            url=filepath,
+            defaults={
+                "name": logo_name,
+            }
+        )
+
+        redis_client.set(redis_key, mtime, ex=REDIS_TTL)
+
+        if created:
+            logger.info(f"Created new logo entry: {logo_name}")
+        else:
+            logger.debug(f"Logo entry already exists: {logo_name}")
+
+        return "processed"
+
+    except Exception as e:
+        logger.error(f"Error processing logo file {filename}: {str(e)}", exc_info=True)
+        return "error"
 
-        logger.info(f"Queueing refresh for M3U file: {filename}")
-        refresh_single_m3u_account.delay(m3u_account.id)
-        m3u_processed += 1
 
-        channel_layer = get_channel_layer()
-        async_to_sync(channel_layer.group_send)(
+def _send_logo_summary(processed, skipped, errors, total_files):
+    """Send summary websocket update for logo processing."""
+    if processed > 0 or errors > 0:
+        send_websocket_update(
             "updates",
+            "update",
             {
-                "type": "update",
-                "data": {"success": True, "type": "m3u_file", "filename": filename}
-            },
+                "success": True,
+                "type": "logo_processing_summary",
+                "processed": processed,
+                "skipped": skipped,
+                "errors": errors,
+                "total_files": total_files,
+                "message": f"Logo processing complete: {processed} processed, {skipped} skipped, {errors} errors"
+            }
+        )
+
+
+_WATCH_PROCESSORS = {
+    "m3u": _process_m3u_file,
+    "epg": _process_epg_file,
+    "logo": _process_logo_file,
+}
+
+
+def process_watched_files(kind, filepaths, *, settled=True):
+    """Ingest files reported by the watch-folder watcher.
+
+    Runs the same per-file processing as the periodic scan. Missing files
+    (deleted or renamed again before the event was handled) are ignored.
+    """
+    processor = _WATCH_PROCESSORS[kind]
+    redis_client = RedisClient.get_client()
+    now = time.time()
+    counts = {"processed": 0, "skipped": 0, "error": 0}
+    for filepath in filepaths:
+        if kind == "m3u" and not filepath.endswith(('.m3u', '.m3u8')):
+            continue
+        try:
+            result = processor(redis_client, filepath, now, settled=settled)
+        except FileNotFoundError:
+            continue
+        except Exception as e:
+            logger.error(f"Error processing watched file {filepath}: {str(e)}", exc_info=True)
+            result = "error"
+        counts[result] += 1
+    if kind == "logo":
+        _send_logo_summary(
+            counts["processed"], counts["skipped"], counts["error"], len(filepaths),
         )
+    return counts
+
+
+def _watcher_covers_scan(redis_client):
+    """True when a live watcher makes this beat run redundant.
+
+    The watch-folder watcher heartbeats a Redis key; while it is alive the
+    full scan only runs every ``WATCH_RECONCILE_INTERVAL`` seconds as a safety
+    net for missed events (e.g. files changed on a network mount).
+    """
+    if not _first_scan_completed:
+        return False
+    try:
+        if not redis_client.exists(WATCHER_HEARTBEAT_KEY):
+            return False
+        # NX claim: the first beat after the interval runs the reconciliation.
+        return not redis_client.set(
+            WATCH_RECONCILE_KEY, str(time.time()), nx=True, ex=WATCH_RECONCILE_INTERVAL,
+        )
+    except Exception:
+        return False
+
+
+@shared_task
+def scan_and_process_files():
+    global _first_scan_completed
+    redis_client = RedisClient.get_client()
+    now = time.time()
+
+    if _watcher_covers_scan(redis_client):
+        return
+
+    # Check if directories exist
+    dirs_exist = all(os.path.exists(d) for d in [M3U_WATCH_DIR, EPG_WATCH_DIR, LOGO_WATCH_DIR])
+    if not dirs_exist:
+        throttled_log(logger.warning, f"Watch directories missing: M3U ({os.path.exists(M3U_WATCH_DIR)}), EPG ({os.path.exists(EPG_WATCH_DIR)}), LOGO ({os.path.exists(LOGO_WATCH_DIR)})", "watch_dirs_missing")
+
+    # Process M3U files
+    m3u_files = [f for f in os.listdir(M3U_WATCH_DIR)
+                if os.path.isfile(os.path.join(M3U_WATCH_DIR, f)) and
+                (f.endswith('.m3u') or f.endswith('.m3u8'))]
+
+    m3u_processed = 0
+    m3u_skipped = 0
+
+    for filename in m3u_files:
+        result = _process_m3u_file(redis_client, os.path.join(M3U_WATCH_DIR, filename), now)
+        if result == "processed":
+            m3u_processed += 1
+        else:
+            m3u_skipped += 1
 
     logger.trace(f"M3U processing complete: {m3u_processed} processed, {m3u_skipped} skipped, {len(m3u_files)} total")
 
@@ -166,105 +393,13 @@ def scan_and_process_files():
     epg_errors = 0
 
     for filename in epg_files:
-        filepath = os.path.join(EPG_WATCH_DIR, filename)
-
-        if not os.path.isfile(filepath):
-            # Use trace level if not first scan
-            if _first_scan_completed:
-                logger.trace(f"Skipping {filename}: Not a file")
-            else:
-                logger.debug(f"Skipping {filename}: Not a file")
-            epg_skipped += 1
-            continue
-
-        if not filename.endswith(('.xml', '.gz', '.zip', '.xz')):
-            # Use trace level if not first scan
-            if _first_scan_completed:
-                logger.trace(f"Skipping {filename}: Not an XML, GZ, ZIP, or XZ file")
-            else:
-                logger.debug(f"Skipping {filename}: Not an XML, GZ, ZIP, or XZ file")
-            epg_skipped += 1
-            continue
-
-        mtime = os.path.getmtime(filepath)
-        age = now - mtime
-        redis_key = REDIS_PREFIX + filepath
-        stored_mtime = redis_client.get(redis_key)
-
-        # Instead of assuming old files were processed, check if they exist in the database
-        if not stored_mtime and age > STARTUP_SKIP_AGE:
-            # Check if this file is already in the database
-            existing_epg = EPGSource.objects.filter(file_path=filepath).exists()
-            if existing_epg:
-                # Use trace level if not first scan
-                if _first_scan_completed:
-                    logger.trace(f"Skipping {filename}: Already exists in database")
-                else:
-                    logger.debug(f"Skipping {filename}: Already exists in database")
-                redis_client.set(redis_key, mtime, ex=REDIS_TTL)
-                epg_skipped += 1
-                continue
-            else:
-                logger.debug(f"Processing {filename} despite age: Not found in database")
-                # Continue processing this file even though it's old
-
-        # File too new — probably still being written
-        if age < MIN_AGE_SECONDS:
-            # Use trace level if not first scan
-            if _first_scan_completed:
-                logger.trace(f"Skipping {filename}: Too new, possibly still being written (age={age}s)")
-            else:
-                logger.debug(f"Skipping {filename}: Too new, possibly still being written (age={age}s)")
-            epg_skipped += 1
-            continue
-
-        # Skip if we've already processed this mtime
-        if stored_mtime and float(stored_mtime) >= mtime:
-            # Use trace level if not first scan
-            if _first_scan_completed:
-                logger.trace(f"Skipping {filename}: Already processed this version")
-            else:
-                logger.debug(f"Skipping {filename}: Already processed this version")
-            epg_skipped += 1
-            continue
-
-        try:
-            epg_source, created = EPGSource.objects.get_or_create(file_path=filepath, defaults={
-                "name": filename,
-                "source_type": "xmltv",
-                "is_active": CoreSettings.get_auto_import_mapped_files() in [True, "true", "True"],
-            })
-
-            redis_client.set(redis_key, mtime, ex=REDIS_TTL)
-
-            # More descriptive creation logging that includes active status
-            if created:
-                if epg_source.is_active:
-                    logger.info(f"Created new EPG source '{filename}' (active)")
-                else:
-                    logger.info(f"Created new EPG source '{filename}' (inactive due to auto-import setting)")
-
-            if not epg_source.is_active:
-                # Use trace level if not first scan
-                if _first_scan_completed:
-                    logger.trace(f"Skipping {filename}: EPG source is marked as inactive")
-                else:
-                    logger.debug(f"Skipping {filename}: EPG source is marked as inactive")
-                epg_skipped += 1
-                continue
-
-            # Log update for existing files (we've already logged creation above)
-            if not created:
-                logger.info(f"Detected update to existing EPG file: {filename}")
-
-            logger.info(f"Queueing refresh for EPG file: {filename}")
-            refresh_epg_data.delay(epg_source.id)  # Trigger Celery task
+        result = _process_epg_file(redis_client, os.path.join(EPG_WATCH_DIR, filename), now)
+        if result == "processed":
             epg_processed += 1
-
-        except Exception as e:
-            logger.error(f"Error processing EPG file {filename}: {str(e)}", exc_info=True)
+        elif result == "error":
             epg_errors += 1
-            continue
+        else:
+            epg_skipped += 1
 
     logger.trace(f"EPG processing complete: {epg_processed} processed, {epg_skipped} skipped, {epg_errors} errors")
 
@@ -285,108 +420,17 @@ def scan_and_process_files():
     logo_errors = 0
 
     for filepath in logo_files:
-        filename = os.path.basename(filepath)
-
-        if not os.path.isfile(filepath):
-            if _first_scan_completed:
-                logger.trace(f"Skipping {filename}: Not a file")
-            else:
-                logger.debug(f"Skipping {filename}: Not a file")
-            logo_skipped += 1
-            continue
-
-        # Check if file has supported logo extension
-        file_ext = os.path.splitext(filename)[1].lower()
-        if file_ext not in SUPPORTED_LOGO_FORMATS:
-            if _first_scan_completed:
-                logger.trace(f"Skipping {filename}: Not a supported logo format")
-            else:
-                logger.debug(f"Skipping {filename}: Not a supported logo format")
-            logo_skipped += 1
-            continue
-
-        mtime = os.path.getmtime(filepath)
-        age = now - mtime
-        redis_key = REDIS_PREFIX + filepath
-        stored_mtime = redis_client.get(redis_key)
-
-        # Check if logo already exists in database
-        if not stored_mtime and age > STARTUP_SKIP_AGE:
-            from apps.channels.models import Logo
-            existing_logo = Logo.objects.filter(url=filepath).exists()
-            if existing_logo:
-                if _first_scan_completed:
-                    logger.trace(f"Skipping {filename}: Already exists in database")
-                else:
-                    logger.debug(f"Skipping {filename}: Already exists in database")
-                redis_client.set(redis_key, mtime, ex=REDIS_TTL)
-                logo_skipped += 1
-                continue
-            else:
-                logger.debug(f"Processing {filename} despite age: Not found in database")
-
-        # File too new — probably still being written
-        if age < MIN_AGE_SECONDS:
-            if _first_scan_completed:
-                logger.trace(f"Skipping {filename}: Too new, possibly still being written (age={age}s)")
-            else:
-                logger.debug(f"Skipping {filename}: Too new, possibly still being written (age={age}s)")
-            logo_skipped += 1
-            continue
-
-        # Skip if we've already processed this mtime
-        if stored_mtime and float(stored_mtime) >= mtime:
-            if _first_scan_completed:
-                logger.trace(f"Skipping {filename}: Already processed this version")
-            else:
-                logger.debug(f"Skipping {filename}: Already processed this version")
-            logo_skipped += 1
-            continue
-
-        try:
-            from apps.channels.models import Logo
-
-            # Create logo entry with just the filename (without extension) as name
-            logo_name = os.path.splitext(filename)[0]
-
-            logo, created = Logo.objects.get_or_create(
-                url=filepath,
-                defaults={
-                    "name": logo_name,
-                }
-            )
-
-            redis_client.set(redis_key, mtime, ex=REDIS_TTL)
-
-            if created:
-                logger.info(f"Created new logo entry: {logo_name}")
-            else:
-                logger.debug(f"Logo entry already exists: {logo_name}")
-
+        result = _process_logo_file(redis_client, filepath, now)
+        if result == "processed":
             logo_processed += 1
-
-        except Exception as e:
-            logger.error(f"Error processing logo file {filename}: {str(e)}", exc_info=True)
+        elif result == "error":
             logo_errors += 1
-            continue
+        else:
+            logo_skipped += 1
 
     logger.trace(f"LOGO processing complete: {logo_processed} processed, {logo_skipped} skipped, {logo_errors} errors")
 
-    # Send summary websocket update for logo processing
-    if logo_processed > 0 or logo_errors > 0:
-        send_websocket_update(
-            "updates",
-            "update",
-            {
-                "success": True,
-                "type": "logo_processing_summary",
-                "processed": logo_processed,
-                "skipped": logo_skipped,
-                "errors": logo_errors,
-                "total_files": len(logo_files),
-                "message": f"Logo processing complete: {logo_processed} processed, {logo_skipped} skipped, {logo_errors} errors"
-            }
-        )
+    _send_logo_summary(logo_processed, logo_skipped, logo_errors, len(logo_files))
 
     # Rebuild EPG programme indices on first run if missing (e.g. after migration or container restart)
     if not _first_scan_completed:
@@ -0,0 +1,67 @@
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from django.http import FileResponse
+from django.test import RequestFactory, SimpleTestCase
+
+from core import file_serving
+from core.file_serving import parse_range_header, serve_file
+
+BODY = bytes(range(256)) * 16
+
+
+class ParseRangeHeaderTests(SimpleTestCase):
+    def test_ranges(self):
+        self.assertEqual(parse_range_header("bytes=0-99", 1000), (0, 99))
+        self.assertEqual(parse_range_header("bytes=900-", 1000), (900, 999))
+        self.assertEqual(parse_range_header("bytes=-100", 1000), (900, 999))
+        self.assertEqual(parse_range_header("bytes=500-5000", 1000), (500, 999))
+
+    def test_ignored_and_unsatisfiable(self):
+        self.assertIsNone(parse_range_header("", 1000))
+        self.assertIsNone(parse_range_header("bytes=0-1,5-6", 1000))
+        self.assertIsNone(parse_range_header("bytes=abc", 1000))
+        with self.assertRaises(ValueError):
+            parse_range_header("bytes=1000-", 1000)
+
+
+class ServeFileTests(SimpleTestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        os.makedirs(os.path.join(self.root, "recordings"))
+        self.path = os.path.join(self.root, "recordings", "My Show.mkv")
+        with open(self.path, "wb") as f:
+            f.write(BODY)
+        self.factory = RequestFactory()
+
+    def test_nginx_accel_hands_off_the_file(self):
+        with patch.dict(os.environ, {"USE_NGINX_ACCEL": "true"}), \
+                patch.object(file_serving, "ACCEL_DATA_ROOT", self.root):
+            response = serve_file(self.factory.get("/", HTTP_RANGE="bytes=0-9"), self.path, "video/x-matroska")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Accel-Redirect"], "/protected-data/recordings/My%20Show.mkv")
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["Content-Type"], "video/x-matroska")
+
+    def test_files_outside_the_accel_root_are_served_directly(self):
+        with patch.dict(os.environ, {"USE_NGINX_ACCEL": "true"}), \
+                patch.object(file_serving, "ACCEL_DATA_ROOT", os.path.join(self.root, "logos")):
+            response = serve_file(self.factory.get("/"), self.path)
+
+        self.assertNotIn("X-Accel-Redirect", response)
+        self.assertIsInstance(response, FileResponse)
+        self.assertEqual(b"".join(response.streaming_content), BODY)
+
+    def test_range_without_nginx(self):
+        with patch.dict(os.environ, {"USE_NGINX_ACCEL": ""}):
+            partial = serve_file(self.factory.get("/", HTTP_RANGE="bytes=100-199"), self.path)
+            unsatisfiable = serve_file(self.factory.get("/", HTTP_RANGE="bytes=999999-"), self.path)
+
+        self.assertEqual(partial.status_code, 206)
+        self.assertEqual(partial["Content-Range"], f"bytes 100-199/{len(BODY)}")
+        self.assertEqual(b"".join(partial.streaming_content), BODY[100:200])
+        self.assertEqual(unsatisfiable.status_code, 416)
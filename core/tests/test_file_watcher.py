@@ -0,0 +1,96 @@
+import os
+import shutil
+import tempfile
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase
+
+import core.tasks as core_tasks
+from core.file_watcher import InotifyWatcher, PollingWatcher
+
+
+class _WatchDirTestMixin:
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix="watch-")
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        self.m3u_dir = os.path.join(self.root, "m3us")
+        self.logo_dir = os.path.join(self.root, "logos")
+        os.makedirs(self.m3u_dir)
+        os.makedirs(self.logo_dir)
+        self.targets = [
+            (self.m3u_dir, "m3u", False),
+            (self.logo_dir, "logo", True),
+        ]
+
+    def _write(self, path, data=b"#EXTM3U\n"):
+        with open(path, "wb") as fh:
+            fh.write(data)
+
+
+class InotifyWatcherTests(_WatchDirTestMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        try:
+            self.watcher = InotifyWatcher(self.targets)
+        except OSError as e:
+            self.skipTest(f"inotify unavailable: {e}")
+        self.addCleanup(self.watcher.close)
+
+    def test_close_write_and_move_are_reported(self):
+        self._write(os.path.join(self.m3u_dir, "a.m3u"))
+        staged = os.path.join(self.root, "b.m3u")
+        self._write(staged)
+        os.rename(staged, os.path.join(self.m3u_dir, "b.m3u"))
+        events = self.watcher.poll(1)
+        self.assertEqual(
+            sorted(events),
+            [
+                ("m3u", os.path.join(self.m3u_dir, "a.m3u")),
+                ("m3u", os.path.join(self.m3u_dir, "b.m3u")),
+            ],
+        )
+
+    def test_new_subdirectory_in_recursive_tree_is_watched(self):
+        subdir = os.path.join(self.logo_dir, "pack")
+        os.makedirs(subdir)
+        self.watcher.poll(1)
+        self._write(os.path.join(subdir, "bbc.png"), b"png")
+        self.assertEqual(
+            self.watcher.poll(1), [("logo", os.path.join(subdir, "bbc.png"))],
+        )
+
+
+class PollingWatcherTests(_WatchDirTestMixin, SimpleTestCase):
+    @patch("core.file_watcher.time.sleep")
+    def test_changed_file_reported_once_stable(self, _mock_sleep):
+        self._write(os.path.join(self.m3u_dir, "existing.m3u"))
+        watcher = PollingWatcher(self.targets)
+        path = os.path.join(self.logo_dir, "cnn.png")
+        self._write(path, b"png")
+        self.assertEqual(watcher.poll(0), [])
+        self.assertEqual(watcher.poll(0), [("logo", path)])
+        self.assertEqual(watcher.poll(0), [])
+
+
+class ProcessWatchedFilesTests(SimpleTestCase):
+    @patch("core.tasks.RedisClient.get_client")
+    def test_events_use_settled_processing(self, _mock_redis):
+        processor = MagicMock(return_value="processed")
+        with patch.dict(core_tasks._WATCH_PROCESSORS, {"m3u": processor}):
+            counts = core_tasks.process_watched_files(
+                "m3u", ["/data/m3us/a.m3u", "/data/m3us/notes.txt"],
+            )
+        self.assertEqual(counts["processed"], 1)
+        processor.assert_called_once()
+        self.assertTrue(processor.call_args.kwargs["settled"])
+
+    def test_live_watcher_skips_beat_scan_until_reconcile_due(self):
+        redis = MagicMock()
+        redis.exists.return_value = True
+        with patch.object(core_tasks, "_first_scan_completed", True):
+            redis.set.return_value = None  # Reconcile key still held.
+            self.assertTrue(core_tasks._watcher_covers_scan(redis))
+            redis.set.return_value = True  # Interval elapsed: full pass.
+            self.assertFalse(core_tasks._watcher_covers_scan(redis))
+            redis.exists.return_value = False
+            self.assertFalse(core_tasks._watcher_covers_scan(redis))
@@ -1,8 +1,13 @@
+import os
+import re
+import shutil
+import tempfile
 from unittest.mock import MagicMock, patch
 
 from django.http import Http404
 from django.test import SimpleTestCase
 
+from core import file_serving
 from core.image_proxy import (
     image_fetch_failures,
     serve_local_or_remote_image,
@@ -199,3 +204,48 @@ class ServeLocalOrRemoteImageTests(SimpleTestCase):
         with self.assertRaises(Http404):
             serve_local_or_remote_image("http://127.0.0.1/logo.png")
         mock_get.assert_not_called()
+
+
+class ServeLocalImageAccelTests(SimpleTestCase):
+    """Local logos behind nginx: what survives the X-Accel-Redirect hand-off."""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        os.makedirs(os.path.join(self.root, "logos"))
+        patches = (
+            patch.dict(os.environ, {"USE_NGINX_ACCEL": "true"}),
+            patch.object(file_serving, "ACCEL_DATA_ROOT", self.root),
+            patch("core.image_proxy.resolve_safe_local_data_path",
+                  side_effect=lambda url: os.path.join(self.root, url[len("/data/"):])),
+        )
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def _write(self, name, body):
+        with open(os.path.join(self.root, "logos", name), "wb") as f:
+            f.write(body)
+        return f"/data/logos/{name}"
+
+    def test_png_is_handed_to_nginx_which_adds_nosniff(self):
+        response = serve_local_or_remote_image(self._write("logo.png", PNG_BYTES))
+
+        self.assertEqual(response["X-Accel-Redirect"], "/protected-data/logos/logo.png")
+        self.assertEqual(response["Content-Type"], "image/png")
+        self.assertEqual(response["Cache-Control"], "public, max-age=14400")
+        # nginx drops X-Content-Type-Options on the internal redirect; the
+        # location it lands in must send it instead.
+        conf_path = os.path.join(os.path.dirname(__file__), "..", "..", "docker", "nginx.conf")
+        with open(conf_path) as f:
+            location = re.search(r"location /protected-data/ \{(.*?)\}", f.read(), re.S).group(1)
+        self.assertIn("add_header X-Content-Type-Options nosniff always;", location)
+
+    def test_svg_is_served_in_process_with_its_csp(self):
+        response = serve_local_or_remote_image(self._write("logo.svg", SVG_BYTES))
+
+        self.assertNotIn("X-Accel-Redirect", response)
+        self.assertEqual(response["Content-Type"], "image/svg+xml")
+        self.assertEqual(response["X-Content-Type-Options"], "nosniff")
+        self.assertIn("sandbox", response["Content-Security-Policy"])
+        self.assertEqual(b"".join(response.streaming_content), SVG_BYTES)
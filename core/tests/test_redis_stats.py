@@ -0,0 +1,175 @@
+"""Redis command accounting: key families, recording and the admin endpoint."""
+
+import json
+from unittest import mock
+
+import redis
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core import redis_stats
+from core.api_views import redis_command_stats
+from core.redis_stats import InstrumentedRedis, command_key, command_stats, key_family
+
+# A database the rest of the suite leaves alone.
+_TEST_DB = 15
+
+
+def _test_client(client_class=redis.Redis):
+    client = client_class(
+        host=getattr(settings, "REDIS_HOST", "localhost"),
+        port=int(getattr(settings, "REDIS_PORT", 6379)),
+        db=_TEST_DB,
+        decode_responses=True,
+    )
+    try:
+        client.ping()
+    except redis.ConnectionError:
+        raise SimpleTestCase.skipTest(None, "Redis is not available")
+    return client
+
+
+class KeyFamilyTests(SimpleTestCase):
+    def test_variable_segments_collapse(self):
+        uuid = "0b6c1f5e-3d2a-4c59-9a51-3f0e2b7d8c11"
+        self.assertEqual(
+            key_family(f"live:channel:{uuid}:input:buffer:chunk:1234"),
+            "live:channel:*:input:buffer:chunk:*",
+        )
+        self.assertEqual(key_family(f"live:channel:{uuid}:clients"), "live:channel:*:clients")
+        self.assertEqual(key_family(f"live:channel:{uuid}:clients:ab12cd34ef"), "live:channel:*:clients:*")
+        self.assertEqual(key_family(b"stream_profile:42"), "stream_profile:*")
+        self.assertEqual(key_family("task_lock_refresh_single_m3u_account_12"), "task_lock_refresh_single_m3u_account_*")
+        self.assertEqual(
+            key_family("epg_content:3:1:d=7:p=0:logos=1:tvgid=0:origin=http://host:9191:chunks"),
+            "epg_content:*:chunks",
+        )
+
+    def test_command_key(self):
+        self.assertEqual(command_key(("GET", "a")), ("GET", "a"))
+        self.assertEqual(command_key(("PING",)), ("PING", None))
+        self.assertEqual(command_key(("CONFIG SET", "save", "")), ("CONFIG SET", None))
+        self.assertEqual(command_key(("EVALSHA", "sha", 2, "k1", "k2", "arg")), ("EVALSHA", "k1"))
+        self.assertEqual(command_key(("EVAL", "return 1", 0)), ("EVAL", None))
+
+
+@mock.patch.object(redis_stats.CommandStats, "_start_reporter")
+class RecordingTests(SimpleTestCase):
+    def setUp(self):
+        self.client = _test_client(InstrumentedRedis)
+        self.addCleanup(self.client.delete, "live:channel:7:clients", "stream_profile:9")
+        command_stats.reset()
+        self.addCleanup(command_stats.reset)
+
+    def _families(self):
+        return {(row["command"], row["family"]): row for row in command_stats.snapshot()["families"]}
+
+    def test_commands_and_pipelines_are_counted(self, _reporter):
+        self.client.set("stream_profile:9", "x" * 100)
+        self.client.get("stream_profile:9")
+        with self.client.pipeline() as pipe:
+            pipe.sadd("live:channel:7:clients", "a", "b")
+            pipe.scard("live:channel:7:clients")
+            pipe.execute()
+
+        families = self._families()
+        get = families[("GET", "stream_profile:*")]
+        self.assertEqual(get["calls"], 1)
+        self.assertEqual(get["bytes_in"], 100)
+        self.assertGreater(get["total_us"], 0)
+        self.assertGreaterEqual(families[("SET", "stream_profile:*")]["bytes_out"], 100)
+        self.assertEqual(families[("SADD", "live:channel:*:clients")]["calls"], 1)
+        self.assertEqual(families[("SCARD", "live:channel:*:clients")]["calls"], 1)
+        hot_keys = dict(command_stats.snapshot()["hot_keys"])
+        self.assertEqual(hot_keys["live:channel:7:clients"], 2)
+
+    def test_errors_are_counted(self, _reporter):
+        self.client.set("stream_profile:9", "x")
+        with self.assertRaises(redis.ResponseError):
+            self.client.lpush("stream_profile:9", "y")
+        self.assertEqual(self._families()[("LPUSH", "stream_profile:*")]["errors"], 1)
+
+    def test_family_count_is_bounded(self, _reporter):
+        with mock.patch.object(redis_stats, "MAX_FAMILIES", 2):
+            for name in ("a", "b", "c", "d"):
+                command_stats.add("GET", f"{name}:x", 3, 3, 0.001)
+        families = self._families()
+        self.assertEqual(len(families), 3)
+        self.assertEqual(families[("GET", redis_stats.OTHER_FAMILY)]["calls"], 2)
+
+
+class CollectStatsTests(SimpleTestCase):
+    def setUp(self):
+        self.client = _test_client()
+        self.addCleanup(redis_stats.reset_stats, self.client)
+        self.addCleanup(self.client.delete, redis_stats.RESET_KEY)
+
+    def _publish(self, process, families, hot_keys=()):
+        snapshot = {
+            "process": process,
+            "started_at": 1.0,
+            "updated_at": 2.0,
+            "families": [
+                {"command": command, "family": family, "calls": calls, "errors": 0,
+                 "bytes_out": 10 * calls, "bytes_in": 100 * calls, "total_us": 50 * calls, "max_us": 90}
+                for command, family, calls in families
+            ],
+            "hot_keys": list(hot_keys),
+        }
+        self.client.set(f"{redis_stats.STATS_KEY_PREFIX}{process}", json.dumps(snapshot))
+
+    def test_processes_are_merged(self):
+        self._publish("web:1", [("GET", "stream_profile:*", 3), ("SET", "stream_profile:*", 1)], [("stream_profile:1", 3)])
+        self._publish("celery:2", [("GET", "stream_profile:*", 5)], [("stream_profile:1", 2)])
+
+        stats = redis_stats.collect_stats(self.client, sort="calls", limit=10)
+
+        self.assertEqual([p["process"] for p in stats["processes"]], ["celery:2", "web:1"])
+        top = stats["commands_by_family"][0]
+        self.assertEqual((top["command"], top["family"], top["calls"]), ("GET", "stream_profile:*", 8))
+        self.assertEqual(top["avg_us"], 50.0)
+        self.assertEqual(stats["families"][0]["calls"], 9)
+        self.assertEqual(stats["totals"]["bytes_in"], 900)
+        self.assertEqual(stats["hot_keys"][0], {"key": "stream_profile:1", "calls": 5})
+
+    def test_reset_drops_published_counters(self):
+        self._publish("web:1", [("GET", "a", 1)])
+        redis_stats.reset_stats(self.client)
+        self.assertEqual(redis_stats.collect_stats(self.client)["processes"], [])
+        self.assertIsNotNone(self.client.get(redis_stats.RESET_KEY))
+
+
+class RedisCommandStatsPermissionTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.admin = User.objects.create_user(
+            username="redis_stats_admin", password="x", user_level=User.UserLevel.ADMIN,
+        )
+        self.standard = User.objects.create_user(
+            username="redis_stats_user", password="x", user_level=User.UserLevel.STANDARD,
+        )
+        self.factory = APIRequestFactory()
+        self.client_patch = mock.patch("core.utils.RedisClient.get_client", return_value=_test_client())
+        self.client_patch.start()
+        self.addCleanup(self.client_patch.stop)
+
+    def test_admin_gets_stats(self):
+        request = self.factory.get("/api/core/redis-stats/", {"sort": "calls", "limit": "5"})
+        force_authenticate(request, user=self.admin)
+        response = redis_command_stats(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["sort"], "calls")
+        self.assertIn("commands_by_family", response.data)
+        self.assertIn("total_commands_processed", response.data["server"])
+
+    def test_rejects_unknown_sort(self):
+        request = self.factory.get("/api/core/redis-stats/", {"sort": "size"})
+        force_authenticate(request, user=self.admin)
+        self.assertEqual(redis_command_stats(request).status_code, 400)
+
+    def test_standard_user_is_forbidden(self):
+        request = self.factory.get("/api/core/redis-stats/")
+        force_authenticate(request, user=self.standard)
+        self.assertEqual(redis_command_stats(request).status_code, 403)
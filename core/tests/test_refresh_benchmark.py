@@ -0,0 +1,106 @@
+"""
+Refresh benchmark harness: the seeded synthetic provider data and the
+per-phase measurements.
+"""
+
+import filecmp
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from apps.m3u.tasks import parse_extinf_line
+from core import synthetic_data
+from core.models import CoreSettings
+from core.refresh_benchmark import FakeXCProvider, QueryCounter, measure_phase
+from core.xtream_codes import Client as XCClient
+
+_START = datetime(2026, 1, 5, tzinfo=timezone.utc)
+
+
+class SyntheticDataTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+
+    def test_same_seed_writes_identical_files(self):
+        first = os.path.join(self.directory, "first")
+        second = os.path.join(self.directory, "second")
+        for directory in (first, second):
+            synthetic_data.generate_dataset(directory, 300, 300, 20, days=1, seed=7, start=_START)
+
+        for name in (synthetic_data.PLAYLIST_FILENAME, synthetic_data.XC_CATALOG_FILENAME,
+                     synthetic_data.XMLTV_FILENAME, synthetic_data.MANIFEST_FILENAME):
+            self.assertTrue(filecmp.cmp(os.path.join(first, name), os.path.join(second, name), shallow=False))
+        self.assertEqual(synthetic_data.load_manifest(first)["streams"], 300)
+
+    def test_playlist_parses_and_links_to_the_guide(self):
+        playlist = os.path.join(self.directory, "playlist.m3u")
+        self.assertEqual(synthetic_data.write_m3u(playlist, 600), 600)
+
+        with open(playlist, encoding="utf-8") as f:
+            entries = [parse_extinf_line(line) for line in f if line.startswith("#EXTINF")]
+        self.assertEqual(len(entries), 600)
+        self.assertTrue(all(entry["attributes"]["group-title"] for entry in entries))
+
+        guide_ids = {station["tvg_id"] for station in synthetic_data.iter_stations(200)}
+        tvg_ids = [entry["attributes"]["tvg-id"] for entry in entries]
+        self.assertTrue(any(tvg_id in guide_ids for tvg_id in tvg_ids))
+        self.assertGreater(tvg_ids.count(""), 0)
+
+    def test_guide_covers_every_channel_for_the_requested_days(self):
+        from lxml import etree
+
+        guide = os.path.join(self.directory, "guide.xml")
+        programmes = synthetic_data.write_xmltv(guide, 5, days=2, start=_START)
+
+        tree = etree.parse(guide)
+        self.assertEqual(len(tree.findall("channel")), 5)
+        elements = tree.findall("programme")
+        self.assertEqual(len(elements), programmes)
+        by_channel = {}
+        for element in elements:
+            by_channel.setdefault(element.get("channel"), []).append(element)
+        self.assertEqual(len(by_channel), 5)
+        for channel_programmes in by_channel.values():
+            # Back to back, and the last one runs past the end of the second day.
+            for before, after in zip(channel_programmes, channel_programmes[1:]):
+                self.assertEqual(before.get("stop"), after.get("start"))
+            self.assertGreaterEqual(channel_programmes[-1].get("stop"), "20260107000000 +0000")
+
+    def test_fake_xc_provider_serves_the_catalog(self):
+        catalog = os.path.join(self.directory, "xc.json")
+        synthetic_data.write_xc_catalog(catalog, 50)
+
+        with FakeXCProvider(catalog) as provider:
+            with XCClient(provider.url, synthetic_data.PROVIDER_USERNAME, synthetic_data.PROVIDER_PASSWORD) as client:
+                categories = client.get_live_categories()
+                streams = client.get_all_live_streams()
+
+        self.assertEqual(len(streams), 50)
+        category_ids = {category["category_id"] for category in categories}
+        self.assertTrue(all(stream["category_id"] in category_ids for stream in streams))
+
+
+class MeasurePhaseTests(TestCase):
+    def test_counts_queries_and_rows_written(self):
+        CoreSettings.objects.create(key="benchmark_a", name="A", value={})
+        CoreSettings.objects.create(key="benchmark_b", name="B", value={})
+        results = []
+        with QueryCounter() as counter:
+            with measure_phase("settings", counter, results) as phase:
+                CoreSettings.objects.filter(key__startswith="benchmark_").update(value={"x": 1})
+                CoreSettings.objects.filter(key__startswith="benchmark_").delete()
+                list(CoreSettings.objects.all())
+                phase["extra"] = True
+
+        self.assertNotIn(counter, connection.execute_wrappers)
+        [phase] = results
+        self.assertEqual(phase["phase"], "settings")
+        self.assertTrue(phase["extra"])
+        self.assertGreaterEqual(phase["queries"], 3)
+        self.assertEqual(phase["rows_written"], 4)
+        self.assertGreater(phase["peak_rss_mb"], 0)
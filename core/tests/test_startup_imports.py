@@ -0,0 +1,49 @@
+"""Web and Celery workers must not import heavy optional packages at startup.
+
+numpy, lxml, rapidfuzz, twisted and friends are imported inside the functions
+that need them so every uWSGI and Celery process does not pay for them on
+boot. A new module-level import of one of them fails here; see
+``scripts/import_audit.py`` for a report of what a worker loads and why.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+
+from django.test import SimpleTestCase
+
+_AUDIT_PATH = Path(__file__).resolve().parents[2] / "scripts" / "import_audit.py"
+
+
+def _load_import_audit():
+    spec = importlib.util.spec_from_file_location("dispatcharr_import_audit", _AUDIT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class StartupImportTests(SimpleTestCase):
+    def test_workers_defer_heavy_imports(self):
+        audit = _load_import_audit()
+        for target in audit.TARGETS:
+            with self.subTest(target=target):
+                report = audit.boot_report(audit.run_boot(target))
+                self.assertEqual(
+                    audit.loaded_deferred_modules(report["modules"]),
+                    [],
+                    f"run `python scripts/import_audit.py --target {target}` to find the importer",
+                )
+
+    def test_parse_importtime(self):
+        audit = _load_import_audit()
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   lxml.etree\n"
+            "import time:        30 |        150 | lxml\n"
+        )
+        self.assertEqual(
+            audit.parse_importtime(stderr),
+            [(120, 120, 1, "lxml.etree"), (30, 150, 0, "lxml")],
+        )
+        self.assertEqual(audit.loaded_deferred_modules(["lxml.etree", "json"]), ["lxml"])
@@ -142,8 +142,14 @@ class RedisClient:
                 # TLS params from settings (empty dict when TLS is disabled)
                 ssl_params = getattr(settings, 'REDIS_SSL_PARAMS', {})
 
+                # Opt-in per-command accounting (DISPATCHARR_REDIS_COMMAND_STATS)
+                client_class = redis.Redis
+                if getattr(settings, 'REDIS_COMMAND_STATS', False):
+                    from core.redis_stats import InstrumentedRedis
+                    client_class = InstrumentedRedis
+
                 # Create Redis client with better defaults
-                client = redis.Redis(
+                client = client_class(
                     host=redis_host,
                     port=redis_port,
                     db=redis_db,
@@ -748,80 +754,112 @@ def validate_flexible_url(value):
         # If it doesn't match our flexible patterns, raise the original error
         raise ValidationError("Enter a valid URL.")
 
-def dispatch_event_system(event_type, channel_id=None, channel_name=None, **details):
-    from django.db import close_old_connections
-
-    try:
-        from apps.connect.utils import trigger_event
-        from apps.channels.models import Channel, Stream
-        from core.models import StreamProfile
-        from core.utils import RedisClient
+def build_event_payload(channel_id=None, channel_name=None, cache=None, **details):
+    """
+    Connect/plugin payload for a system event: the event details plus channel,
+    stream, provider and profile names. ``cache`` memoizes model lookups
+    across a batch of events.
+    """
+    from apps.channels.models import Channel, Stream
+    from core.models import StreamProfile
+    from core.utils import RedisClient
 
-        payload = dict(details)
+    cache = cache if cache is not None else {}
 
-        channel_obj = None
-        if channel_id:
+    def _lookup(kind, key, loader):
+        cache_key = (kind, key)
+        if cache_key not in cache:
             try:
-                channel_obj = Channel.objects.get(uuid=channel_id)
-                payload["channel_name"] = channel_obj.name
+                cache[cache_key] = loader()
             except Exception:
-                payload["channel_name"] = channel_name or None
-        else:
-            payload["channel_name"] = channel_name or None
+                cache[cache_key] = None
+        return cache[cache_key]
 
-        # Resolve current stream info
-        stream_id = details.get("stream_id")
-        stream_obj = None
-        if not stream_id and channel_obj:
-            try:
-                redis = RedisClient.get_client()
-                sid = redis.get(f"channel_stream:{channel_obj.id}")
-                if sid:
-                    stream_id = int(sid)
-            except Exception:
-                stream_id = None
+    payload = dict(details)
+    # Captured when the event was queued (apps.connect.outbox); not part of the payload.
+    stream_profile_id = payload.pop("stream_profile_id", None)
 
-        if stream_id:
-            try:
-                stream_obj = Stream.objects.get(id=stream_id)
-            except Exception:
-                stream_obj = None
+    channel_obj = None
+    if channel_id:
+        channel_obj = _lookup(
+            "channel", str(channel_id), lambda: Channel.objects.get(uuid=channel_id)
+        )
+        payload["channel_name"] = channel_obj.name if channel_obj else (channel_name or None)
+    else:
+        payload["channel_name"] = channel_name or None
 
-        # Populate stream details
-        payload["stream_name"] = getattr(stream_obj, "name", None)
-        payload["stream_url"] = getattr(stream_obj, "url", None)
+    # Resolve current stream info
+    stream_id = details.get("stream_id")
+    stream_obj = None
+    if not stream_id and channel_obj:
+        try:
+            redis = RedisClient.get_client()
+            sid = redis.get(f"channel_stream:{channel_obj.id}")
+            if sid:
+                stream_id = int(sid)
+        except Exception:
+            stream_id = None
+
+    if stream_id:
+        stream_obj = _lookup(
+            "stream",
+            stream_id,
+            lambda: Stream.objects.select_related("m3u_account").get(id=stream_id),
+        )
 
-        # Channel URL: use stream URL as best-effort
-        payload["channel_url"] = payload.get("stream_url")
+    # Populate stream details
+    payload["stream_name"] = getattr(stream_obj, "name", None)
+    payload["stream_url"] = getattr(stream_obj, "url", None)
 
-        # Provider name from M3U account
+    # Channel URL: use stream URL as best-effort
+    payload["channel_url"] = payload.get("stream_url")
+
+    # Provider name from M3U account
+    provider_name = None
+    try:
+        if stream_obj and stream_obj.m3u_account:
+            provider_name = stream_obj.m3u_account.name
+    except Exception:
         provider_name = None
-        try:
-            if stream_obj and stream_obj.m3u_account:
-                provider_name = stream_obj.m3u_account.name
-        except Exception:
-            provider_name = None
-        payload["provider_name"] = provider_name
+    payload["provider_name"] = provider_name
 
-        # Profile used
-        profile_used = None
-        try:
-            if stream_id:
+    # Profile used
+    profile_used = None
+    try:
+        if stream_id:
+            pid = stream_profile_id
+            if not pid:
                 redis = RedisClient.get_client()
                 pid = redis.get(f"stream_profile:{stream_id}")
-                if pid:
-                    profile = StreamProfile.objects.filter(id=int(pid)).first()
-                    profile_used = profile.name if profile else None
-        except Exception:
-            profile_used = None
+            if pid:
+                profile = _lookup(
+                    "profile",
+                    int(pid),
+                    lambda: StreamProfile.objects.filter(id=int(pid)).first(),
+                )
+                profile_used = profile.name if profile else None
+    except Exception:
+        profile_used = None
 
-        payload["profile_used"] = profile_used
+    payload["profile_used"] = profile_used
 
-        # remove empty keys
-        for k in list(payload.keys()):
-            if not payload[k]:
-                del payload[k]
+    # remove empty keys
+    for k in list(payload.keys()):
+        if not payload[k]:
+            del payload[k]
 
+    return payload
+
+
+def dispatch_event_system(event_type, channel_id=None, channel_name=None, **details):
+    from django.db import close_old_connections
+
+    try:
+        from apps.connect.utils import trigger_event
+
+        payload = build_event_payload(
+            channel_id=channel_id, channel_name=channel_name, **details
+        )
         trigger_event(event_type, payload)
 
     except Exception:
@@ -838,10 +876,16 @@ def _dispatch_system_event_integrations(
     """
     Run Connect subscriptions and plugin event hooks without blocking the caller.
 
-    On gevent uWSGI workers, dispatch runs in a spawned greenlet so slow webhooks,
-    scripts, or plugin handlers cannot stall live-proxy teardown or streaming paths.
-    Celery prefork workers (gevent patched but no hub) run synchronously instead.
+    While a ``deliver_events`` worker is running the event is only appended
+    to the Redis outbox (one XADD) and delivered there. Otherwise, on gevent
+    uWSGI workers, dispatch runs in a spawned greenlet so slow webhooks,
+    scripts, or plugin handlers cannot stall live-proxy teardown or streaming
+    paths; Celery prefork workers (gevent patched but no hub) run synchronously.
     """
+    from apps.connect.outbox import enqueue_event
+
+    if enqueue_event(event_type, channel_id=channel_id, channel_name=channel_name, **details):
+        return
 
     def _run():
         try:
@@ -1,5 +1,6 @@
 import os
 import ssl
+import sys
 from pathlib import Path
 from datetime import timedelta
 from urllib.parse import quote_plus
@@ -61,6 +62,12 @@ if REDIS_SSL:
 else:
     print("Redis TLS: disabled")
 
+# Count commands, bytes and latency per command and key family on the
+# RedisClient connections (see core/redis_stats.py). Off by default; each
+# process publishes its counters and logs a summary every interval seconds.
+REDIS_COMMAND_STATS = os.environ.get("DISPATCHARR_REDIS_COMMAND_STATS", "false").lower() == "true"
+REDIS_COMMAND_STATS_INTERVAL = int(os.environ.get("DISPATCHARR_REDIS_COMMAND_STATS_INTERVAL", "60"))
+
 ENABLE_IP_LOOKUP = os.environ.get("DISPATCHARR_ENABLE_IP_LOOKUP", "true").lower() == "true"
 
 # Set DEBUG to True for development, False for production
@@ -87,7 +94,6 @@ INSTALLED_APPS = [
     "apps.vod.apps.VODConfig",
     "apps.connect.apps.ConnectConfig",
     "core",
-    "daphne",
     "drf_spectacular",
     "channels",
     "django.contrib.admin",
@@ -104,6 +110,13 @@ INSTALLED_APPS = [
     "apps.timeshift.apps.TimeshiftConfig",
 ]
 
+# daphne's app only provides the ASGI ``runserver`` override, but loading it
+# imports twisted and autobahn into every uWSGI and Celery process. Production
+# runs daphne as its own binary, so only install it for ``manage.py runserver``
+# (it must come before django.contrib.staticfiles).
+if "runserver" in sys.argv:
+    INSTALLED_APPS.insert(INSTALLED_APPS.index("drf_spectacular"), "daphne")
+
 # EPG Processing optimization settings
 EPG_BATCH_SIZE = 1000  # Number of records to process in a batch
 EPG_MEMORY_LIMIT = 512  # Memory limit in MB before forcing garbage collection
@@ -442,6 +455,27 @@ BACKUP_DATA_DIRS = [
     os.environ.get("PLUGINS_DIR", "/data/plugins"),
 ]
 
+# Watch-folder watcher (manage.py watch_files): auto = inotify with polling
+# fallback, or inotify / poll / off. Off leaves ingestion to the beat scan.
+FILE_WATCHER_MODE = os.environ.get("DISPATCHARR_FILE_WATCHER", "auto").lower()
+
+# Catch-up byte-range cache: archive blocks shared by all workers, LRU-evicted
+# above the cap. Set DISPATCHARR_CATCHUP_CACHE_MAX_MB=0 to disable.
+CATCHUP_CACHE_DIR = os.environ.get("DISPATCHARR_CATCHUP_CACHE_DIR", "/data/cache/catchup")
+CATCHUP_CACHE_MAX_MB = int(os.environ.get("DISPATCHARR_CATCHUP_CACHE_MAX_MB", "2048"))
+
+# Float16 EPG name embeddings for ML-assisted matching, updated after each EPG
+# refresh and memory-mapped by matching runs.
+EPG_EMBEDDING_INDEX_DIR = os.environ.get("DISPATCHARR_EPG_EMBEDDING_DIR", "/data/models/epg_index")
+
+# Pre-serialized XC get_vod_streams / get_series lists, rebuilt per VOD refresh.
+XC_CATALOG_SNAPSHOT_DIR = os.environ.get("DISPATCHARR_XC_SNAPSHOT_DIR", "/data/cache/xc_catalog")
+
+# Live proxy buffer memory budget: chunk retention windows shrink (down to
+# BUFFER_MIN_TTL) so all live buffers together stay under this many MB of
+# Redis. Set DISPATCHARR_LIVE_BUFFER_BUDGET_MB=0 to always use redis_chunk_ttl.
+LIVE_BUFFER_BUDGET_MB = int(os.environ.get("DISPATCHARR_LIVE_BUFFER_BUDGET_MB", "1024"))
+
 SERVER_IP = "127.0.0.1"
 
 CORS_ALLOW_ALL_ORIGINS = True
@@ -610,3 +644,12 @@ CONNECT_SCRIPT_MAX_OUTPUT = int(os.environ.get("DISPATCHARR_SCRIPT_MAX_OUTPUT",
 # Require executable bit and disallow world-writable files
 CONNECT_SCRIPT_REQUIRE_EXECUTABLE = True
 CONNECT_SCRIPT_DISALLOW_WORLD_WRITABLE = True
+
+# Connect event outbox (manage.py deliver_events). While the delivery worker
+# runs, system events are queued in Redis and delivered there; set
+# DISPATCHARR_CONNECT_OUTBOX=false to always dispatch from the emitting process.
+CONNECT_OUTBOX_ENABLED = os.environ.get("DISPATCHARR_CONNECT_OUTBOX", "true").lower() not in ("0", "false", "no", "off")
+
+# Delivery thread pool size and concurrent deliveries allowed per integration
+CONNECT_DELIVERY_WORKERS = int(os.environ.get("DISPATCHARR_CONNECT_WORKERS", "8"))
+CONNECT_DELIVERY_PER_INTEGRATION = int(os.environ.get("DISPATCHARR_CONNECT_PER_INTEGRATION", "2"))
@@ -32,6 +32,9 @@ PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
 CELERY_TASK_ALWAYS_EAGER = False
 CELERY_TASK_EAGER_PROPAGATES = False
 
+# Keep the catch-up disk cache off; cache tests opt in with override_settings.
+CATCHUP_CACHE_MAX_MB = 0
+
 _use_sqlite = os.environ.get("TEST_USE_SQLITE", "").lower() in ("1", "true", "yes")
 
 if _use_sqlite:
@@ -60,6 +60,10 @@ done
 # Start Celery
 echo 'Migrations complete, starting Celery...'
 celery -A dispatcharr beat -l info &
+# Watch-folder watcher: ingests dropped M3U/EPG/logo files immediately.
+python manage.py watch_files &
+# Connect outbox: delivers webhook/script/plugin events off the streaming path.
+python manage.py deliver_events &
 
 # Default to nice level 5 (lower priority) - safe for unprivileged containers
 # Negative values require SYS_NICE capability
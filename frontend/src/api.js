@@ -2470,6 +2470,19 @@ export default class API {
     }
   }
 
+  static async getTuneStats(params = {}) {
+    try {
+      const queryParams = new URLSearchParams(params);
+      const response = await request(
+        `${host}/proxy/ts/tune_stats?${queryParams.toString()}`
+      );
+
+      return response;
+    } catch (e) {
+      errorNotification('Failed to retrieve tune latency stats', e);
+    }
+  }
+
   static async getVODStats() {
     try {
       const response = await request(`${host}/proxy/vod/stats/`);
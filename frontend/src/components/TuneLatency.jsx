@@ -0,0 +1,223 @@
+import React, { useCallback, useEffect, useState } from 'react';
+import {
+  ActionIcon,
+  Badge,
+  Button,
+  Card,
+  Group,
+  SegmentedControl,
+  Stack,
+  Table,
+  TableTbody,
+  TableTd,
+  TableTh,
+  TableThead,
+  TableTr,
+  Text,
+  Title,
+} from '@mantine/core';
+import { ChevronDown, Timer } from 'lucide-react';
+import API from '../api';
+
+const PHASE_LABELS = {
+  resolve: 'Resolve',
+  allocate: 'Allocate',
+  initialize: 'Initialize',
+  connect: 'Connect',
+  first_data: 'First data',
+  buffer_ready: 'Buffer',
+  deliver: 'Deliver',
+};
+
+export const formatMs = (ms) => {
+  if (ms === null || ms === undefined) return '—';
+  return ms >= 1000 ? `${(ms / 1000).toFixed(2)}s` : `${Math.round(ms)}ms`;
+};
+
+const PhaseBar = ({ phases, order }) => {
+  const medians = order
+    .filter((phase) => phases[phase])
+    .map((phase) => [phase, phases[phase].p50 || 0]);
+  const total = medians.reduce((sum, [, ms]) => sum + ms, 0);
+  if (!total) return null;
+
+  return (
+    <Group gap={0} wrap="nowrap" w="100%" h={6} style={{ borderRadius: 3 }}>
+      {medians.map(([phase, ms], i) => (
+        <div
+          key={phase}
+          title={`${PHASE_LABELS[phase] || phase}: ${formatMs(ms)}`}
+          style={{
+            width: `${(ms / total) * 100}%`,
+            height: '100%',
+            backgroundColor: `var(--mantine-color-${
+              ['blue', 'cyan', 'teal', 'green', 'lime', 'yellow', 'orange'][
+                i % 7
+              ]
+            }-6)`,
+          }}
+        />
+      ))}
+    </Group>
+  );
+};
+
+const LatencyRow = ({ label, stats, order }) => (
+  <TableTr>
+    <TableTd maw={220}>
+      <Text size="sm" truncate>
+        {label}
+      </Text>
+    </TableTd>
+    <TableTd>{stats.tunes}</TableTd>
+    <TableTd>{formatMs(stats.ttfb_ms.p50)}</TableTd>
+    <TableTd>{formatMs(stats.ttfb_ms.p95)}</TableTd>
+    <TableTd>
+      {stats.dominant_phase && (
+        <Badge size="sm" variant="light">
+          {PHASE_LABELS[stats.dominant_phase] || stats.dominant_phase}
+        </Badge>
+      )}
+    </TableTd>
+    <TableTd miw={140}>
+      <PhaseBar phases={stats.phases_ms} order={order} />
+    </TableTd>
+  </TableTr>
+);
+
+const TuneLatency = () => {
+  const [isExpanded, setIsExpanded] = useState(false);
+  const [isLoading, setIsLoading] = useState(false);
+  const [groupBy, setGroupBy] = useState('channels');
+  const [stats, setStats] = useState(null);
+
+  const fetchStats = useCallback(async () => {
+    setIsLoading(true);
+    try {
+      const response = await API.getTuneStats();
+      if (response) {
+        setStats(response);
+      }
+    } finally {
+      setIsLoading(false);
+    }
+  }, []);
+
+  useEffect(() => {
+    if (isExpanded) {
+      fetchStats();
+    }
+  }, [isExpanded, fetchStats]);
+
+  const overall = stats?.overall;
+  const order = stats?.phases || Object.keys(PHASE_LABELS);
+  const rows = stats?.[groupBy] || [];
+
+  return (
+    <Card
+      shadow="sm"
+      padding="sm"
+      radius="md"
+      withBorder
+      style={{ color: '#fff', backgroundColor: '#27272A' }}
+    >
+      <Group justify="space-between" mb={isExpanded ? 'sm' : 0}>
+        <Group gap="xs">
+          <Timer size={20} />
+          <Title order={4}>Tune Latency</Title>
+          {overall && (
+            <Text size="sm" c="dimmed">
+              p50 {formatMs(overall.ttfb_ms.p50)} • p95{' '}
+              {formatMs(overall.ttfb_ms.p95)} • {overall.tunes} tunes
+            </Text>
+          )}
+        </Group>
+        <Group gap="xs">
+          {isExpanded && (
+            <>
+              <SegmentedControl
+                size="xs"
+                value={groupBy}
+                onChange={setGroupBy}
+                data={[
+                  { value: 'channels', label: 'Channels' },
+                  { value: 'providers', label: 'Providers' },
+                ]}
+              />
+              <Button
+                size="xs"
+                variant="subtle"
+                onClick={fetchStats}
+                loading={isLoading}
+              >
+                Refresh
+              </Button>
+            </>
+          )}
+          <ActionIcon
+            variant="subtle"
+            onClick={() => setIsExpanded(!isExpanded)}
+          >
+            <ChevronDown
+              size={18}
+              style={{
+                transform: isExpanded ? 'rotate(180deg)' : 'rotate(0deg)',
+                transition: 'transform 0.2s',
+              }}
+            />
+          </ActionIcon>
+        </Group>
+      </Group>
+
+      {isExpanded && (
+        <Stack gap="xs">
+          {overall && (
+            <Group gap="xs">
+              {order
+                .filter((phase) => overall.phases_ms[phase])
+                .map((phase) => (
+                  <Badge key={phase} size="sm" variant="outline">
+                    {PHASE_LABELS[phase] || phase}: p50{' '}
+                    {formatMs(overall.phases_ms[phase].p50)} / p95{' '}
+                    {formatMs(overall.phases_ms[phase].p95)}
+                  </Badge>
+                ))}
+            </Group>
+          )}
+          {rows.length === 0 ? (
+            <Text size="sm" c="dimmed" ta="center" py="md">
+              No tunes recorded yet
+            </Text>
+          ) : (
+            <Table fontSize="xs" striped highlightOnHover>
+              <TableThead>
+                <TableTr>
+                  <TableTh>
+                    {groupBy === 'channels' ? 'Channel' : 'Provider'}
+                  </TableTh>
+                  <TableTh>Tunes</TableTh>
+                  <TableTh>p50</TableTh>
+                  <TableTh>p95</TableTh>
+                  <TableTh>Slowest phase</TableTh>
+                  <TableTh>Median breakdown</TableTh>
+                </TableTr>
+              </TableThead>
+              <TableTbody>
+                {rows.map((row) => (
+                  <LatencyRow
+                    key={row.channel_id || row.m3u_account_id}
+                    label={row.channel_name || row.name || row.channel_id}
+                    stats={row}
+                    order={order}
+                  />
+                ))}
+              </TableTbody>
+            </Table>
+          )}
+        </Stack>
+      )}
+    </Card>
+  );
+};
+
+export default TuneLatency;
@@ -212,6 +212,17 @@ const DvrSettingsForm = React.memo(({ active }) => {
             ? `Using ${comskipConfig.path}`
             : 'No custom comskip.ini uploaded.'}
         </Text>
+        <Select
+          label="Finalize recordings as"
+          description="MKV: joins the recorded segments into a single file when the recording ends (reads and rewrites the whole recording). HLS: keeps the segments and closes the playlist, so finishing a recording costs almost no disk I/O. Comskip requires MKV."
+          data={[
+            { value: 'concat', label: 'MKV (concatenate segments)' },
+            { value: 'hls', label: 'HLS (keep segments, no concat)' },
+          ]}
+          {...form.getInputProps('finalize_mode')}
+          id="finalize_mode"
+          name="finalize_mode"
+        />
         <NumberInput
           label="Start early (minutes)"
           description="Begin recording this many minutes before the scheduled start."
@@ -8,6 +8,7 @@ import {
   Collapse,
   Flex,
   NumberInput,
+  Select,
   Stack,
   TextInput,
 } from '@mantine/core';
@@ -26,6 +27,7 @@ const isNumericField = (key) => {
     'channel_init_grace_period',
     'channel_client_wait_period',
     'new_client_behind_seconds',
+    'standby_channels',
   ].includes(key);
 };
 
@@ -37,10 +39,24 @@ const getNumericFieldMax = (key) => {
   if (key === 'channel_shutdown_delay') return 300;
   if (key === 'channel_client_wait_period') return 300;
   if (key === 'new_client_behind_seconds') return 120;
+  if (key === 'standby_channels') return 50;
   return 300;
 };
 
 const renderProxySettingField = (key, config, proxySettingsForm) => {
+  if (config.options) {
+    return (
+      <Select
+        key={key}
+        label={config.label}
+        data={config.options}
+        allowDeselect={false}
+        {...proxySettingsForm.getInputProps(key)}
+        description={config.description || null}
+      />
+    );
+  }
+
   if (isNumericField(key)) {
     return (
       <NumberInput
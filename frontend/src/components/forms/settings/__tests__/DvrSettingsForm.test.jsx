@@ -133,6 +133,7 @@ const mockFormValues = {
   comskip_custom_path: '',
   comskip_mode: 'cut',
   comskip_hw_accel: 'none',
+  finalize_mode: 'concat',
   pre_offset_minutes: 0,
   post_offset_minutes: 0,
   tv_template: '',
@@ -231,6 +232,13 @@ describe('DvrSettingsForm', () => {
       });
     });
 
+    it('renders the finalize_mode select', async () => {
+      render(<DvrSettingsForm active={true} />);
+      await waitFor(() => {
+        expect(screen.getByTestId('finalize_mode')).toBeInTheDocument();
+      });
+    });
+
     it('renders the file input for comskip.ini upload', async () => {
       render(<DvrSettingsForm active={true} />);
       await waitFor(() => {
@@ -69,6 +69,28 @@ export const PROXY_SETTINGS_OPTIONS = {
     description:
       'Seconds of received buffer to start behind live when a new client connects (0 = start at live). Note: this is chunk receive time, not video duration.',
   },
+  standby_channels: {
+    label: 'Standby Channels',
+    advanced: true,
+    description:
+      'Keep this many of the most-tuned channels connected with no viewers so they start instantly (0 = off). Only spare provider connections are used; a standby channel gives up its connection as soon as a viewer needs it.',
+  },
+  standby_pinned_channels: {
+    label: 'Pinned Standby Channels',
+    advanced: true,
+    description:
+      'Comma-separated channel numbers to always keep on standby, in addition to the most-tuned ones.',
+  },
+  stream_ordering: {
+    label: 'Stream Failover Order',
+    advanced: true,
+    options: [
+      { value: 'static', label: 'Channel order' },
+      { value: 'adaptive', label: 'Adaptive (prefer healthy streams)' },
+    ],
+    description:
+      "Channel order always tries a channel's streams as listed. Adaptive tries streams that recently started quickly and played without failures or buffering first, keeping the listed order among similarly healthy streams.",
+  },
 };
 
 export const USER_LIMITS_OPTIONS = {
@@ -21,6 +21,7 @@ import useLogosStore from '../store/logos';
 import useStreamProfilesStore from '../store/streamProfiles';
 import useLocalStorage from '../hooks/useLocalStorage';
 import SystemEvents from '../components/SystemEvents';
+import TuneLatency from '../components/TuneLatency';
 import ErrorBoundary from '../components/ErrorBoundary.jsx';
 import {
   fetchAllConnectionStats,
@@ -601,6 +602,9 @@ const StatsPage = () => {
               </Group>
             </Group>
           </Box>
+          <Box p={10} pb={0}>
+            <TuneLatency />
+          </Box>
           <Box
             style={{
               gap: '1rem',
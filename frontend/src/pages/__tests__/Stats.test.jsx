@@ -33,6 +33,10 @@ vi.mock('../../components/SystemEvents', () => ({
   default: () => <div data-testid="system-events">SystemEvents</div>,
 }));
 
+vi.mock('../../components/TuneLatency', () => ({
+  default: () => <div data-testid="tune-latency">TuneLatency</div>,
+}));
+
 vi.mock('../../components/ErrorBoundary.jsx', () => ({
   default: ({ children }) => <div data-testid="error-boundary">{children}</div>,
 }));
@@ -136,11 +136,14 @@ const useVODStore = create((set, get) => ({
   currentPage: 1,
   totalCount: 0,
   pageSize: 24,
+  // Keyset cursors for the 'all' view, by the page number they start.
+  pageCursors: {},
 
   setFilters: (newFilters) =>
     set((state) => ({
       filters: { ...state.filters, ...newFilters },
       currentPage: 1, // Reset to first page when filters change
+      pageCursors: {},
     })),
 
   setPage: (page) =>
@@ -152,6 +155,7 @@ const useVODStore = create((set, get) => ({
     set(() => ({
       pageSize: size,
       currentPage: 1, // Reset to first page when page size changes
+      pageCursors: {},
     })),
 
   fetchContent: async () => {
@@ -183,6 +187,10 @@ const useVODStore = create((set, get) => ({
         totalCount = response.count || results.length;
       } else {
         // Use the new unified backend endpoint for 'all' view
+        const cursor = state.pageCursors[state.currentPage];
+        if (cursor) {
+          params.append('cursor', cursor);
+        }
         const response = await api.getAllContent(params);
         console.log('getAllContent response:', response);
 
@@ -201,6 +209,15 @@ const useVODStore = create((set, get) => ({
           contentType: item.content_type, // Backend provides this field
         }));
         totalCount = response.count || results.length;
+
+        if (response.next_cursor) {
+          set((current) => ({
+            pageCursors: {
+              ...current.pageCursors,
+              [state.currentPage + 1]: response.next_cursor,
+            },
+          }));
+        }
       }
 
       // Store the current page results directly (don't accumulate all pages)
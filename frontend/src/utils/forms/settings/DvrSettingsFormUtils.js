@@ -18,6 +18,7 @@ export const getDvrSettingsFormInitialValues = () => {
     comskip_custom_path: '',
     comskip_mode: 'cut',
     comskip_hw_accel: 'none',
+    finalize_mode: 'concat',
     pre_offset_minutes: 0,
     post_offset_minutes: 0,
   };
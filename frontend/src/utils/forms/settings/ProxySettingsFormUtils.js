@@ -16,5 +16,8 @@ export const getProxySettingDefaults = () => {
     channel_init_grace_period: 60,
     channel_client_wait_period: 5,
     new_client_behind_seconds: 5,
+    standby_channels: 0,
+    standby_pinned_channels: '',
+    stream_ordering: 'static',
   };
 };
@@ -73,6 +73,7 @@ describe('DvrSettingsFormUtils', () => {
         comskip_custom_path: '',
         comskip_mode: 'cut',
         comskip_hw_accel: 'none',
+        finalize_mode: 'concat',
         pre_offset_minutes: 0,
         post_offset_minutes: 0,
       });
@@ -63,6 +63,9 @@ describe('ProxySettingsFormUtils', () => {
         channel_init_grace_period: 60,
         channel_client_wait_period: 5,
         new_client_behind_seconds: 5,
+        standby_channels: 0,
+        standby_pinned_channels: '',
+        stream_ordering: 'static',
       });
     });
 
@@ -84,6 +87,9 @@ describe('ProxySettingsFormUtils', () => {
       expect(typeof result.channel_init_grace_period).toBe('number');
       expect(typeof result.channel_client_wait_period).toBe('number');
       expect(typeof result.new_client_behind_seconds).toBe('number');
+      expect(typeof result.standby_channels).toBe('number');
+      expect(typeof result.standby_pinned_channels).toBe('string');
+      expect(typeof result.stream_ordering).toBe('string');
     });
   });
 });
@@ -50,6 +50,7 @@ export const saveChangedSettings = async (settings, changedSettings) => {
     'comskip_custom_path',
     'comskip_mode',
     'comskip_hw_accel',
+    'finalize_mode',
     'pre_offset_minutes',
     'post_offset_minutes',
     'series_rules',
@@ -323,6 +324,8 @@ export const parseSettings = (settings) => {
     // Legacy "qsv" never worked with the bundled binary; map to hwassist.
     const hwAccel = dvrSettings.comskip_hw_accel || 'none';
     parsed.comskip_hw_accel = hwAccel === 'qsv' ? 'hwassist' : hwAccel;
+    parsed.finalize_mode =
+      dvrSettings.finalize_mode === 'hls' ? 'hls' : 'concat';
     parsed.pre_offset_minutes =
       typeof dvrSettings.pre_offset_minutes === 'number'
         ? dvrSettings.pre_offset_minutes
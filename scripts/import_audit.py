@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""Report what a cold web or Celery worker imports, and how long it takes.
+
+Boots Django in a fresh interpreter under ``python -X importtime`` the way a
+uWSGI worker (settings, apps, URLconf) or a Celery worker (settings, apps,
+task modules) does, then prints the slowest imports.
+
+With ``--check`` it exits non-zero when a module that should only load on
+first use (numpy, lxml, twisted, ...) was imported at startup, or when the
+total import time exceeds ``--budget-ms``. ``core.tests.test_startup_imports``
+runs the same check so regressions fail the backend tests.
+
+Run from the repository root with the same environment as the app, e.g.::
+
+    python scripts/import_audit.py --target celery --top 30
+    python scripts/import_audit.py --check --budget-ms 4000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Heavy third-party packages that only some requests or tasks need. Each is
+# imported inside the function that uses it; loading one at startup costs
+# every worker its import time and resident memory.
+DEFERRED_MODULES = (
+    "autobahn",
+    "lxml",
+    "numpy",
+    "rapidfuzz",
+    "sentence_transformers",
+    "torch",
+    "twisted",
+)
+
+_BOOT = {
+    "web": (
+        "from django.core.wsgi import get_wsgi_application\n"
+        "get_wsgi_application()\n"
+        "from django.urls import get_resolver\n"
+        "get_resolver().url_patterns\n"
+    ),
+    "celery": (
+        "import django\n"
+        "django.setup()\n"
+        "from dispatcharr.celery import app\n"
+        "app.loader.import_default_modules()\n"
+    ),
+}
+
+_REPORT = (
+    "import json, resource, sys\n"
+    "print('\\n' + json.dumps({\n"
+    "    'modules': sorted(sys.modules),\n"
+    "    'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,\n"
+    "}))\n"
+)
+
+TARGETS = tuple(_BOOT)
+
+
+def run_boot(target: str, importtime: bool = False) -> subprocess.CompletedProcess:
+    """Boot *target* in a fresh interpreter; the last stdout line is a JSON report."""
+    env = dict(os.environ)
+    env.setdefault("DJANGO_SETTINGS_MODULE", "dispatcharr.settings")
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-c", _BOOT[target] + _REPORT]
+    result = subprocess.run(command, cwd=REPO_ROOT, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"{target} boot failed:\n{result.stderr[-4000:]}")
+    return result
+
+
+def boot_report(result: subprocess.CompletedProcess) -> dict:
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def parse_importtime(stderr: str) -> list[tuple[int, int, int, str]]:
+    """``(self_us, cumulative_us, depth, module)`` for each ``-X importtime`` line."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(parts[0]), int(parts[1]), depth, name.strip()))
+    return rows
+
+
+def loaded_deferred_modules(modules, deferred=DEFERRED_MODULES) -> list[str]:
+    """Top-level packages from *deferred* that appear in *modules*."""
+    loaded = {name.partition(".")[0] for name in modules}
+    return sorted(set(deferred) & loaded)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", choices=TARGETS, default="web")
+    parser.add_argument("--top", type=int, default=25, help="number of imports to list")
+    parser.add_argument("--check", action="store_true", help="fail when deferred modules load at startup")
+    parser.add_argument("--budget-ms", type=float, help="fail when total import time exceeds this")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    result = run_boot(args.target, importtime=True)
+    rows = parse_importtime(result.stderr)
+    report = boot_report(result)
+    total_ms = sum(row[0] for row in rows) / 1000
+    loaded = loaded_deferred_modules(report["modules"])
+
+    if args.json:
+        print(json.dumps({
+            "target": args.target,
+            "total_import_ms": round(total_ms, 1),
+            "modules": len(report["modules"]),
+            "max_rss_kb": report["max_rss_kb"],
+            "deferred_modules_loaded": loaded,
+            "slowest": [
+                {"module": name, "self_us": self_us, "cumulative_us": cumulative_us}
+                for self_us, cumulative_us, _depth, name in sorted(rows, reverse=True)[:args.top]
+            ],
+        }, indent=2))
+    else:
+        print(f"{args.target}: {len(report['modules'])} modules, {total_ms:.0f} ms importing, "
+              f"max RSS {report['max_rss_kb'] / 1024:.1f} MiB")
+        print(f"\nSlowest top-level imports (cumulative):")
+        for _self_us, cumulative_us, _depth, name in sorted(
+            (row for row in rows if row[2] == 0), key=lambda row: row[1], reverse=True
+        )[:args.top]:
+            print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+        print(f"\nSlowest modules (self):")
+        for self_us, _cumulative_us, _depth, name in sorted(rows, reverse=True)[:args.top]:
+            print(f"  {self_us / 1000:8.1f} ms  {name}")
+        if loaded:
+            print(f"\nDeferred modules loaded at startup: {', '.join(loaded)}")
+
+    failed = False
+    if args.check and loaded:
+        print(f"FAIL: {', '.join(loaded)} imported during {args.target} startup", file=sys.stderr)
+        failed = True
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        print(f"FAIL: {total_ms:.0f} ms importing exceeds the {args.budget_ms:.0f} ms budget", file=sys.stderr)
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
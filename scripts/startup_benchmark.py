@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Measure cold-start time and baseline memory of web and Celery workers.
+
+Boots each target (see ``import_audit.py``) in a fresh interpreter several
+times and reports the median wall-clock time and resident set size once
+startup imports are done. ``--max-seconds`` and ``--max-rss-mb`` turn the
+numbers into a pass/fail check; ``--json`` prints them for comparing
+branches::
+
+    python scripts/startup_benchmark.py --runs 7
+    python scripts/startup_benchmark.py --target web --max-rss-mb 160
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+
+from import_audit import TARGETS, boot_report, run_boot
+
+
+def benchmark(target: str, runs: int) -> dict:
+    run_boot(target)  # warm the bytecode cache so every run measures the same thing
+    seconds, rss_kb = [], []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = run_boot(target)
+        seconds.append(time.perf_counter() - started)
+        rss_kb.append(boot_report(result)["max_rss_kb"])
+    return {
+        "target": target,
+        "runs": runs,
+        "median_seconds": round(statistics.median(seconds), 3),
+        "min_seconds": round(min(seconds), 3),
+        "max_seconds": round(max(seconds), 3),
+        "median_rss_mb": round(statistics.median(rss_kb) / 1024, 1),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", choices=TARGETS, action="append", help="default: all targets")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, help="fail when a median start exceeds this")
+    parser.add_argument("--max-rss-mb", type=float, help="fail when a median RSS exceeds this")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args(argv)
+
+    results = [benchmark(target, max(1, args.runs)) for target in args.target or TARGETS]
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for r in results:
+            print(f"{r['target']:>7}: {r['median_seconds']:.2f} s median "
+                  f"({r['min_seconds']:.2f}-{r['max_seconds']:.2f} s over {r['runs']} runs), "
+                  f"{r['median_rss_mb']:.1f} MiB RSS")
+
+    failed = False
+    for r in results:
+        if args.max_seconds is not None and r["median_seconds"] > args.max_seconds:
+            print(f"FAIL: {r['target']} starts in {r['median_seconds']:.2f} s "
+                  f"(limit {args.max_seconds:.2f} s)", file=sys.stderr)
+            failed = True
+        if args.max_rss_mb is not None and r["median_rss_mb"] > args.max_rss_mb:
+            print(f"FAIL: {r['target']} uses {r['median_rss_mb']:.1f} MiB after startup "
+                  f"(limit {args.max_rss_mb:.1f} MiB)", file=sys.stderr)
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
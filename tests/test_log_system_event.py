@@ -28,10 +28,11 @@ class LogSystemEventDispatchTests(SimpleTestCase):
         )
         mock_close.assert_called_once()
 
+    @patch("apps.connect.outbox.enqueue_event", return_value=False)
     @patch("django.db.close_old_connections")
     @patch("apps.connect.utils.trigger_event")
     def test_integration_dispatch_closes_db_on_sync_path(
-        self, mock_trigger, mock_close
+        self, mock_trigger, mock_close, _mock_enqueue
     ):
         from core.utils import _dispatch_system_event_integrations
 
@@ -41,9 +42,10 @@ class LogSystemEventDispatchTests(SimpleTestCase):
         mock_trigger.assert_called_once()
         mock_close.assert_called_once()
 
+    @patch("apps.connect.outbox.enqueue_event", return_value=False)
     @patch("core.utils.dispatch_event_system")
     def test_integration_dispatch_spawns_on_gevent_uwsgi(
-        self, mock_dispatch
+        self, mock_dispatch, _mock_enqueue
     ):
         from core.utils import _dispatch_system_event_integrations
 
@@ -54,3 +56,19 @@ class LogSystemEventDispatchTests(SimpleTestCase):
 
         mock_spawn.assert_called_once()
         mock_dispatch.assert_not_called()
+
+    @patch("core.utils.dispatch_event_system")
+    @patch("apps.connect.outbox.enqueue_event", return_value=True)
+    def test_integration_dispatch_only_enqueues_while_outbox_worker_runs(
+        self, mock_enqueue, mock_dispatch
+    ):
+        from core.utils import _dispatch_system_event_integrations
+
+        with patch("gevent.spawn") as mock_spawn:
+            _dispatch_system_event_integrations("client_connect", channel_id="abc", user="bob")
+
+        mock_enqueue.assert_called_once_with(
+            "client_connect", channel_id="abc", channel_name=None, user="bob"
+        )
+        mock_spawn.assert_not_called()
+        mock_dispatch.assert_not_called()